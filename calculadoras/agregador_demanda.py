@@ -0,0 +1,236 @@
+# calculadoras/agregador_demanda.py
+"""
+Agregador en streaming de la demanda mensual de financiamiento
+Recorre fichas_tecnicas por lotes de id_ficha, extrae en SQLite solo el
+detalle de instalación y los totales de datos_json, y acumula por
+(provincia, categoría, cultivo) en arrays de NumPy. La memoria depende
+del número de grupos, no del tamaño de la tabla, y el avance se guarda
+en un checkpoint para reanudar.
+
+Uso:
+    python -m calculadoras.agregador_demanda [--lote N] [--checkpoint RUTA] [--reiniciar]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+
+from .almacenamiento import AlmacenFichas, DATOS_PARAMETRICOS, RUTA_BD, ESPERA_BLOQUEO_MS
+from .resumen_fichas import MESES, cronograma_instalacion
+
+TAMAÑO_LOTE_DEFECTO = 500
+CAPACIDAD_INICIAL = 16
+
+# Subárboles de datos_json que se decodifican (el resto no sale de SQLite).
+# Las filas paramétricas tienen datos_json vacío, que json_extract rechaza,
+# así que se saltan aquí y se regeneran en _procesar_lote
+_CONSULTA_LOTE = '''
+    SELECT id_ficha, provincia, categoria_id, cultivo_id, hectareas, parametrica,
+           CASE WHEN parametrica THEN NULL
+                ELSE json_extract(datos_json, '$.costos_instalacion_detallado') END AS detalle,
+           CASE WHEN parametrica THEN NULL
+                ELSE json_extract(datos_json, '$.analisis_financiero.inversion_inicial') END AS inversion
+    FROM (SELECT *, datos_json = ? AS parametrica FROM fichas_tecnicas WHERE id_ficha > ?)
+    ORDER BY id_ficha
+    LIMIT ?
+'''
+
+
+class AgregadorDemanda:
+    """
+    Acumula por grupo: número de fichas, hectáreas, inversión inicial y
+    el cronograma de inversión de 12 meses (ago-jul)
+    """
+
+    def __init__(self, ruta: str = None, tamaño_lote: int = TAMAÑO_LOTE_DEFECTO,
+                 checkpoint: str = None):
+        """
+        Args:
+            ruta: Archivo SQLite (default: fichas_tecnicas.db en la raíz del proyecto)
+            tamaño_lote: Filas leídas por consulta
+            checkpoint: Archivo JSON de avance (None: sin checkpoint)
+
+        Raises:
+            ValueError: Si tamaño_lote no es positivo
+        """
+        if tamaño_lote <= 0:
+            raise ValueError("El tamaño de lote debe ser mayor a 0")
+        self.ruta = RUTA_BD if ruta is None else ruta
+        self.tamaño_lote = tamaño_lote
+        self.checkpoint = checkpoint
+        self.reiniciar()
+        if checkpoint is not None and os.path.exists(checkpoint):
+            self._cargar_checkpoint()
+
+    def reiniciar(self) -> None:
+        """
+        Descarta lo acumulado y vuelve a empezar desde el primer id_ficha
+        """
+        self.ultimo_id = 0
+        self.grupos: Dict[Tuple[str, str, str], int] = {}
+        self.fichas = np.zeros(CAPACIDAD_INICIAL, dtype=np.int64)
+        self.fichas_con_cronograma = np.zeros(CAPACIDAD_INICIAL, dtype=np.int64)
+        self.hectareas = np.zeros(CAPACIDAD_INICIAL)
+        self.inversion = np.zeros(CAPACIDAD_INICIAL)
+        self.demanda = np.zeros((CAPACIDAD_INICIAL, len(MESES)))
+
+    def _indice(self, grupo: Tuple[str, str, str]) -> int:
+        if grupo not in self.grupos:
+            indice = len(self.grupos)
+            if indice == len(self.fichas):
+                capacidad = 2 * indice
+                for nombre in ('fichas', 'fichas_con_cronograma', 'hectareas', 'inversion', 'demanda'):
+                    actual = getattr(self, nombre)
+                    ampliado = np.zeros((capacidad,) + actual.shape[1:], dtype=actual.dtype)
+                    ampliado[:indice] = actual
+                    setattr(self, nombre, ampliado)
+            self.grupos[grupo] = indice
+        return self.grupos[grupo]
+
+    def _procesar_lote(self, filas: List[tuple], almacen: AlmacenFichas) -> None:
+        n = len(filas)
+        indices = np.empty(n, dtype=np.int64)
+        hectareas = np.empty(n)
+        inversion = np.zeros(n)
+        meses = np.zeros((n, len(MESES)))
+        con_cronograma = np.zeros(n, dtype=np.int64)
+
+        for i, (id_ficha, provincia, categoria_id, cultivo_id, ha, parametrica, detalle, inv) in enumerate(filas):
+            indices[i] = self._indice((provincia, categoria_id, None if cultivo_id is None else str(cultivo_id)))
+            hectareas[i] = ha
+            if parametrica:
+                datos = almacen.leer(id_ficha)
+                cronograma = cronograma_instalacion(datos)
+                inv = datos.get('analisis_financiero', {}).get('inversion_inicial')
+            else:
+                cronograma = cronograma_instalacion({'costos_instalacion_detallado': json.loads(detalle)}) \
+                    if detalle is not None else None
+            inversion[i] = inv or 0
+            if cronograma is not None:
+                meses[i] = [cronograma[mes] for mes in MESES]
+                con_cronograma[i] = 1
+
+        np.add.at(self.fichas, indices, 1)
+        np.add.at(self.fichas_con_cronograma, indices, con_cronograma)
+        np.add.at(self.hectareas, indices, hectareas)
+        np.add.at(self.inversion, indices, inversion)
+        np.add.at(self.demanda, indices, meses)
+
+    def ejecutar(self) -> Dict[str, Any]:
+        """
+        Procesa las fichas pendientes (id_ficha > último procesado)
+
+        Returns:
+            Dict con filas procesadas en esta ejecución y el resultado acumulado
+        """
+        conexion = sqlite3.connect(self.ruta, timeout=ESPERA_BLOQUEO_MS / 1000)
+        conexion.execute(f'PRAGMA busy_timeout = {ESPERA_BLOQUEO_MS}')
+        almacen = AlmacenFichas(self.ruta)
+        procesadas = 0
+        try:
+            while True:
+                filas = conexion.execute(
+                    _CONSULTA_LOTE, (DATOS_PARAMETRICOS, self.ultimo_id, self.tamaño_lote)
+                ).fetchall()
+                if not filas:
+                    break
+                self._procesar_lote(filas, almacen)
+                self.ultimo_id = filas[-1][0]
+                procesadas += len(filas)
+                if self.checkpoint is not None:
+                    self._guardar_checkpoint()
+        finally:
+            almacen.cerrar()
+            conexion.close()
+        return {'procesadas': procesadas, **self.resultado()}
+
+    def resultado(self) -> Dict[str, Any]:
+        """
+        Demanda acumulada por grupo y total
+
+        Returns:
+            Dict con ultimo_id, la lista de grupos y el total general
+        """
+        n = len(self.grupos)
+        grupos = []
+        for (provincia, categoria_id, cultivo_id), i in sorted(self.grupos.items(), key=lambda g: g[1]):
+            grupos.append({
+                'provincia': provincia,
+                'categoria_id': categoria_id,
+                'cultivo_id': cultivo_id,
+                'fichas': int(self.fichas[i]),
+                'fichas_con_cronograma': int(self.fichas_con_cronograma[i]),
+                'hectareas': round(float(self.hectareas[i]), 2),
+                'inversion_inicial': round(float(self.inversion[i]), 2),
+                'meses': dict(zip(MESES, np.round(self.demanda[i], 2).tolist()))
+            })
+        return {
+            'ultimo_id': self.ultimo_id,
+            'grupos': grupos,
+            'total': {
+                'fichas': int(self.fichas[:n].sum()),
+                'inversion_inicial': round(float(self.inversion[:n].sum()), 2),
+                'meses': dict(zip(MESES, np.round(self.demanda[:n].sum(axis=0), 2).tolist()))
+            }
+        }
+
+    # ===== CHECKPOINT =====
+
+    def _guardar_checkpoint(self) -> None:
+        n = len(self.grupos)
+        estado = {
+            'ruta': os.path.abspath(self.ruta),
+            'ultimo_id': self.ultimo_id,
+            'grupos': [list(grupo) for grupo in sorted(self.grupos, key=self.grupos.get)],
+            'fichas': self.fichas[:n].tolist(),
+            'fichas_con_cronograma': self.fichas_con_cronograma[:n].tolist(),
+            'hectareas': self.hectareas[:n].tolist(),
+            'inversion': self.inversion[:n].tolist(),
+            'demanda': self.demanda[:n].tolist()
+        }
+        temporal = self.checkpoint + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(estado, archivo)
+        os.replace(temporal, self.checkpoint)
+
+    def _cargar_checkpoint(self) -> None:
+        with open(self.checkpoint, encoding='utf-8') as archivo:
+            estado = json.load(archivo)
+        if estado['ruta'] != os.path.abspath(self.ruta):
+            raise ValueError(f"El checkpoint corresponde a otra base de datos: {estado['ruta']}")
+        for grupo in estado['grupos']:
+            self._indice(tuple(grupo))
+        n = len(estado['grupos'])
+        self.fichas[:n] = estado['fichas']
+        self.fichas_con_cronograma[:n] = estado['fichas_con_cronograma']
+        self.hectareas[:n] = estado['hectareas']
+        self.inversion[:n] = estado['inversion']
+        self.demanda[:n] = np.array(estado['demanda']).reshape(n, len(MESES))
+        self.ultimo_id = estado['ultimo_id']
+
+
+def main():
+    argumentos = sys.argv[1:]
+    try:
+        tamaño_lote = TAMAÑO_LOTE_DEFECTO
+        checkpoint = None
+        if '--lote' in argumentos:
+            tamaño_lote = int(argumentos[argumentos.index('--lote') + 1])
+        if '--checkpoint' in argumentos:
+            checkpoint = argumentos[argumentos.index('--checkpoint') + 1]
+            if '--reiniciar' in argumentos and os.path.exists(checkpoint):
+                os.remove(checkpoint)
+
+        agregador = AgregadorDemanda(tamaño_lote=tamaño_lote, checkpoint=checkpoint)
+        print(json.dumps(agregador.ejecutar(), ensure_ascii=False))
+    except Exception as e:
+        print(json.dumps({"error": str(e), "type": type(e).__name__}))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
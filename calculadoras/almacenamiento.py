@@ -0,0 +1,355 @@
+# calculadoras/almacenamiento.py
+"""
+Almacenamiento paramétrico de fichas técnicas en fichas_tecnicas.db
+En lugar del datos_json completo se guardan solo las entradas y las
+huellas de versión; la ficha se regenera al leerla con el conjunto de
+parámetros fijado en la tabla parametros_versionados. El código no se
+guarda: si la versión de la calculadora ya no es la vigente, la ficha se
+regenera con el código actual y se marca con CLAVE_ADVERTENCIA, y
+materializar no la escribe.
+
+Uso:
+    python -m calculadoras.almacenamiento migrar [--simular] [--vacuum]
+    python -m calculadoras.almacenamiento leer <id_ficha>
+    python -m calculadoras.almacenamiento materializar
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from types import SimpleNamespace
+from typing import Dict, Any, List, Optional, Tuple
+
+from .versionado import huella_ficha, huella_parametros, parametros_publicos
+
+RUTA_BD = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fichas_tecnicas.db')
+
+ESPERA_BLOQUEO_MS = 5000
+
+# datos_json de las filas paramétricas (la columna es NOT NULL)
+DATOS_PARAMETRICOS = ''
+
+# Clave con la que leer marca una ficha regenerada con código distinto al que la guardó
+CLAVE_ADVERTENCIA = 'advertencia_version'
+
+
+def _cacao_convencional() -> Tuple[Any, Any, str]:
+    from .cacao_convencional import calculadora_cacao_convencional, parametros
+    return (calculadora_cacao_convencional.CalculadoraCacaoConvencional, parametros,
+            os.path.dirname(calculadora_cacao_convencional.__file__))
+
+
+# Calculadoras con almacenamiento paramétrico: nombre -> cargador de (clase, parametros, paquete a versionar)
+CALCULADORAS = {
+    'cacao_convencional': _cacao_convencional,
+}
+
+
+def _calculadora(nombre: str) -> Tuple[Any, Any, str]:
+    if nombre not in CALCULADORAS:
+        raise ValueError(f"Calculadora sin almacenamiento paramétrico: {nombre}")
+    return CALCULADORAS[nombre]()
+
+
+def version_calculadora(nombre: str) -> str:
+    """
+    Huella del código que determina la ficha (paquete de la calculadora y
+    módulos compartidos de calculadoras/)
+    """
+    return huella_ficha(_calculadora(nombre)[2])
+
+
+def _comparable(ficha: Dict[str, Any]) -> Any:
+    # Igual a lo que Node guarda: JSON de Python leído y reescrito
+    return json.loads(json.dumps(ficha, default=str))
+
+
+class AlmacenFichas:
+    """
+    Lectura y escritura de fichas en modo paramétrico
+
+    Las filas paramétricas de fichas_tecnicas tienen datos_json vacío y
+    una fila en fichas_parametricas con hectareas, sensibilizado, huella
+    de parámetros y versión de la calculadora.
+    """
+
+    def __init__(self, ruta: str = None):
+        """
+        Args:
+            ruta: Archivo SQLite (default: fichas_tecnicas.db en la raíz del proyecto)
+        """
+        self.ruta = RUTA_BD if ruta is None else ruta
+        self._conexion: Optional[sqlite3.Connection] = None
+        self._cache_parametros: Dict[str, SimpleNamespace] = {}
+
+    def _conectar(self) -> sqlite3.Connection:
+        if self._conexion is None:
+            conexion = sqlite3.connect(self.ruta, timeout=ESPERA_BLOQUEO_MS / 1000, isolation_level=None)
+            conexion.execute(f'PRAGMA busy_timeout = {ESPERA_BLOQUEO_MS}')
+            conexion.execute('''
+                CREATE TABLE IF NOT EXISTS parametros_versionados (
+                    huella TEXT PRIMARY KEY,
+                    calculadora TEXT NOT NULL,
+                    parametros_json TEXT NOT NULL,
+                    fecha_creacion DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conexion.execute('''
+                CREATE TABLE IF NOT EXISTS fichas_parametricas (
+                    id_ficha INTEGER PRIMARY KEY,
+                    calculadora TEXT NOT NULL,
+                    hectareas REAL NOT NULL,
+                    sensibilizado INTEGER NOT NULL,
+                    huella_parametros TEXT NOT NULL,
+                    version_calculadora TEXT NOT NULL,
+                    FOREIGN KEY (id_ficha) REFERENCES fichas_tecnicas(id_ficha),
+                    FOREIGN KEY (huella_parametros) REFERENCES parametros_versionados(huella)
+                )
+            ''')
+            self._conexion = conexion
+        return self._conexion
+
+    def registrar_parametros(self, calculadora: str = 'cacao_convencional',
+                             parametros: Dict[str, Any] = None) -> str:
+        """
+        Fija un conjunto de parámetros de una calculadora
+
+        Args:
+            calculadora: Calculadora
+            parametros: Valores del conjunto (default: módulo parametros vigente)
+
+        Returns:
+            Huella del conjunto (se inserta solo si no existía)
+        """
+        if parametros is None:
+            parametros = parametros_publicos(_calculadora(calculadora)[1])
+        huella = huella_parametros(parametros)
+        self._conectar().execute(
+            'INSERT OR IGNORE INTO parametros_versionados (huella, calculadora, parametros_json) VALUES (?, ?, ?)',
+            (huella, calculadora, json.dumps(parametros, ensure_ascii=False))
+        )
+        return huella
+
+    def _parametros(self, huella: str) -> SimpleNamespace:
+        # Los conjuntos fijados son inmutables: se leen una vez por almacén
+        if huella not in self._cache_parametros:
+            fila = self._conectar().execute(
+                'SELECT parametros_json FROM parametros_versionados WHERE huella = ?', (huella,)
+            ).fetchone()
+            if fila is None:
+                raise ValueError(f"Conjunto de parámetros no registrado: {huella}")
+            self._cache_parametros[huella] = SimpleNamespace(**json.loads(fila[0]))
+        return self._cache_parametros[huella]
+
+    def guardar(self, categoria_id: str, cultivo_id: Any, provincia: str, hectareas: float,
+                sensibilizado: bool, calculadora: str = 'cacao_convencional',
+                parametros: Dict[str, Any] = None) -> int:
+        """
+        Guarda una ficha en modo paramétrico
+
+        Args:
+            categoria_id: Categoría (ejemplo: 'PEREN_SEMI')
+            cultivo_id: Cultivo
+            provincia: Provincia
+            hectareas: Número de hectáreas
+            sensibilizado: Modo de la ficha
+            calculadora: Calculadora que genera la ficha
+            parametros: Valores con los que se generó (default: módulo parametros)
+
+        Returns:
+            id_ficha de la fila creada
+        """
+        huella = self.registrar_parametros(calculadora, parametros)
+        version = version_calculadora(calculadora)
+        conexion = self._conectar()
+        conexion.execute('BEGIN IMMEDIATE')
+        try:
+            cursor = conexion.execute(
+                'INSERT INTO fichas_tecnicas (categoria_id, cultivo_id, provincia, hectareas, datos_json) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (categoria_id, cultivo_id, provincia, hectareas, DATOS_PARAMETRICOS)
+            )
+            id_ficha = cursor.lastrowid
+            conexion.execute(
+                'INSERT INTO fichas_parametricas VALUES (?, ?, ?, ?, ?, ?)',
+                (id_ficha, calculadora, hectareas, int(sensibilizado), huella, version)
+            )
+            conexion.execute('COMMIT')
+        except Exception:
+            conexion.execute('ROLLBACK')
+            raise
+        return id_ficha
+
+    def _regenerar(self, calculadora: str, hectareas: float, sensibilizado: bool, huella: str) -> Dict[str, Any]:
+        return _calculadora(calculadora)[0](hectareas=hectareas, sensibilizado=sensibilizado,
+                                            parametros=self._parametros(huella)).generar_ficha_tecnica()
+
+    def leer(self, id_ficha: int) -> Dict[str, Any]:
+        """
+        Devuelve el datos_json de una ficha (regenerado si es paramétrica,
+        con los parámetros con los que se guardó)
+
+        Si la ficha se guardó con otra versión de la calculadora, se regenera
+        con el código vigente y lleva CLAVE_ADVERTENCIA con ambas versiones:
+        el resultado puede no ser el que se guardó.
+
+        Raises:
+            ValueError: Si la ficha no existe o no puede regenerarse
+        """
+        conexion = self._conectar()
+        fila = conexion.execute('SELECT datos_json FROM fichas_tecnicas WHERE id_ficha = ?', (id_ficha,)).fetchone()
+        if fila is None:
+            raise ValueError(f"Ficha técnica no encontrada: {id_ficha}")
+        if fila[0] != DATOS_PARAMETRICOS:
+            return json.loads(fila[0])
+
+        calculadora, hectareas, sensibilizado, huella, version = conexion.execute(
+            'SELECT calculadora, hectareas, sensibilizado, huella_parametros, version_calculadora '
+            'FROM fichas_parametricas WHERE id_ficha = ?', (id_ficha,)
+        ).fetchone()
+        datos = self._regenerar(calculadora, hectareas, bool(sensibilizado), huella)
+        vigente = version_calculadora(calculadora)
+        if version != vigente:
+            datos[CLAVE_ADVERTENCIA] = {
+                'mensaje': 'Ficha regenerada con una versión de la calculadora distinta a la que la guardó',
+                'version_guardada': version,
+                'version_vigente': vigente
+            }
+        return datos
+
+    def migrar(self, calculadora: str = 'cacao_convencional', simular: bool = False) -> Dict[str, Any]:
+        """
+        Convierte a modo paramétrico las fichas que se regeneran idénticas
+
+        Las fichas de versiones anteriores del formato (sin modo_sensibilizado)
+        o generadas con fórmulas anteriores de la calculadora no se pueden
+        reproducir y se dejan intactas; 'motivos' cuenta cada caso.
+
+        Args:
+            calculadora: Calculadora con la que se regeneran
+            simular: Si True, solo reporta lo que se convertiría
+
+        Returns:
+            Dict con filas revisadas, convertidas, bytes liberados, los
+            id_ficha no reproducibles y sus motivos
+        """
+        conexion = self._conectar()
+        huella = self.registrar_parametros(calculadora)
+        version = version_calculadora(calculadora)
+        filas = conexion.execute(
+            'SELECT id_ficha, hectareas, datos_json FROM fichas_tecnicas WHERE datos_json != ?',
+            (DATOS_PARAMETRICOS,)
+        ).fetchall()
+
+        convertibles = []
+        no_reproducibles = []
+        motivos = {'formato_anterior': 0, 'resultado_distinto': 0}
+        for id_ficha, hectareas, datos_json in filas:
+            datos = json.loads(datos_json)
+            sensibilizado = datos.get('modo_sensibilizado') if isinstance(datos, dict) else None
+            if not isinstance(sensibilizado, bool) or hectareas <= 0:
+                motivos['formato_anterior'] += 1
+                no_reproducibles.append(id_ficha)
+            elif _comparable(self._regenerar(calculadora, hectareas, sensibilizado, huella)) == datos:
+                convertibles.append((id_ficha, hectareas, sensibilizado, len(datos_json)))
+            else:
+                motivos['resultado_distinto'] += 1
+                no_reproducibles.append(id_ficha)
+
+        if not simular and convertibles:
+            conexion.execute('BEGIN IMMEDIATE')
+            try:
+                conexion.executemany(
+                    'INSERT OR REPLACE INTO fichas_parametricas VALUES (?, ?, ?, ?, ?, ?)',
+                    [(i, calculadora, h, int(s), huella, version) for i, h, s, _ in convertibles]
+                )
+                conexion.executemany(
+                    'UPDATE fichas_tecnicas SET datos_json = ? WHERE id_ficha = ?',
+                    [(DATOS_PARAMETRICOS, i) for i, _, _, _ in convertibles]
+                )
+                conexion.execute('COMMIT')
+            except Exception:
+                conexion.execute('ROLLBACK')
+                raise
+
+        return {
+            'revisadas': len(filas),
+            'convertidas': len(convertibles),
+            'bytes_liberados': sum(n for _, _, _, n in convertibles),
+            'no_reproducibles': no_reproducibles,
+            'motivos': motivos,
+            'simulado': simular
+        }
+
+    def materializar(self) -> Dict[str, Any]:
+        """
+        Vuelve a guardar el datos_json completo de las fichas paramétricas
+
+        Deja de depender de parametros_versionados (por ejemplo, antes de
+        depurar versiones antiguas de esa tabla). Las fichas guardadas con
+        otra versión de la calculadora no se materializan, porque el código
+        vigente puede no reproducirlas; quedan paramétricas y se listan.
+
+        Returns:
+            Dict con el número de fichas materializadas y los id_ficha de
+            versiones anteriores
+        """
+        conexion = self._conectar()
+        vigentes: List[int] = []
+        desactualizadas: List[int] = []
+        for id_ficha, calculadora, version in conexion.execute(
+                'SELECT id_ficha, calculadora, version_calculadora FROM fichas_parametricas').fetchall():
+            (vigentes if version == version_calculadora(calculadora) else desactualizadas).append(id_ficha)
+        datos = [(json.dumps(self.leer(id_ficha), ensure_ascii=False, default=str), id_ficha) for id_ficha in vigentes]
+        conexion.execute('BEGIN IMMEDIATE')
+        try:
+            conexion.executemany('UPDATE fichas_tecnicas SET datos_json = ? WHERE id_ficha = ?', datos)
+            conexion.executemany('DELETE FROM fichas_parametricas WHERE id_ficha = ?', [(i,) for i in vigentes])
+            conexion.execute('COMMIT')
+        except Exception:
+            conexion.execute('ROLLBACK')
+            raise
+        return {'materializadas': len(vigentes), 'desactualizadas': desactualizadas}
+
+    def compactar(self) -> None:
+        """
+        Recupera el espacio liberado por la migración (VACUUM)
+        """
+        self._conectar().execute('VACUUM')
+
+    def cerrar(self) -> None:
+        if self._conexion is not None:
+            self._conexion.close()
+            self._conexion = None
+
+
+def main():
+    argumentos = sys.argv[1:]
+    if not argumentos:
+        print(__doc__)
+        sys.exit(1)
+
+    almacen = AlmacenFichas()
+    try:
+        comando = argumentos[0]
+        if comando == 'migrar':
+            resultado = almacen.migrar(simular='--simular' in argumentos)
+            if '--vacuum' in argumentos and not resultado['simulado']:
+                almacen.compactar()
+        elif comando == 'leer' and len(argumentos) > 1:
+            resultado = almacen.leer(int(argumentos[1]))
+        elif comando == 'materializar':
+            resultado = almacen.materializar()
+        else:
+            raise ValueError(f"Comando inválido: {' '.join(argumentos)}")
+        print(json.dumps(resultado, default=str))
+    except Exception as e:
+        print(json.dumps({"error": str(e), "type": type(e).__name__}))
+        sys.exit(1)
+    finally:
+        almacen.cerrar()
+
+
+if __name__ == '__main__':
+    main()
@@ -5,18 +5,110 @@ Contiene métodos comunes y estructura base
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Mapping
 from datetime import datetime
 
+
+class DictInmutable(dict):
+    """
+    Dict de solo lectura para resultados de las calculadoras
+
+    Es un dict (se serializa a JSON igual que antes) pero cualquier
+    modificación lanza TypeError, así un resultado puede cachearse y
+    compartirse entre hilos sin copias defensivas.
+    """
+
+    def _solo_lectura(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} es de solo lectura")
+
+    __setitem__ = __delitem__ = _solo_lectura
+    clear = pop = popitem = setdefault = update = _solo_lectura
+    __ior__ = _solo_lectura
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+    def __hash__(self):
+        return hash(tuple(self.items()))
+
+
+def congelar(valor: Any) -> Any:
+    """
+    Copia inmutable de un resultado: dicts a DictInmutable y listas a tuplas
+
+    Args:
+        valor: Dict, lista o escalar (anidados)
+
+    Returns:
+        Misma estructura sin referencias compartidas con el original
+    """
+    if isinstance(valor, DictInmutable):
+        return valor
+    if isinstance(valor, Mapping):
+        return DictInmutable({clave: congelar(v) for clave, v in valor.items()})
+    if isinstance(valor, (list, tuple)):
+        return tuple(congelar(v) for v in valor)
+    return valor
+
+
+def descongelar(valor: Any) -> Any:
+    """
+    Copia mutable (dicts y listas) de un resultado congelado
+    """
+    if isinstance(valor, Mapping):
+        return {clave: descongelar(v) for clave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [descongelar(v) for v in valor]
+    return valor
+
+
+@dataclass
+class EstadoCalculo:
+    """
+    Acumuladores de un cálculo
+
+    Se crea uno nuevo en cada llamada a calcular(), nunca vive en la
+    calculadora: así una misma instancia puede atender cálculos
+    concurrentes y calcular() dos veces da el mismo resultado.
+    """
+    cronograma: Dict[str, float]
+    costos_directos: Dict[str, Any] = field(default_factory=dict)
+    costos_indirectos: Dict[str, Any] = field(default_factory=dict)
+    ingresos: Dict[str, Any] = field(default_factory=dict)
+    total_directos: float = 0.0
+    total_indirectos: float = 0.0
+
+    def desglose(self) -> DictInmutable:
+        """
+        Copia congelada del estado (para inspección o cache)
+        """
+        return congelar({
+            'cronograma': self.cronograma,
+            'costos_directos': self.costos_directos,
+            'costos_indirectos': self.costos_indirectos,
+            'ingresos': self.ingresos,
+            'total_directos': self.total_directos,
+            'total_indirectos': self.total_indirectos
+        })
+
+
 class CalculadoraFichaTecnica(ABC):
     """
     Clase base para todas las calculadoras de fichas técnicas agrícolas
+
+    Las instancias solo guardan las entradas (inmutables); cada cálculo
+    acumula en su propio EstadoCalculo y devuelve un resultado congelado.
     
     Atributos:
         hectareas (float): Número de hectáreas a calcular
-        cronograma (Dict[str, float]): Costos mensuales
-        costos_directos (Dict): Desglose de costos directos
-        costos_indirectos (Dict): Desglose de costos indirectos
+        metadata (Mapping): Fecha de creación y versión
     """
     
     # Meses del año agrícola (Agosto - Julio)
@@ -36,13 +128,10 @@ class CalculadoraFichaTecnica(ABC):
             raise ValueError("El número de hectáreas debe ser mayor a 0")
         
         self.hectareas = hectareas
-        self.cronograma = self._inicializar_cronograma()
-        self.costos_directos = {}
-        self.costos_indirectos = {}
-        self.metadata = {
+        self.metadata = DictInmutable({
             'fecha_calculo': datetime.now().isoformat(),
             'version': '1.0'
-        }
+        })
     
     def _inicializar_cronograma(self) -> Dict[str, float]:
         """
@@ -53,6 +142,12 @@ class CalculadoraFichaTecnica(ABC):
         """
         return {mes: 0.0 for mes in self.MESES}
     
+    def nuevo_estado(self) -> EstadoCalculo:
+        """
+        Acumuladores vacíos para un cálculo
+        """
+        return EstadoCalculo(cronograma=self._inicializar_cronograma())
+    
     def escalar(self, valor: float) -> float:
         """
         Escala un valor base (1 ha) al número de hectáreas solicitadas
@@ -108,11 +203,12 @@ class CalculadoraFichaTecnica(ABC):
         costo_por_mes = total / len(meses)
         return {mes: self.redondear(costo_por_mes) for mes in meses}
     
-    def agregar_al_cronograma(self, mes: str, valor: float):
+    def agregar_al_cronograma(self, estado: EstadoCalculo, mes: str, valor: float):
         """
         Agrega un valor al cronograma de un mes específico
         
         Args:
+            estado: Estado del cálculo en curso
             mes: Mes a agregar (debe estar en MESES)
             valor: Valor a agregar
         
@@ -122,16 +218,19 @@ class CalculadoraFichaTecnica(ABC):
         if mes not in self.MESES:
             raise ValueError(f"Mes inválido: {mes}. Debe ser uno de {self.MESES}")
         
-        self.cronograma[mes] += valor
+        estado.cronograma[mes] += valor
     
-    def obtener_total_cronograma(self) -> float:
+    def obtener_total_cronograma(self, estado: EstadoCalculo) -> float:
         """
         Calcula el total del cronograma mensual
         
+        Args:
+            estado: Estado de un cálculo
+        
         Returns:
             Suma de todos los valores mensuales
         """
-        return self.redondear(sum(self.cronograma.values()))
+        return self.redondear(sum(estado.cronograma.values()))
     
     def calcular_costos_indirectos_estandar(
         self, 
@@ -175,23 +274,27 @@ class CalculadoraFichaTecnica(ABC):
     # ===== MÉTODOS ABSTRACTOS (deben implementarse en subclases) =====
     
     @abstractmethod
-    def calcular_costos_directos(self) -> float:
+    def calcular_costos_directos(self, estado: EstadoCalculo) -> float:
         """
         Calcula todos los costos directos de producción
         Debe ser implementado por cada calculadora específica
         
+        Args:
+            estado: Estado del cálculo en curso (cronograma y desglose)
+        
         Returns:
             Total de costos directos
         """
         pass
     
     @abstractmethod
-    def calcular_costos_indirectos(self, total_directos: float) -> float:
+    def calcular_costos_indirectos(self, estado: EstadoCalculo, total_directos: float) -> float:
         """
         Calcula todos los costos indirectos
         Debe ser implementado por cada calculadora específica
         
         Args:
+            estado: Estado del cálculo en curso
             total_directos: Total de costos directos calculados
         
         Returns:
@@ -199,6 +302,24 @@ class CalculadoraFichaTecnica(ABC):
         """
         pass
     
+    def calcular_estado(self) -> EstadoCalculo:
+        """
+        Ejecuta los cálculos sobre un estado nuevo
+        
+        Returns:
+            EstadoCalculo propio de esta llamada (el llamador puede modificarlo)
+        """
+        estado = self.nuevo_estado()
+        estado.total_directos = self.calcular_costos_directos(estado)
+        estado.total_indirectos = self.calcular_costos_indirectos(estado, estado.total_directos)
+        return estado
+    
+    def desglose(self) -> DictInmutable:
+        """
+        Cronograma y desglose de costos sin escalar (1 ha), congelados
+        """
+        return self.calcular_estado().desglose()
+    
     @abstractmethod
     def calcular(self) -> Dict[str, Any]:
         """
@@ -234,12 +355,13 @@ class CalculadoraFichaTecnica(ABC):
         Returns:
             Dict con resumen de costos y cronograma
         """
-        return {
+        estado = self.calcular_estado()
+        return congelar({
             'hectareas': self.hectareas,
-            'costo_total_cronograma': self.obtener_total_cronograma(),
-            'meses_con_actividad': [mes for mes, valor in self.cronograma.items() if valor > 0],
+            'costo_total_cronograma': self.obtener_total_cronograma(estado),
+            'meses_con_actividad': [mes for mes, valor in estado.cronograma.items() if valor > 0],
             'metadata': self.metadata
-        }
+        })
     
     def __repr__(self) -> str:
         """Representación string de la calculadora"""
@@ -0,0 +1,300 @@
+# calculadoras/bulk.py
+"""
+Generación masiva de fichas técnicas para carteras de parcelas
+Lee un archivo JSON-lines o CSV de parcelas (hectareas, cultivo,
+sensibilizado, provincia) y genera las fichas en un ProcessPoolExecutor
+por bloques de parcelas. Cada parcela produce una línea JSON en el
+archivo de salida, en el orden de entrada o a medida que terminan los
+bloques, y el avance se guarda en un checkpoint para reanudar.
+
+Columnas opcionales: id (se copia a la salida), categoria_id y region
+(default: la región registrada del cultivo).
+
+Uso:
+    python -m calculadoras.bulk ENTRADA SALIDA [--procesos N] [--bloque N]
+        [--desordenado] [--checkpoint RUTA] [--reiniciar]
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Dict, Any, Iterator, List, Tuple
+
+from .parametros_externos import obtener_parametros
+from .registro import REGISTRO, buscar_cultivo, obtener_calculadora
+from .salida import deduplicar_alternativos, serializar_json
+
+TAMAÑO_BLOQUE_DEFECTO = 50
+
+# Bloques enviados o esperando turno de escritura por proceso
+BLOQUES_POR_PROCESO = 4
+
+VALORES_VERDADEROS = ['true', '1', 'yes', 's', 'si']
+
+
+def leer_parcelas(ruta: str) -> Iterator[Any]:
+    """
+    Recorre las parcelas del archivo sin cargarlo completo
+
+    Los archivos .csv se leen con cabecera; el resto como JSON-lines. Las
+    líneas JSON se entregan sin decodificar (se decodifican en los procesos).
+    """
+    with open(ruta, encoding='utf-8', newline='') as archivo:
+        if ruta.lower().endswith('.csv'):
+            yield from csv.DictReader(archivo)
+        else:
+            for linea in archivo:
+                if linea.strip():
+                    yield linea
+
+
+def _ficha_parcela(fila: Any) -> Dict[str, Any]:
+    if isinstance(fila, str):
+        fila = json.loads(fila)
+    if not isinstance(fila, dict):
+        raise ValueError("Cada parcela debe ser un objeto")
+
+    for campo in ('hectareas', 'cultivo'):
+        if fila.get(campo) in (None, ''):
+            raise ValueError(f"Falta el campo {campo}")
+    hectareas = float(fila['hectareas'])
+    if hectareas <= 0:
+        raise ValueError("El número de hectáreas debe ser mayor a 0")
+    sensibilizado = fila.get('sensibilizado')
+    if sensibilizado in (None, ''):
+        sensibilizado = True
+    elif not isinstance(sensibilizado, bool):
+        sensibilizado = str(sensibilizado).strip().lower() in VALORES_VERDADEROS
+
+    clave = buscar_cultivo(fila['cultivo'], fila.get('categoria_id') or None)
+    entrada = REGISTRO[clave]
+    calculadora = obtener_calculadora(*clave)
+    conjunto = obtener_parametros(entrada.paquete, fila.get('region') or entrada.region)
+    ficha = calculadora(hectareas=hectareas, sensibilizado=sensibilizado,
+                        parametros=conjunto.valores).generar_ficha_tecnica()
+
+    return {
+        'id': fila.get('id'),
+        'categoria_id': clave[0],
+        'cultivo_id': clave[1],
+        'provincia': fila.get('provincia') or 'No especificada',
+        'hectareas': hectareas,
+        'sensibilizado': sensibilizado,
+        'parametros': conjunto.version,
+        'ficha': deduplicar_alternativos(ficha)
+    }
+
+
+def procesar_bloque(filas: List[Tuple[int, Any]]) -> Tuple[str, int, int]:
+    """
+    Genera las fichas de un bloque de parcelas (se ejecuta en un proceso)
+
+    Un error en una parcela se reporta en su línea y no detiene el bloque.
+
+    Args:
+        filas: Pares (índice en el archivo, parcela)
+
+    Returns:
+        Tupla (texto JSON-lines del bloque, fichas generadas, errores)
+    """
+    lineas = []
+    errores = 0
+    for indice, fila in filas:
+        try:
+            registro = {'indice': indice, **_ficha_parcela(fila)}
+        except Exception as e:
+            registro = {'indice': indice, 'error': str(e), 'type': type(e).__name__}
+            errores += 1
+        lineas.append(serializar_json(registro) + '\n')
+    return ''.join(lineas), len(filas) - errores, errores
+
+
+class GeneradorMasivo:
+    """
+    Reparte las parcelas de un archivo en bloques entre procesos y escribe
+    las fichas en un archivo JSON-lines
+
+    Con checkpoint, cada bloque escrito queda registrado junto con el
+    tamaño del archivo de salida; al reanudar se trunca lo escrito después
+    del último bloque registrado y se omiten los bloques completos.
+    """
+
+    def __init__(self, entrada: str, salida: str, procesos: int = None,
+                 tamaño_bloque: int = TAMAÑO_BLOQUE_DEFECTO, ordenado: bool = True,
+                 checkpoint: str = None):
+        """
+        Args:
+            entrada: Archivo de parcelas (.csv o JSON-lines)
+            salida: Archivo JSON-lines de fichas
+            procesos: Procesos de trabajo (default: número de CPUs)
+            tamaño_bloque: Parcelas por unidad de trabajo
+            ordenado: Si True, la salida respeta el orden de entrada
+            checkpoint: Archivo JSON de avance (None: sin checkpoint)
+
+        Raises:
+            ValueError: Si procesos o tamaño_bloque no son positivos
+        """
+        procesos = (os.cpu_count() or 1) if procesos is None else procesos
+        if procesos <= 0:
+            raise ValueError("El número de procesos debe ser mayor a 0")
+        if tamaño_bloque <= 0:
+            raise ValueError("El tamaño de bloque debe ser mayor a 0")
+        self.entrada = entrada
+        self.salida = salida
+        self.procesos = procesos
+        self.tamaño_bloque = tamaño_bloque
+        self.ordenado = ordenado
+        self.checkpoint = checkpoint
+        self.completados = set()
+        self.fichas = 0
+        self.errores = 0
+        self.bytes_escritos = 0
+        if checkpoint is not None and os.path.exists(checkpoint):
+            self._cargar_checkpoint()
+
+    def _bloques(self) -> Iterator[Tuple[int, List[Tuple[int, Any]]]]:
+        parcelas = enumerate(leer_parcelas(self.entrada))
+        numero = 0
+        while True:
+            filas = list(islice(parcelas, self.tamaño_bloque))
+            if not filas:
+                return
+            if numero not in self.completados:
+                yield numero, filas
+            numero += 1
+
+    def ejecutar(self) -> Dict[str, Any]:
+        """
+        Genera las fichas de los bloques pendientes
+
+        Returns:
+            Dict con bloques y parcelas procesados en esta ejecución y los
+            totales acumulados (incluye ejecuciones anteriores reanudadas)
+        """
+        inicio = time.perf_counter()
+        reanudado = bool(self.completados)
+        previos = len(self.completados)
+        pendientes = {}
+        turno = deque()
+        listos = {}
+        limite = self.procesos * BLOQUES_POR_PROCESO
+
+        if reanudado:
+            os.truncate(self.salida, self.bytes_escritos)
+        with open(self.salida, 'ab' if reanudado else 'wb') as archivo, \
+                ProcessPoolExecutor(max_workers=self.procesos) as ejecutor:
+
+            def recoger(terminados):
+                for futuro in terminados:
+                    numero = pendientes.pop(futuro)
+                    if not self.ordenado:
+                        self._escribir(archivo, numero, futuro.result())
+                        continue
+                    listos[numero] = futuro.result()
+                    while turno and turno[0] in listos:
+                        siguiente = turno.popleft()
+                        self._escribir(archivo, siguiente, listos.pop(siguiente))
+
+            for numero, filas in self._bloques():
+                while len(pendientes) + len(listos) >= limite:
+                    recoger(wait(pendientes, return_when=FIRST_COMPLETED).done)
+                pendientes[ejecutor.submit(procesar_bloque, filas)] = numero
+                turno.append(numero)
+            while pendientes:
+                recoger(wait(pendientes, return_when=FIRST_COMPLETED).done)
+
+        return {
+            'entrada': self.entrada,
+            'salida': self.salida,
+            'reanudado': reanudado,
+            'bloques_procesados': len(self.completados) - previos,
+            'bloques_totales': len(self.completados),
+            'fichas': self.fichas,
+            'errores': self.errores,
+            'segundos': round(time.perf_counter() - inicio, 3)
+        }
+
+    def _escribir(self, archivo, numero: int, resultado: Tuple[str, int, int]) -> None:
+        texto, fichas, errores = resultado
+        archivo.write(texto.encode('utf-8'))
+        archivo.flush()
+        self.bytes_escritos = archivo.tell()
+        self.completados.add(numero)
+        self.fichas += fichas
+        self.errores += errores
+        if self.checkpoint is not None:
+            self._guardar_checkpoint()
+
+    # ===== CHECKPOINT =====
+
+    def _guardar_checkpoint(self) -> None:
+        estado = {
+            'entrada': os.path.abspath(self.entrada),
+            'salida': os.path.abspath(self.salida),
+            'tamaño_bloque': self.tamaño_bloque,
+            'bytes_escritos': self.bytes_escritos,
+            'fichas': self.fichas,
+            'errores': self.errores,
+            'completados': sorted(self.completados)
+        }
+        temporal = self.checkpoint + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(estado, archivo)
+        os.replace(temporal, self.checkpoint)
+
+    def _cargar_checkpoint(self) -> None:
+        with open(self.checkpoint, encoding='utf-8') as archivo:
+            estado = json.load(archivo)
+        if estado['entrada'] != os.path.abspath(self.entrada) or estado['salida'] != os.path.abspath(self.salida):
+            raise ValueError("El checkpoint corresponde a otros archivos de entrada o salida")
+        if estado['tamaño_bloque'] != self.tamaño_bloque:
+            raise ValueError(f"El checkpoint usa bloques de {estado['tamaño_bloque']} parcelas")
+        if not os.path.exists(self.salida) or os.path.getsize(self.salida) < estado['bytes_escritos']:
+            raise ValueError("El archivo de salida no contiene lo registrado en el checkpoint")
+        self.completados = set(estado['completados'])
+        self.fichas = estado['fichas']
+        self.errores = estado['errores']
+        self.bytes_escritos = estado['bytes_escritos']
+
+
+def main():
+    argumentos = sys.argv[1:]
+    try:
+        opciones = {}
+        for nombre in ('--procesos', '--bloque', '--checkpoint'):
+            if nombre in argumentos:
+                indice = argumentos.index(nombre)
+                if indice + 1 >= len(argumentos):
+                    raise ValueError(f"{nombre} requiere un valor")
+                opciones[nombre] = argumentos[indice + 1]
+                del argumentos[indice:indice + 2]
+        ordenado = '--desordenado' not in argumentos
+        reiniciar = '--reiniciar' in argumentos
+        argumentos = [a for a in argumentos if a not in ('--desordenado', '--reiniciar')]
+        if len(argumentos) != 2:
+            raise ValueError("Uso: python -m calculadoras.bulk ENTRADA SALIDA [opciones]")
+
+        checkpoint = opciones.get('--checkpoint')
+        if reiniciar and checkpoint is not None and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
+        generador = GeneradorMasivo(
+            argumentos[0], argumentos[1],
+            procesos=int(opciones['--procesos']) if '--procesos' in opciones else None,
+            tamaño_bloque=int(opciones.get('--bloque', TAMAÑO_BLOQUE_DEFECTO)),
+            ordenado=ordenado,
+            checkpoint=checkpoint
+        )
+        print(json.dumps(generador.ejecutar(), ensure_ascii=False))
+    except Exception as e:
+        print(json.dumps({"error": str(e), "type": type(e).__name__}))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,67 +5,453 @@ Basado en valores promedio del Excel oficial
 Soporta cálculos sensibilizados y no sensibilizados
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from . import parametros as p
 
+# Secciones de la ficha técnica, en el orden en que se entregan
+SECCIONES = [
+    'datos_proyecto',
+    'instalacion',
+    'produccion_promedio',
+    'costos_produccion_detallado',
+    'costos_instalacion_detallado',
+    'analisis_financiero',
+    'proyeccion_15_años'
+]
+
+
+# ===== DETALLE DE COSTOS (valores por ha del Excel) =====
+# Filas: (nombre, costo_total, precio_unitario, cantidad, ud, meses)
+
+DETALLE_INSTALACION = [
+    ('1. PREPARACIÓN DE TERRENO', [
+        ('Roce y quema', 240, 40.00, 6, 'Jornal', {'ago': 240}),
+        ('Limpieza', 240, 40.00, 6, 'Jornal', {'ago': 240}),
+    ]),
+    ('2. PREPARACIÓN DE HOYOS', [
+        ('Marcado y Estacado', 160, 40.00, 4, 'Jornal', {'ago': 160}),
+        ('Apertura de Hoyos (0.4m Prof x 0.3m x 0.3 Diam)', 1600, 40.00, 40, 'Jornal', {'ago': 1600}),
+        ('Desinfeccion de Hoyos', 200, 40.00, 5, 'Jornal', {'ago': 200}),
+        ('Pre Tapado (Fertilizaci on en hoyo)', 400, 40.00, 10, 'Jornal', {'sep': 400}),
+    ]),
+    ('3. PLANTADO', [
+        ('Plantones de Cacao', 1111, 1.00, 1111, 'Plantones', {'sep': 1111}),
+        ('Plantones de Sombra temporal (Platano 5.2m x 3.0 m)', 455, 0.70, 650, 'Hijuelos', {'sep': 455}),
+        ('Plantado y Tapado de Plantas de Cacao', 1200, 40.00, 30, 'Jornal', {'sep': 1200}),
+        ('Plantado y Tapado de Plantas de Sombra', 240, 40.00, 6, 'Jornal', {'sep': 240}),
+    ]),
+    ('4. LABORES DE CULTIVO', [
+        ('Labores de cultivo (mantenimiento)', 320, 40.00, 8, 'Jornal', {'abr': 80, 'may': 80, 'jun': 80, 'jul': 80}),
+        ('Deshiervo (2 veces año)', 400, 40.00, 10, 'Jornal', {'oct': 200, 'feb': 200}),
+        ('Fumigados', 480, 40.00, 12, 'Jornal', {'oct': 48, 'nov': 48, 'dic': 48, 'ene': 48, 'feb': 48, 'mar': 48, 'abr': 48, 'may': 48, 'jun': 48, 'jul': 48}),
+    ]),
+    ('5. FERTILIZACIÓN', [
+        ('Fosfato Diamonico', 663, 255.00, 2.6, 'Saco (50 kg)', {'sep': 663}),
+        ('Cloruro de Potasio', 624, 240.00, 2.6, 'Saco (50 kg)', {'sep': 624}),
+        ('Guano de Isla', 220, 55.00, 4, 'Saco (50 Kg)', {'sep': 220}),
+        ('Compost', 120, 20.00, 6, 'Saco (50 Kg)', {'sep': 120}),
+        ('Abono foliar', 70, 35.00, 2, 'Litro', {'nov': 17.5, 'feb': 17.5, 'abr': 17.5, 'jul': 17.5}),
+    ]),
+    ('6. CONTROL FITOSANITARIO', [
+        ('Insecticida y Nematicida (Carfoburan - Killfuran)', 460, 115.00, 4, 'Litro', {'oct': 460}),
+        ('Fungicida cuprico', 90, 90.00, 1, 'Kg', {'oct': 22.5, 'dic': 22.5, 'mar': 22.5, 'jun': 22.5}),
+        ('Adherente', 74, 37.00, 2, 'Litro', {'oct': 7.4, 'nov': 7.4, 'dic': 7.4, 'ene': 7.4, 'feb': 7.4, 'mar': 7.4, 'abr': 7.4, 'may': 7.4, 'jun': 7.4, 'jul': 7.4}),
+        ('Desinfectante para hoyos y planton (Captan)', 72, 0.24, 300, 'Gr', {'ago': 72}),
+    ]),
+    ('7. GASTOS ESPECIALES', [
+        ('Transporte de insumos', 128, 3.00, 43, 'Global', {'sep': 128}),
+    ]),
+]
+
+# (nombre, porcentaje, costo, meses); el costo del Excel es porcentaje × directos
+INDIRECTOS_INSTALACION = [
+    ('Imprevistos', 1.0, 96, {'ago': 32, 'dic': 32, 'may': 32}),
+    ('Gastos operativos', 1.5, 144, {'sep': 36, 'ene': 36, 'abr': 36, 'jul': 36}),
+    ('Asistencia tecnica', 2.0, 191, {'sep': 96, 'feb': 95}),
+]
+
+GASTOS_ASUMIDOS_INSTALACION_MESES = {
+    'ago': 640,
+    'sep': 0,
+    'oct': 248,
+    'nov': 48,
+    'dic': 48,
+    'ene': 48,
+    'feb': 248,
+    'mar': 48,
+    'abr': 128,
+    'may': 128,
+    'jun': 128,
+    'jul': 128
+}
+
+# Producción: (categoria, subtotal del Excel, filas); los meses no se escalan
+DETALLE_PRODUCCION = [
+    ('1. LABORES DE CULTIVO', 960.0, [
+        ('Preparación de plantones de sombra', 80, 40, 2, 'Jornal', {'ago': 80, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}),
+        ('Desyerbe mecánico (desbrozadora)', 160, 40, 2, 'Jornal', {'ago': 53.33, 'sep': 0, 'oct': 0, 'nov': 53.33, 'dic': 0, 'ene': 0, 'feb': 53.33, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}),
+        ('Poda de mantenimiento de café (flosadora)', 160, 40, 4, 'Jornal', {'ago': 0, 'sep': 160, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}),
+        ('Abonamiento y/o fertilización', 160, 40, 4, 'Jornal', {'ago': 0, 'sep': 0, 'oct': 80, 'nov': 80, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}),
+        ('Poda de sombra especies arbóreas', 280, 40, 7, 'Jornal', {'ago': 0, 'sep': 40, 'oct': 40, 'nov': 40, 'dic': 40, 'ene': 40, 'feb': 0, 'mar': 40, 'abr': 40, 'may': 0, 'jun': 0, 'jul': 0}),
+        ('Poda de sombra especies arbóreas', 120, 40, 3, 'Jornal', {'ago': 0, 'sep': 0, 'oct': 120, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}),
+    ]),
+    ('2. FERTILIZACIÓN', 1553.8, [
+        ('Urea', 909, 195, 4.66, 'Saco (50 Kg)', {'ago': 0, 'sep': 0, 'oct': 454.35, 'nov': 454.35, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}),
+        ('Roca Fosfórica', 62, 50, 1.24, 'Saco (50 Kg)', {'ago': 0, 'sep': 0, 'oct': 31, 'nov': 31, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}),
+        ('Sulfato de potasio', 475, 210, 2.26, 'Saco (50 Kg)', {'ago': 0, 'sep': 0, 'oct': 237.3, 'nov': 237.3, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}),
+        ('Guano de isla', 39, 55, 0.7, 'Saco (50 Kg)', {'ago': 0, 'sep': 0, 'oct': 19.25, 'nov': 19.25, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}),
+        ('Abono foliar', 70, 35, 2, 'Litro', {'ago': 0, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 70, 'may': 0, 'jun': 0, 'jul': 0}),
+    ]),
+    ('3. CONTROL FITOSANITARIO', 989, [
+        ('Insecticida y Nematicida (Carfouran - Killifuran)', 690, 115, 6, 'Litro', {'ago': 0, 'sep': 345, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 345, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}),
+        ('Fungicida cúprico', 90, 90, 1, 'Kg', {'ago': 0, 'sep': 0, 'oct': 45, 'nov': 45, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}),
+        ('Adherente', 74, 37, 2, 'Litro', {'ago': 0, 'sep': 10.57, 'oct': 10.57, 'nov': 10.57, 'dic': 10.57, 'ene': 10.57, 'feb': 0, 'mar': 10.57, 'abr': 10.57, 'may': 0, 'jun': 0, 'jul': 0}),
+        ('Herbicida (Basoxla - Glyphosate)', 135, 45, 3, 'Litro', {'ago': 0, 'sep': 45, 'oct': 0, 'nov': 0, 'dic': 45, 'ene': 0, 'feb': 0, 'mar': 45, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}),
+    ]),
+    ('4. COSECHA', 880, [
+        ('Cosecha de mazorcas', 400, 40, 10, 'Jornal', {'ago': 0, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 400, 'jun': 0, 'jul': 0}),
+        ('Quiebre de mazorcas', 80, 40, 2, 'Jornal', {'ago': 0, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 80, 'jun': 0, 'jul': 0}),
+        ('Fermentación', 160, 40, 4, 'Jornal', {'ago': 0, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 160, 'jun': 0, 'jul': 0}),
+        ('Secado', 80, 40, 2, 'Jornal', {'ago': 0, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 80, 'jun': 0, 'jul': 0}),
+        ('Limpieza y Selección de granos', 80, 40, 2, 'Jornal', {'ago': 0, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 80, 'jun': 0, 'jul': 0}),
+        ('Envasado', 80, 40, 2, 'Jornal', {'ago': 0, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 80, 'jun': 0, 'jul': 0}),
+    ]),
+    ('5. GASTOS ESPECIALES', 853.52, [
+        ('Plantones de reposición de sombra', 21, 0.7, 30, 'Unid', {'ago': 21, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}),
+        ('Transporte de insumos', 36, 3.0, 12, 'Sacos', {'ago': 36, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}),
+        ('Transporte de cosecha', 78, 3.0, 26, 'Sacos', {'ago': 0, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 78, 'jun': 0, 'jul': 0}),
+        ('Sacos (1 QQ)', 52, 2.0, 26, 'Unid', {'ago': 0, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 52, 'jun': 0, 'jul': 0}),
+        ('Costo de la instalación inicial (Para 15 Años)', 666.52, 667, 1, 'Global', {'ago': 66.65, 'sep': 66.65, 'oct': 66.65, 'nov': 66.65, 'dic': 66.65, 'ene': 66.65, 'feb': 66.65, 'mar': 66.65, 'abr': 66.65, 'may': 66.65, 'jun': 0, 'jul': 0}),
+    ]),
+]
+
+# (nombre, porcentaje, costo, meses); el costo del Excel es porcentaje × directos
+INDIRECTOS_PRODUCCION = [
+    ('Imprevistos (1.5%)', 1.5, 78.54, {'ago': 0, 'sep': 26.18, 'oct': 0, 'nov': 0, 'dic': 26.18, 'ene': 0, 'feb': 0, 'mar': 26.18, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}),
+    ('Gastos operativos (Pago de agua, compra y reparación de herramientas)', 2.5, 130.91, {'ago': 44, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 43.64, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 43.64, 'jun': 0, 'jul': 0}),
+    ('Asistencia técnica', 2.0, 104.73, {'ago': 0, 'sep': 0, 'oct': 52.36, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 52.36, 'may': 0, 'jun': 0, 'jul': 0}),
+]
+
+COSTO_TECNICO_PRODUCCION = 5550.50
+GASTOS_ASUMIDOS_PRODUCCION = 680.00
+
+# Clave de parametros.PRECIOS de cada fila de detalle (las filas en 'Jornal'
+# usan 'jornal'); las filas sin clave quedan con el valor del Excel
+CLAVES_PRECIO = {
+    'Plantones de Cacao': 'planton_cacao',
+    'Plantones de Sombra temporal (Platano 5.2m x 3.0 m)': 'planton_sombra_platano',
+    'Plantones de reposición de sombra': 'planton_sombra_platano',
+    'Fosfato Diamonico': 'fosfato_diamonico',
+    'Cloruro de Potasio': 'cloruro_potasio',
+    'Guano de Isla': 'guano_isla',
+    'Guano de isla': 'guano_isla',
+    'Compost': 'compost',
+    'Abono foliar': 'abono_foliar',
+    'Urea': 'urea',
+    'Roca Fosfórica': 'roca_fosforica',
+    'Sulfato de potasio': 'sulfato_potasio',
+    'Insecticida y Nematicida (Carfoburan - Killfuran)': 'insecticida_nematicida',
+    'Insecticida y Nematicida (Carfouran - Killifuran)': 'insecticida_nematicida',
+    'Fungicida cuprico': 'fungicida_cuprico',
+    'Fungicida cúprico': 'fungicida_cuprico',
+    'Adherente': 'adherente',
+    'Desinfectante para hoyos y planton (Captan)': 'desinfectante',
+    'Herbicida (Basoxla - Glyphosate)': 'herbicida',
+    'Transporte de insumos': 'transporte_insumo',
+    'Transporte de cosecha': 'transporte_cosecha',
+    'Sacos (1 QQ)': 'saco_yute',
+}
+
+# Constante de parametros con el porcentaje de cada fila de INDIRECTOS_*
+CLAVES_PORCENTAJE_INSTALACION = ['PORCENTAJE_IMPREVISTOS', 'PORCENTAJE_GASTOS_OPERATIVOS',
+                                 'PORCENTAJE_ASISTENCIA_TECNICA']
+CLAVES_PORCENTAJE_PRODUCCION = ['PORCENTAJE_IMPREVISTOS_PROD', 'PORCENTAJE_GASTOS_OPERATIVOS_PROD',
+                                'PORCENTAJE_ASISTENCIA_TECNICA_PROD']
+
+_TABLAS_CENTAVOS = None
+
+
+def _ajustar_filas(filas: List[tuple], precios: Dict[str, float]) -> Tuple[List[tuple], float]:
+    """
+    Aplica los precios del conjunto de parámetros a filas de detalle
+
+    El costo y los meses de cada fila se escalan por precio / precio del
+    Excel, de modo que con los precios del Excel la fila queda igual.
+
+    Returns:
+        Tupla (filas ajustadas, diferencia de costo respecto al Excel)
+    """
+    ajustadas, diferencia = [], 0.0
+    for nombre, costo_total, precio_unitario, cantidad, ud, meses in filas:
+        clave = 'jornal' if ud == 'Jornal' else CLAVES_PRECIO.get(nombre)
+        precio = precios.get(clave, precio_unitario) if clave else precio_unitario
+        if precio == precio_unitario:
+            ajustadas.append((nombre, costo_total, precio_unitario, cantidad, ud, meses))
+            continue
+        factor = precio / precio_unitario
+        costo = round(costo_total * factor, 2)
+        ajustadas.append((nombre, costo, precio, cantidad, ud, {mes: round(v * factor, 2) for mes, v in meses.items()}))
+        diferencia += costo - costo_total
+    return ajustadas, diferencia
+
+
+def _ajustar_indirectos(indirectos: List[tuple], porcentajes: List[float], directos: float,
+                        diferencia_directos: float) -> Tuple[List[tuple], float]:
+    """
+    Recalcula cada costo indirecto con el porcentaje del conjunto de parámetros
+
+    El costo es el del Excel más (porcentaje × directos ajustados -
+    porcentaje del Excel × directos del Excel), de modo que con los
+    porcentajes y precios del Excel la fila queda igual.
+
+    Args:
+        porcentajes: Fracción de cada fila (ej. 0.015) en el conjunto de parámetros
+        directos: Costos directos por ha del Excel
+        diferencia_directos: Diferencia de los directos ajustados respecto al Excel
+
+    Returns:
+        Tupla (indirectos ajustados, diferencia de costo respecto al Excel)
+    """
+    ajustados, diferencia = [], 0.0
+    for (nombre, porcentaje, costo, meses), fraccion in zip(indirectos, porcentajes):
+        nuevo_porcentaje = round(fraccion * 100, 4)
+        nuevo = round(costo + fraccion * (directos + diferencia_directos) - porcentaje / 100 * directos, 2)
+        if nuevo_porcentaje == porcentaje and nuevo == costo:
+            ajustados.append((nombre, porcentaje, costo, meses))
+            continue
+        factor = nuevo / costo if costo else 0.0
+        nombre = nombre.replace(f'({porcentaje}%)', f'({nuevo_porcentaje}%)')
+        ajustados.append((nombre, nuevo_porcentaje, nuevo, {mes: round(v * factor, 2) for mes, v in meses.items()}))
+        diferencia += nuevo - costo
+    return ajustados, diferencia
+
+
+def detalle_costos(parametros: Any) -> Dict[str, Any]:
+    """
+    Detalles de costos por ha con los precios y porcentajes de indirectos
+    de un conjunto de parámetros
+
+    Args:
+        parametros: Módulo o namespace con PRECIOS y los PORCENTAJE_*
+
+    Returns:
+        Dict con las tablas de detalle (misma forma que DETALLE_* e
+        INDIRECTOS_*), la diferencia de costo total por ha respecto al Excel
+        de instalación y de producción, y 'por_defecto' si nada cambia
+    """
+    precios = parametros.PRECIOS
+    instalacion, diferencia_instalacion = [], 0.0
+    for categoria, filas in DETALLE_INSTALACION:
+        ajustadas, diferencia = _ajustar_filas(filas, precios)
+        instalacion.append((categoria, ajustadas))
+        diferencia_instalacion += diferencia
+    produccion, diferencia_produccion = [], 0.0
+    for categoria, subtotal, filas in DETALLE_PRODUCCION:
+        ajustadas, diferencia = _ajustar_filas(filas, precios)
+        produccion.append((categoria, round(subtotal + diferencia, 2), ajustadas))
+        diferencia_produccion += diferencia
+
+    indirectos_instalacion, diferencia = _ajustar_indirectos(
+        INDIRECTOS_INSTALACION, [getattr(parametros, clave) for clave in CLAVES_PORCENTAJE_INSTALACION],
+        sum(fila[1] for _, filas in DETALLE_INSTALACION for fila in filas), diferencia_instalacion
+    )
+    diferencia_instalacion += diferencia
+    indirectos_produccion, diferencia = _ajustar_indirectos(
+        INDIRECTOS_PRODUCCION, [getattr(parametros, clave) for clave in CLAVES_PORCENTAJE_PRODUCCION],
+        sum(subtotal for _, subtotal, _ in DETALLE_PRODUCCION), diferencia_produccion
+    )
+    diferencia_produccion += diferencia
+
+    if (instalacion, indirectos_instalacion, produccion, indirectos_produccion) == \
+            (DETALLE_INSTALACION, INDIRECTOS_INSTALACION, DETALLE_PRODUCCION, INDIRECTOS_PRODUCCION):
+        return {
+            'instalacion': DETALLE_INSTALACION,
+            'indirectos_instalacion': INDIRECTOS_INSTALACION,
+            'produccion': DETALLE_PRODUCCION,
+            'indirectos_produccion': INDIRECTOS_PRODUCCION,
+            'diferencia_instalacion': 0.0,
+            'diferencia_produccion': 0.0,
+            'por_defecto': True
+        }
+
+    return {
+        'instalacion': instalacion,
+        'indirectos_instalacion': indirectos_instalacion,
+        'produccion': produccion,
+        'indirectos_produccion': indirectos_produccion,
+        'diferencia_instalacion': diferencia_instalacion,
+        'diferencia_produccion': diferencia_produccion,
+        'por_defecto': False
+    }
+
+
+def _tablas_centavos(detalle: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Detalles de costos como arrays de céntimos (los del Excel se construyen
+    una sola vez)
+    """
+    global _TABLAS_CENTAVOS
+    if not detalle['por_defecto']:
+        return _construir_tablas_centavos(detalle)
+    if _TABLAS_CENTAVOS is None:
+        _TABLAS_CENTAVOS = _construir_tablas_centavos(detalle)
+    return _TABLAS_CENTAVOS
+
+
+def _construir_tablas_centavos(detalle: Dict[str, Any]) -> Dict[str, Any]:
+    from ..centavos import MESES, a_centavos
+
+    def _inicios(categorias) -> List[int]:
+        inicios, fila = [], 0
+        for filas in categorias:
+            inicios.append(fila)
+            fila += len(filas)
+        return inicios
+
+    filas_instalacion = [fila for _, filas in detalle['instalacion'] for fila in filas]
+    meses_instalacion = ([fila[5] for fila in filas_instalacion]
+                         + [meses for _, _, _, meses in detalle['indirectos_instalacion']]
+                         + [GASTOS_ASUMIDOS_INSTALACION_MESES])
+    return {
+        'instalacion': {
+            'directos': len(filas_instalacion),
+            'inicios': _inicios(filas for _, filas in detalle['instalacion']),
+            'costos': a_centavos([fila[1] for fila in filas_instalacion]
+                                 + [costo for _, _, costo, _ in detalle['indirectos_instalacion']]),
+            'meses': a_centavos([[meses.get(mes, 0) for mes in MESES] for meses in meses_instalacion]),
+            'claves_meses': [[(mes, MESES.index(mes)) for mes in meses] for meses in meses_instalacion]
+        },
+        'produccion': {
+            'inicios': _inicios(filas for _, _, filas in detalle['produccion']),
+            'items': a_centavos([fila[1] for _, _, filas in detalle['produccion'] for fila in filas]),
+            'indirectos': a_centavos([costo for _, _, costo, _ in detalle['indirectos_produccion']])
+        }
+    }
+
+
 class CalculadoraCacaoConvencional:
-    def __init__(self, hectareas: float = 1.0, sensibilizado: bool = True):
+    def __init__(self, hectareas: float = 1.0, sensibilizado: bool = True, parametros: Any = None,
+                 centavos: bool = False):
         """
         Inicializa la calculadora de cacao convencional
         
         Args:
             hectareas: Número de hectáreas (mayor a 0)
             sensibilizado: Si True, usa costos sensibilizados. Si False, usa costos normales
+            parametros: Módulo o namespace con las constantes de parametros
+                (default: módulo parametros vigente). Permite regenerar fichas
+                con un conjunto de parámetros histórico. Sus PRECIOS y
+                PORCENTAJE_* determinan los detalles de costos y los totales
+                de instalación y producción (ver detalle_costos)
+            centavos: Si True, los montos de instalación y de los detalles de
+                costos se calculan en céntimos enteros (ver calculadoras.centavos):
+                subtotales exactos y una sola regla de redondeo por hectáreas
         """
         if hectareas <= 0:
             raise ValueError("Las hectáreas deben ser mayores a 0")
         self.hectareas = hectareas
         self.sensibilizado = sensibilizado
+        self.p = p if parametros is None else parametros
+        self.centavos = centavos
+        # Detalles de costos con los PRECIOS del conjunto de parámetros
+        self.detalle = detalle_costos(self.p)
 
-    def generar_ficha_tecnica(self) -> Dict[str, Any]:
+    def generar_ficha_tecnica(self, campos: List[str] = None) -> Dict[str, Any]:
         """
-        Genera la ficha técnica completa con ambos tipos de cálculos
+        Genera la ficha técnica con ambos tipos de cálculos
+        
+        Args:
+            campos: Secciones a evaluar (ver SECCIONES); 'calculos_alternativos'
+                agrega ambos modos con esas mismas secciones. Si es None se genera
+                la ficha completa con ambos modos
         
         Returns:
-            Dict con resultados sensibilizados, no sensibilizados y toggle activo
-        """
-        # Generar ambos tipos de cálculos
-        resultado_sensibilizado = self._calcular_ficha(sensibilizado=True)
-        resultado_no_sensibilizado = self._calcular_ficha(sensibilizado=False)
+            Dict con el resultado activo, el toggle activo y, si corresponde,
+            los resultados sensibilizados y no sensibilizados
         
-        # Retornar el resultado activo según el modo seleccionado
-        resultado_activo = resultado_sensibilizado if self.sensibilizado else resultado_no_sensibilizado
+        Raises:
+            ValueError: Si algún campo no es válido
+        """
+        if campos is None:
+            secciones = SECCIONES
+            incluir_alternativos = True
+        else:
+            validos = SECCIONES + ['calculos_alternativos']
+            invalidos = [campo for campo in campos if campo not in validos]
+            if invalidos:
+                raise ValueError(f"Campos inválidos: {invalidos}. Deben ser de {validos}")
+            secciones = [seccion for seccion in SECCIONES if seccion in campos]
+            incluir_alternativos = 'calculos_alternativos' in campos
         
-        return {
+        # Solo se calcula el modo alterno si se piden los cálculos alternativos
+        resultado_activo = self._calcular_ficha(self.sensibilizado, secciones)
+        ficha = {
             **resultado_activo,
-            'modo_sensibilizado': self.sensibilizado,
-            'calculos_alternativos': {
+            'modo_sensibilizado': self.sensibilizado
+        }
+        
+        if incluir_alternativos:
+            resultado_alterno = self._calcular_ficha(not self.sensibilizado, secciones)
+            if self.sensibilizado:
+                resultado_sensibilizado, resultado_no_sensibilizado = resultado_activo, resultado_alterno
+            else:
+                resultado_sensibilizado, resultado_no_sensibilizado = resultado_alterno, resultado_activo
+            ficha['calculos_alternativos'] = {
                 'sensibilizado': resultado_sensibilizado,
                 'no_sensibilizado': resultado_no_sensibilizado
             }
-        }
+        
+        return ficha
 
-    def _calcular_ficha(self, sensibilizado: bool) -> Dict[str, Any]:
+    def _calcular_ficha(self, sensibilizado: bool, secciones: List[str] = None) -> Dict[str, Any]:
         """
         Realiza el cálculo de la ficha técnica
         
         Args:
             sensibilizado: Si True, usa costos sensibilizados (+23% en instalación)
+            secciones: Secciones a construir (default: todas)
         
         Returns:
-            Dict con todos los datos de la ficha técnica
+            Dict con los datos de la ficha técnica de las secciones pedidas
+        """
+        base = self._valores_base(sensibilizado)
+        constructores = {
+            'datos_proyecto': self._seccion_datos_proyecto,
+            'instalacion': self._seccion_instalacion,
+            'produccion_promedio': self._seccion_produccion_promedio,
+            'costos_produccion_detallado': self._seccion_costos_produccion_detallado,
+            'costos_instalacion_detallado': self._seccion_costos_instalacion_detallado,
+            'analisis_financiero': self._seccion_analisis_financiero,
+            'proyeccion_15_años': self._seccion_proyeccion_15_años
+        }
+        
+        return {
+            seccion: constructores[seccion](base)
+            for seccion in (SECCIONES if secciones is None else secciones)
+        }
+
+    def _valores_base(self, sensibilizado: bool) -> Dict[str, Any]:
+        """
+        Calcula los valores de los que dependen todas las secciones
+        
+        Args:
+            sensibilizado: Si True, usa costos sensibilizados
+        
+        Returns:
+            Dict con costos, ingresos, utilidades e indicadores escalados
         """
         # ===== PARÁMETROS DE PRODUCCIÓN (constantes) =====
-        PRODUCCION_PROMEDIO_QQ = 26.17  # qq/ha/año
+        PRODUCCION_PROMEDIO_QQ = self.p.FICHA_PRODUCCION_PROMEDIO_QQ  # 26.17 qq/ha/año
         NUMERO_TOTAL_PLANTONES = self.hectareas * 10000/9
-        PRODUCCION_ARBOL_ANIO = p.PRODUCCION_QQ_POR_ARBOL_AÑO  # 0.03 qq/árbol/año
-        MERMA_PRODUCTIVA = p.MERMA_PRODUCTIVA  # 0.02 (2%)
+        PRODUCCION_ARBOL_ANIO = self.p.PRODUCCION_QQ_POR_ARBOL_AÑO  # 0.03 qq/árbol/año
+        MERMA_PRODUCTIVA = self.p.MERMA_PRODUCTIVA  # 0.02 (2%)
         
         # ===== COSTOS DE INSTALACIÓN =====
         # Costo base de instalación (año 0): 9,998 S/
-        COSTO_INSTALACION_BASE = 9998.00
+        # (más la diferencia de los detalles con PRECIOS respecto al Excel)
+        COSTO_INSTALACION_BASE = self.p.FICHA_COSTO_INSTALACION_BASE + self.detalle['diferencia_instalacion']
         # Sensibilización: gastos asumidos por productor
-        SENSIBILIZACION_INSTALACION = 1840.00
+        SENSIBILIZACION_INSTALACION = self.p.FICHA_SENSIBILIZACION_INSTALACION
         
         if sensibilizado:
             costo_instalacion_ha = COSTO_INSTALACION_BASE - SENSIBILIZACION_INSTALACION  # 9,998
@@ -81,11 +467,11 @@ class CalculadoraCacaoConvencional:
         # Promedio ponderado: ~26.2 qq/ha/año
         
         # Cálculo optimizado de producción
-        produccion_qq = NUMERO_TOTAL_PLANTONES * PRODUCCION_ARBOL_ANIO * 0.89 * (1 - MERMA_PRODUCTIVA)
+        produccion_qq = NUMERO_TOTAL_PLANTONES * PRODUCCION_ARBOL_ANIO * self.p.FICHA_FACTOR_PRODUCCION * (1 - MERMA_PRODUCTIVA)
         
         # ===== INGRESOS Y COSTOS ANUALES PROMEDIO =====
         # Precio promedio de venta: 440 S/. por qq
-        PRECIO_VENTA_PROMEDIO = p.PRECIO_VENTA_PROMEDIO  # 440.00
+        PRECIO_VENTA_PROMEDIO = self.p.PRECIO_VENTA_PROMEDIO  # 440.00
         
         # Ingreso anual promedio
         ingreso_anual_ha = produccion_qq * PRECIO_VENTA_PROMEDIO  # 11,528
@@ -93,8 +479,8 @@ class CalculadoraCacaoConvencional:
         # ===== COSTOS DE PRODUCCIÓN ANUAL =====
         # Costo base de producción: 4,871 S/. por ha (años 4-9)
         # Costo sensibilizado años 10-15: 8,158 S/. por ha
-        COSTO_PRODUCCION_BASE = 5550.50
-        COSTO_PRODUCCION_SENSIBILIZADO = 680.00
+        COSTO_PRODUCCION_BASE = self.p.FICHA_COSTO_PRODUCCION_BASE + self.detalle['diferencia_produccion']
+        COSTO_PRODUCCION_SENSIBILIZADO = self.p.FICHA_COSTO_PRODUCCION_SENSIBILIZADO
         
         if sensibilizado:
             # Promedio ponderado con sensibilización en años 10-15
@@ -116,7 +502,7 @@ class CalculadoraCacaoConvencional:
         
         # ===== PROYECCIÓN 15 AÑOS =====
         # 3 años de desarrollo (sin producción) + 12 años productivos
-        AÑOS_PRODUCTIVOS = 12
+        AÑOS_PRODUCTIVOS = self.p.PERIODO_VEGETATIVO_TOTAL - self.p.PERIODO_DESARROLLO  # 12
         
         ingresos_12años = ingreso_anual * AÑOS_PRODUCTIVOS
         costos_12años = costo_anual * AÑOS_PRODUCTIVOS
@@ -131,15 +517,191 @@ class CalculadoraCacaoConvencional:
         # VAN no sensibilizado: ~28,500 S/. por ha (estimado)
         # TIR: ~29.33% (relativamente estable entre ambos escenarios)
         
-        if sensibilizado:
-            van_10pct_ha = 26445.20
-            tir_pct = 29.33
-        else:
-            van_10pct_ha = 28500.00  # Estimación (mayor al reducir costos)
-            tir_pct = 32.50  # Estimación (mayor al tener mejores flujos)
+        modo = 'sensibilizado' if sensibilizado else 'no_sensibilizado'
+        van_10pct_ha = self.p.FICHA_VAN_10PCT_HA[modo]
+        tir_pct = self.p.FICHA_TIR_PCT[modo]  # No sensibilizado: estimación
         
         van_10pct = van_10pct_ha * self.hectareas
 
+        return {
+            'sensibilizado': sensibilizado,
+            'produccion_promedio_qq': PRODUCCION_PROMEDIO_QQ,
+            'costo_instalacion_base': COSTO_INSTALACION_BASE,
+            'sensibilizacion_instalacion': SENSIBILIZACION_INSTALACION,
+            'costo_instalacion_ha': costo_instalacion_ha,
+            'produccion_qq': produccion_qq,
+            'precio_venta_promedio': PRECIO_VENTA_PROMEDIO,
+            'inversion_inicial': inversion_inicial,
+            'ingreso_anual': ingreso_anual,
+            'costo_anual_ha': costo_anual_ha,
+            'costo_anual': costo_anual,
+            'utilidad_anual': utilidad_anual,
+            'roi_anual': roi_anual,
+            'años_productivos': AÑOS_PRODUCTIVOS,
+            'ingresos_12años': ingresos_12años,
+            'costos_12años': costos_12años,
+            'utilidad_neta_15años': utilidad_neta_15años,
+            'roi_15años': roi_15años,
+            'van_10pct': van_10pct,
+            'tir_pct': tir_pct
+        }
+
+    def _seccion_datos_proyecto(self, base: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sección de datos generales del proyecto
+        """
+        AÑOS_PRODUCTIVOS = base['años_productivos']
+
+        return {
+            'hectareas': self.hectareas,
+            'variedad': self.p.VARIEDAD,
+            'region': self.p.REGION,
+            'ciclo_productivo_años': self.p.PERIODO_VEGETATIVO_TOTAL,
+            'años_desarrollo': self.p.PERIODO_DESARROLLO,
+            'años_productivos': AÑOS_PRODUCTIVOS
+        }
+
+    def _seccion_instalacion(self, base: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sección de costo de instalación
+        """
+        sensibilizado = base['sensibilizado']
+        COSTO_INSTALACION_BASE = base['costo_instalacion_base']
+        SENSIBILIZACION_INSTALACION = base['sensibilizacion_instalacion']
+        costo_instalacion_ha = base['costo_instalacion_ha']
+        inversion_inicial = base['inversion_inicial']
+
+        if self.centavos:
+            from .. import centavos as c
+            costo_base, sensibilizacion = c.escalar(
+                c.a_centavos([COSTO_INSTALACION_BASE, SENSIBILIZACION_INSTALACION]), self.hectareas
+            ).tolist()
+            if not sensibilizado:
+                sensibilizacion = 0
+            return {
+                'costo_total': c.a_soles(costo_base - sensibilizacion),
+                'costo_por_hectarea': round(costo_instalacion_ha, 2),
+                'sensibilizado': sensibilizado,
+                'desglose': {
+                    'costo_base': c.a_soles(costo_base),
+                    'sensibilizacion': c.a_soles(sensibilizacion) if sensibilizado else 0
+                }
+            }
+
+        return {
+            'costo_total': round(inversion_inicial, 2),
+            'costo_por_hectarea': round(costo_instalacion_ha, 2),
+            'sensibilizado': sensibilizado,
+            'desglose': {
+                'costo_base': round(COSTO_INSTALACION_BASE * self.hectareas, 2),
+                'sensibilizacion': round(SENSIBILIZACION_INSTALACION * self.hectareas, 2) if sensibilizado else 0
+            }
+        }
+
+    def _seccion_produccion_promedio(self, base: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sección de producción, ingresos y costos anuales promedio
+        """
+        PRODUCCION_PROMEDIO_QQ = base['produccion_promedio_qq']
+        produccion_qq = base['produccion_qq']
+        PRECIO_VENTA_PROMEDIO = base['precio_venta_promedio']
+        ingreso_anual = base['ingreso_anual']
+        costo_anual = base['costo_anual']
+        utilidad_anual = base['utilidad_anual']
+
+        return {
+            'produccion_qq': round(produccion_qq, 2),
+            'produccion_qq_por_ha': round(PRODUCCION_PROMEDIO_QQ, 2),
+            'precio_venta_qq': PRECIO_VENTA_PROMEDIO,
+            'ingresos': round(ingreso_anual, 2),
+            'costos': round(costo_anual, 2),
+            'utilidad': round(utilidad_anual, 2),
+            'margen_utilidad_pct': round((costo_anual / ingreso_anual * 100) if ingreso_anual > 0 else 0, 2)
+        }
+
+    def _seccion_costos_produccion_detallado(self, base: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sección de detalle de costos de producción anual
+        """
+        if self.centavos:
+            return self._costos_produccion_centavos(base)
+
+        costo_anual = base['costo_anual']
+        gastos_asumidos = round(GASTOS_ASUMIDOS_PRODUCCION * self.hectareas, 2)
+
+        return {
+            'costos_directos': [
+                {
+                    'categoria': categoria,
+                    'subtotal': round(subtotal * self.hectareas, 2),
+                    'items': [
+                        {'nombre': nombre, 'costo_total': round(costo_total * self.hectareas, 2), 'precio_unitario': precio_unitario, 'cantidad': cantidad, 'ud': ud, 'meses': dict(meses)}
+                        for nombre, costo_total, precio_unitario, cantidad, ud, meses in items
+                    ]
+                }
+                for categoria, subtotal, items in self.detalle['produccion']
+            ],
+            'costos_indirectos': [
+                {'nombre': nombre, 'porcentaje': porcentaje, 'costo': round(costo * self.hectareas, 2), 'meses': dict(meses)}
+                for nombre, porcentaje, costo, meses in self.detalle['indirectos_produccion']
+            ],
+            'costo_tecnico': round(self._costo_tecnico_produccion() * self.hectareas, 2),
+            'gastos_asumidos_productor': gastos_asumidos,
+            'costo_sensibilizado': round(costo_anual - gastos_asumidos, 2)
+        }
+
+    def _costo_tecnico_produccion(self) -> float:
+        return COSTO_TECNICO_PRODUCCION + self.detalle['diferencia_produccion']
+
+    def _costos_produccion_centavos(self, base: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Detalle de costos de producción en céntimos exactos
+
+        Los subtotales son la suma exacta de sus items. Los meses quedan
+        como en el Excel (por ha, sin escalar), igual que en el modo normal.
+        """
+        from .. import centavos as c
+
+        tabla = _tablas_centavos(self.detalle)['produccion']
+        items = c.escalar(tabla['items'], self.hectareas)
+        subtotales = c.sumar_grupos(items, tabla['inicios'])
+        indirectos = c.escalar(tabla['indirectos'], self.hectareas)
+        costo_tecnico, gastos_asumidos, costo_anual = c.escalar(
+            c.a_centavos([self._costo_tecnico_produccion(), GASTOS_ASUMIDOS_PRODUCCION, base['costo_anual_ha']]),
+            self.hectareas
+        ).tolist()
+
+        items_soles = iter(c.a_soles(items))
+        subtotales_soles = c.a_soles(subtotales)
+        return {
+            'costos_directos': [
+                {
+                    'categoria': categoria,
+                    'subtotal': subtotales_soles[i],
+                    'items': [
+                        {'nombre': nombre, 'costo_total': next(items_soles), 'precio_unitario': precio_unitario, 'cantidad': cantidad, 'ud': ud, 'meses': dict(meses)}
+                        for nombre, _, precio_unitario, cantidad, ud, meses in filas
+                    ]
+                }
+                for i, (categoria, _, filas) in enumerate(self.detalle['produccion'])
+            ],
+            'costos_indirectos': [
+                {'nombre': nombre, 'porcentaje': porcentaje, 'costo': costo, 'meses': dict(meses)}
+                for (nombre, porcentaje, _, meses), costo in zip(self.detalle['indirectos_produccion'], c.a_soles(indirectos))
+            ],
+            'costo_tecnico': c.a_soles(costo_tecnico),
+            'gastos_asumidos_productor': c.a_soles(gastos_asumidos),
+            'costo_sensibilizado': c.a_soles(costo_anual - gastos_asumidos)
+        }
+
+    def _seccion_costos_instalacion_detallado(self, base: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sección de detalle de costos de instalación (1 año)
+        """
+        SENSIBILIZACION_INSTALACION = base['sensibilizacion_instalacion']
+        if self.centavos:
+            return self._costos_instalacion_centavos(SENSIBILIZACION_INSTALACION)
+
         # ===== DETALLE DE COSTOS DE INSTALACIÓN (1 AÑO) =====
         def _escalar_meses(meses: Dict[str, float]) -> Dict[str, float]:
             return {k: round(v * self.hectareas, 2) for k, v in meses.items()}
@@ -155,64 +717,8 @@ class CalculadoraCacaoConvencional:
             }
 
         costos_instalacion_directos = [
-            {
-                'categoria': '1. PREPARACIÓN DE TERRENO',
-                'items': [
-                    _item_instalacion('Roce y quema', 240, 40.00, 6, 'Jornal', {'ago': 240}),
-                    _item_instalacion('Limpieza', 240, 40.00, 6, 'Jornal', {'ago': 240})
-                ]
-            },
-            {
-                'categoria': '2. PREPARACIÓN DE HOYOS',
-                'items': [
-                    _item_instalacion('Marcado y Estacado', 160, 40.00, 4, 'Jornal', {'ago': 160}),
-                    _item_instalacion('Apertura de Hoyos (0.4m Prof x 0.3m x 0.3 Diam)', 1600, 40.00, 40, 'Jornal', {'ago': 1600}),
-                    _item_instalacion('Desinfeccion de Hoyos', 200, 40.00, 5, 'Jornal', {'ago': 200}),
-                    _item_instalacion('Pre Tapado (Fertilizaci on en hoyo)', 400, 40.00, 10, 'Jornal', {'sep': 400})
-                ]
-            },
-            {
-                'categoria': '3. PLANTADO',
-                'items': [
-                    _item_instalacion('Plantones de Cacao', 1111, 1.00, 1111, 'Plantones', {'sep': 1111}),
-                    _item_instalacion('Plantones de Sombra temporal (Platano 5.2m x 3.0 m)', 455, 0.70, 650, 'Hijuelos', {'sep': 455}),
-                    _item_instalacion('Plantado y Tapado de Plantas de Cacao', 1200, 40.00, 30, 'Jornal', {'sep': 1200}),
-                    _item_instalacion('Plantado y Tapado de Plantas de Sombra', 240, 40.00, 6, 'Jornal', {'sep': 240})
-                ]
-            },
-            {
-                'categoria': '4. LABORES DE CULTIVO',
-                'items': [
-                    _item_instalacion('Labores de cultivo (mantenimiento)', 320, 40.00, 8, 'Jornal', {'abr': 80, 'may': 80, 'jun': 80, 'jul': 80}),
-                    _item_instalacion('Deshiervo (2 veces año)', 400, 40.00, 10, 'Jornal', {'oct': 200, 'feb': 200}),
-                    _item_instalacion('Fumigados', 480, 40.00, 12, 'Jornal', {'oct': 48, 'nov': 48, 'dic': 48, 'ene': 48, 'feb': 48, 'mar': 48, 'abr': 48, 'may': 48, 'jun': 48, 'jul': 48})
-                ]
-            },
-            {
-                'categoria': '5. FERTILIZACIÓN',
-                'items': [
-                    _item_instalacion('Fosfato Diamonico', 663, 255.00, 2.6, 'Saco (50 kg)', {'sep': 663}),
-                    _item_instalacion('Cloruro de Potasio', 624, 240.00, 2.6, 'Saco (50 kg)', {'sep': 624}),
-                    _item_instalacion('Guano de Isla', 220, 55.00, 4, 'Saco (50 Kg)', {'sep': 220}),
-                    _item_instalacion('Compost', 120, 20.00, 6, 'Saco (50 Kg)', {'sep': 120}),
-                    _item_instalacion('Abono foliar', 70, 35.00, 2, 'Litro', {'nov': 17.5, 'feb': 17.5, 'abr': 17.5, 'jul': 17.5})
-                ]
-            },
-            {
-                'categoria': '6. CONTROL FITOSANITARIO',
-                'items': [
-                    _item_instalacion('Insecticida y Nematicida (Carfoburan - Killfuran)', 460, 115.00, 4, 'Litro', {'oct': 460}),
-                    _item_instalacion('Fungicida cuprico', 90, 90.00, 1, 'Kg', {'oct': 22.5, 'dic': 22.5, 'mar': 22.5, 'jun': 22.5}),
-                    _item_instalacion('Adherente', 74, 37.00, 2, 'Litro', {'oct': 7.4, 'nov': 7.4, 'dic': 7.4, 'ene': 7.4, 'feb': 7.4, 'mar': 7.4, 'abr': 7.4, 'may': 7.4, 'jun': 7.4, 'jul': 7.4}),
-                    _item_instalacion('Desinfectante para hoyos y planton (Captan)', 72, 0.24, 300, 'Gr', {'ago': 72})
-                ]
-            },
-            {
-                'categoria': '7. GASTOS ESPECIALES',
-                'items': [
-                    _item_instalacion('Transporte de insumos', 128, 3.00, 43, 'Global', {'sep': 128})
-                ]
-            }
+            {'categoria': categoria, 'items': [_item_instalacion(*item) for item in items]}
+            for categoria, items in self.detalle['instalacion']
         ]
 
         for categoria in costos_instalacion_directos:
@@ -220,23 +726,12 @@ class CalculadoraCacaoConvencional:
 
         costos_instalacion_indirectos = [
             {
-                'nombre': 'Imprevistos',
-                'porcentaje': 1.0,
-                'costo': round(96 * self.hectareas, 2),
-                'meses': _escalar_meses({'ago': 32, 'dic': 32, 'may': 32})
-            },
-            {
-                'nombre': 'Gastos operativos',
-                'porcentaje': 1.5,
-                'costo': round(144 * self.hectareas, 2),
-                'meses': _escalar_meses({'sep': 36, 'ene': 36, 'abr': 36, 'jul': 36})
-            },
-            {
-                'nombre': 'Asistencia tecnica',
-                'porcentaje': 2.0,
-                'costo': round(191 * self.hectareas, 2),
-                'meses': _escalar_meses({'sep': 96, 'feb': 95})
+                'nombre': nombre,
+                'porcentaje': porcentaje,
+                'costo': round(costo * self.hectareas, 2),
+                'meses': _escalar_meses(meses)
             }
+            for nombre, porcentaje, costo, meses in self.detalle['indirectos_instalacion']
         ]
 
         total_instalacion_directo = round(sum(cat['subtotal'] for cat in costos_instalacion_directos), 2)
@@ -244,172 +739,152 @@ class CalculadoraCacaoConvencional:
         total_instalacion = round(total_instalacion_directo + total_instalacion_indirecto, 2)
         gastos_asumidos_instalacion = round(SENSIBILIZACION_INSTALACION * self.hectareas, 2)
         costo_total_sensibilizado_instalacion = round(total_instalacion - gastos_asumidos_instalacion, 2)
-        gastos_asumidos_instalacion_meses = _escalar_meses({
-            'ago': 640,
-            'sep': 0,
-            'oct': 248,
-            'nov': 48,
-            'dic': 48,
-            'ene': 48,
-            'feb': 248,
-            'mar': 48,
-            'abr': 128,
-            'may': 128,
-            'jun': 128,
-            'jul': 128
-        })
-        
+        gastos_asumidos_instalacion_meses = _escalar_meses(GASTOS_ASUMIDOS_INSTALACION_MESES)
+
+        return {
+            'costos_directos': costos_instalacion_directos,
+            'costos_indirectos': costos_instalacion_indirectos,
+            'total_directo': total_instalacion_directo,
+            'total_indirecto': total_instalacion_indirecto,
+            'total_instalacion': total_instalacion,
+            'gastos_asumidos_productor': gastos_asumidos_instalacion,
+            'gastos_asumidos_meses': gastos_asumidos_instalacion_meses,
+            'costo_total_sensibilizado': costo_total_sensibilizado_instalacion
+        }
+
+    def _costos_instalacion_centavos(self, SENSIBILIZACION_INSTALACION: float) -> Dict[str, Any]:
+        """
+        Detalle de costos de instalación en céntimos exactos
+
+        Cada fila se escala una sola vez y sus meses se reparten de modo que
+        sumen exactamente el costo escalado; subtotales y totales son sumas
+        enteras de esos costos.
+        """
+        from .. import centavos as c
+
+        tabla = _tablas_centavos(self.detalle)['instalacion']
+        n = tabla['directos']
+        costos = c.escalar(tabla['costos'], self.hectareas)
+        meses = c.a_soles(c.repartir_meses(tabla['meses'], self.hectareas))
+        subtotales = c.a_soles(c.sumar_grupos(costos[:n], tabla['inicios']))
+        costos_soles = c.a_soles(costos)
+
+        def _meses(fila: int) -> Dict[str, float]:
+            return {mes: meses[fila][j] for mes, j in tabla['claves_meses'][fila]}
+
+        fila = 0
+        costos_instalacion_directos = []
+        for i, (categoria, items) in enumerate(self.detalle['instalacion']):
+            lista = []
+            for nombre, _, precio_unitario, cantidad, ud, _ in items:
+                lista.append({
+                    'nombre': nombre,
+                    'costo_total': costos_soles[fila],
+                    'precio_unitario': precio_unitario,
+                    'cantidad': cantidad,
+                    'ud': ud,
+                    'meses': _meses(fila)
+                })
+                fila += 1
+            costos_instalacion_directos.append({'categoria': categoria, 'items': lista, 'subtotal': subtotales[i]})
+
+        costos_instalacion_indirectos = []
+        for nombre, porcentaje, _, _ in self.detalle['indirectos_instalacion']:
+            costos_instalacion_indirectos.append({
+                'nombre': nombre,
+                'porcentaje': porcentaje,
+                'costo': costos_soles[fila],
+                'meses': _meses(fila)
+            })
+            fila += 1
+
+        total_directo = int(costos[:n].sum())
+        total_indirecto = int(costos[n:].sum())
+        gastos_asumidos = int(c.escalar(c.a_centavos(SENSIBILIZACION_INSTALACION), self.hectareas))
+
+        return {
+            'costos_directos': costos_instalacion_directos,
+            'costos_indirectos': costos_instalacion_indirectos,
+            'total_directo': c.a_soles(total_directo),
+            'total_indirecto': c.a_soles(total_indirecto),
+            'total_instalacion': c.a_soles(total_directo + total_indirecto),
+            'gastos_asumidos_productor': c.a_soles(gastos_asumidos),
+            'gastos_asumidos_meses': _meses(fila),
+            'costo_total_sensibilizado': c.a_soles(total_directo + total_indirecto - gastos_asumidos)
+        }
+
+    def _seccion_analisis_financiero(self, base: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sección de indicadores financieros (VAN, TIR, ROI)
+        """
+        inversion_inicial = base['inversion_inicial']
+        utilidad_anual = base['utilidad_anual']
+        roi_anual = base['roi_anual']
+        utilidad_neta_15años = base['utilidad_neta_15años']
+        roi_15años = base['roi_15años']
+        van_10pct = base['van_10pct']
+        tir_pct = base['tir_pct']
+
+        return {
+            'van_tasa_10_pct': round(van_10pct, 2),
+            'tir_porcentaje': round(tir_pct, 2),
+            'roi_anual_porcentaje': round(roi_anual, 2),
+            'roi_15años_porcentaje': round(roi_15años, 2),
+            'inversion_inicial': round(inversion_inicial, 2),
+            'utilidad_anual_promedio': round(utilidad_anual, 2),
+            'utilidad_neta_15años': round(utilidad_neta_15años, 2),
+            'punto_equilibrio_años': round(inversion_inicial / utilidad_anual, 2) if utilidad_anual > 0 else 0
+        }
+
+    def _seccion_proyeccion_15_años(self, base: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sección de proyección del ciclo de 15 años
+        """
+        inversion_inicial = base['inversion_inicial']
+        ingreso_anual = base['ingreso_anual']
+        costo_anual = base['costo_anual']
+        utilidad_anual = base['utilidad_anual']
+        AÑOS_PRODUCTIVOS = base['años_productivos']
+        ingresos_12años = base['ingresos_12años']
+        costos_12años = base['costos_12años']
+        utilidad_neta_15años = base['utilidad_neta_15años']
+        roi_15años = base['roi_15años']
+
         return {
-            'datos_proyecto': {
-                'hectareas': self.hectareas,
-                'variedad': p.VARIEDAD,
-                'region': p.REGION,
-                'ciclo_productivo_años': p.PERIODO_VEGETATIVO_TOTAL,
-                'años_desarrollo': p.PERIODO_DESARROLLO,
-                'años_productivos': AÑOS_PRODUCTIVOS
-            },
             'instalacion': {
-                'costo_total': round(inversion_inicial, 2),
-                'costo_por_hectarea': round(costo_instalacion_ha, 2),
-                'sensibilizado': sensibilizado,
-                'desglose': {
-                    'costo_base': round(COSTO_INSTALACION_BASE * self.hectareas, 2),
-                    'sensibilizacion': round(SENSIBILIZACION_INSTALACION * self.hectareas, 2) if sensibilizado else 0
+                'año_0': {
+                    'año': 0,
+                    'costo': round(inversion_inicial, 2),
+                    'ingreso': 0,
+                    'utilidad': round(-inversion_inicial, 2),
+                    'descripcion': 'Año de inversión inicial'
                 }
             },
-            'produccion_promedio': {
-                'produccion_qq': round(produccion_qq, 2),
-                'produccion_qq_por_ha': round(PRODUCCION_PROMEDIO_QQ, 2),
-                'precio_venta_qq': PRECIO_VENTA_PROMEDIO,
-                'ingresos': round(ingreso_anual, 2),
-                'costos': round(costo_anual, 2),
-                'utilidad': round(utilidad_anual, 2),
-                'margen_utilidad_pct': round((costo_anual / ingreso_anual * 100) if ingreso_anual > 0 else 0, 2)
-            },
-            'costos_produccion_detallado': {
-                'costos_directos': [
-                    {
-                        'categoria': '1. LABORES DE CULTIVO',
-                        'subtotal': round(960.00 * self.hectareas, 2),
-                        'items': [
-                            {'nombre': 'Preparación de plantones de sombra', 'costo_total': round(80 * self.hectareas, 2), 'precio_unitario': 40, 'cantidad': 2, 'ud': 'Jornal', 'meses': {'ago': 80, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Desyerbe mecánico (desbrozadora)', 'costo_total': round(160 * self.hectareas, 2), 'precio_unitario': 40, 'cantidad': 2, 'ud': 'Jornal', 'meses': {'ago': 53.33, 'sep': 0, 'oct': 0, 'nov': 53.33, 'dic': 0, 'ene': 0, 'feb': 53.33, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Poda de mantenimiento de café (flosadora)', 'costo_total': round(160 * self.hectareas, 2), 'precio_unitario': 40, 'cantidad': 4, 'ud': 'Jornal', 'meses': {'ago': 0, 'sep': 160, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Abonamiento y/o fertilización', 'costo_total': round(160 * self.hectareas, 2), 'precio_unitario': 40, 'cantidad': 4, 'ud': 'Jornal', 'meses': {'ago': 0, 'sep': 0, 'oct': 80, 'nov': 80, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Poda de sombra especies arbóreas', 'costo_total': round(280 * self.hectareas, 2), 'precio_unitario': 40, 'cantidad': 7, 'ud': 'Jornal', 'meses': {'ago': 0, 'sep': 40, 'oct': 40, 'nov': 40, 'dic': 40, 'ene': 40, 'feb': 0, 'mar': 40, 'abr': 40, 'may': 0, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Poda de sombra especies arbóreas', 'costo_total': round(120 * self.hectareas, 2), 'precio_unitario': 40, 'cantidad': 3, 'ud': 'Jornal', 'meses': {'ago': 0, 'sep': 0, 'oct': 120, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}}
-                        ]
-                    },
-                    {
-                        'categoria': '2. FERTILIZACIÓN',
-                        'subtotal': round(1553.80 * self.hectareas, 2),
-                        'items': [
-                            {'nombre': 'Urea', 'costo_total': round(909 * self.hectareas, 2), 'precio_unitario': 195, 'cantidad': 4.66, 'ud': 'Saco (50 Kg)', 'meses': {'ago': 0, 'sep': 0, 'oct': 454.35, 'nov': 454.35, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Roca Fosfórica', 'costo_total': round(62 * self.hectareas, 2), 'precio_unitario': 50, 'cantidad': 1.24, 'ud': 'Saco (50 Kg)', 'meses': {'ago': 0, 'sep': 0, 'oct': 31, 'nov': 31, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Sulfato de potasio', 'costo_total': round(475 * self.hectareas, 2), 'precio_unitario': 210, 'cantidad': 2.26, 'ud': 'Saco (50 Kg)', 'meses': {'ago': 0, 'sep': 0, 'oct': 237.30, 'nov': 237.30, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Guano de isla', 'costo_total': round(39 * self.hectareas, 2), 'precio_unitario': 55, 'cantidad': 0.7, 'ud': 'Saco (50 Kg)', 'meses': {'ago': 0, 'sep': 0, 'oct': 19.25, 'nov': 19.25, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Abono foliar', 'costo_total': round(70 * self.hectareas, 2), 'precio_unitario': 35, 'cantidad': 2, 'ud': 'Litro', 'meses': {'ago': 0, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 70, 'may': 0, 'jun': 0, 'jul': 0}}
-                        ]
-                    },
-                    {
-                        'categoria': '3. CONTROL FITOSANITARIO',
-                        'subtotal': round(989 * self.hectareas, 2),
-                        'items': [
-                            {'nombre': 'Insecticida y Nematicida (Carfouran - Killifuran)', 'costo_total': round(690 * self.hectareas, 2), 'precio_unitario': 115, 'cantidad': 6, 'ud': 'Litro', 'meses': {'ago': 0, 'sep': 345, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 345, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Fungicida cúprico', 'costo_total': round(90 * self.hectareas, 2), 'precio_unitario': 90, 'cantidad': 1, 'ud': 'Kg', 'meses': {'ago': 0, 'sep': 0, 'oct': 45, 'nov': 45, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Adherente', 'costo_total': round(74 * self.hectareas, 2), 'precio_unitario': 37, 'cantidad': 2, 'ud': 'Litro', 'meses': {'ago': 0, 'sep': 10.57, 'oct': 10.57, 'nov': 10.57, 'dic': 10.57, 'ene': 10.57, 'feb': 0, 'mar': 10.57, 'abr': 10.57, 'may': 0, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Herbicida (Basoxla - Glyphosate)', 'costo_total': round(135 * self.hectareas, 2), 'precio_unitario': 45, 'cantidad': 3, 'ud': 'Litro', 'meses': {'ago': 0, 'sep': 45, 'oct': 0, 'nov': 0, 'dic': 45, 'ene': 0, 'feb': 0, 'mar': 45, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}}
-                        ]
-                    },
-                    {
-                        'categoria': '4. COSECHA',
-                        'subtotal': round(880 * self.hectareas, 2),
-                        'items': [
-                            {'nombre': 'Cosecha de mazorcas', 'costo_total': round(400 * self.hectareas, 2), 'precio_unitario': 40, 'cantidad': 10, 'ud': 'Jornal', 'meses': {'ago': 0, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 400, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Quiebre de mazorcas', 'costo_total': round(80 * self.hectareas, 2), 'precio_unitario': 40, 'cantidad': 2, 'ud': 'Jornal', 'meses': {'ago': 0, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 80, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Fermentación', 'costo_total': round(160 * self.hectareas, 2), 'precio_unitario': 40, 'cantidad': 4, 'ud': 'Jornal', 'meses': {'ago': 0, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 160, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Secado', 'costo_total': round(80 * self.hectareas, 2), 'precio_unitario': 40, 'cantidad': 2, 'ud': 'Jornal', 'meses': {'ago': 0, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 80, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Limpieza y Selección de granos', 'costo_total': round(80 * self.hectareas, 2), 'precio_unitario': 40, 'cantidad': 2, 'ud': 'Jornal', 'meses': {'ago': 0, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 80, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Envasado', 'costo_total': round(80 * self.hectareas, 2), 'precio_unitario': 40, 'cantidad': 2, 'ud': 'Jornal', 'meses': {'ago': 0, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 80, 'jun': 0, 'jul': 0}}
-                        ]
-                    },
-                    {
-                        'categoria': '5. GASTOS ESPECIALES',
-                        'subtotal': round(853.52  * self.hectareas, 2),
-                        'items': [
-                            {'nombre': 'Plantones de reposición de sombra', 'costo_total': round(21 * self.hectareas, 2), 'precio_unitario': 0.70, 'cantidad': 30, 'ud': 'Unid', 'meses': {'ago': 21, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Transporte de insumos', 'costo_total': round(36 * self.hectareas, 2), 'precio_unitario': 3.00, 'cantidad': 12, 'ud': 'Sacos', 'meses': {'ago': 36, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Transporte de cosecha', 'costo_total': round(78 * self.hectareas, 2), 'precio_unitario': 3.00, 'cantidad': 26, 'ud': 'Sacos', 'meses': {'ago': 0, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 78, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Sacos (1 QQ)', 'costo_total': round(52 * self.hectareas, 2), 'precio_unitario': 2.00, 'cantidad': 26, 'ud': 'Unid', 'meses': {'ago': 0, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 52, 'jun': 0, 'jul': 0}},
-                            {'nombre': 'Costo de la instalación inicial (Para 15 Años)', 'costo_total': round(666.52 * self.hectareas, 2), 'precio_unitario': 667, 'cantidad': 1, 'ud': 'Global', 'meses': {'ago': 66.65, 'sep': 66.65, 'oct': 66.65, 'nov': 66.65, 'dic': 66.65, 'ene': 66.65, 'feb': 66.65, 'mar': 66.65, 'abr': 66.65, 'may': 66.65, 'jun': 0, 'jul': 0}}
-                        ]
-                    }
-                ],
-                'costos_indirectos': [
-                    {'nombre': 'Imprevistos (1.5%)', 'porcentaje': 1.5, 'costo': round(78.54 * self.hectareas, 2), 'meses': {'ago': 0, 'sep': 26.18, 'oct': 0, 'nov': 0, 'dic': 26.18, 'ene': 0, 'feb': 0, 'mar': 26.18, 'abr': 0, 'may': 0, 'jun': 0, 'jul': 0}},
-                    {'nombre': 'Gastos operativos (Pago de agua, compra y reparación de herramientas)', 'porcentaje': 2.5, 'costo': round(130.91 * self.hectareas, 2), 'meses': {'ago': 44, 'sep': 0, 'oct': 0, 'nov': 0, 'dic': 0, 'ene': 43.64, 'feb': 0, 'mar': 0, 'abr': 0, 'may': 43.64, 'jun': 0, 'jul': 0}},
-                    {'nombre': 'Asistencia técnica', 'porcentaje': 2.0, 'costo': round(104.73 * self.hectareas, 2), 'meses': {'ago': 0, 'sep': 0, 'oct': 52.36, 'nov': 0, 'dic': 0, 'ene': 0, 'feb': 0, 'mar': 0, 'abr': 52.36, 'may': 0, 'jun': 0, 'jul': 0}}
-                ],
-                'costo_tecnico': round(5550.50 * self.hectareas, 2),
-                'gastos_asumidos_productor': round(680.00 * self.hectareas, 2),
-                'costo_sensibilizado': round(costo_anual - round(680.00 * self.hectareas, 2), 2)
+            'desarrollo': {
+                'años_1_3': {
+                    'años': '1-3',
+                    'costo_anual': 0,
+                    'ingreso_anual': 0,
+                    'descripcion': 'Período de desarrollo sin producción'
+                }
             },
-            'costos_instalacion_detallado': {
-                'costos_directos': costos_instalacion_directos,
-                'costos_indirectos': costos_instalacion_indirectos,
-                'total_directo': total_instalacion_directo,
-                'total_indirecto': total_instalacion_indirecto,
-                'total_instalacion': total_instalacion,
-                'gastos_asumidos_productor': gastos_asumidos_instalacion,
-                'gastos_asumidos_meses': gastos_asumidos_instalacion_meses,
-                'costo_total_sensibilizado': costo_total_sensibilizado_instalacion
+            'produccion': {
+                'años_4_15': {
+                    'años': '4-15',
+                    'años_productivos': AÑOS_PRODUCTIVOS,
+                    'ingreso_anual_promedio': round(ingreso_anual, 2),
+                    'costo_anual_promedio': round(costo_anual, 2),
+                    'utilidad_anual_promedio': round(utilidad_anual, 2),
+                    'ingreso_total': round(ingresos_12años, 2),
+                    'costo_total': round(costos_12años, 2)
+                }
             },
-            'analisis_financiero': {
-                'van_tasa_10_pct': round(van_10pct, 2),
-                'tir_porcentaje': round(tir_pct, 2),
-                'roi_anual_porcentaje': round(roi_anual, 2),
-                'roi_15años_porcentaje': round(roi_15años, 2),
+            'resumen': {
+                'hectareas': self.hectareas,
                 'inversion_inicial': round(inversion_inicial, 2),
-                'utilidad_anual_promedio': round(utilidad_anual, 2),
+                'ingreso_total_15años': round(ingresos_12años, 2),
+                'costo_total_15años': round(costos_12años + inversion_inicial, 2),
                 'utilidad_neta_15años': round(utilidad_neta_15años, 2),
-                'punto_equilibrio_años': round(inversion_inicial / utilidad_anual, 2) if utilidad_anual > 0 else 0
-            },
-            'proyeccion_15_años': {
-                'instalacion': {
-                    'año_0': {
-                        'año': 0,
-                        'costo': round(inversion_inicial, 2),
-                        'ingreso': 0,
-                        'utilidad': round(-inversion_inicial, 2),
-                        'descripcion': 'Año de inversión inicial'
-                    }
-                },
-                'desarrollo': {
-                    'años_1_3': {
-                        'años': '1-3',
-                        'costo_anual': 0,
-                        'ingreso_anual': 0,
-                        'descripcion': 'Período de desarrollo sin producción'
-                    }
-                },
-                'produccion': {
-                    'años_4_15': {
-                        'años': '4-15',
-                        'años_productivos': AÑOS_PRODUCTIVOS,
-                        'ingreso_anual_promedio': round(ingreso_anual, 2),
-                        'costo_anual_promedio': round(costo_anual, 2),
-                        'utilidad_anual_promedio': round(utilidad_anual, 2),
-                        'ingreso_total': round(ingresos_12años, 2),
-                        'costo_total': round(costos_12años, 2)
-                    }
-                },
-                'resumen': {
-                    'hectareas': self.hectareas,
-                    'inversion_inicial': round(inversion_inicial, 2),
-                    'ingreso_total_15años': round(ingresos_12años, 2),
-                    'costo_total_15años': round(costos_12años + inversion_inicial, 2),
-                    'utilidad_neta_15años': round(utilidad_neta_15años, 2),
-                    'roi_total_porcentaje': round(roi_15años, 2)
-                }
+                'roi_total_porcentaje': round(roi_15años, 2)
             }
         }
\ No newline at end of file
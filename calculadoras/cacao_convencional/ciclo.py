@@ -0,0 +1,128 @@
+# calculadoras/cacao_convencional/ciclo.py
+"""
+Proyección del ciclo productivo completo de Cacao (años 4-15)
+Evalúa una sola vez los costos que no dependen del año y aplica
+la parte dependiente del rendimiento como vectores sobre los años
+Base: 1 hectárea
+"""
+
+from typing import Dict, Any, List
+
+import numpy as np
+
+from . import parametros as p
+from .produccion import CacaoProduccion, grupo_productividad
+
+
+class CicloProductivoCacao:
+    """
+    Proyecta costos mensuales e ingresos de todos los años productivos
+    sin instanciar una CacaoProduccion por año.
+
+    Solo PRODUCTIVIDAD (cinco grupos de años) y los items que dependen de
+    los QQ cosechados (transporte de cosecha y sacos) varían entre años;
+    el resto de costos directos se calcula una vez con un año de referencia.
+    """
+
+    def __init__(self, hectareas: float = 1.0, año_inicio: int = 4, año_fin: int = 15,
+                 parametros: Any = None):
+        """
+        Inicializa el proyector del ciclo
+
+        Args:
+            hectareas: Número de hectáreas (mayor a 0)
+            año_inicio: Primer año productivo a proyectar (default: 4)
+            año_fin: Último año productivo a proyectar (default: 15)
+            parametros: Módulo o namespace de parámetros, por ejemplo
+                ConjuntoParametros.valores (default: módulo parametros)
+        """
+        if hectareas <= 0:
+            raise ValueError("El número de hectáreas debe ser mayor a 0")
+        if año_inicio < 4 or año_fin > 15 or año_inicio > año_fin:
+            raise ValueError("Los años de producción deben estar entre 4 y 15")
+
+        self.hectareas = hectareas
+        self.p = p if parametros is None else parametros
+        self.años: List[int] = list(range(año_inicio, año_fin + 1))
+
+    def _productividad_por_año(self) -> Dict[str, np.ndarray]:
+        """
+        Productividad por año, evaluando una sola vez cada grupo de PRODUCTIVIDAD
+
+        Returns:
+            Dict con vectores (años,) de QQ netos (con merma) por hectárea
+            y proporciones de primera y segunda
+        """
+        qq_por_grupo = {}
+        for grupo, datos in self.p.PRODUCTIVIDAD.items():
+            qq_bruto = datos['qq']
+            qq_por_grupo[grupo] = round(qq_bruto - qq_bruto * self.p.MERMA_PRODUCTIVA, 1)
+
+        grupos = [grupo_productividad(año) for año in self.años]
+        return {
+            'qq': np.array([qq_por_grupo[g] for g in grupos]),
+            'primera': np.array([self.p.PRODUCTIVIDAD[g]['primera'] for g in grupos]),
+            'segunda': np.array([self.p.PRODUCTIVIDAD[g]['segunda'] for g in grupos])
+        }
+
+    def calcular(self) -> Dict[str, Any]:
+        """
+        Ejecuta la proyección del ciclo completo
+
+        Returns:
+            Dict con vectores por año y la matriz de costos (años x meses),
+            todos escalados por hectáreas
+        """
+        # Costos invariantes: un solo cálculo con el año de referencia
+        calculadora = CacaoProduccion(hectareas=1.0, año_produccion=self.años[0], parametros=self.p)
+        referencia = calculadora.nuevo_estado()
+        total_directos_ref = calculadora.calcular_costos_directos(referencia)
+        gastos_ref = referencia.costos_directos['gastos_especiales']
+        variable_ref = gastos_ref['transporte_cosecha']['subtotal'] + gastos_ref['sacos']['subtotal']
+
+        directos_fijos = total_directos_ref - variable_ref
+        cronograma_fijo = np.array([referencia.cronograma[mes] for mes in self.p.MESES])
+        idx_cosecha = self.p.MESES.index(gastos_ref['sacos']['mes'])
+        cronograma_fijo[idx_cosecha] -= variable_ref
+
+        # Parte dependiente del rendimiento como vectores sobre los años
+        productividad = self._productividad_por_año()
+        qq = productividad['qq']
+        costo_por_qq = self.p.PRECIOS['transporte_cosecha'] + self.p.PRECIOS['saco_yute']
+        costo_variable = qq * costo_por_qq
+
+        directos = directos_fijos + costo_variable
+        indirectos = (
+            np.round(directos * self.p.PORCENTAJE_IMPREVISTOS_PROD, 2)
+            + np.round(directos * self.p.PORCENTAJE_GASTOS_OPERATIVOS_PROD, 2)
+            + np.round(directos * self.p.PORCENTAJE_ASISTENCIA_TECNICA_PROD, 2)
+        )
+        costos_totales = directos + indirectos
+
+        matriz_costos = np.tile(cronograma_fijo, (len(self.años), 1))
+        matriz_costos[:, idx_cosecha] += costo_variable
+
+        ingresos = np.round(
+            qq * productividad['primera'] * self.p.PRECIO_VENTA_PRIMERA
+            + qq * productividad['segunda'] * self.p.PRECIO_VENTA_SEGUNDA,
+            2
+        )
+        utilidad = ingresos - costos_totales
+
+        return {
+            'hectareas': self.hectareas,
+            'años': self.años,
+            'meses': list(self.p.MESES),
+            'produccion_qq': qq * self.hectareas,
+            'ingresos': ingresos * self.hectareas,
+            'costos_directos': directos * self.hectareas,
+            'costos_indirectos': indirectos * self.hectareas,
+            'costos_totales': costos_totales * self.hectareas,
+            'utilidad': utilidad * self.hectareas,
+            'matriz_costos': matriz_costos * self.hectareas,
+            'metadata': {
+                'tipo_ficha': 'ciclo_produccion',
+                'cultivo': 'cacao_convencional',
+                'region': self.p.REGION
+            }
+        }
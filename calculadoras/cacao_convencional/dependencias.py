@@ -0,0 +1,254 @@
+# calculadoras/cacao_convencional/dependencias.py
+"""
+Grafo de dependencias entre PRECIOS y los items de las calculadoras de Cacao
+Permite recalcular incrementalmente solo los items, subtotales, indirectos
+y celdas del cronograma afectados cuando cambia un precio
+"""
+
+from typing import Dict, Any, List, Tuple, Optional
+
+from . import parametros as p
+from .instalacion import CacaoInstalacion
+from .produccion import CacaoProduccion, grupo_productividad
+
+# Orden de las categorías tal como las suma cada calculadora
+CATEGORIAS = {
+    'instalacion': ['preparacion_terreno', 'preparacion_hoyos', 'plantado', 'labores_cultivo',
+                    'fertilizacion', 'control_fitosanitario', 'gastos_especiales'],
+    'produccion': ['labores_cultivo', 'fertilizacion', 'control_fitosanitario', 'cosecha',
+                   'gastos_especiales'],
+}
+
+
+def _crear_calculadora(tipo: str, año: Optional[int], hectareas: float, precios: Dict[str, float]):
+    if tipo == 'instalacion':
+        return CacaoInstalacion(hectareas=hectareas, precios=precios)
+    if tipo == 'produccion':
+        return CacaoProduccion(hectareas=hectareas, año_produccion=año, precios=precios)
+    raise ValueError(f"Tipo de ficha inválido: {tipo}")
+
+
+def _hojas_numericas(item: Dict[str, Any], prefijo: Tuple[str, ...] = ()) -> Dict[Tuple[str, ...], float]:
+    """
+    Aplana los valores numéricos de un item (incluye distribuciones anidadas)
+    """
+    hojas = {}
+    for clave, valor in item.items():
+        if isinstance(valor, dict):
+            hojas.update(_hojas_numericas(valor, prefijo + (clave,)))
+        elif isinstance(valor, (int, float)) and not isinstance(valor, bool):
+            hojas[prefijo + (clave,)] = valor
+    return hojas
+
+
+class GrafoDependencias:
+    """
+    Registra qué campos de qué items y qué meses del cronograma leen cada precio
+
+    Como todos los costos directos son lineales en los precios, basta con
+    evaluar una vez cada precio con +1 para obtener el coeficiente de cada
+    campo afectado. Los grafos se construyen una vez por (tipo, grupo de año).
+    """
+
+    def __init__(self):
+        self._grafos: Dict[Tuple[str, Optional[str]], Dict[str, Dict[str, Any]]] = {}
+
+    def _clave(self, tipo: str, año: Optional[int]) -> Tuple[str, Optional[str]]:
+        return (tipo, grupo_productividad(año) if tipo == 'produccion' else None)
+
+    def _construir(self, tipo: str, año: Optional[int]) -> Dict[str, Dict[str, Any]]:
+        base = _crear_calculadora(tipo, año, 1.0, p.PRECIOS).calcular_estado()
+
+        grafo = {}
+        for parametro in p.PRECIOS:
+            sonda = _crear_calculadora(tipo, año, 1.0, {**p.PRECIOS, parametro: p.PRECIOS[parametro] + 1}).calcular_estado()
+
+            items = {}
+            for categoria in CATEGORIAS[tipo]:
+                for nombre, item in base.costos_directos[categoria].items():
+                    if not isinstance(item, dict):
+                        continue
+                    hojas_base = _hojas_numericas(item)
+                    hojas_sonda = _hojas_numericas(sonda.costos_directos[categoria][nombre])
+                    coeficientes = {
+                        campo: hojas_sonda[campo] - valor
+                        for campo, valor in hojas_base.items()
+                        if hojas_sonda[campo] != valor
+                    }
+                    if coeficientes:
+                        items[(categoria, nombre)] = coeficientes
+
+            cronograma = {
+                mes: sonda.cronograma[mes] - base.cronograma[mes]
+                for mes in p.MESES
+                if sonda.cronograma[mes] != base.cronograma[mes]
+            }
+
+            if items or cronograma:
+                grafo[parametro] = {'items': items, 'cronograma': cronograma}
+        return grafo
+
+    def grafo(self, tipo: str, año: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Dependencias de una calculadora
+
+        Args:
+            tipo: 'instalacion' o 'produccion'
+            año: Año de producción (solo para 'produccion')
+
+        Returns:
+            Dict parametro -> {'items': {(categoria, item): {campo: coef}},
+                               'cronograma': {mes: coef}}
+        """
+        clave = self._clave(tipo, año)
+        if clave not in self._grafos:
+            self._grafos[clave] = self._construir(tipo, año)
+        return self._grafos[clave]
+
+    def items_afectados(self, parametro: str, tipo: str, año: Optional[int] = None) -> List[Tuple[str, str]]:
+        """
+        Items (categoria, item) que leen un parámetro
+        """
+        return list(self.grafo(tipo, año).get(parametro, {}).get('items', {}))
+
+
+class RecalculadorIncremental:
+    """
+    Mantiene calculadoras ya evaluadas y aplica cambios de precio
+    recalculando solo lo afectado según el GrafoDependencias.
+    El estado de cada cálculo es propio del recalculador; los resultados
+    entregados son copias congeladas que no cambian con actualizaciones
+    posteriores.
+
+    Las fichas se registran con un identificador (por ejemplo id_ficha)
+    para poder reportar cuáles quedan desactualizadas tras un cambio.
+    """
+
+    def __init__(self, precios: Dict[str, float] = None):
+        """
+        Args:
+            precios: Precios iniciales (default: copia de parametros.PRECIOS)
+        """
+        self.precios = dict(p.PRECIOS if precios is None else precios)
+        self.grafo = GrafoDependencias()
+        self._estados: Dict[Tuple[str, Optional[int], float], Dict[str, Any]] = {}
+        self._fichas: Dict[Any, Tuple[str, Optional[int], float]] = {}
+        self._obsoletas = set()
+
+    def _estado(self, tipo: str, año: Optional[int], hectareas: float) -> Dict[str, Any]:
+        clave = (tipo, año if tipo == 'produccion' else None, hectareas)
+        if clave not in self._estados:
+            calc = _crear_calculadora(tipo, año, hectareas, self.precios)
+            calculo = calc.calcular_estado()
+            total_directos = sum(calculo.costos_directos[c]['total'] for c in CATEGORIAS[tipo])
+            self._estados[clave] = {'calc': calc, 'calculo': calculo, 'total_directos': total_directos,
+                                    'resultado': calc.armar_resultado(calculo)}
+        return self._estados[clave]
+
+    def registrar_ficha(self, id_ficha: Any, tipo: str, año: Optional[int] = None,
+                        hectareas: float = 1.0) -> Dict[str, Any]:
+        """
+        Registra una ficha almacenada y devuelve su resultado vigente
+
+        Args:
+            id_ficha: Identificador de la ficha
+            tipo: 'instalacion' o 'produccion'
+            año: Año de producción (solo para 'produccion')
+            hectareas: Número de hectáreas
+        """
+        if hectareas <= 0:
+            raise ValueError("El número de hectáreas debe ser mayor a 0")
+        self._fichas[id_ficha] = (tipo, año if tipo == 'produccion' else None, hectareas)
+        return self._estado(tipo, año, hectareas)['resultado']
+
+    def resultado(self, id_ficha: Any) -> Dict[str, Any]:
+        """
+        Resultado vigente de una ficha registrada (la marca como actualizada)
+        """
+        tipo, año, hectareas = self._fichas[id_ficha]
+        self._obsoletas.discard(id_ficha)
+        return self._estado(tipo, año, hectareas)['resultado']
+
+    def fichas_obsoletas(self) -> List[Any]:
+        """
+        Fichas registradas cuyo resultado cambió desde la última consulta
+        """
+        return sorted(self._obsoletas, key=str)
+
+    def actualizar_parametro(self, nombre: str, valor: float) -> Dict[str, Any]:
+        """
+        Cambia un precio y recalcula solo los elementos que dependen de él
+
+        Args:
+            nombre: Clave de PRECIOS
+            valor: Nuevo precio
+
+        Returns:
+            Dict con los items, categorías y meses recalculados por tipo de
+            ficha, y la lista de fichas registradas que quedaron obsoletas
+
+        Raises:
+            ValueError: Si el parámetro no existe en PRECIOS
+        """
+        if nombre not in self.precios:
+            raise ValueError(f"Parámetro desconocido: {nombre}")
+
+        anterior = self.precios[nombre]
+        delta = valor - anterior
+        self.precios[nombre] = valor
+
+        afectados = set()
+        recalculos = []
+        for (tipo, año, hectareas), estado in self._estados.items():
+            dependencias = self.grafo.grafo(tipo, año).get(nombre)
+            if not dependencias or delta == 0:
+                continue
+
+            calc = estado['calc']
+            calculo = estado['calculo']
+            categorias = set()
+            for (categoria, item), coeficientes in dependencias['items'].items():
+                destino = calculo.costos_directos[categoria][item]
+                for campo, coef in coeficientes.items():
+                    contenedor = destino
+                    for parte in campo[:-1]:
+                        contenedor = contenedor[parte]
+                    contenedor[campo[-1]] += coef * delta
+                if ('subtotal',) in coeficientes:
+                    calculo.costos_directos[categoria]['total'] += coeficientes[('subtotal',)] * delta
+                    categorias.add(categoria)
+
+            for mes, coef in dependencias['cronograma'].items():
+                calculo.cronograma[mes] += coef * delta
+
+            total_directos = sum(calculo.costos_directos[c]['total'] for c in CATEGORIAS[tipo])
+            if tipo == 'instalacion':
+                calculo.costos_indirectos = calc.desglosar_indirectos(total_directos)
+                total_indirectos = calculo.costos_indirectos['total']
+            else:
+                total_indirectos = calc.calcular_costos_indirectos(calculo, total_directos)
+
+            calculo.total_directos = total_directos
+            calculo.total_indirectos = total_indirectos
+            estado['total_directos'] = total_directos
+            estado['resultado'] = calc.armar_resultado(calculo)
+            afectados.add((tipo, año, hectareas))
+            recalculos.append({
+                'tipo': tipo,
+                'año': año,
+                'hectareas': hectareas,
+                'items': [f'{c}.{i}' for c, i in dependencias['items']],
+                'categorias': sorted(categorias),
+                'meses_cronograma': list(dependencias['cronograma'])
+            })
+
+        obsoletas = [id_ficha for id_ficha, clave in self._fichas.items() if clave in afectados]
+        self._obsoletas.update(obsoletas)
+
+        return {
+            'parametro': nombre,
+            'valor_anterior': anterior,
+            'valor_nuevo': valor,
+            'recalculos': recalculos,
+            'fichas_obsoletas': obsoletas
+        }
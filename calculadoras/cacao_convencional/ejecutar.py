@@ -1,25 +1,135 @@
 #!/usr/bin/env python3
 """Script auxiliar para ejecutar calculadora desde Node.js"""
 import sys
+import os
 import json
+import sqlite3
+
+from ..salida import (deduplicar_alternativos, resolver_referencias, serializar_json,
+                      escribir_json, escribir_msgpack)
+from ..versionado import clave_contenido, huella_ficha
+from ..parametros_externos import obtener_parametros
+from . import parametros
+
+def _extraer_opcion(argumentos, nombre):
+    """Quita '--nombre valor' de la lista de argumentos y devuelve el valor"""
+    if nombre not in argumentos:
+        return None
+    indice = argumentos.index(nombre)
+    if indice + 1 >= len(argumentos):
+        raise ValueError(f"{nombre} requiere un valor")
+    valor = argumentos[indice + 1]
+    del argumentos[indice:indice + 2]
+    return valor
+
+def _clave_cache(hectareas, sensibilizado, campos, conjunto, centavos=False):
+    """Clave de contenido de la ficha para el cache persistente"""
+    return clave_contenido(
+        calculadora='cacao_convencional',
+        hectareas=hectareas,
+        sensibilizado=sensibilizado,
+        campos=sorted(campos) if campos is not None else None,
+        centavos=centavos,
+        parametros=conjunto.huella,
+        version=huella_ficha(os.path.dirname(os.path.abspath(__file__)))
+    )
+
+def _generar_texto(hectareas, sensibilizado, campos, conjunto, centavos=False):
+    """Genera la ficha y la devuelve como JSON compacto deduplicado"""
+    # Importar calculadora (ahora con imports relativos que funcionan)
+    from .calculadora_cacao_convencional import CalculadoraCacaoConvencional
+    
+    # Crear instancia y generar ficha
+    calc = CalculadoraCacaoConvencional(hectareas=hectareas, sensibilizado=sensibilizado,
+                                        parametros=conjunto.valores, centavos=centavos)
+    return serializar_json(deduplicar_alternativos(calc.generar_ficha_tecnica(campos)))
 
 def main():
     try:
+        argumentos = sys.argv[1:]
+        # Opción --campos a,b,c: solo evalúa esas secciones de la ficha
+        campos = _extraer_opcion(argumentos, '--campos')
+        if campos is not None:
+            campos = [campo.strip() for campo in campos.split(',') if campo.strip()]
+        # Opción --formato json|msgpack (msgpack: marco binario con longitud)
+        formato = (_extraer_opcion(argumentos, '--formato') or 'json').lower()
+        if formato not in ['json', 'msgpack']:
+            raise ValueError(f"Formato inválido: {formato}. Debe ser 'json' o 'msgpack'")
+        # Opción --indentar: JSON legible y sin deduplicar (depuración)
+        indentar = '--indentar' in argumentos
+        if indentar:
+            argumentos.remove('--indentar')
+        # Opción --region: conjunto de parámetros a usar (default: parametros.REGION)
+        region = _extraer_opcion(argumentos, '--region') or parametros.REGION
+        # Opción --guardar CATEGORIA,CULTIVO[,PROVINCIA]: guarda la ficha en
+        # modo paramétrico (solo entradas + versión) y agrega su id_ficha;
+        # al leerla se regenera completa, sin importar --campos
+        guardar = _extraer_opcion(argumentos, '--guardar')
+        if guardar is not None:
+            destino = [valor.strip() for valor in guardar.split(',', 2)]
+            if len(destino) < 2:
+                raise ValueError("--guardar requiere CATEGORIA,CULTIVO[,PROVINCIA]")
+        # Opción --centavos: montos de instalación y detalles en céntimos exactos
+        centavos = '--centavos' in argumentos
+        if centavos:
+            argumentos.remove('--centavos')
+            if guardar is not None:
+                raise ValueError("--centavos no se puede combinar con --guardar")
+        # Opción --sin-cache: siempre recalcula y no toca fichas_cache.db
+        usar_cache = '--sin-cache' not in argumentos
+        if not usar_cache:
+            argumentos.remove('--sin-cache')
+        
         # Obtener parámetros de los argumentos
-        hectareas = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+        hectareas = float(argumentos[0]) if len(argumentos) > 0 else 1.0
         # Nuevo parámetro: sensibilizado (true/false)
-        sensibilizado_str = sys.argv[2].lower() if len(sys.argv) > 2 else 'true'
+        sensibilizado_str = argumentos[1].lower() if len(argumentos) > 1 else 'true'
         sensibilizado = sensibilizado_str in ['true', '1', 'yes', 's', 'si']
         
-        # Importar calculadora (ahora con imports relativos que funcionan)
-        from .calculadora_cacao_convencional import CalculadoraCacaoConvencional
+        # Parámetros vigentes de la región (conjuntos_parametros/ o parametros.py)
+        conjunto = obtener_parametros('cacao_convencional', region)
+        
+        # Servir desde el cache si la misma ficha ya fue calculada con
+        # los mismos parámetros y versión de calculadora
+        cache = None
+        texto = None
+        if usar_cache:
+            from ..cache import CacheFichas
+            clave = _clave_cache(hectareas, sensibilizado, campos, conjunto, centavos)
+            try:
+                cache = CacheFichas()
+                texto = cache.obtener(clave)
+            except sqlite3.Error:
+                cache = None  # Sin cache (ej. sistema de archivos de solo lectura)
+        
+        if texto is None:
+            texto = _generar_texto(hectareas, sensibilizado, campos, conjunto, centavos)
+            if cache is not None:
+                try:
+                    cache.guardar(clave, texto)
+                except sqlite3.Error:
+                    pass
         
-        # Crear instancia y generar ficha
-        calc = CalculadoraCacaoConvencional(hectareas=hectareas, sensibilizado=sensibilizado)
-        ficha = calc.generar_ficha_tecnica()
+        if guardar is not None:
+            from ..almacenamiento import AlmacenFichas
+            almacen = AlmacenFichas()
+            try:
+                id_ficha = almacen.guardar(destino[0], destino[1],
+                                           destino[2] if len(destino) > 2 else 'No especificada',
+                                           hectareas, sensibilizado,
+                                           parametros=vars(conjunto.valores))
+            finally:
+                almacen.cerrar()
+            texto = serializar_json({**json.loads(texto), 'id_ficha': id_ficha})
         
-        # Retornar JSON
-        print(json.dumps(ficha, indent=2, default=str))
+        # Retornar ficha (el modo alterno igual al activo va como {"$ref": "#"})
+        if indentar:
+            escribir_json(resolver_referencias(json.loads(texto)), sys.stdout, compacto=False)
+        elif formato == 'msgpack':
+            escribir_msgpack(json.loads(texto), sys.stdout.buffer)
+        else:
+            sys.stdout.write(texto + '\n')
+            sys.stdout.flush()
         
     except Exception as e:
         import traceback
@@ -5,6 +5,7 @@ Año 0-3: Desarrollo sin producción
 Base: 1 hectárea
 """
 
+from ..base_calculadora import EstadoCalculo, DictInmutable, congelar
 from . import parametros as p
 from typing import Dict, Any
 
@@ -12,40 +13,50 @@ class CacaoInstalacion:
     """
     Calcula todos los costos de instalación del cultivo de cacao
     para el primer año (establecimiento)
+
+    La instancia solo guarda las entradas: cada calcular() acumula en un
+    EstadoCalculo propio y devuelve un resultado congelado, por lo que una
+    misma instancia puede usarse desde varios hilos.
     """
     
-    def __init__(self, hectareas: float = 1.0):
+    def __init__(self, hectareas: float = 1.0, precios: Dict[str, float] = None, parametros: Any = None):
         self.hectareas = hectareas
-        self.cronograma = {mes: 0.0 for mes in p.MESES}
-        self.costos_directos = {}
-        self.costos_indirectos = {}
+        self.p = p if parametros is None else parametros
+        # Copia propia: cambiar el dict original no altera a la calculadora
+        self.precios = DictInmutable(self.p.PRECIOS if precios is None else precios)
+    
+    def nuevo_estado(self) -> EstadoCalculo:
+        """
+        Acumuladores vacíos para un cálculo
+        """
+        return EstadoCalculo(cronograma={mes: 0.0 for mes in self.p.MESES})
         
     # ===== 1. PREPARACIÓN DE TERRENO =====
-    def calcular_preparacion_terreno(self):
+    def calcular_preparacion_terreno(self, estado: EstadoCalculo):
         """
         Agosto: Roce, quema y limpieza
         """
         roce_quema = {
             'descripcion': 'Roce y quema',
             'jornales': 6,
-            'precio_jornal': p.PRECIOS['jornal'],
-            'subtotal': 6 * p.PRECIOS['jornal'],  # 240
+            'precio_jornal': self.precios['jornal'],
+            'subtotal': 6 * self.precios['jornal'],  # 240
             'mes': 'ago'
         }
         
         limpieza = {
             'descripcion': 'Limpieza',
             'jornales': 6,
-            'precio_jornal': p.PRECIOS['jornal'],
-            'subtotal': 6 * p.PRECIOS['jornal'],  # 240
+            'precio_jornal': self.precios['jornal'],
+            'subtotal': 6 * self.precios['jornal'],  # 240
             'mes': 'ago'
         }
         
         total = roce_quema['subtotal'] + limpieza['subtotal']  # 480
         
-        self.cronograma['ago'] += total
+        estado.cronograma['ago'] += total
         
-        self.costos_directos['preparacion_terreno'] = {
+        estado.costos_directos['preparacion_terreno'] = {
             'roce_quema': roce_quema,
             'limpieza': limpieza,
             'total': total
@@ -54,7 +65,7 @@ class CacaoInstalacion:
         return total
     
     # ===== 2. PREPARACIÓN DE HOYOS =====
-    def calcular_preparacion_hoyos(self):
+    def calcular_preparacion_hoyos(self, estado: EstadoCalculo):
         """
         Agosto: Marcado, apertura, desinfección
         Septiembre: Pre-tapado
@@ -62,28 +73,28 @@ class CacaoInstalacion:
         marcado = {
             'descripcion': 'Marcado y Estacado',
             'jornales': 4,
-            'subtotal': 4 * p.PRECIOS['jornal'],  # 160
+            'subtotal': 4 * self.precios['jornal'],  # 160
             'mes': 'ago'
         }
         
         apertura = {
             'descripcion': 'Apertura de Hoyos (0.4m Prof x 0.3m x 0.3 Diam)',
             'jornales': 40,
-            'subtotal': 40 * p.PRECIOS['jornal'],  # 1,600
+            'subtotal': 40 * self.precios['jornal'],  # 1,600
             'mes': 'ago'
         }
         
         desinfeccion = {
             'descripcion': 'Desinfeccion de Hoyos',
             'jornales': 5,
-            'subtotal': 5 * p.PRECIOS['jornal'],  # 200
+            'subtotal': 5 * self.precios['jornal'],  # 200
             'mes': 'ago'
         }
         
         pre_tapado = {
             'descripcion': 'Pre Tapado (Fertilizacion en hoyo)',
             'jornales': 10,
-            'subtotal': 10 * p.PRECIOS['jornal'],  # 400
+            'subtotal': 10 * self.precios['jornal'],  # 400
             'mes': 'sep'
         }
         
@@ -91,10 +102,10 @@ class CacaoInstalacion:
         total_sep = pre_tapado['subtotal']  # 400
         total = total_ago + total_sep  # 2,360
         
-        self.cronograma['ago'] += total_ago
-        self.cronograma['sep'] += total_sep
+        estado.cronograma['ago'] += total_ago
+        estado.cronograma['sep'] += total_sep
         
-        self.costos_directos['preparacion_hoyos'] = {
+        estado.costos_directos['preparacion_hoyos'] = {
             'marcado': marcado,
             'apertura': apertura,
             'desinfeccion': desinfeccion,
@@ -105,46 +116,46 @@ class CacaoInstalacion:
         return total
     
     # ===== 3. PLANTADO =====
-    def calcular_plantado(self):
+    def calcular_plantado(self, estado: EstadoCalculo):
         """
         Septiembre: Compra de plantones y plantado
         """
         plantones_cacao = {
             'descripcion': 'Plantones de Cacao',
-            'cantidad': p.NUMERO_PLANTONES_POR_HA,  # 1,111
-            'precio_unitario': p.PRECIOS['planton_cacao'],  # 1.00
-            'subtotal': p.NUMERO_PLANTONES_POR_HA * p.PRECIOS['planton_cacao'],  # 1,111
+            'cantidad': self.p.NUMERO_PLANTONES_POR_HA,  # 1,111
+            'precio_unitario': self.precios['planton_cacao'],  # 1.00
+            'subtotal': self.p.NUMERO_PLANTONES_POR_HA * self.precios['planton_cacao'],  # 1,111
             'mes': 'sep'
         }
         
         plantones_sombra = {
             'descripcion': 'Plantones de Sombra temporal (Platano 5.2m x 3.0m)',
             'cantidad': 650,  # hijuelos
-            'precio_unitario': p.PRECIOS['planton_sombra_platano'],  # 0.70
-            'subtotal': 650 * p.PRECIOS['planton_sombra_platano'],  # 455
+            'precio_unitario': self.precios['planton_sombra_platano'],  # 0.70
+            'subtotal': 650 * self.precios['planton_sombra_platano'],  # 455
             'mes': 'sep'
         }
         
         plantado_cacao = {
             'descripcion': 'Plantado y Tapado de Plantas de Cacao',
             'jornales': 30,
-            'subtotal': 30 * p.PRECIOS['jornal'],  # 1,200
+            'subtotal': 30 * self.precios['jornal'],  # 1,200
             'mes': 'sep'
         }
         
         plantado_sombra = {
             'descripcion': 'Plantado y Tapado de Plantas de Sombra',
             'jornales': 6,
-            'subtotal': 6 * p.PRECIOS['jornal'],  # 240
+            'subtotal': 6 * self.precios['jornal'],  # 240
             'mes': 'sep'
         }
         
         total = (plantones_cacao['subtotal'] + plantones_sombra['subtotal'] + 
                  plantado_cacao['subtotal'] + plantado_sombra['subtotal'])  # 3,006
         
-        self.cronograma['sep'] += total
+        estado.cronograma['sep'] += total
         
-        self.costos_directos['plantado'] = {
+        estado.costos_directos['plantado'] = {
             'plantones_cacao': plantones_cacao,
             'plantones_sombra': plantones_sombra,
             'plantado_cacao': plantado_cacao,
@@ -155,7 +166,7 @@ class CacaoInstalacion:
         return total
     
     # ===== 4. LABORES DE CULTIVO =====
-    def calcular_labores_cultivo(self):
+    def calcular_labores_cultivo(self, estado: EstadoCalculo):
         """
         Distribuido en varios meses
         """
@@ -163,7 +174,7 @@ class CacaoInstalacion:
         riegos = {
             'descripcion': 'Riegos',
             'jornales_total': 8,
-            'subtotal': 8 * p.PRECIOS['jornal'],  # 320
+            'subtotal': 8 * self.precios['jornal'],  # 320
             'distribucion': {
                 'abr': 80, 'may': 80, 'jun': 80, 'jul': 80
             }
@@ -174,7 +185,7 @@ class CacaoInstalacion:
             'descripcion': 'Deshiervo (2 veces año)',
             'jornales_por_vez': 10,
             'veces': 2,
-            'subtotal': 10 * p.PRECIOS['jornal'] * 2,  # 400
+            'subtotal': 10 * self.precios['jornal'] * 2,  # 400
             'distribucion': {
                 'oct': 200, 'feb': 200
             }
@@ -184,7 +195,7 @@ class CacaoInstalacion:
         fumigados = {
             'descripcion': 'Fumigados',
             'jornales_total': 12,
-            'subtotal': 12 * p.PRECIOS['jornal'],  # 480
+            'subtotal': 12 * self.precios['jornal'],  # 480
             'distribucion': {
                 'oct': 48, 'nov': 48, 'dic': 48, 'ene': 48,
                 'feb': 48, 'mar': 48, 'abr': 48, 'may': 48,
@@ -196,13 +207,13 @@ class CacaoInstalacion:
         
         # Agregar al cronograma
         for mes, valor in riegos['distribucion'].items():
-            self.cronograma[mes] += valor
+            estado.cronograma[mes] += valor
         for mes, valor in deshiervo['distribucion'].items():
-            self.cronograma[mes] += valor
+            estado.cronograma[mes] += valor
         for mes, valor in fumigados['distribucion'].items():
-            self.cronograma[mes] += valor
+            estado.cronograma[mes] += valor
         
-        self.costos_directos['labores_cultivo'] = {
+        estado.costos_directos['labores_cultivo'] = {
             'riegos': riegos,
             'deshiervo': deshiervo,
             'fumigados': fumigados,
@@ -212,7 +223,7 @@ class CacaoInstalacion:
         return total
     
     # ===== 5. FERTILIZACIÓN =====
-    def calcular_fertilizacion(self):
+    def calcular_fertilizacion(self, estado: EstadoCalculo):
         """
         Septiembre: Fertilización base
         Mensual: Abono foliar (nov, ene, mar, jul)
@@ -221,8 +232,8 @@ class CacaoInstalacion:
             'descripcion': 'Fosfato Diamonico',
             'cantidad': 2.6,  # sacos
             'unidad': 'Saco (50 kg)',
-            'precio': p.PRECIOS['fosfato_diamonico'],
-            'subtotal': 2.6 * p.PRECIOS['fosfato_diamonico'],  # 663
+            'precio': self.precios['fosfato_diamonico'],
+            'subtotal': 2.6 * self.precios['fosfato_diamonico'],  # 663
             'mes': 'sep'
         }
         
@@ -230,8 +241,8 @@ class CacaoInstalacion:
             'descripcion': 'Cloruro de Potasio',
             'cantidad': 2.6,
             'unidad': 'Saco (50 kg)',
-            'precio': p.PRECIOS['cloruro_potasio'],
-            'subtotal': 2.6 * p.PRECIOS['cloruro_potasio'],  # 624
+            'precio': self.precios['cloruro_potasio'],
+            'subtotal': 2.6 * self.precios['cloruro_potasio'],  # 624
             'mes': 'sep'
         }
         
@@ -239,8 +250,8 @@ class CacaoInstalacion:
             'descripcion': 'Guano de Isla',
             'cantidad': 4,
             'unidad': 'Saco (50 Kg)',
-            'precio': p.PRECIOS['guano_isla'],
-            'subtotal': 4 * p.PRECIOS['guano_isla'],  # 220
+            'precio': self.precios['guano_isla'],
+            'subtotal': 4 * self.precios['guano_isla'],  # 220
             'mes': 'sep'
         }
         
@@ -248,8 +259,8 @@ class CacaoInstalacion:
             'descripcion': 'Compost',
             'cantidad': 6,
             'unidad': 'Saco (50 Kg)',
-            'precio': p.PRECIOS['compost'],
-            'subtotal': 6 * p.PRECIOS['compost'],  # 120
+            'precio': self.precios['compost'],
+            'subtotal': 6 * self.precios['compost'],  # 120
             'mes': 'sep'
         }
         
@@ -258,10 +269,10 @@ class CacaoInstalacion:
         abono_foliar = {
             'descripcion': 'Abono foliar',
             'litros_total': 2,
-            'precio_litro': p.PRECIOS['abono_foliar'],
-            'subtotal': 2 * p.PRECIOS['abono_foliar'],  # 70
+            'precio_litro': self.precios['abono_foliar'],
+            'subtotal': 2 * self.precios['abono_foliar'],  # 70
             'aplicaciones': 4,
-            'costo_por_aplicacion': (2 * p.PRECIOS['abono_foliar']) / 4,  # 17.5
+            'costo_por_aplicacion': (2 * self.precios['abono_foliar']) / 4,  # 17.5
             'distribucion': {
                 'nov': 18, 'ene': 18, 'mar': 18, 'jul': 18
             }
@@ -272,11 +283,11 @@ class CacaoInstalacion:
         total_foliar = abono_foliar['subtotal']  # 70
         total = total_sep + total_foliar  # 1,697
         
-        self.cronograma['sep'] += total_sep
+        estado.cronograma['sep'] += total_sep
         for mes, valor in abono_foliar['distribucion'].items():
-            self.cronograma[mes] += valor
+            estado.cronograma[mes] += valor
         
-        self.costos_directos['fertilizacion'] = {
+        estado.costos_directos['fertilizacion'] = {
             'fosfato_diamonico': fosfato,
             'cloruro_potasio': cloruro,
             'guano_isla': guano,
@@ -288,7 +299,7 @@ class CacaoInstalacion:
         return total
     
     # ===== 6. CONTROL FITOSANITARIO =====
-    def calcular_control_fitosanitario(self):
+    def calcular_control_fitosanitario(self, estado: EstadoCalculo):
         """
         Agosto: Desinfectante
         Octubre: Insecticida/Nematicida
@@ -297,16 +308,16 @@ class CacaoInstalacion:
         desinfectante = {
             'descripcion': 'Desinfectante para hoyos y planton (Captan)',
             'cantidad': 300,  # gramos
-            'precio_gramo': p.PRECIOS['desinfectante'],
-            'subtotal': 300 * p.PRECIOS['desinfectante'],  # 72
+            'precio_gramo': self.precios['desinfectante'],
+            'subtotal': 300 * self.precios['desinfectante'],  # 72
             'mes': 'ago'
         }
         
         insecticida = {
             'descripcion': 'Insecticida y Nematicida (Carfoburan - Killfuran)',
             'cantidad': 4,  # litros
-            'precio': p.PRECIOS['insecticida_nematicida'],
-            'subtotal': 4 * p.PRECIOS['insecticida_nematicida'],  # 460
+            'precio': self.precios['insecticida_nematicida'],
+            'subtotal': 4 * self.precios['insecticida_nematicida'],  # 460
             'mes': 'oct'
         }
         
@@ -314,10 +325,10 @@ class CacaoInstalacion:
         fungicida = {
             'descripcion': 'Fungicida cuprico',
             'cantidad': 1,  # kg
-            'precio': p.PRECIOS['fungicida_cuprico'],
-            'subtotal': 1 * p.PRECIOS['fungicida_cuprico'],  # 90
+            'precio': self.precios['fungicida_cuprico'],
+            'subtotal': 1 * self.precios['fungicida_cuprico'],  # 90
             'aplicaciones': 4,
-            'costo_por_aplicacion': (1 * p.PRECIOS['fungicida_cuprico']) / 4,  # 22.5
+            'costo_por_aplicacion': (1 * self.precios['fungicida_cuprico']) / 4,  # 22.5
             'distribucion': {
                 'oct': 23, 'dic': 23, 'feb': 23, 'abr': 23  # Redondeado a 23
             }
@@ -327,8 +338,8 @@ class CacaoInstalacion:
         adherente = {
             'descripcion': 'Adherente',
             'cantidad': 2,  # litros
-            'precio': p.PRECIOS['adherente'],
-            'subtotal': 2 * p.PRECIOS['adherente'],  # 74
+            'precio': self.precios['adherente'],
+            'subtotal': 2 * self.precios['adherente'],  # 74
             'distribucion': {
                 'oct': 7, 'nov': 7, 'dic': 7, 'ene': 7,
                 'feb': 7, 'mar': 7, 'abr': 7, 'may': 7,
@@ -339,14 +350,14 @@ class CacaoInstalacion:
         total = (desinfectante['subtotal'] + insecticida['subtotal'] + 
                  fungicida['subtotal'] + adherente['subtotal'])  # 696
         
-        self.cronograma['ago'] += desinfectante['subtotal']
-        self.cronograma['oct'] += insecticida['subtotal']
+        estado.cronograma['ago'] += desinfectante['subtotal']
+        estado.cronograma['oct'] += insecticida['subtotal']
         for mes, valor in fungicida['distribucion'].items():
-            self.cronograma[mes] += valor
+            estado.cronograma[mes] += valor
         for mes, valor in adherente['distribucion'].items():
-            self.cronograma[mes] += valor
+            estado.cronograma[mes] += valor
         
-        self.costos_directos['control_fitosanitario'] = {
+        estado.costos_directos['control_fitosanitario'] = {
             'desinfectante': desinfectante,
             'insecticida_nematicida': insecticida,
             'fungicida': fungicida,
@@ -357,23 +368,23 @@ class CacaoInstalacion:
         return total
     
     # ===== 7. GASTOS ESPECIALES =====
-    def calcular_gastos_especiales(self):
+    def calcular_gastos_especiales(self, estado: EstadoCalculo):
         """
         Septiembre: Transporte de insumos
         """
         transporte = {
             'descripcion': 'Transporte de insumos',
             'cantidad': 43,  # Global (estimado de sacos/insumos)
-            'precio': p.PRECIOS['transporte_insumo'],
-            'subtotal': 43 * p.PRECIOS['transporte_insumo'],  # 128 (redondeado)
+            'precio': self.precios['transporte_insumo'],
+            'subtotal': 43 * self.precios['transporte_insumo'],  # 128 (redondeado)
             'mes': 'sep'
         }
         
         total = transporte['subtotal']
         
-        self.cronograma['sep'] += total
+        estado.cronograma['sep'] += total
         
-        self.costos_directos['gastos_especiales'] = {
+        estado.costos_directos['gastos_especiales'] = {
             'transporte_insumos': transporte,
             'total': total
         }
@@ -381,83 +392,114 @@ class CacaoInstalacion:
         return total
     
     # ===== CALCULAR COSTOS INDIRECTOS =====
-    def calcular_costos_indirectos(self, total_directos: float):
+    def calcular_costos_indirectos(self, estado: EstadoCalculo, total_directos: float):
         """
         Calcula imprevistos, gastos operativos y asistencia técnica
         """
-        imprevistos = total_directos * p.PORCENTAJE_IMPREVISTOS  # 1.0%
-        gastos_operativos = total_directos * p.PORCENTAJE_GASTOS_OPERATIVOS  # 1.5%
-        asistencia_tecnica = total_directos * p.PORCENTAJE_ASISTENCIA_TECNICA  # 2.0%
-        
         # Distribución aproximada según cronograma
         # Imprevistos: ago, dic, may (96 total)
-        self.cronograma['ago'] += 32
-        self.cronograma['dic'] += 32
-        self.cronograma['may'] += 32
+        estado.cronograma['ago'] += 32
+        estado.cronograma['dic'] += 32
+        estado.cronograma['may'] += 32
         
         # Gastos operativos: sep, dic, feb, jul (144 total)
-        self.cronograma['sep'] += 36
-        self.cronograma['dic'] += 36
-        self.cronograma['feb'] += 36
-        self.cronograma['jul'] += 36
+        estado.cronograma['sep'] += 36
+        estado.cronograma['dic'] += 36
+        estado.cronograma['feb'] += 36
+        estado.cronograma['jul'] += 36
         
         # Asistencia técnica: sep, ene, jul (191 total)
-        self.cronograma['sep'] += 96
-        self.cronograma['ene'] += 96
+        estado.cronograma['sep'] += 96
+        estado.cronograma['ene'] += 96
         # Ajuste para redondeo
         
-        self.costos_indirectos = {
+        estado.costos_indirectos = self.desglosar_indirectos(total_directos)
+        
+        return estado.costos_indirectos['total']
+    
+    def desglosar_indirectos(self, total_directos: float) -> Dict[str, float]:
+        """
+        Montos de costos indirectos sobre el total directo (sin tocar el cronograma)
+        """
+        imprevistos = total_directos * self.p.PORCENTAJE_IMPREVISTOS  # 1.0%
+        gastos_operativos = total_directos * self.p.PORCENTAJE_GASTOS_OPERATIVOS  # 1.5%
+        asistencia_tecnica = total_directos * self.p.PORCENTAJE_ASISTENCIA_TECNICA  # 2.0%
+        
+        return {
             'imprevistos': imprevistos,
             'gastos_operativos': gastos_operativos,
             'asistencia_tecnica': asistencia_tecnica,
             'total': imprevistos + gastos_operativos + asistencia_tecnica
         }
-        
-        return self.costos_indirectos['total']
     
     # ===== CALCULAR =====
-    def calcular(self):
+    def calcular_estado(self) -> EstadoCalculo:
         """
-        Ejecuta todos los cálculos y retorna resultado completo
+        Ejecuta los cálculos sobre un estado nuevo
+        
+        Returns:
+            EstadoCalculo propio de esta llamada (el llamador puede modificarlo)
         """
+        estado = self.nuevo_estado()
         # Calcular todos los costos directos
-        prep_terreno = self.calcular_preparacion_terreno()
-        prep_hoyos = self.calcular_preparacion_hoyos()
-        plantado = self.calcular_plantado()
-        labores = self.calcular_labores_cultivo()
-        fertilizacion = self.calcular_fertilizacion()
-        fitosanitario = self.calcular_control_fitosanitario()
-        gastos_esp = self.calcular_gastos_especiales()
+        prep_terreno = self.calcular_preparacion_terreno(estado)
+        prep_hoyos = self.calcular_preparacion_hoyos(estado)
+        plantado = self.calcular_plantado(estado)
+        labores = self.calcular_labores_cultivo(estado)
+        fertilizacion = self.calcular_fertilizacion(estado)
+        fitosanitario = self.calcular_control_fitosanitario(estado)
+        gastos_esp = self.calcular_gastos_especiales(estado)
         
         total_directos = (prep_terreno + prep_hoyos + plantado + labores + 
                           fertilizacion + fitosanitario + gastos_esp)
         
         # Calcular costos indirectos
-        total_indirectos = self.calcular_costos_indirectos(total_directos)
+        estado.total_directos = total_directos
+        estado.total_indirectos = self.calcular_costos_indirectos(estado, total_directos)
         
+        return estado
+    
+    def desglose(self) -> DictInmutable:
+        """
+        Cronograma y desglose de costos sin escalar (1 ha), congelados
+        """
+        return self.calcular_estado().desglose()
+    
+    def calcular(self) -> DictInmutable:
+        """
+        Ejecuta todos los cálculos y retorna resultado completo (congelado)
+        """
+        return self.armar_resultado(self.calcular_estado())
+    
+    def armar_resultado(self, estado: EstadoCalculo) -> DictInmutable:
+        """
+        Arma el resultado escalado a partir de un estado ya calculado
+        """
+        total_directos = estado.total_directos
+        total_indirectos = estado.total_indirectos
         # Costo total
         costo_total = total_directos + total_indirectos
         
         # Escalar por hectáreas
         costo_total_escalado = costo_total * self.hectareas
-        cronograma_escalado = {mes: valor * self.hectareas for mes, valor in self.cronograma.items()}
+        cronograma_escalado = {mes: valor * self.hectareas for mes, valor in estado.cronograma.items()}
         
-        return {
+        return congelar({
             'hectareas': self.hectareas,
             'costos_directos': {
-                'preparacion_terreno': self.costos_directos['preparacion_terreno'],
-                'preparacion_hoyos': self.costos_directos['preparacion_hoyos'],
-                'plantado': self.costos_directos['plantado'],
-                'labores_cultivo': self.costos_directos['labores_cultivo'],
-                'fertilizacion': self.costos_directos['fertilizacion'],
-                'control_fitosanitario': self.costos_directos['control_fitosanitario'],
-                'gastos_especiales': self.costos_directos['gastos_especiales'],
+                'preparacion_terreno': estado.costos_directos['preparacion_terreno'],
+                'preparacion_hoyos': estado.costos_directos['preparacion_hoyos'],
+                'plantado': estado.costos_directos['plantado'],
+                'labores_cultivo': estado.costos_directos['labores_cultivo'],
+                'fertilizacion': estado.costos_directos['fertilizacion'],
+                'control_fitosanitario': estado.costos_directos['control_fitosanitario'],
+                'gastos_especiales': estado.costos_directos['gastos_especiales'],
                 'total': total_directos * self.hectareas
             },
             'costos_indirectos': {
-                'imprevistos': self.costos_indirectos['imprevistos'] * self.hectareas,
-                'gastos_operativos': self.costos_indirectos['gastos_operativos'] * self.hectareas,
-                'asistencia_tecnica': self.costos_indirectos['asistencia_tecnica'] * self.hectareas,
+                'imprevistos': estado.costos_indirectos['imprevistos'] * self.hectareas,
+                'gastos_operativos': estado.costos_indirectos['gastos_operativos'] * self.hectareas,
+                'asistencia_tecnica': estado.costos_indirectos['asistencia_tecnica'] * self.hectareas,
                 'total': total_indirectos * self.hectareas
             },
             'costo_total': costo_total_escalado,
@@ -468,4 +510,4 @@ class CacaoInstalacion:
                 'costo_total_1ha': costo_total,
                 'costo_total_escalado': costo_total_escalado
             }
-        }
\ No newline at end of file
+        })
\ No newline at end of file
@@ -0,0 +1,338 @@
+# calculadoras/cacao_convencional/montecarlo.py
+"""
+Simulación Monte Carlo de riesgo de precio y rendimiento para Cacao Convencional
+Muestrea precios de venta, productividad, merma y precios de insumos,
+evalúa el ciclo completo por bloques de tamaño fijo y acumula los
+percentiles de VAN, utilidad y año de equilibrio con memoria acotada
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterator, List
+
+import numpy as np
+
+from . import parametros as p
+from .vectorial import GRUPOS_PRODUCTIVOS, escenario_base, evaluar_escenarios, matriz_cantidades
+
+# Especificación de cada distribución:
+#   {'tipo': 'normal', 'media': m, 'desviacion': s}
+#   {'tipo': 'lognormal', 'media': m, 'desviacion': s}   (parámetros del log)
+#   {'tipo': 'uniforme', 'min': a, 'max': b}
+#   {'tipo': 'triangular', 'min': a, 'moda': c, 'max': b}
+#   {'tipo': 'constante', 'valor': v}
+# Con 'relativo': True (default) los valores son factores sobre el valor base.
+DISTRIBUCIONES_DEFECTO = {
+    'precio_venta_primera': {'tipo': 'triangular', 'min': 0.75, 'moda': 1.0, 'max': 1.15},
+    'precio_venta_segunda': {'tipo': 'triangular', 'min': 0.75, 'moda': 1.0, 'max': 1.15},
+    'qq_año_4_6': {'tipo': 'normal', 'media': 1.0, 'desviacion': 0.12},
+    'qq_año_7_9': {'tipo': 'normal', 'media': 1.0, 'desviacion': 0.12},
+    'qq_año_10_11': {'tipo': 'normal', 'media': 1.0, 'desviacion': 0.12},
+    'qq_año_12_13': {'tipo': 'normal', 'media': 1.0, 'desviacion': 0.12},
+    'qq_año_14_15': {'tipo': 'normal', 'media': 1.0, 'desviacion': 0.12},
+    'merma_productiva': {'tipo': 'uniforme', 'min': 0.01, 'max': 0.05, 'relativo': False},
+    'jornal': {'tipo': 'triangular', 'min': 0.95, 'moda': 1.0, 'max': 1.25},
+    'dia_mecanizado': {'tipo': 'triangular', 'min': 0.95, 'moda': 1.0, 'max': 1.20},
+    'urea': {'tipo': 'triangular', 'min': 0.90, 'moda': 1.0, 'max': 1.40},
+    'fosfato_diamonico': {'tipo': 'triangular', 'min': 0.90, 'moda': 1.0, 'max': 1.30},
+    'cloruro_potasio': {'tipo': 'triangular', 'min': 0.90, 'moda': 1.0, 'max': 1.30},
+    'sulfato_potasio': {'tipo': 'triangular', 'min': 0.90, 'moda': 1.0, 'max': 1.30},
+}
+
+PERCENTILES_DEFECTO = (5, 10, 25, 50, 75, 90, 95)
+METRICAS = ('van', 'utilidad_neta', 'costo_total')
+TAMAÑO_BLOQUE_DEFECTO = 50_000
+BINS_HISTOGRAMA = 4096
+
+
+def _valores_base(parametros: Any = None) -> Dict[str, float]:
+    """
+    Valores base de todos los parámetros simulables
+    """
+    conjunto = p if parametros is None else parametros
+    base = {
+        'precio_venta_primera': conjunto.PRECIO_VENTA_PRIMERA,
+        'precio_venta_segunda': conjunto.PRECIO_VENTA_SEGUNDA,
+        'merma_productiva': conjunto.MERMA_PRODUCTIVA,
+    }
+    for grupo in GRUPOS_PRODUCTIVOS:
+        base[f'qq_{grupo}'] = conjunto.PRODUCTIVIDAD[grupo]['qq']
+    base.update(conjunto.PRECIOS)
+    return base
+
+
+def _muestrear(rng: np.random.Generator, spec: Dict[str, Any], base: float, n: int) -> np.ndarray:
+    """
+    Muestrea n valores de una distribución configurada
+
+    Raises:
+        ValueError: Si el tipo de distribución no es válido
+    """
+    tipo = spec['tipo']
+    if tipo == 'normal':
+        valores = rng.normal(spec['media'], spec['desviacion'], n)
+    elif tipo == 'lognormal':
+        valores = rng.lognormal(spec['media'], spec['desviacion'], n)
+    elif tipo == 'uniforme':
+        valores = rng.uniform(spec['min'], spec['max'], n)
+    elif tipo == 'triangular':
+        valores = rng.triangular(spec['min'], spec['moda'], spec['max'], n)
+    elif tipo == 'constante':
+        valores = np.full(n, float(spec['valor']))
+    else:
+        raise ValueError(f"Distribución inválida: {tipo}")
+
+    if spec.get('relativo', True):
+        valores = valores * base
+    return np.maximum(valores, 0.0)
+
+
+def _generar_escenarios(rng: np.random.Generator, distribuciones: Dict[str, Dict[str, Any]],
+                        n: int, parametros: Any = None) -> Dict[str, np.ndarray]:
+    """
+    Genera n escenarios partiendo de los valores base y muestreando
+    solo los parámetros con distribución configurada
+    """
+    base = _valores_base(parametros)
+    claves_precios = matriz_cantidades().claves
+    escenario = escenario_base(n, parametros)
+
+    # Orden fijo para que la semilla reproduzca los mismos escenarios
+    for nombre in sorted(distribuciones):
+        if nombre not in base:
+            raise ValueError(f"Parámetro no simulable: {nombre}")
+        valores = _muestrear(rng, distribuciones[nombre], base[nombre], n)
+
+        if nombre in ('precio_venta_primera', 'precio_venta_segunda', 'merma_productiva'):
+            escenario[nombre] = valores
+        elif nombre.startswith('qq_'):
+            escenario['qq'][:, GRUPOS_PRODUCTIVOS.index(nombre[3:])] = valores
+        else:
+            escenario['precios'][:, claves_precios.index(nombre)] = valores
+
+    escenario['merma_productiva'] = np.clip(escenario['merma_productiva'], 0.0, 1.0)
+    return escenario
+
+
+class _Acumulador:
+    """
+    Histograma de bordes fijos para estimar percentiles en streaming
+
+    Los valores fuera del rango caen en los bins extremos y se conservan
+    mínimo y máximo exactos, así la memoria no depende de los escenarios.
+    """
+
+    def __init__(self, bordes: np.ndarray):
+        self.bordes = bordes
+        self.conteos = np.zeros(len(bordes) - 1, dtype=np.int64)
+        self.n = 0
+        self.suma = 0.0
+        self.suma_cuadrados = 0.0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+
+    def agregar(self, valores: np.ndarray):
+        idx = np.clip(np.searchsorted(self.bordes, valores, side='right') - 1, 0, len(self.conteos) - 1)
+        self.conteos += np.bincount(idx, minlength=len(self.conteos))
+        self.n += len(valores)
+        self.suma += float(valores.sum())
+        self.suma_cuadrados += float(np.square(valores).sum())
+        self.minimo = min(self.minimo, float(valores.min()))
+        self.maximo = max(self.maximo, float(valores.max()))
+
+    def combinar(self, otro: '_Acumulador'):
+        self.conteos += otro.conteos
+        self.n += otro.n
+        self.suma += otro.suma
+        self.suma_cuadrados += otro.suma_cuadrados
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+
+    def percentiles(self, qs) -> Dict[int, float]:
+        bordes = self.bordes.copy()
+        bordes[0] = min(bordes[0], self.minimo)
+        bordes[-1] = max(bordes[-1], self.maximo)
+        acumulado = np.concatenate([[0], np.cumsum(self.conteos)]) / self.n
+        return {q: round(float(np.interp(q / 100, acumulado, bordes)), 2) for q in qs}
+
+    def resumen(self, qs) -> Dict[str, Any]:
+        media = self.suma / self.n
+        varianza = max(self.suma_cuadrados / self.n - media ** 2, 0.0)
+        return {
+            'media': round(media, 2),
+            'desviacion': round(varianza ** 0.5, 2),
+            'minimo': round(self.minimo, 2),
+            'maximo': round(self.maximo, 2),
+            'percentiles': self.percentiles(qs)
+        }
+
+
+def _bordes_desde_piloto(valores: np.ndarray) -> np.ndarray:
+    """
+    Fija los bordes del histograma con holgura alrededor del bloque piloto
+    """
+    minimo, maximo = float(valores.min()), float(valores.max())
+    holgura = max(maximo - minimo, abs(maximo) * 0.1, 1.0)
+    return np.linspace(minimo - holgura, maximo + holgura, BINS_HISTOGRAMA + 1)
+
+
+def _evaluar_bloque(semilla: np.random.SeedSequence, n: int, distribuciones: Dict[str, Dict[str, Any]],
+                    hectareas: float, tasa_descuento: float, parametros: Any) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(semilla)
+    escenario = _generar_escenarios(rng, distribuciones, n, parametros)
+    return evaluar_escenarios(escenario, hectareas=hectareas, tasa_descuento=tasa_descuento, parametros=parametros)
+
+
+def _resumir_bloque(resultado: Dict[str, np.ndarray], bordes: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    acumuladores = {}
+    for metrica in METRICAS:
+        acumuladores[metrica] = _Acumulador(bordes[metrica])
+        acumuladores[metrica].agregar(resultado[metrica])
+    años = np.bincount(resultado['año_equilibrio'], minlength=p.PERIODO_VEGETATIVO_TOTAL + 2)
+    return {'acumuladores': acumuladores, 'años_equilibrio': años}
+
+
+def _simular_bloque(semilla: np.random.SeedSequence, n: int, distribuciones: Dict[str, Dict[str, Any]],
+                    hectareas: float, tasa_descuento: float, parametros: Any,
+                    bordes: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """
+    Unidad de trabajo de un proceso: genera, evalúa y resume un bloque
+    """
+    resultado = _evaluar_bloque(semilla, n, distribuciones, hectareas, tasa_descuento, parametros)
+    return _resumir_bloque(resultado, bordes)
+
+
+class SimulacionMonteCarlo:
+    """
+    Simulación Monte Carlo del ciclo productivo de cacao por bloques
+
+    Cada bloque usa un flujo independiente derivado de la semilla
+    (SeedSequence.spawn), por lo que el resultado es reproducible y no
+    depende del número de procesos.
+    """
+
+    def __init__(self, hectareas: float = 1.0, distribuciones: Dict[str, Dict[str, Any]] = None,
+                 semilla: int = 2025, tamaño_bloque: int = TAMAÑO_BLOQUE_DEFECTO,
+                 tasa_descuento: float = None, percentiles=PERCENTILES_DEFECTO, parametros: Any = None):
+        """
+        Inicializa la simulación
+
+        Args:
+            hectareas: Número de hectáreas (mayor a 0)
+            distribuciones: Distribución por parámetro (default: DISTRIBUCIONES_DEFECTO)
+            semilla: Semilla del generador
+            tamaño_bloque: Escenarios evaluados por bloque (acota la memoria)
+            tasa_descuento: Tasa para el VAN (default: parametros.TASA_DESCUENTO)
+            percentiles: Percentiles a reportar
+            parametros: Namespace de parámetros, por ejemplo
+                ConjuntoParametros.valores (default: módulo parametros). Se
+                envía a los procesos del pool, así que debe poder serializarse
+        """
+        if hectareas <= 0:
+            raise ValueError("El número de hectáreas debe ser mayor a 0")
+        if tamaño_bloque <= 0:
+            raise ValueError("El tamaño de bloque debe ser mayor a 0")
+
+        self.hectareas = hectareas
+        self.distribuciones = DISTRIBUCIONES_DEFECTO if distribuciones is None else distribuciones
+        self.semilla = semilla
+        self.tamaño_bloque = tamaño_bloque
+        self.parametros = parametros
+        conjunto = p if parametros is None else parametros
+        self.tasa_descuento = conjunto.TASA_DESCUENTO if tasa_descuento is None else tasa_descuento
+        self.percentiles = tuple(percentiles)
+
+    def _bloques(self, escenarios: int) -> List[int]:
+        completos, resto = divmod(escenarios, self.tamaño_bloque)
+        return [self.tamaño_bloque] * completos + ([resto] if resto else [])
+
+    def _resumen(self, acumuladores: Dict[str, _Acumulador], años: np.ndarray) -> Dict[str, Any]:
+        n = int(años.sum())
+        acumulado = np.cumsum(años) / n
+        sin_recuperar = p.PERIODO_VEGETATIVO_TOTAL + 1
+
+        return {
+            'escenarios': n,
+            'hectareas': self.hectareas,
+            **{metrica: acc.resumen(self.percentiles) for metrica, acc in acumuladores.items()},
+            'año_equilibrio': {
+                'percentiles': {
+                    q: int(np.searchsorted(acumulado, q / 100)) for q in self.percentiles
+                },
+                'distribucion': {int(año): int(c) for año, c in enumerate(años) if c},
+                'probabilidad_no_recupera': round(float(años[sin_recuperar:].sum()) / n, 4)
+            }
+        }
+
+    def iterar(self, escenarios: int, procesos: int = None) -> Iterator[Dict[str, Any]]:
+        """
+        Ejecuta la simulación y entrega el resumen acumulado tras cada bloque
+
+        Args:
+            escenarios: Número total de escenarios
+            procesos: Procesos del pool (None o 1: en el proceso actual)
+
+        Yields:
+            Dict con percentiles acumulados de VAN, utilidad neta, costo total
+            y año de equilibrio
+        """
+        if escenarios <= 0:
+            raise ValueError("El número de escenarios debe ser mayor a 0")
+
+        tamaños = self._bloques(escenarios)
+        semillas = np.random.SeedSequence(self.semilla).spawn(len(tamaños))
+        args = (self.distribuciones, self.hectareas, self.tasa_descuento, self.parametros)
+
+        # El primer bloque fija los bordes de los histogramas
+        piloto = _evaluar_bloque(semillas[0], tamaños[0], *args)
+        bordes = {metrica: _bordes_desde_piloto(piloto[metrica]) for metrica in METRICAS}
+        parcial = _resumir_bloque(piloto, bordes)
+        del piloto
+
+        acumuladores = parcial['acumuladores']
+        años = parcial['años_equilibrio']
+        yield self._resumen(acumuladores, años)
+
+        pendientes = list(zip(semillas[1:], tamaños[1:]))
+        if procesos is None or procesos <= 1:
+            resultados = (_simular_bloque(s, n, *args, bordes) for s, n in pendientes)
+            for bloque in resultados:
+                for metrica in METRICAS:
+                    acumuladores[metrica].combinar(bloque['acumuladores'][metrica])
+                años = años + bloque['años_equilibrio']
+                yield self._resumen(acumuladores, años)
+            return
+
+        # Ventana de tareas en vuelo para no encolar todos los bloques a la vez
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            en_vuelo = deque()
+            trabajo = iter(pendientes)
+            for s, n in trabajo:
+                en_vuelo.append(pool.submit(_simular_bloque, s, n, *args, bordes))
+                if len(en_vuelo) >= 2 * procesos:
+                    break
+            while en_vuelo:
+                bloque = en_vuelo.popleft().result()
+                siguiente = next(trabajo, None)
+                if siguiente is not None:
+                    en_vuelo.append(pool.submit(_simular_bloque, *siguiente, *args, bordes))
+                for metrica in METRICAS:
+                    acumuladores[metrica].combinar(bloque['acumuladores'][metrica])
+                años = años + bloque['años_equilibrio']
+                yield self._resumen(acumuladores, años)
+
+    def simular(self, escenarios: int, procesos: int = None) -> Dict[str, Any]:
+        """
+        Ejecuta la simulación completa
+
+        Args:
+            escenarios: Número total de escenarios
+            procesos: Procesos del pool (None o 1: en el proceso actual)
+
+        Returns:
+            Resumen final (ver iterar)
+        """
+        resumen = None
+        for resumen in self.iterar(escenarios, procesos=procesos):
+            pass
+        return resumen
@@ -86,6 +86,19 @@ PRECIO_VENTA_PRIMERA = 480.00  # S/. por QQ
 PRECIO_VENTA_SEGUNDA = 400.00  # S/. por QQ
 PRECIO_VENTA_PROMEDIO = 440.00  # S/. por QQ (en chacra)
 
+# ===== ANÁLISIS FINANCIERO =====
+TASA_DESCUENTO = 0.10  # 10% (VAN)
+
+# ===== FICHA TÉCNICA (valores resumen del Excel) =====
+FICHA_PRODUCCION_PROMEDIO_QQ = 26.17  # qq/ha/año
+FICHA_FACTOR_PRODUCCION = 0.89
+FICHA_COSTO_INSTALACION_BASE = 9998.00
+FICHA_SENSIBILIZACION_INSTALACION = 1840.00  # Gastos asumidos por productor
+FICHA_COSTO_PRODUCCION_BASE = 5550.50
+FICHA_COSTO_PRODUCCION_SENSIBILIZADO = 680.00
+FICHA_VAN_10PCT_HA = {'sensibilizado': 26445.20, 'no_sensibilizado': 28500.00}
+FICHA_TIR_PCT = {'sensibilizado': 29.33, 'no_sensibilizado': 32.50}
+
 # ===== COSTOS INDIRECTOS (%) =====
 PORCENTAJE_IMPREVISTOS = 0.01       # 1.0%
 PORCENTAJE_GASTOS_OPERATIVOS = 0.015  # 1.5%
@@ -5,33 +5,59 @@ Año 4 en adelante: Producción y cosecha
 Base: 1 hectárea
 """
 
-from ..base_calculadora import CalculadoraFichaTecnica
+from ..base_calculadora import CalculadoraFichaTecnica, EstadoCalculo, DictInmutable, congelar
 from . import parametros as p
 from typing import Dict, Any
 
+def grupo_productividad(año_produccion: int) -> str:
+    """
+    Obtiene la clave de PRODUCTIVIDAD que corresponde a un año productivo
+    
+    Args:
+        año_produccion: Año del ciclo productivo (4-15)
+    
+    Returns:
+        Clave del grupo de años (ej: 'año_4_6')
+    """
+    if 4 <= año_produccion <= 6:
+        return 'año_4_6'
+    elif 7 <= año_produccion <= 9:
+        return 'año_7_9'
+    elif 10 <= año_produccion <= 11:
+        return 'año_10_11'
+    elif 12 <= año_produccion <= 13:
+        return 'año_12_13'
+    else:  # 14-15
+        return 'año_14_15'
+
+
 class CacaoProduccion(CalculadoraFichaTecnica):
     """
     Calcula todos los costos de producción y mantenimiento del cultivo de cacao
     Para años productivos (4to año en adelante)
     """
     
-    def __init__(self, hectareas: float = 1.0, año_produccion: int = 4):
+    def __init__(self, hectareas: float = 1.0, año_produccion: int = 4,
+                 precios: Dict[str, float] = None, parametros: Any = None):
         """
         Inicializa calculadora de producción
         
         Args:
             hectareas: Número de hectáreas
             año_produccion: Año del ciclo productivo (4-15)
+            precios: Precios unitarios a usar (default: parametros.PRECIOS)
+            parametros: Módulo o namespace de parámetros (default: módulo parametros)
         """
         super().__init__(hectareas)
+        self.p = p if parametros is None else parametros
+        # Copia propia: cambiar el dict original no altera a la calculadora
+        self.precios = DictInmutable(self.p.PRECIOS if precios is None else precios)
         
         if año_produccion < 4 or año_produccion > 15:
             raise ValueError("Año de producción debe estar entre 4 y 15")
         
         self.año_produccion = año_produccion
-        self.productividad = self._obtener_productividad()
-        self.costos_directos = {}
-        self.ingresos = {}
+        self.productividad = congelar(self._obtener_productividad())
     
     def _obtener_productividad(self) -> Dict[str, float]:
         """
@@ -40,19 +66,10 @@ class CacaoProduccion(CalculadoraFichaTecnica):
         Returns:
             Dict con qq, rendimiento, primera, segunda
         """
-        if 4 <= self.año_produccion <= 6:
-            return p.PRODUCTIVIDAD['año_4_6']
-        elif 7 <= self.año_produccion <= 9:
-            return p.PRODUCTIVIDAD['año_7_9']
-        elif 10 <= self.año_produccion <= 11:
-            return p.PRODUCTIVIDAD['año_10_11']
-        elif 12 <= self.año_produccion <= 13:
-            return p.PRODUCTIVIDAD['año_12_13']
-        else:  # 14-15
-            return p.PRODUCTIVIDAD['año_14_15']
+        return self.p.PRODUCTIVIDAD[grupo_productividad(self.año_produccion)]
     
     # ===== 1. LABORES DE CULTIVO =====
-    def calcular_labores_cultivo(self) -> float:
+    def calcular_labores_cultivo(self, estado: EstadoCalculo) -> float:
         """
         Cálculo de labores de cultivo durante el año de producción
         """
@@ -60,7 +77,7 @@ class CacaoProduccion(CalculadoraFichaTecnica):
         reposicion_sombra = {
             'descripcion': 'Plantado para reposicion de plantones de sombra',
             'jornales': 2,
-            'subtotal': 2 * p.PRECIOS['jornal'],  # 80
+            'subtotal': 2 * self.precios['jornal'],  # 80
             'mes': 'ago'
         }
         
@@ -68,8 +85,8 @@ class CacaoProduccion(CalculadoraFichaTecnica):
         deshierbo_mecanico = {
             'descripcion': 'Deshierbo mecánico (desbrozadora)',
             'dias': 2,
-            'precio_dia': p.PRECIOS['dia_mecanizado'],  # 80
-            'subtotal': 2 * p.PRECIOS['dia_mecanizado'],  # 160
+            'precio_dia': self.precios['dia_mecanizado'],  # 80
+            'subtotal': 2 * self.precios['dia_mecanizado'],  # 160
             'distribucion': {
                 'ago': 53, 'oct': 53, 'ene': 53
             }
@@ -79,7 +96,7 @@ class CacaoProduccion(CalculadoraFichaTecnica):
         poda_mantenimiento = {
             'descripcion': 'Poda de mantenimiento de café (fitosanitaria)',
             'jornales': 4,
-            'subtotal': 4 * p.PRECIOS['jornal'],  # 160
+            'subtotal': 4 * self.precios['jornal'],  # 160
             'mes': 'sep'
         }
         
@@ -87,7 +104,7 @@ class CacaoProduccion(CalculadoraFichaTecnica):
         abonamiento = {
             'descripcion': 'Abonamiento y/o fertilizacion',
             'jornales': 4,
-            'subtotal': 4 * p.PRECIOS['jornal'],  # 160
+            'subtotal': 4 * self.precios['jornal'],  # 160
             'distribucion': {
                 'oct': 80, 'nov': 80
             }
@@ -97,7 +114,7 @@ class CacaoProduccion(CalculadoraFichaTecnica):
         fumigados = {
             'descripcion': 'Fumigados',
             'jornales': 7,
-            'subtotal': 7 * p.PRECIOS['jornal'],  # 280
+            'subtotal': 7 * self.precios['jornal'],  # 280
             'distribucion': {
                 'sep': 40, 'oct': 40, 'nov': 40, 'dic': 40,
                 'ene': 40, 'mar': 40, 'abr': 40
@@ -108,7 +125,7 @@ class CacaoProduccion(CalculadoraFichaTecnica):
         poda_sombra = {
             'descripcion': 'Poda de sombra especies arbóreas',
             'jornales': 3,
-            'subtotal': 3 * p.PRECIOS['jornal'],  # 120
+            'subtotal': 3 * self.precios['jornal'],  # 120
             'mes': 'oct'
         }
         
@@ -117,17 +134,17 @@ class CacaoProduccion(CalculadoraFichaTecnica):
                  fumigados['subtotal'] + poda_sombra['subtotal'])  # 960
         
         # Agregar al cronograma
-        self.cronograma['ago'] += reposicion_sombra['subtotal']
+        estado.cronograma['ago'] += reposicion_sombra['subtotal']
         for mes, valor in deshierbo_mecanico['distribucion'].items():
-            self.cronograma[mes] += valor
-        self.cronograma['sep'] += poda_mantenimiento['subtotal']
+            estado.cronograma[mes] += valor
+        estado.cronograma['sep'] += poda_mantenimiento['subtotal']
         for mes, valor in abonamiento['distribucion'].items():
-            self.cronograma[mes] += valor
+            estado.cronograma[mes] += valor
         for mes, valor in fumigados['distribucion'].items():
-            self.cronograma[mes] += valor
-        self.cronograma['oct'] += poda_sombra['subtotal']
+            estado.cronograma[mes] += valor
+        estado.cronograma['oct'] += poda_sombra['subtotal']
         
-        self.costos_directos['labores_cultivo'] = {
+        estado.costos_directos['labores_cultivo'] = {
             'reposicion_sombra': reposicion_sombra,
             'deshierbo_mecanico': deshierbo_mecanico,
             'poda_mantenimiento': poda_mantenimiento,
@@ -140,47 +157,47 @@ class CacaoProduccion(CalculadoraFichaTecnica):
         return total
     
     # ===== 2. FERTILIZACIÓN =====
-    def calcular_fertilizacion(self) -> float:
+    def calcular_fertilizacion(self, estado: EstadoCalculo) -> float:
         """
         Fertilización durante año de producción
         """
         urea = {
             'descripcion': 'Urea',
             'cantidad': 4.66,  # sacos
-            'precio': p.PRECIOS['urea'],
-            'subtotal': 4.66 * p.PRECIOS['urea'],  # 909
+            'precio': self.precios['urea'],
+            'subtotal': 4.66 * self.precios['urea'],  # 909
             'distribucion': {'oct': 454, 'nov': 454}
         }
         
         roca_fosforica = {
             'descripcion': 'Roca Fosforica',
             'cantidad': 1.24,
-            'precio': p.PRECIOS['roca_fosforica'],
-            'subtotal': 1.24 * p.PRECIOS['roca_fosforica'],  # 62
+            'precio': self.precios['roca_fosforica'],
+            'subtotal': 1.24 * self.precios['roca_fosforica'],  # 62
             'distribucion': {'oct': 31, 'nov': 31}
         }
         
         sulfato_potasio = {
             'descripcion': 'Sulfato de potasio',
             'cantidad': 2.26,
-            'precio': p.PRECIOS['sulfato_potasio'],
-            'subtotal': 2.26 * p.PRECIOS['sulfato_potasio'],  # 475
+            'precio': self.precios['sulfato_potasio'],
+            'subtotal': 2.26 * self.precios['sulfato_potasio'],  # 475
             'distribucion': {'oct': 237, 'nov': 237}
         }
         
         guano_isla = {
             'descripcion': 'Guano de Isla',
             'cantidad': 0.7,
-            'precio': p.PRECIOS['guano_isla'],
-            'subtotal': 0.7 * p.PRECIOS['guano_isla'],  # 39
+            'precio': self.precios['guano_isla'],
+            'subtotal': 0.7 * self.precios['guano_isla'],  # 39
             'distribucion': {'oct': 19, 'nov': 19}
         }
         
         abono_foliar = {
             'descripcion': 'Abono foliar',
             'cantidad': 2,  # litros
-            'precio': p.PRECIOS['abono_foliar'],
-            'subtotal': 2 * p.PRECIOS['abono_foliar'],  # 70
+            'precio': self.precios['abono_foliar'],
+            'subtotal': 2 * self.precios['abono_foliar'],  # 70
             'mes': 'abr'
         }
         
@@ -191,10 +208,10 @@ class CacaoProduccion(CalculadoraFichaTecnica):
         # Agregar al cronograma
         for fertilizante in [urea, roca_fosforica, sulfato_potasio, guano_isla]:
             for mes, valor in fertilizante['distribucion'].items():
-                self.cronograma[mes] += valor
-        self.cronograma['abr'] += abono_foliar['subtotal']
+                estado.cronograma[mes] += valor
+        estado.cronograma['abr'] += abono_foliar['subtotal']
         
-        self.costos_directos['fertilizacion'] = {
+        estado.costos_directos['fertilizacion'] = {
             'urea': urea,
             'roca_fosforica': roca_fosforica,
             'sulfato_potasio': sulfato_potasio,
@@ -206,31 +223,31 @@ class CacaoProduccion(CalculadoraFichaTecnica):
         return total
     
     # ===== 3. CONTROL FITOSANITARIO =====
-    def calcular_control_fitosanitario(self) -> float:
+    def calcular_control_fitosanitario(self, estado: EstadoCalculo) -> float:
         """
         Control de plagas y enfermedades
         """
         insecticida = {
             'descripcion': 'Insecticida y Nematicida (Carfoburan - Killfuran)',
             'cantidad': 6,  # litros
-            'precio': p.PRECIOS['insecticida_nematicida'],
-            'subtotal': 6 * p.PRECIOS['insecticida_nematicida'],  # 690
+            'precio': self.precios['insecticida_nematicida'],
+            'subtotal': 6 * self.precios['insecticida_nematicida'],  # 690
             'distribucion': {'sep': 345, 'ene': 345}
         }
         
         fungicida = {
             'descripcion': 'Fungicida cuprico',
             'cantidad': 1,  # kg
-            'precio': p.PRECIOS['fungicida_cuprico'],
-            'subtotal': 1 * p.PRECIOS['fungicida_cuprico'],  # 90
+            'precio': self.precios['fungicida_cuprico'],
+            'subtotal': 1 * self.precios['fungicida_cuprico'],  # 90
             'distribucion': {'oct': 45, 'nov': 45}
         }
         
         adherente = {
             'descripcion': 'Adherente',
             'cantidad': 2,  # litros
-            'precio': p.PRECIOS['adherente'],
-            'subtotal': 2 * p.PRECIOS['adherente'],  # 74
+            'precio': self.precios['adherente'],
+            'subtotal': 2 * self.precios['adherente'],  # 74
             'distribucion': {
                 'sep': 11, 'oct': 11, 'nov': 11, 'dic': 11,
                 'ene': 11, 'mar': 11, 'abr': 11
@@ -240,8 +257,8 @@ class CacaoProduccion(CalculadoraFichaTecnica):
         herbicida = {
             'descripcion': 'Herbicida (Bazooka - Glyphosate)',
             'cantidad': 3,  # litros
-            'precio': p.PRECIOS['herbicida'],
-            'subtotal': 3 * p.PRECIOS['herbicida'],  # 135
+            'precio': self.precios['herbicida'],
+            'subtotal': 3 * self.precios['herbicida'],  # 135
             'distribucion': {'sep': 45, 'nov': 45, 'feb': 45}
         }
         
@@ -250,15 +267,15 @@ class CacaoProduccion(CalculadoraFichaTecnica):
         
         # Agregar al cronograma
         for mes, valor in insecticida['distribucion'].items():
-            self.cronograma[mes] += valor
+            estado.cronograma[mes] += valor
         for mes, valor in fungicida['distribucion'].items():
-            self.cronograma[mes] += valor
+            estado.cronograma[mes] += valor
         for mes, valor in adherente['distribucion'].items():
-            self.cronograma[mes] += valor
+            estado.cronograma[mes] += valor
         for mes, valor in herbicida['distribucion'].items():
-            self.cronograma[mes] += valor
+            estado.cronograma[mes] += valor
         
-        self.costos_directos['control_fitosanitario'] = {
+        estado.costos_directos['control_fitosanitario'] = {
             'insecticida': insecticida,
             'fungicida': fungicida,
             'adherente': adherente,
@@ -269,49 +286,49 @@ class CacaoProduccion(CalculadoraFichaTecnica):
         return total
     
     # ===== 4. COSECHA =====
-    def calcular_cosecha(self) -> float:
+    def calcular_cosecha(self, estado: EstadoCalculo) -> float:
         """
         Costos de cosecha y post-cosecha
         """
         cosecha_mazorca = {
             'descripcion': 'Cosecha de mazorca',
             'jornales': 10,
-            'subtotal': 10 * p.PRECIOS['jornal'],  # 400
+            'subtotal': 10 * self.precios['jornal'],  # 400
             'mes': 'may'
         }
         
         quiebre = {
             'descripcion': 'Quiebre de mazorcas',
             'jornales': 2,
-            'subtotal': 2 * p.PRECIOS['jornal'],  # 80
+            'subtotal': 2 * self.precios['jornal'],  # 80
             'mes': 'may'
         }
         
         fermentacion = {
             'descripcion': 'Fermentacion',
             'jornales': 4,
-            'subtotal': 4 * p.PRECIOS['jornal'],  # 160
+            'subtotal': 4 * self.precios['jornal'],  # 160
             'mes': 'may'
         }
         
         secado = {
             'descripcion': 'Secado',
             'jornales': 2,
-            'subtotal': 2 * p.PRECIOS['jornal'],  # 80
+            'subtotal': 2 * self.precios['jornal'],  # 80
             'mes': 'may'
         }
         
         limpieza = {
             'descripcion': 'Limpieza y Selección de granos',
             'jornales': 2,
-            'subtotal': 2 * p.PRECIOS['jornal'],  # 80
+            'subtotal': 2 * self.precios['jornal'],  # 80
             'mes': 'may'
         }
         
         ensacado = {
             'descripcion': 'Ensacado',
             'jornales': 2,
-            'subtotal': 2 * p.PRECIOS['jornal'],  # 80
+            'subtotal': 2 * self.precios['jornal'],  # 80
             'mes': 'may'
         }
         
@@ -319,9 +336,9 @@ class CacaoProduccion(CalculadoraFichaTecnica):
                  fermentacion['subtotal'] + secado['subtotal'] + 
                  limpieza['subtotal'] + ensacado['subtotal'])  # 880
         
-        self.cronograma['may'] += total
+        estado.cronograma['may'] += total
         
-        self.costos_directos['cosecha'] = {
+        estado.costos_directos['cosecha'] = {
             'cosecha_mazorca': cosecha_mazorca,
             'quiebre': quiebre,
             'fermentacion': fermentacion,
@@ -334,7 +351,7 @@ class CacaoProduccion(CalculadoraFichaTecnica):
         return total
     
     # ===== 5. GASTOS ESPECIALES =====
-    def calcular_gastos_especiales(self) -> float:
+    def calcular_gastos_especiales(self, estado: EstadoCalculo) -> float:
         """
         Transporte y otros gastos
         """
@@ -344,32 +361,32 @@ class CacaoProduccion(CalculadoraFichaTecnica):
         reposicion_sombra = {
             'descripcion': 'Plantones de reposicion de sombra',
             'cantidad': 30,
-            'precio': p.PRECIOS['planton_sombra_platano'],
-            'subtotal': 30 * p.PRECIOS['planton_sombra_platano'],  # 21
+            'precio': self.precios['planton_sombra_platano'],
+            'subtotal': 30 * self.precios['planton_sombra_platano'],  # 21
             'mes': 'ago'
         }
         
         transporte_insumos = {
             'descripcion': 'Transporte de insumos',
             'sacos': 12,
-            'precio': p.PRECIOS['transporte_insumo'],
-            'subtotal': 12 * p.PRECIOS['transporte_insumo'],  # 36
+            'precio': self.precios['transporte_insumo'],
+            'subtotal': 12 * self.precios['transporte_insumo'],  # 36
             'mes': 'ago'
         }
         
         transporte_cosecha = {
             'descripcion': 'Transporte de cosecha',
             'qq': qq_producidos,
-            'precio': p.PRECIOS['transporte_cosecha'],
-            'subtotal': qq_producidos * p.PRECIOS['transporte_cosecha'],  # ~78
+            'precio': self.precios['transporte_cosecha'],
+            'subtotal': qq_producidos * self.precios['transporte_cosecha'],  # ~78
             'mes': 'may'
         }
         
         sacos = {
             'descripcion': 'Sacos (1 QQ)',
             'cantidad': qq_producidos,
-            'precio': p.PRECIOS['saco_yute'],
-            'subtotal': qq_producidos * p.PRECIOS['saco_yute'],  # ~52
+            'precio': self.precios['saco_yute'],
+            'subtotal': qq_producidos * self.precios['saco_yute'],  # ~52
             'mes': 'may'
         }
         
@@ -383,7 +400,7 @@ class CacaoProduccion(CalculadoraFichaTecnica):
             'costo_total_instalacion': 667,
             'años_amortizacion': 15,
             'subtotal': costo_instalacion_anual,
-            'distribucion_mensual': {mes: costo_instalacion_mensual for mes in p.MESES if mes != 'jun' and mes != 'jul'}
+            'distribucion_mensual': {mes: costo_instalacion_mensual for mes in self.p.MESES if mes != 'jun' and mes != 'jul'}
         }
         
         # Total sin instalación
@@ -395,14 +412,14 @@ class CacaoProduccion(CalculadoraFichaTecnica):
         total = total_sin_instalacion + instalacion['subtotal']  # ~854
         
         # Agregar al cronograma
-        self.cronograma['ago'] += reposicion_sombra['subtotal'] + transporte_insumos['subtotal']
-        self.cronograma['may'] += transporte_cosecha['subtotal'] + sacos['subtotal']
+        estado.cronograma['ago'] += reposicion_sombra['subtotal'] + transporte_insumos['subtotal']
+        estado.cronograma['may'] += transporte_cosecha['subtotal'] + sacos['subtotal']
         
         # Distribuir costo de instalación
         for mes in instalacion['distribucion_mensual']:
-            self.cronograma[mes] += costo_instalacion_mensual
+            estado.cronograma[mes] += costo_instalacion_mensual
         
-        self.costos_directos['gastos_especiales'] = {
+        estado.costos_directos['gastos_especiales'] = {
             'reposicion_sombra': reposicion_sombra,
             'transporte_insumos': transporte_insumos,
             'transporte_cosecha': transporte_cosecha,
@@ -422,7 +439,7 @@ class CacaoProduccion(CalculadoraFichaTecnica):
             Quintales producidos (con merma)
         """
         qq_bruto = self.productividad['qq']
-        merma = qq_bruto * p.MERMA_PRODUCTIVA
+        merma = qq_bruto * self.p.MERMA_PRODUCTIVA
         qq_neto = qq_bruto - merma
         
         return self.redondear(qq_neto, 1)
@@ -437,63 +454,73 @@ class CacaoProduccion(CalculadoraFichaTecnica):
         qq_primera = qq_total * self.productividad['primera']
         qq_segunda = qq_total * self.productividad['segunda']
         
-        ingreso_primera = qq_primera * p.PRECIO_VENTA_PRIMERA
-        ingreso_segunda = qq_segunda * p.PRECIO_VENTA_SEGUNDA
+        ingreso_primera = qq_primera * self.p.PRECIO_VENTA_PRIMERA
+        ingreso_segunda = qq_segunda * self.p.PRECIO_VENTA_SEGUNDA
         ingreso_total = ingreso_primera + ingreso_segunda
         
-        self.ingresos = {
+        return {
             'qq_total': qq_total,
             'qq_primera': self.redondear(qq_primera, 1),
             'qq_segunda': self.redondear(qq_segunda, 1),
-            'precio_primera': p.PRECIO_VENTA_PRIMERA,
-            'precio_segunda': p.PRECIO_VENTA_SEGUNDA,
+            'precio_primera': self.p.PRECIO_VENTA_PRIMERA,
+            'precio_segunda': self.p.PRECIO_VENTA_SEGUNDA,
             'ingreso_primera': self.redondear(ingreso_primera),
             'ingreso_segunda': self.redondear(ingreso_segunda),
             'ingreso_total': self.redondear(ingreso_total)
         }
-        
-        return self.ingresos
     
     # ===== COSTOS DIRECTOS E INDIRECTOS =====
-    def calcular_costos_directos(self) -> float:
+    def calcular_costos_directos(self, estado: EstadoCalculo) -> float:
         """
         Calcula todos los costos directos de producción
         """
-        labores = self.calcular_labores_cultivo()
-        fertilizacion = self.calcular_fertilizacion()
-        fitosanitario = self.calcular_control_fitosanitario()
-        cosecha = self.calcular_cosecha()
-        gastos_esp = self.calcular_gastos_especiales()
+        labores = self.calcular_labores_cultivo(estado)
+        fertilizacion = self.calcular_fertilizacion(estado)
+        fitosanitario = self.calcular_control_fitosanitario(estado)
+        cosecha = self.calcular_cosecha(estado)
+        gastos_esp = self.calcular_gastos_especiales(estado)
 
         total = labores + fertilizacion + fitosanitario + cosecha + gastos_esp
         return total
     
-    def calcular_costos_indirectos(self, total_directos: float) -> float:
+    def calcular_costos_indirectos(self, estado: EstadoCalculo, total_directos: float) -> float:
         """
         Calcula costos indirectos para producción
         """
         indirectos = self.calcular_costos_indirectos_estandar(
             total_directos,
-            porcentaje_imprevistos=p.PORCENTAJE_IMPREVISTOS_PROD,
-            porcentaje_gastos_operativos=p.PORCENTAJE_GASTOS_OPERATIVOS_PROD,
-            porcentaje_asistencia_tecnica=p.PORCENTAJE_ASISTENCIA_TECNICA_PROD
+            porcentaje_imprevistos=self.p.PORCENTAJE_IMPREVISTOS_PROD,
+            porcentaje_gastos_operativos=self.p.PORCENTAJE_GASTOS_OPERATIVOS_PROD,
+            porcentaje_asistencia_tecnica=self.p.PORCENTAJE_ASISTENCIA_TECNICA_PROD
         )
         
-        self.costos_indirectos = indirectos
+        estado.costos_indirectos = indirectos
         return indirectos['total']
 
     # ===== CÁLCULO COMPLETO =====
-    def calcular(self) -> Dict[str, Any]:
+    def calcular_estado(self) -> EstadoCalculo:
         """
-        Ejecuta todos los cálculos y retorna resultado completo
+        Costos (directos e indirectos) e ingresos sobre un estado nuevo
         """
-        # Calcular costos
-        total_directos = self.calcular_costos_directos()
-        total_indirectos = self.calcular_costos_indirectos(total_directos)
+        estado = super().calcular_estado()
+        estado.ingresos = self.calcular_ingresos()
+        return estado
+    
+    def calcular(self) -> DictInmutable:
+        """
+        Ejecuta todos los cálculos y retorna resultado completo (congelado)
+        """
+        return self.armar_resultado(self.calcular_estado())
+    
+    def armar_resultado(self, estado: EstadoCalculo) -> DictInmutable:
+        """
+        Arma el resultado escalado a partir de un estado ya calculado
+        (costos directos, costos indirectos, ingresos y cronograma)
+        """
+        total_directos = estado.total_directos
+        total_indirectos = estado.total_indirectos
         costo_total = total_directos + total_indirectos
-        
-        # Calcular ingresos
-        ingresos = self.calcular_ingresos()
+        ingresos = estado.ingresos
         
         # Calcular utilidad
         utilidad = ingresos['ingreso_total'] - costo_total
@@ -518,18 +545,18 @@ class CacaoProduccion(CalculadoraFichaTecnica):
             },
             
             'costos_directos': {
-                'labores_cultivo': self.costos_directos['labores_cultivo']['total'] * self.hectareas,
-                'fertilizacion': self.costos_directos['fertilizacion']['total'] * self.hectareas,
-                'control_fitosanitario': self.costos_directos['control_fitosanitario']['total'] * self.hectareas,
-                'cosecha': self.costos_directos['cosecha']['total'] * self.hectareas,
-                'gastos_especiales': self.costos_directos['gastos_especiales']['total'] * self.hectareas,
+                'labores_cultivo': estado.costos_directos['labores_cultivo']['total'] * self.hectareas,
+                'fertilizacion': estado.costos_directos['fertilizacion']['total'] * self.hectareas,
+                'control_fitosanitario': estado.costos_directos['control_fitosanitario']['total'] * self.hectareas,
+                'cosecha': estado.costos_directos['cosecha']['total'] * self.hectareas,
+                'gastos_especiales': estado.costos_directos['gastos_especiales']['total'] * self.hectareas,
                 'total': total_directos * self.hectareas
             },
             
             'costos_indirectos': {
-                'imprevistos': self.costos_indirectos['imprevistos']['monto'] * self.hectareas,
-                'gastos_operativos': self.costos_indirectos['gastos_operativos']['monto'] * self.hectareas,
-                'asistencia_tecnica': self.costos_indirectos['asistencia_tecnica']['monto'] * self.hectareas,
+                'imprevistos': estado.costos_indirectos['imprevistos']['monto'] * self.hectareas,
+                'gastos_operativos': estado.costos_indirectos['gastos_operativos']['monto'] * self.hectareas,
+                'asistencia_tecnica': estado.costos_indirectos['asistencia_tecnica']['monto'] * self.hectareas,
                 'total': total_indirectos * self.hectareas
             },
             
@@ -546,16 +573,16 @@ class CacaoProduccion(CalculadoraFichaTecnica):
                 'roi': self.redondear((utilidad / costo_total * 100), 2) if costo_total > 0 else 0
             },
             
-            'cronograma_mensual': {mes: valor * self.hectareas for mes, valor in self.cronograma.items()},
+            'cronograma_mensual': {mes: valor * self.hectareas for mes, valor in estado.cronograma.items()},
             
             'metadata': {
                 **self.metadata,
                 'tipo_ficha': 'produccion',
                 'cultivo': 'cacao_convencional',
-                'region': p.REGION
+                'region': self.p.REGION
             }
         }
     
-        return resultado
+        return congelar(resultado)
 
 
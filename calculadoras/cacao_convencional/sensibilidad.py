@@ -0,0 +1,133 @@
+# calculadoras/cacao_convencional/sensibilidad.py
+"""
+Análisis de sensibilidad (tornado) para Cacao Convencional
+Perturba ±X% cada precio de PRECIOS, los precios de venta y los
+porcentajes de costos indirectos, y evalúa todos los escenarios en
+una sola llamada vectorizada sobre la matriz de cantidades
+"""
+
+from typing import Dict, Any, List
+
+import numpy as np
+
+from . import parametros as p
+from .vectorial import escenario_base, evaluar_escenarios, matriz_cantidades
+
+METRICAS = ('costo_total', 'utilidad_neta', 'van')
+
+# Porcentajes indirectos: nombre -> (atributo de parametros, fase)
+PORCENTAJES_INDIRECTOS = {
+    'porcentaje_imprevistos': ('PORCENTAJE_IMPREVISTOS', 'instalacion'),
+    'porcentaje_gastos_operativos': ('PORCENTAJE_GASTOS_OPERATIVOS', 'instalacion'),
+    'porcentaje_asistencia_tecnica': ('PORCENTAJE_ASISTENCIA_TECNICA', 'instalacion'),
+    'porcentaje_imprevistos_prod': ('PORCENTAJE_IMPREVISTOS_PROD', 'produccion'),
+    'porcentaje_gastos_operativos_prod': ('PORCENTAJE_GASTOS_OPERATIVOS_PROD', 'produccion'),
+    'porcentaje_asistencia_tecnica_prod': ('PORCENTAJE_ASISTENCIA_TECNICA_PROD', 'produccion'),
+}
+
+
+def parametros_sensibilizables() -> List[str]:
+    """
+    Lista de parámetros que el análisis perturba
+
+    Returns:
+        Claves de PRECIOS, precios de venta y porcentajes indirectos
+    """
+    return (list(matriz_cantidades().claves)
+            + ['precio_venta_primera', 'precio_venta_segunda']
+            + list(PORCENTAJES_INDIRECTOS))
+
+
+def _valor_base(nombre: str, conjunto: Any) -> float:
+    if nombre in PORCENTAJES_INDIRECTOS:
+        return getattr(conjunto, PORCENTAJES_INDIRECTOS[nombre][0])
+    if nombre == 'precio_venta_primera':
+        return conjunto.PRECIO_VENTA_PRIMERA
+    if nombre == 'precio_venta_segunda':
+        return conjunto.PRECIO_VENTA_SEGUNDA
+    return conjunto.PRECIOS[nombre]
+
+
+def analizar_sensibilidad(hectareas: float = 1.0, variacion: float = 0.10,
+                          parametros: List[str] = None, valores: Any = None) -> Dict[str, Any]:
+    """
+    Calcula elasticidades de costo total, utilidad neta y VAN
+
+    Construye una matriz de escenarios (base + bajo/alto por parámetro)
+    y la evalúa en una sola pasada.
+
+    Args:
+        hectareas: Número de hectáreas (mayor a 0)
+        variacion: Perturbación relativa (ejemplo: 0.10 para ±10%)
+        parametros: Parámetros a perturbar (default: parametros_sensibilizables())
+        valores: Módulo o namespace con los valores base, por ejemplo
+            ConjuntoParametros.valores (default: módulo parametros)
+
+    Returns:
+        Dict con valores base y, por métrica, la lista de parámetros
+        ordenada por amplitud de impacto (para gráfico tornado)
+
+    Raises:
+        ValueError: Si los argumentos no son válidos
+    """
+    if hectareas <= 0:
+        raise ValueError("El número de hectáreas debe ser mayor a 0")
+    if not 0 < variacion < 1:
+        raise ValueError("La variación debe estar entre 0 y 1")
+
+    conjunto = p if valores is None else valores
+    nombres = parametros_sensibilizables() if parametros is None else list(parametros)
+    claves_precios = matriz_cantidades().claves
+    for nombre in nombres:
+        if nombre not in claves_precios and nombre not in PORCENTAJES_INDIRECTOS \
+                and nombre not in ('precio_venta_primera', 'precio_venta_segunda'):
+            raise ValueError(f"Parámetro no sensibilizable: {nombre}")
+
+    # Fila 0: base; filas 2i+1 / 2i+2: parámetro i bajo / alto
+    n = 1 + 2 * len(nombres)
+    escenario = escenario_base(n, conjunto)
+    factores = np.tile([1 - variacion, 1 + variacion], len(nombres))
+    filas = np.arange(1, n)
+
+    for i, nombre in enumerate(nombres):
+        par = filas[2 * i:2 * i + 2]
+        base = _valor_base(nombre, conjunto)
+        perturbados = base * factores[2 * i:2 * i + 2]
+        if nombre in PORCENTAJES_INDIRECTOS:
+            fase = PORCENTAJES_INDIRECTOS[nombre][1]
+            escenario[f'porcentaje_indirecto_{fase}'][par] += perturbados - base
+        elif nombre in ('precio_venta_primera', 'precio_venta_segunda'):
+            escenario[nombre][par] = perturbados
+        else:
+            escenario['precios'][par, claves_precios.index(nombre)] = perturbados
+
+    resultado = evaluar_escenarios(escenario, hectareas=hectareas, parametros=conjunto)
+
+    tornado = {}
+    for metrica in METRICAS:
+        por_escenario = resultado[metrica]
+        base = por_escenario[0]
+        bajo = por_escenario[1::2]
+        alto = por_escenario[2::2]
+        elasticidad = ((alto - bajo) / (2 * variacion * base)) if base != 0 else np.zeros_like(alto)
+        amplitud = np.abs(alto - bajo)
+
+        orden = np.argsort(-amplitud, kind='stable')
+        tornado[metrica] = [
+            {
+                'parametro': nombres[i],
+                'valor_base': _valor_base(nombres[i], conjunto),
+                'bajo': round(float(bajo[i]), 2),
+                'alto': round(float(alto[i]), 2),
+                'elasticidad': round(float(elasticidad[i]), 4),
+                'amplitud': round(float(amplitud[i]), 2)
+            }
+            for i in orden
+        ]
+
+    return {
+        'hectareas': hectareas,
+        'variacion': variacion,
+        'base': {metrica: round(float(resultado[metrica][0]), 2) for metrica in METRICAS},
+        'tornado': tornado
+    }
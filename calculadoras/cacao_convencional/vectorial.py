@@ -0,0 +1,130 @@
+# calculadoras/cacao_convencional/vectorial.py
+"""
+Modelo vectorial del ciclo de Cacao Convencional
+Matriz de cantidades por precio (compilada de especificaciones/cacao_convencional.json)
+y evaluación por lotes de escenarios de parámetros
+Base: 1 hectárea
+"""
+
+from functools import lru_cache
+from typing import Any, Dict
+
+import numpy as np
+
+from ..especificacion import MatrizCantidades, cargar_especificacion, compilar_especificacion
+from . import parametros as p
+from .produccion import grupo_productividad
+
+# Grupos de PRODUCTIVIDAD de los años productivos (4-15), en orden
+GRUPOS_PRODUCTIVOS = ['año_4_6', 'año_7_9', 'año_10_11', 'año_12_13', 'año_14_15']
+AÑOS_PRODUCTIVOS = list(range(p.PERIODO_DESARROLLO + 1, p.PERIODO_VEGETATIVO_TOTAL + 1))
+
+
+@lru_cache(maxsize=1)
+def matriz_cantidades() -> MatrizCantidades:
+    """
+    Matriz de cantidades de la especificación declarativa del cultivo
+
+    Se compila una vez por proceso y se reutiliza (es la misma que expone
+    registro.obtener_especificacion).
+
+    Returns:
+        MatrizCantidades por hectárea
+    """
+    return compilar_especificacion(cargar_especificacion('cacao_convencional'), p).cantidades
+
+
+def escenario_base(n: int = 1, parametros: Any = None) -> Dict[str, np.ndarray]:
+    """
+    Construye n escenarios idénticos con los valores de parametros
+
+    Args:
+        n: Número de escenarios
+        parametros: Módulo o namespace de parámetros, por ejemplo
+            ConjuntoParametros.valores (default: módulo parametros)
+
+    Returns:
+        Dict de arrays con la forma que espera evaluar_escenarios
+    """
+    conjunto = p if parametros is None else parametros
+    cantidades = matriz_cantidades()
+    return {
+        'precios': np.tile(cantidades.vector_precios(conjunto.PRECIOS), (n, 1)),
+        'precio_venta_primera': np.full(n, conjunto.PRECIO_VENTA_PRIMERA),
+        'precio_venta_segunda': np.full(n, conjunto.PRECIO_VENTA_SEGUNDA),
+        'qq': np.tile([conjunto.PRODUCTIVIDAD[g]['qq'] for g in GRUPOS_PRODUCTIVOS], (n, 1)).astype(float),
+        'merma_productiva': np.full(n, conjunto.MERMA_PRODUCTIVA),
+        'porcentaje_indirecto_instalacion': np.full(
+            n, conjunto.PORCENTAJE_IMPREVISTOS + conjunto.PORCENTAJE_GASTOS_OPERATIVOS
+            + conjunto.PORCENTAJE_ASISTENCIA_TECNICA
+        ),
+        'porcentaje_indirecto_produccion': np.full(
+            n, conjunto.PORCENTAJE_IMPREVISTOS_PROD + conjunto.PORCENTAJE_GASTOS_OPERATIVOS_PROD
+            + conjunto.PORCENTAJE_ASISTENCIA_TECNICA_PROD
+        ),
+    }
+
+
+def evaluar_escenarios(escenario: Dict[str, np.ndarray], hectareas: float = 1.0,
+                       tasa_descuento: float = None, parametros: Any = None) -> Dict[str, np.ndarray]:
+    """
+    Evalúa el ciclo completo (año 0 a 15) de n escenarios en una sola pasada
+
+    Los costos indirectos se aplican como porcentaje sin redondeo por
+    concepto, por lo que pueden diferir en céntimos de las calculadoras.
+
+    Args:
+        escenario: Dict de arrays (ver escenario_base)
+        hectareas: Número de hectáreas
+        tasa_descuento: Tasa para el VAN (default: parametros.TASA_DESCUENTO)
+        parametros: Módulo o namespace con TASA_DESCUENTO y las proporciones
+            de primera y segunda de PRODUCTIVIDAD (default: módulo parametros)
+
+    Returns:
+        Dict de vectores (n,) con costos, utilidad, VAN y año de equilibrio,
+        y la matriz de flujos (n, años)
+    """
+    conjunto = p if parametros is None else parametros
+    tasa = conjunto.TASA_DESCUENTO if tasa_descuento is None else tasa_descuento
+    cantidades = matriz_cantidades()
+    precios = escenario['precios']
+
+    costo_instalacion = (precios @ cantidades.instalacion) * (1 + escenario['porcentaje_indirecto_instalacion'])
+
+    idx_grupo = np.array([GRUPOS_PRODUCTIVOS.index(grupo_productividad(año)) for año in AÑOS_PRODUCTIVOS])
+    primera = np.array([conjunto.PRODUCTIVIDAD[GRUPOS_PRODUCTIVOS[i]]['primera'] for i in idx_grupo])
+    segunda = np.array([conjunto.PRODUCTIVIDAD[GRUPOS_PRODUCTIVOS[i]]['segunda'] for i in idx_grupo])
+
+    qq_bruto = escenario['qq']
+    qq_neto = np.round(qq_bruto - qq_bruto * escenario['merma_productiva'][:, None], 1)
+    qq = qq_neto[:, idx_grupo]
+
+    fijo = cantidades.constante_produccion + precios @ cantidades.produccion_fija
+    por_qq = precios @ cantidades.produccion_por_qq
+    directos = fijo[:, None] + qq * por_qq[:, None]
+    costos_produccion = directos * (1 + escenario['porcentaje_indirecto_produccion'][:, None])
+
+    ingresos = qq * (primera * escenario['precio_venta_primera'][:, None]
+                     + segunda * escenario['precio_venta_segunda'][:, None])
+
+    n = precios.shape[0]
+    flujos = np.zeros((n, p.PERIODO_VEGETATIVO_TOTAL + 1))
+    flujos[:, 0] = -costo_instalacion
+    flujos[:, AÑOS_PRODUCTIVOS[0]:] = ingresos - costos_produccion
+    flujos *= hectareas
+
+    descuento = (1 + tasa) ** -np.arange(flujos.shape[1])
+    acumulado = np.cumsum(flujos, axis=1)
+    recupera = acumulado >= 0
+    año_equilibrio = np.where(recupera.any(axis=1), recupera.argmax(axis=1), flujos.shape[1])
+
+    return {
+        'costo_instalacion': costo_instalacion * hectareas,
+        'costo_produccion': costos_produccion.sum(axis=1) * hectareas,
+        'costo_total': (costo_instalacion + costos_produccion.sum(axis=1)) * hectareas,
+        'ingreso_total': ingresos.sum(axis=1) * hectareas,
+        'utilidad_neta': flujos.sum(axis=1),
+        'van': flujos @ descuento,
+        'año_equilibrio': año_equilibrio,
+        'flujos': flujos
+    }
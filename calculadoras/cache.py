@@ -0,0 +1,138 @@
+# calculadoras/cache.py
+"""
+Cache persistente de fichas técnicas en SQLite
+Las fichas se guardan comprimidas, direccionadas por contenido (hash de
+entradas + versión de parámetros y calculadora) y con desalojo LRU
+acotado por tamaño. Usa WAL para lectores y escritores concurrentes.
+"""
+
+import os
+import sqlite3
+import time
+import zlib
+from typing import Optional
+
+# Archivo auxiliar junto a fichas_tecnicas.db (no comparte la BD de Node)
+RUTA_DEFECTO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fichas_cache.db')
+
+TAMAÑO_MAXIMO_DEFECTO = 32 * 1024 * 1024  # 32 MB comprimidos
+ESPERA_BLOQUEO_MS = 5000
+NIVEL_COMPRESION = 6
+# Segundos mínimos entre actualizaciones de ultimo_acceso de una entrada:
+# las lecturas frecuentes no escriben en la BD en cada acierto
+RESOLUCION_ACCESO = 300
+
+
+class CacheFichas:
+    """
+    Cache clave -> texto (JSON de la ficha) comprimido con zlib
+
+    Cada proceso abre su propia conexión; la concurrencia entre procesos
+    la resuelve SQLite (WAL + busy_timeout).
+    """
+
+    def __init__(self, ruta: str = None, tamaño_maximo: int = TAMAÑO_MAXIMO_DEFECTO):
+        """
+        Args:
+            ruta: Archivo SQLite (default: fichas_cache.db en la raíz del proyecto)
+            tamaño_maximo: Bytes comprimidos máximos antes de desalojar
+
+        Raises:
+            ValueError: Si tamaño_maximo no es positivo
+        """
+        if tamaño_maximo <= 0:
+            raise ValueError("El tamaño máximo del cache debe ser mayor a 0")
+        self.ruta = RUTA_DEFECTO if ruta is None else ruta
+        self.tamaño_maximo = tamaño_maximo
+        self._conexion: Optional[sqlite3.Connection] = None
+
+    def _conectar(self) -> sqlite3.Connection:
+        if self._conexion is None:
+            conexion = sqlite3.connect(self.ruta, timeout=ESPERA_BLOQUEO_MS / 1000, isolation_level=None)
+            conexion.execute(f'PRAGMA busy_timeout = {ESPERA_BLOQUEO_MS}')
+            conexion.execute('PRAGMA journal_mode = WAL')
+            conexion.execute('PRAGMA synchronous = NORMAL')
+            conexion.execute('''
+                CREATE TABLE IF NOT EXISTS cache_fichas (
+                    clave TEXT PRIMARY KEY,
+                    datos BLOB NOT NULL,
+                    tamaño INTEGER NOT NULL,
+                    ultimo_acceso REAL NOT NULL
+                )
+            ''')
+            conexion.execute('CREATE INDEX IF NOT EXISTS idx_cache_fichas_acceso ON cache_fichas (ultimo_acceso)')
+            self._conexion = conexion
+        return self._conexion
+
+    def obtener(self, clave: str) -> Optional[str]:
+        """
+        Devuelve el texto cacheado
+
+        El último acceso solo se actualiza si tiene más de RESOLUCION_ACCESO
+        segundos, por lo que un acierto normalmente no escribe en la BD
+
+        Args:
+            clave: Clave de contenido (ver versionado.clave_contenido)
+
+        Returns:
+            Texto de la ficha o None si no está en cache
+        """
+        conexion = self._conectar()
+        fila = conexion.execute('SELECT datos, ultimo_acceso FROM cache_fichas WHERE clave = ?', (clave,)).fetchone()
+        if fila is None:
+            return None
+        ahora = time.time()
+        if ahora - fila[1] > RESOLUCION_ACCESO:
+            conexion.execute('UPDATE cache_fichas SET ultimo_acceso = ? WHERE clave = ?', (ahora, clave))
+        return zlib.decompress(fila[0]).decode('utf-8')
+
+    def guardar(self, clave: str, texto: str) -> None:
+        """
+        Guarda un texto comprimido y desaloja las entradas menos usadas
+        si se supera el tamaño máximo
+
+        Args:
+            clave: Clave de contenido
+            texto: Texto de la ficha (JSON)
+        """
+        datos = zlib.compress(texto.encode('utf-8'), NIVEL_COMPRESION)
+        conexion = self._conectar()
+        conexion.execute('BEGIN IMMEDIATE')
+        try:
+            conexion.execute(
+                'INSERT OR REPLACE INTO cache_fichas (clave, datos, tamaño, ultimo_acceso) VALUES (?, ?, ?, ?)',
+                (clave, datos, len(datos), time.time())
+            )
+            self._desalojar(conexion)
+            conexion.execute('COMMIT')
+        except Exception:
+            conexion.execute('ROLLBACK')
+            raise
+
+    def _desalojar(self, conexion: sqlite3.Connection) -> None:
+        total = conexion.execute('SELECT COALESCE(SUM(tamaño), 0) FROM cache_fichas').fetchone()[0]
+        if total <= self.tamaño_maximo:
+            return
+        exceso = total - self.tamaño_maximo
+        liberar = []
+        for clave, tamaño in conexion.execute('SELECT clave, tamaño FROM cache_fichas ORDER BY ultimo_acceso'):
+            liberar.append((clave,))
+            exceso -= tamaño
+            if exceso <= 0:
+                break
+        conexion.executemany('DELETE FROM cache_fichas WHERE clave = ?', liberar)
+
+    def estadisticas(self) -> dict:
+        """
+        Returns:
+            Dict con número de entradas y bytes comprimidos
+        """
+        entradas, total = self._conectar().execute(
+            'SELECT COUNT(*), COALESCE(SUM(tamaño), 0) FROM cache_fichas'
+        ).fetchone()
+        return {'entradas': entradas, 'bytes': total, 'tamaño_maximo': self.tamaño_maximo}
+
+    def cerrar(self) -> None:
+        if self._conexion is not None:
+            self._conexion.close()
+            self._conexion = None
@@ -0,0 +1,98 @@
+# calculadoras/centavos.py
+"""
+Aritmética exacta en céntimos para los montos de las fichas
+Los montos se guardan como enteros int64 (céntimos de sol), las hectáreas
+como enteros en diezmilésimas y el escalado usa una sola regla de redondeo
+(mitad hacia arriba) sobre enteros. Así los subtotales son exactamente la
+suma de sus items y el resultado no depende del orden de las operaciones
+de punto flotante. La conversión a soles se hace solo al serializar.
+"""
+
+from typing import Any, List
+
+import numpy as np
+
+MESES = ['ago', 'sep', 'oct', 'nov', 'dic', 'ene', 'feb', 'mar', 'abr', 'may', 'jun', 'jul']
+
+# Hectáreas representadas con 4 decimales (1 ha = 10000)
+ESCALA_HECTAREAS = 10000
+
+
+def hectareas_enteras(hectareas: float) -> int:
+    """
+    Hectáreas en diezmilésimas (2.5 -> 25000)
+
+    Raises:
+        ValueError: Si hectareas no es positivo
+    """
+    if hectareas <= 0:
+        raise ValueError("Las hectáreas deben ser mayores a 0")
+    return int(round(hectareas * ESCALA_HECTAREAS))
+
+
+def a_centavos(soles: Any) -> np.ndarray:
+    """
+    Convierte montos en soles (escalar, lista o array) a céntimos int64
+    """
+    return np.rint(np.asarray(soles, dtype=np.float64) * 100).astype(np.int64)
+
+
+def escalar(centavos: Any, hectareas: float) -> np.ndarray:
+    """
+    Escala montos por ha a las hectáreas del proyecto
+
+    Regla única: producto entero y redondeo a céntimo, mitad hacia arriba.
+
+    Args:
+        centavos: Montos por ha en céntimos (no negativos)
+        hectareas: Número de hectáreas
+
+    Returns:
+        Array int64 del mismo tamaño
+    """
+    producto = np.asarray(centavos, dtype=np.int64) * hectareas_enteras(hectareas)
+    return (producto + ESCALA_HECTAREAS // 2) // ESCALA_HECTAREAS
+
+
+def repartir_meses(meses: np.ndarray, hectareas: float) -> np.ndarray:
+    """
+    Escala una matriz de montos mensuales conservando el total de cada fila
+
+    Cada fila se escala como total (regla de escalar) y ese total se reparte
+    entre sus meses por el método del mayor residuo, de modo que la suma de
+    los meses escalados es exactamente el total escalado.
+
+    Args:
+        meses: Matriz (n, 12) de céntimos por ha (no negativos)
+        hectareas: Número de hectáreas
+
+    Returns:
+        Matriz (n, 12) int64
+    """
+    meses = np.asarray(meses, dtype=np.int64)
+    producto = meses * hectareas_enteras(hectareas)
+    repartido = producto // ESCALA_HECTAREAS
+    residuo = producto % ESCALA_HECTAREAS
+    faltante = escalar(meses.sum(axis=1), hectareas) - repartido.sum(axis=1)
+
+    # Posición de cada mes al ordenar por residuo descendente (estable)
+    orden = np.argsort(-residuo, axis=1, kind='stable')
+    posicion = np.empty_like(orden)
+    np.put_along_axis(posicion, orden, np.arange(meses.shape[1])[None, :], axis=1)
+    return repartido + (posicion < faltante[:, None])
+
+
+def a_soles(centavos: Any) -> Any:
+    """
+    Céntimos a soles (float) para serializar; escalar o lista
+    """
+    if np.ndim(centavos):
+        return (np.asarray(centavos) / 100).tolist()
+    return int(centavos) / 100
+
+
+def sumar_grupos(centavos: np.ndarray, inicios: List[int]) -> np.ndarray:
+    """
+    Suma exacta de tramos consecutivos (inicios: primer índice de cada tramo)
+    """
+    return np.add.reduceat(np.asarray(centavos, dtype=np.int64), inicios)
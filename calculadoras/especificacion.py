@@ -0,0 +1,307 @@
+# calculadoras/especificacion.py
+"""
+Compilador de especificaciones declarativas de cultivos
+Una especificación (JSON) lista por fase los items de costo con su clave
+de precio, cantidad por hectárea, cantidad por QQ cosechado, montos fijos
+y la distribución por meses. Se compila una vez a una MatrizCantidades
+(cantidades por clave de PRECIOS), la misma que evalúa por lotes
+cacao_convencional.vectorial, más el desglose por item para las fichas.
+
+Formato:
+    {
+        "cultivo": "cacao_convencional",
+        "version": "1",
+        "fases": {
+            "instalacion": {
+                "indirectos": ["PORCENTAJE_IMPREVISTOS", ...],
+                "items": [
+                    {"categoria": "preparacion_terreno", "nombre": "Roce y quema",
+                     "precio": "jornal", "cantidad": 6, "unidad": "Jornal",
+                     "meses": {"ago": 240}}
+                ]
+            },
+            "produccion": {...}
+        }
+    }
+
+Las fases son "instalacion" y "produccion". Cada item usa "precio" +
+"cantidad" y/o "cantidad_por_qq" (solo producción), o "monto" (costo fijo
+por ha, solo producción). "meses" es la distribución del cronograma de la
+ficha: montos o pesos relativos que se normalizan.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Any, List, Tuple, Optional
+
+import numpy as np
+
+MESES = ['ago', 'sep', 'oct', 'nov', 'dic', 'ene', 'feb', 'mar', 'abr', 'may', 'jun', 'jul']
+
+DIRECTORIO_ESPECIFICACIONES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'especificaciones')
+
+FASES = ('instalacion', 'produccion')
+
+_CAMPOS_ITEM = {'categoria', 'nombre', 'precio', 'cantidad', 'cantidad_por_qq', 'monto', 'unidad', 'meses'}
+
+
+@dataclass(frozen=True)
+class MatrizCantidades:
+    """
+    Cantidades por hectárea consumidas de cada clave de PRECIOS
+
+    Los costos directos son lineales en los precios:
+        instalación = instalacion · precios
+        producción  = constante_produccion + produccion_fija · precios
+                      + qq · (produccion_por_qq · precios)
+    """
+    claves: Tuple[str, ...]
+    instalacion: np.ndarray
+    produccion_fija: np.ndarray
+    produccion_por_qq: np.ndarray
+    constante_produccion: float
+
+    def vector_precios(self, precios: Dict[str, float]) -> np.ndarray:
+        """
+        Ordena un dict de precios según las claves de la matriz
+
+        Args:
+            precios: Precios unitarios
+
+        Returns:
+            Vector (claves,) de precios
+        """
+        return np.array([precios[clave] for clave in self.claves], dtype=float)
+
+    def directos(self, fase: str, precios: np.ndarray, qq: Any = 0.0) -> np.ndarray:
+        """
+        Costos directos por ha de una fase
+
+        Args:
+            fase: 'instalacion' o 'produccion'
+            precios: Vector (claves,) o matriz (escenarios, claves)
+            qq: QQ cosechados por ha (producción), escalar o vector (escenarios,)
+
+        Returns:
+            Escalar o vector (escenarios,)
+        """
+        if fase == 'instalacion':
+            return precios @ self.instalacion
+        return self.constante_produccion + precios @ self.produccion_fija + qq * (precios @ self.produccion_por_qq)
+
+
+@dataclass(frozen=True)
+class FaseCompilada:
+    """
+    Items de una fase como arrays alineados, para el desglose por item
+
+    item_i = (cantidad_i + qq * cantidad_por_qq_i) * precio[indice_precio_i] + monto_i
+    """
+    nombres: Tuple[str, ...]
+    categorias: Tuple[str, ...]
+    unidades: Tuple[str, ...]
+    indice_precio: np.ndarray
+    cantidad: np.ndarray
+    cantidad_por_qq: np.ndarray
+    monto: np.ndarray
+    pesos_meses: np.ndarray
+    indice_categoria: np.ndarray
+    nombres_categorias: Tuple[str, ...]
+    porcentaje_indirecto: float
+
+    def cantidades_por_clave(self, claves: int, cantidades: np.ndarray) -> np.ndarray:
+        """
+        Suma las cantidades de los items por clave de precio
+
+        Returns:
+            Vector (claves,)
+        """
+        total = np.zeros(claves)
+        np.add.at(total, self.indice_precio, cantidades)
+        return total
+
+
+@dataclass(frozen=True)
+class CultivoCompilado:
+    """
+    Especificación compilada de un cultivo
+    """
+    cultivo: str
+    version: str
+    claves_precios: Tuple[str, ...]
+    cantidades: MatrizCantidades
+    fases: Dict[str, FaseCompilada]
+
+    def vector_precios(self, precios: Dict[str, float]) -> np.ndarray:
+        """
+        Ordena un dict de precios según claves_precios
+        """
+        return self.cantidades.vector_precios(precios)
+
+    def calcular(self, fase: str, precios: Dict[str, float], qq: float = 0.0,
+                 hectareas: float = 1.0) -> Dict[str, Any]:
+        """
+        Costos de una fase para un escenario, en el formato de dict de las calculadoras
+
+        Los totales salen de la MatrizCantidades; los items y el cronograma
+        (meses de la ficha) son su desglose.
+
+        Args:
+            fase: 'instalacion' o 'produccion'
+            precios: Dict de precios unitarios
+            qq: QQ cosechados por ha (producción)
+            hectareas: Número de hectáreas
+
+        Returns:
+            Dict con costos por categoría (items y total), cronograma y resumen
+
+        Raises:
+            ValueError: Si la fase no existe o hectareas no es positivo
+        """
+        if fase not in self.fases:
+            raise ValueError(f"Fase inválida: {fase}. Debe ser una de {list(self.fases)}")
+        if hectareas <= 0:
+            raise ValueError("El número de hectáreas debe ser mayor a 0")
+
+        compilada = self.fases[fase]
+        vector = self.vector_precios(precios)
+        items = ((compilada.cantidad + qq * compilada.cantidad_por_qq) * vector[compilada.indice_precio]
+                 + compilada.monto) * hectareas
+        por_categoria = np.zeros(len(compilada.nombres_categorias))
+        np.add.at(por_categoria, compilada.indice_categoria, items)
+        total_directos = float(self.cantidades.directos(fase, vector, qq)) * hectareas
+        total_indirectos = total_directos * compilada.porcentaje_indirecto
+
+        costos_directos = {categoria: {'items': [], 'total': 0.0} for categoria in compilada.nombres_categorias}
+        for i, nombre in enumerate(compilada.nombres):
+            categoria = compilada.categorias[i]
+            costos_directos[categoria]['items'].append({
+                'nombre': nombre,
+                'unidad': compilada.unidades[i],
+                'subtotal': round(float(items[i]), 2)
+            })
+        for j, categoria in enumerate(compilada.nombres_categorias):
+            costos_directos[categoria]['total'] = round(float(por_categoria[j]), 2)
+
+        return {
+            'cultivo': self.cultivo,
+            'fase': fase,
+            'hectareas': hectareas,
+            'costos_directos': costos_directos,
+            'cronograma': {mes: round(float(v), 2) for mes, v in zip(MESES, items @ compilada.pesos_meses)},
+            'resumen': {
+                'total_directos': round(total_directos, 2),
+                'total_indirectos': round(total_indirectos, 2),
+                'costo_total': round(total_directos + total_indirectos, 2)
+            }
+        }
+
+
+def _compilar_fase(nombre_fase: str, fase: Dict[str, Any], claves_precios: List[str],
+                   parametros: Any) -> FaseCompilada:
+    items = fase.get('items', [])
+    if not items:
+        raise ValueError(f"La fase {nombre_fase} no tiene items")
+
+    n = len(items)
+    indice_precio = np.zeros(n, dtype=np.int64)
+    cantidad = np.zeros(n)
+    cantidad_por_qq = np.zeros(n)
+    monto = np.zeros(n)
+    pesos = np.zeros((n, len(MESES)))
+    categorias: List[str] = []
+
+    for i, item in enumerate(items):
+        desconocidos = set(item) - _CAMPOS_ITEM
+        if desconocidos:
+            raise ValueError(f"Campos desconocidos en {nombre_fase}.{item.get('nombre')}: {sorted(desconocidos)}")
+        if nombre_fase == 'instalacion' and ('cantidad_por_qq' in item or 'monto' in item):
+            raise ValueError(f"El item {nombre_fase}.{item['nombre']} no puede tener cantidad_por_qq ni monto")
+        if 'precio' in item:
+            if item['precio'] not in claves_precios:
+                raise ValueError(f"Clave de precio desconocida en {nombre_fase}.{item['nombre']}: {item['precio']}")
+            indice_precio[i] = claves_precios.index(item['precio'])
+            cantidad[i] = item.get('cantidad', 0)
+            cantidad_por_qq[i] = item.get('cantidad_por_qq', 0)
+        elif 'cantidad' in item or 'cantidad_por_qq' in item:
+            raise ValueError(f"El item {nombre_fase}.{item['nombre']} tiene cantidad pero no precio")
+        monto[i] = item.get('monto', 0)
+
+        meses = item.get('meses') or {}
+        invalidos = set(meses) - set(MESES)
+        if invalidos or not meses or sum(meses.values()) <= 0:
+            raise ValueError(f"Distribución de meses inválida en {nombre_fase}.{item['nombre']}")
+        total_pesos = sum(meses.values())
+        for mes, peso in meses.items():
+            pesos[i, MESES.index(mes)] = peso / total_pesos
+
+        categorias.append(item['categoria'])
+
+    nombres_categorias = tuple(dict.fromkeys(categorias))
+    porcentaje = sum(getattr(parametros, nombre) for nombre in fase.get('indirectos', []))
+
+    return FaseCompilada(
+        nombres=tuple(item['nombre'] for item in items),
+        categorias=tuple(categorias),
+        unidades=tuple(item.get('unidad', '') for item in items),
+        indice_precio=indice_precio,
+        cantidad=cantidad,
+        cantidad_por_qq=cantidad_por_qq,
+        monto=monto,
+        pesos_meses=pesos,
+        indice_categoria=np.array([nombres_categorias.index(c) for c in categorias], dtype=np.int64),
+        nombres_categorias=nombres_categorias,
+        porcentaje_indirecto=float(porcentaje)
+    )
+
+
+def compilar_especificacion(especificacion: Dict[str, Any], parametros: Any) -> CultivoCompilado:
+    """
+    Compila una especificación declarativa a una MatrizCantidades
+
+    Args:
+        especificacion: Dict con el formato descrito en el módulo
+        parametros: Módulo o namespace con PRECIOS y los porcentajes indirectos
+
+    Returns:
+        CultivoCompilado
+
+    Raises:
+        ValueError: Si la especificación no es válida
+    """
+    fases = especificacion.get('fases')
+    if not isinstance(fases, dict) or sorted(fases) != sorted(FASES):
+        raise ValueError(f"La especificación debe definir las fases {list(FASES)}")
+    claves_precios = list(parametros.PRECIOS)
+    compiladas = {nombre: _compilar_fase(nombre, fases[nombre], claves_precios, parametros) for nombre in FASES}
+
+    k = len(claves_precios)
+    instalacion, produccion = compiladas['instalacion'], compiladas['produccion']
+    return CultivoCompilado(
+        cultivo=especificacion.get('cultivo', ''),
+        version=str(especificacion.get('version', '')),
+        claves_precios=tuple(claves_precios),
+        cantidades=MatrizCantidades(
+            claves=tuple(claves_precios),
+            instalacion=instalacion.cantidades_por_clave(k, instalacion.cantidad),
+            produccion_fija=produccion.cantidades_por_clave(k, produccion.cantidad),
+            produccion_por_qq=produccion.cantidades_por_clave(k, produccion.cantidad_por_qq),
+            constante_produccion=float(produccion.monto.sum())
+        ),
+        fases=compiladas
+    )
+
+
+def cargar_especificacion(nombre: str, directorio: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Lee especificaciones/<nombre>.json
+
+    Raises:
+        ValueError: Si el archivo no existe
+    """
+    ruta = os.path.join(directorio or DIRECTORIO_ESPECIFICACIONES, f'{nombre}.json')
+    if not os.path.exists(ruta):
+        raise ValueError(f"Especificación no encontrada: {ruta}")
+    with open(ruta, encoding='utf-8') as archivo:
+        return json.load(archivo)
@@ -0,0 +1,249 @@
+# calculadoras/parametros_externos.py
+"""
+Conjuntos de parámetros versionados en archivos JSON/TOML por cultivo y región
+Permiten actualizar precios, productividad y porcentajes sin desplegar código:
+los procesos de larga duración recargan el archivo cuando cambia su mtime.
+
+Estructura:
+    conjuntos_parametros/<cultivo>/<region>.json (o .toml)
+    {
+        "version": "2025.1",
+        "parametros": {"PRECIOS": {"jornal": 40.0}, "TASA_DESCUENTO": 0.10}
+    }
+
+Los valores del archivo se aplican sobre el módulo <cultivo>/parametros.py:
+los dict se combinan clave a clave y el resto se reemplaza.
+"""
+
+import copy
+import importlib
+import json
+import os
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+from .versionado import huella_parametros, parametros_publicos
+
+DIRECTORIO_DEFECTO = os.environ.get(
+    'ECOMODEL_PARAMETROS',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'conjuntos_parametros')
+)
+
+# Segundos entre revisiones de mtime de un mismo conjunto
+INTERVALO_REVISION_DEFECTO = 1.0
+
+EXTENSIONES = ('.json', '.toml')
+
+
+def normalizar_region(region: str) -> str:
+    """
+    Nombre de archivo de una región ('La Convención' -> 'la_convencion')
+    """
+    sin_tildes = unicodedata.normalize('NFKD', region).encode('ascii', 'ignore').decode('ascii')
+    return sin_tildes.strip().lower().replace(' ', '_')
+
+
+@dataclass(frozen=True)
+class ConjuntoParametros:
+    """
+    Conjunto de parámetros compilado e inmutable
+
+    Se reemplaza completo al recargar, por lo que un cálculo en curso
+    sigue usando la instancia con la que empezó.
+    """
+    cultivo: str
+    region: str
+    version: str
+    huella: str
+    ruta: Optional[str]
+    mtime_ns: int
+    valores: SimpleNamespace = field(repr=False)
+    claves_precios: Tuple[str, ...] = field(repr=False)
+    vector_precios: Tuple[float, ...] = field(repr=False)
+
+    def a_dict(self) -> Dict[str, Any]:
+        """
+        Metadatos del conjunto (sin los valores)
+        """
+        return {
+            'cultivo': self.cultivo,
+            'region': self.region,
+            'version': self.version,
+            'huella': self.huella,
+            'ruta': self.ruta
+        }
+
+
+def _leer_archivo(ruta: str) -> Dict[str, Any]:
+    if ruta.endswith('.toml'):
+        if tomllib is None:
+            raise ValueError(f"Leer {ruta} requiere Python 3.11+ (tomllib)")
+        with open(ruta, 'rb') as archivo:
+            return tomllib.load(archivo)
+    with open(ruta, encoding='utf-8') as archivo:
+        return json.load(archivo)
+
+
+def compilar_conjunto(cultivo: str, region: str, ruta: Optional[str]) -> ConjuntoParametros:
+    """
+    Combina el archivo de parámetros con los valores por defecto del cultivo
+
+    Args:
+        cultivo: Paquete de calculadora (ejemplo: 'cacao_convencional')
+        region: Región del conjunto
+        ruta: Archivo JSON/TOML, o None para usar solo el módulo parametros
+
+    Returns:
+        ConjuntoParametros compilado
+
+    Raises:
+        ValueError: Si el archivo no es válido o define parámetros desconocidos
+    """
+    modulo = importlib.import_module(f'calculadoras.{cultivo}.parametros')
+    valores = copy.deepcopy(parametros_publicos(modulo))
+    version = 'modulo'
+    mtime_ns = 0
+
+    if ruta is not None:
+        mtime_ns = os.stat(ruta).st_mtime_ns
+        try:
+            contenido = _leer_archivo(ruta)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Archivo de parámetros inválido {ruta}: {e}") from e
+        if not isinstance(contenido.get('parametros'), dict) or 'version' not in contenido:
+            raise ValueError(f"{ruta} debe definir 'version' y el objeto 'parametros'")
+
+        version = str(contenido['version'])
+        for nombre, valor in contenido['parametros'].items():
+            if nombre not in valores:
+                raise ValueError(f"Parámetro desconocido en {ruta}: {nombre}")
+            if isinstance(valores[nombre], dict) and isinstance(valor, dict):
+                desconocidas = set(valor) - set(valores[nombre])
+                if desconocidas:
+                    raise ValueError(f"Claves desconocidas de {nombre} en {ruta}: {sorted(desconocidas)}")
+                valores[nombre] = {**valores[nombre], **valor}
+            else:
+                valores[nombre] = valor
+
+    precios = valores.get('PRECIOS', {})
+    return ConjuntoParametros(
+        cultivo=cultivo,
+        region=region,
+        version=version,
+        huella=huella_parametros(valores),
+        ruta=ruta,
+        mtime_ns=mtime_ns,
+        valores=SimpleNamespace(**valores),
+        claves_precios=tuple(precios),
+        vector_precios=tuple(float(v) for v in precios.values())
+    )
+
+
+class CargadorParametros:
+    """
+    Cache de conjuntos por (cultivo, región) con recarga por mtime
+
+    Las lecturas no toman el lock: devuelven la referencia vigente. Solo
+    un hilo recarga un archivo modificado; mientras tanto los demás siguen
+    usando el conjunto anterior. Si el archivo nuevo es inválido se
+    conserva el conjunto anterior y el error queda en `errores`.
+    """
+
+    def __init__(self, directorio: str = None, intervalo_revision: float = INTERVALO_REVISION_DEFECTO):
+        """
+        Args:
+            directorio: Raíz de los archivos (default: conjuntos_parametros/
+                o la variable de entorno ECOMODEL_PARAMETROS)
+            intervalo_revision: Segundos mínimos entre revisiones de mtime
+        """
+        self.directorio = DIRECTORIO_DEFECTO if directorio is None else directorio
+        self.intervalo_revision = intervalo_revision
+        self.errores: Dict[Tuple[str, str], str] = {}
+        self._conjuntos: Dict[Tuple[str, str], ConjuntoParametros] = {}
+        self._revisado: Dict[Tuple[str, str], float] = {}
+        self._bloqueo = threading.Lock()
+
+    def ruta(self, cultivo: str, region: str) -> Optional[str]:
+        """
+        Archivo de parámetros de un cultivo y región, si existe
+        """
+        base = os.path.join(self.directorio, cultivo, normalizar_region(region))
+        for extension in EXTENSIONES:
+            if os.path.exists(base + extension):
+                return base + extension
+        return None
+
+    def obtener(self, cultivo: str, region: str) -> ConjuntoParametros:
+        """
+        Conjunto vigente (recarga si el archivo cambió)
+
+        Args:
+            cultivo: Paquete de calculadora (ejemplo: 'cacao_convencional')
+            region: Región (ejemplo: 'Cusco')
+
+        Returns:
+            ConjuntoParametros
+
+        Raises:
+            ValueError: Si no hay conjunto previo y el archivo es inválido
+        """
+        clave = (cultivo, normalizar_region(region))
+        actual = self._conjuntos.get(clave)
+        ahora = time.monotonic()
+        if actual is not None and ahora - self._revisado.get(clave, 0) < self.intervalo_revision:
+            return actual
+
+        ruta = self.ruta(cultivo, region)
+        mtime_ns = os.stat(ruta).st_mtime_ns if ruta is not None else 0
+        if actual is not None and actual.ruta == ruta and actual.mtime_ns == mtime_ns:
+            self._revisado[clave] = ahora
+            return actual
+
+        # Sin conjunto previo se espera la carga; con conjunto previo, si otro
+        # hilo ya está recargando se sigue usando el anterior
+        if not self._bloqueo.acquire(blocking=actual is None):
+            return actual
+        try:
+            vigente = self._conjuntos.get(clave)
+            if vigente is not None and vigente is not actual:
+                return vigente
+            try:
+                nuevo = compilar_conjunto(cultivo, region, ruta)
+            except ValueError as e:
+                if actual is None:
+                    raise
+                self.errores[clave] = str(e)
+                self._revisado[clave] = ahora
+                return actual
+            self.errores.pop(clave, None)
+            self._conjuntos[clave] = nuevo
+            self._revisado[clave] = ahora
+            return nuevo
+        finally:
+            self._bloqueo.release()
+
+
+_cargador = CargadorParametros()
+
+
+def obtener_parametros(cultivo: str, region: str) -> ConjuntoParametros:
+    """
+    Conjunto vigente del cargador compartido del proceso
+
+    Args:
+        cultivo: Paquete de calculadora (ejemplo: 'cacao_convencional')
+        region: Región (ejemplo: 'Cusco')
+
+    Returns:
+        ConjuntoParametros
+    """
+    return _cargador.obtener(cultivo, region)
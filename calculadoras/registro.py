@@ -0,0 +1,171 @@
+# calculadoras/registro.py
+"""
+Registro de calculadoras por categoria_id / cultivo_id (tabla cultivos)
+Los paquetes y especificaciones se importan y compilan solo cuando se
+pide el cultivo, y se reutilizan durante la vida del proceso.
+"""
+
+import importlib
+import threading
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Dict, Any, List, Optional, Tuple
+
+from .parametros_externos import obtener_parametros
+
+
+@dataclass(frozen=True)
+class EntradaCultivo:
+    """
+    Cómo calcular un cultivo
+
+    Atributos:
+        nombre: Nombre en la tabla cultivos
+        paquete: Subpaquete de calculadoras con parametros.py (o None)
+        calculadora: Clase de ficha técnica dentro del paquete (o None)
+        especificacion: Archivo especificaciones/<nombre>.json (o None)
+        region: Región por defecto de los parámetros
+    """
+    nombre: str
+    paquete: Optional[str] = None
+    calculadora: Optional[str] = None
+    especificacion: Optional[str] = None
+    region: str = 'Cusco'
+
+
+# (categoria_id, cultivo_id) -> EntradaCultivo
+REGISTRO: Dict[Tuple[str, int], EntradaCultivo] = {
+    ('PEREN_SEMI', 45): EntradaCultivo(
+        nombre='cacao (convencional)',
+        paquete='cacao_convencional',
+        calculadora='CalculadoraCacaoConvencional',
+        especificacion='cacao_convencional'
+    ),
+}
+
+_bloqueo = threading.Lock()
+_calculadoras: Dict[Tuple[str, int], Any] = {}
+_compilados: Dict[Tuple[str, int, str], Any] = {}
+
+
+def _clave(categoria_id: str, cultivo_id: Any) -> Tuple[str, int]:
+    try:
+        clave = (categoria_id, int(cultivo_id))
+    except (TypeError, ValueError):
+        raise ValueError(f"cultivo_id inválido: {cultivo_id}")
+    if clave not in REGISTRO:
+        raise ValueError(f"No hay calculadora registrada para {categoria_id}/{cultivo_id}")
+    return clave
+
+
+def registrar(categoria_id: str, cultivo_id: int, entrada: EntradaCultivo) -> None:
+    """
+    Agrega o reemplaza un cultivo en el registro (sin importarlo)
+    """
+    with _bloqueo:
+        clave = (categoria_id, int(cultivo_id))
+        REGISTRO[clave] = entrada
+        _calculadoras.pop(clave, None)
+        for compilado in [c for c in _compilados if c[:2] == clave]:
+            del _compilados[compilado]
+
+
+def cultivos_registrados() -> List[Dict[str, Any]]:
+    """
+    Cultivos con calculadora, sin importar ninguno
+
+    Returns:
+        Lista de dicts con categoria_id, cultivo_id, nombre y qué ofrece
+    """
+    return [
+        {
+            'categoria_id': categoria_id,
+            'cultivo_id': cultivo_id,
+            'nombre': entrada.nombre,
+            'ficha_tecnica': entrada.calculadora is not None,
+            'especificacion': entrada.especificacion is not None
+        }
+        for (categoria_id, cultivo_id), entrada in sorted(REGISTRO.items())
+    ]
+
+
+def obtener_calculadora(categoria_id: str, cultivo_id: Any):
+    """
+    Clase de ficha técnica del cultivo (importa su paquete la primera vez)
+
+    Raises:
+        ValueError: Si el cultivo no está registrado o no tiene ficha técnica
+    """
+    clave = _clave(categoria_id, cultivo_id)
+    if clave not in _calculadoras:
+        entrada = REGISTRO[clave]
+        if entrada.paquete is None or entrada.calculadora is None:
+            raise ValueError(f"{entrada.nombre} no tiene calculadora de ficha técnica")
+        modulo = importlib.import_module(f'calculadoras.{entrada.paquete}')
+        _calculadoras[clave] = getattr(modulo, entrada.calculadora)
+    return _calculadoras[clave]
+
+
+def obtener_especificacion(categoria_id: str, cultivo_id: Any, region: str = None):
+    """
+    Especificación compilada del cultivo con los parámetros vigentes de la región
+
+    Se recompila solo si cambia el conjunto de parámetros (ver parametros_externos).
+
+    Returns:
+        CultivoCompilado
+
+    Raises:
+        ValueError: Si el cultivo no está registrado o no tiene especificación
+    """
+    clave = _clave(categoria_id, cultivo_id)
+    entrada = REGISTRO[clave]
+    if entrada.especificacion is None:
+        raise ValueError(f"{entrada.nombre} no tiene especificación declarativa")
+
+    from .especificacion import cargar_especificacion, compilar_especificacion
+
+    region = region or entrada.region
+    if entrada.paquete is not None:
+        parametros = obtener_parametros(entrada.paquete, region)
+        huella, valores = parametros.huella, parametros.valores
+    else:
+        huella, valores = '', None
+
+    clave_compilado = clave + (huella,)
+    if clave_compilado not in _compilados:
+        especificacion = cargar_especificacion(entrada.especificacion)
+        if valores is None:
+            # Cultivo sin paquete: precios y porcentajes en la especificación
+            valores = SimpleNamespace(PRECIOS=especificacion['precios'], **especificacion.get('porcentajes', {}))
+        compilado = compilar_especificacion(especificacion, valores)
+        with _bloqueo:
+            _compilados[clave_compilado] = compilado
+    return _compilados[clave_compilado]
+
+
+def buscar_cultivo(cultivo: Any, categoria_id: str = None) -> Tuple[str, int]:
+    """
+    Clave (categoria_id, cultivo_id) a partir de un id, nombre o paquete
+
+    Args:
+        cultivo: cultivo_id ('45'), nombre en la tabla cultivos o paquete
+            ('cacao_convencional')
+        categoria_id: Restringe la búsqueda a una categoría
+
+    Raises:
+        ValueError: Si no hay coincidencia o es ambigua
+    """
+    texto = str(cultivo).strip()
+    buscado = texto.lower()
+    coincidencias = [
+        clave for clave, entrada in REGISTRO.items()
+        if (categoria_id is None or clave[0] == categoria_id)
+        and (str(clave[1]) == texto or entrada.nombre.lower() == buscado
+             or (entrada.paquete or '').lower() == buscado)
+    ]
+    if not coincidencias:
+        raise ValueError(f"Cultivo sin calculadora registrada: {cultivo}")
+    if len(coincidencias) > 1:
+        raise ValueError(f"Cultivo ambiguo, indique categoria_id: {cultivo}")
+    return coincidencias[0]
@@ -0,0 +1,247 @@
+# calculadoras/resumen_fichas.py
+"""
+Tabla resumen indexada de las fichas guardadas en fichas_tecnicas.db
+Extrae las métricas clave de datos_json a columnas tipadas para que los
+agregados del dashboard no tengan que decodificar cada blob JSON.
+
+Uso:
+    python -m calculadoras.resumen_fichas actualizar
+    python -m calculadoras.resumen_fichas consultar provincia,cultivo_id [avg|sum|min|max|count]
+"""
+
+import json
+import sqlite3
+import sys
+from typing import Dict, Any, List, Optional
+
+from .almacenamiento import AlmacenFichas, DATOS_PARAMETRICOS, RUTA_BD, ESPERA_BLOQUEO_MS
+
+MESES = ['ago', 'sep', 'oct', 'nov', 'dic', 'ene', 'feb', 'mar', 'abr', 'may', 'jun', 'jul']
+
+# Métricas: columna -> (sección de la ficha, clave)
+METRICAS = {
+    'inversion_inicial': ('analisis_financiero', 'inversion_inicial'),
+    'van': ('analisis_financiero', 'van_tasa_10_pct'),
+    'tir': ('analisis_financiero', 'tir_porcentaje'),
+    'roi_anual': ('analisis_financiero', 'roi_anual_porcentaje'),
+    'roi_15años': ('analisis_financiero', 'roi_15años_porcentaje'),
+    'utilidad_anual': ('analisis_financiero', 'utilidad_anual_promedio'),
+    'utilidad_neta_15años': ('analisis_financiero', 'utilidad_neta_15años'),
+}
+
+COLUMNAS_MESES = [f'mes_{mes}' for mes in MESES]
+DIMENSIONES = ['categoria_id', 'cultivo_id', 'provincia', 'modo_sensibilizado']
+FUNCIONES = ['sum', 'avg', 'min', 'max', 'count']
+
+
+def cronograma_instalacion(datos: Dict[str, Any]) -> Optional[Dict[str, float]]:
+    """
+    Cronograma mensual de la inversión (costos directos + indirectos de instalación)
+
+    Args:
+        datos: datos_json de la ficha
+
+    Returns:
+        Dict mes -> monto, o None si la ficha no tiene el detalle de instalación
+    """
+    detalle = datos.get('costos_instalacion_detallado')
+    if not isinstance(detalle, dict):
+        return None
+
+    cronograma = {mes: 0.0 for mes in MESES}
+    conceptos = [item for categoria in detalle.get('costos_directos', []) for item in categoria['items']]
+    conceptos += detalle.get('costos_indirectos', [])
+    for concepto in conceptos:
+        for mes, monto in concepto.get('meses', {}).items():
+            cronograma[mes] += monto
+    return {mes: round(monto, 2) for mes, monto in cronograma.items()}
+
+
+def extraer_resumen(datos: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Métricas clave de una ficha (None si la versión de la ficha no las tiene)
+
+    Args:
+        datos: datos_json de la ficha
+
+    Returns:
+        Dict columna -> valor con modo_sensibilizado, METRICAS y COLUMNAS_MESES
+    """
+    resumen = {'modo_sensibilizado': datos.get('modo_sensibilizado')}
+    for columna, (seccion, clave) in METRICAS.items():
+        resumen[columna] = datos.get(seccion, {}).get(clave)
+
+    cronograma = cronograma_instalacion(datos)
+    for mes, columna in zip(MESES, COLUMNAS_MESES):
+        resumen[columna] = cronograma[mes] if cronograma else None
+    return resumen
+
+
+class ResumenFichas:
+    """
+    Mantiene la tabla resumen_fichas y responde consultas agregadas
+
+    La tabla se actualiza incrementalmente: solo se procesan los id_ficha
+    mayores al último resumido (y se eliminan los de fichas borradas).
+    """
+
+    def __init__(self, ruta: str = None):
+        """
+        Args:
+            ruta: Archivo SQLite (default: fichas_tecnicas.db en la raíz del proyecto)
+        """
+        self.ruta = RUTA_BD if ruta is None else ruta
+        self._conexion: Optional[sqlite3.Connection] = None
+
+    def _conectar(self) -> sqlite3.Connection:
+        if self._conexion is None:
+            conexion = sqlite3.connect(self.ruta, timeout=ESPERA_BLOQUEO_MS / 1000, isolation_level=None)
+            conexion.execute(f'PRAGMA busy_timeout = {ESPERA_BLOQUEO_MS}')
+            columnas = ',\n'.join(f'"{columna}" REAL' for columna in list(METRICAS) + COLUMNAS_MESES)
+            conexion.execute(f'''
+                CREATE TABLE IF NOT EXISTS resumen_fichas (
+                    id_ficha INTEGER PRIMARY KEY,
+                    categoria_id TEXT,
+                    cultivo_id TEXT,
+                    provincia TEXT,
+                    hectareas REAL,
+                    modo_sensibilizado INTEGER,
+                    {columnas},
+                    FOREIGN KEY (id_ficha) REFERENCES fichas_tecnicas(id_ficha)
+                )
+            ''')
+            for dimension in ['categoria_id, cultivo_id', 'provincia', 'cultivo_id']:
+                nombre = 'idx_resumen_' + dimension.replace(', ', '_')
+                conexion.execute(f'CREATE INDEX IF NOT EXISTS {nombre} ON resumen_fichas ({dimension})')
+            self._conexion = conexion
+        return self._conexion
+
+    def actualizar(self) -> Dict[str, int]:
+        """
+        Resume las fichas nuevas y elimina las de fichas borradas
+
+        Returns:
+            Dict con fichas agregadas y eliminadas
+        """
+        conexion = self._conectar()
+        ultimo = conexion.execute('SELECT COALESCE(MAX(id_ficha), 0) FROM resumen_fichas').fetchone()[0]
+        filas = conexion.execute(
+            'SELECT id_ficha, categoria_id, cultivo_id, provincia, hectareas, datos_json '
+            'FROM fichas_tecnicas WHERE id_ficha > ? ORDER BY id_ficha', (ultimo,)
+        ).fetchall()
+
+        almacen = AlmacenFichas(self.ruta)
+        registros = []
+        try:
+            for id_ficha, categoria_id, cultivo_id, provincia, hectareas, datos_json in filas:
+                if datos_json == DATOS_PARAMETRICOS:
+                    datos = almacen.leer(id_ficha)
+                else:
+                    datos = json.loads(datos_json)
+                resumen = extraer_resumen(datos)
+                registros.append(
+                    (id_ficha, categoria_id, None if cultivo_id is None else str(cultivo_id), provincia, hectareas)
+                    + tuple(resumen[columna] for columna in ['modo_sensibilizado'] + list(METRICAS) + COLUMNAS_MESES)
+                )
+        finally:
+            almacen.cerrar()
+
+        marcadores = ', '.join('?' * (6 + len(METRICAS) + len(COLUMNAS_MESES)))
+        conexion.execute('BEGIN IMMEDIATE')
+        try:
+            conexion.executemany(f'INSERT OR REPLACE INTO resumen_fichas VALUES ({marcadores})', registros)
+            eliminadas = conexion.execute(
+                'DELETE FROM resumen_fichas WHERE id_ficha NOT IN (SELECT id_ficha FROM fichas_tecnicas)'
+            ).rowcount
+            conexion.execute('COMMIT')
+        except Exception:
+            conexion.execute('ROLLBACK')
+            raise
+        return {'agregadas': len(registros), 'eliminadas': eliminadas}
+
+    def consultar(self, agrupar_por: List[str] = None, metricas: List[str] = None,
+                  funcion: str = 'avg', filtros: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """
+        Agregado de métricas por dimensiones
+
+        Args:
+            agrupar_por: Dimensiones (ver DIMENSIONES); None para un total general
+            metricas: Columnas a agregar (default: todas las METRICAS y meses)
+            funcion: 'sum', 'avg', 'min', 'max' o 'count'
+            filtros: Dict dimensión -> valor (igualdad)
+
+        Returns:
+            Lista de filas (dict) con las dimensiones, 'fichas' y las métricas
+
+        Raises:
+            ValueError: Si alguna dimensión, métrica o función no es válida
+        """
+        agrupar_por = list(agrupar_por or [])
+        metricas = list(METRICAS) + COLUMNAS_MESES if metricas is None else list(metricas)
+        filtros = filtros or {}
+        if funcion not in FUNCIONES:
+            raise ValueError(f"Función inválida: {funcion}. Debe ser una de {FUNCIONES}")
+        for dimension in agrupar_por + list(filtros):
+            if dimension not in DIMENSIONES:
+                raise ValueError(f"Dimensión inválida: {dimension}. Debe ser una de {DIMENSIONES}")
+        for metrica in metricas:
+            if metrica not in METRICAS and metrica not in COLUMNAS_MESES and metrica != 'hectareas':
+                raise ValueError(f"Métrica inválida: {metrica}")
+
+        seleccion = agrupar_por + ['COUNT(*)'] + [f'{funcion.upper()}("{m}")' for m in metricas]
+        sql = f'SELECT {", ".join(seleccion)} FROM resumen_fichas'
+        if filtros:
+            sql += ' WHERE ' + ' AND '.join(f'{dimension} = ?' for dimension in filtros)
+        if agrupar_por:
+            sql += f' GROUP BY {", ".join(agrupar_por)} ORDER BY {", ".join(agrupar_por)}'
+
+        resultado = []
+        for fila in self._conectar().execute(sql, list(filtros.values())):
+            resultado.append(dict(zip(agrupar_por + ['fichas'] + metricas, fila)))
+        return resultado
+
+    def demanda_mensual(self, agrupar_por: List[str] = None,
+                        filtros: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """
+        Suma del cronograma de inversión por mes (fichas con detalle de instalación)
+        """
+        filas = self.consultar(agrupar_por, COLUMNAS_MESES, 'sum', filtros)
+        return [
+            {**{clave: fila[clave] for clave in (agrupar_por or []) + ['fichas']},
+             'meses': {mes: round(fila[columna] or 0, 2) for mes, columna in zip(MESES, COLUMNAS_MESES)}}
+            for fila in filas
+        ]
+
+    def cerrar(self) -> None:
+        if self._conexion is not None:
+            self._conexion.close()
+            self._conexion = None
+
+
+def main():
+    argumentos = sys.argv[1:]
+    if not argumentos:
+        print(__doc__)
+        sys.exit(1)
+
+    resumen = ResumenFichas()
+    try:
+        if argumentos[0] == 'actualizar':
+            resultado = resumen.actualizar()
+        elif argumentos[0] == 'consultar':
+            agrupar_por = argumentos[1].split(',') if len(argumentos) > 1 and argumentos[1] else None
+            funcion = argumentos[2] if len(argumentos) > 2 else 'avg'
+            resumen.actualizar()
+            resultado = resumen.consultar(agrupar_por, funcion=funcion)
+        else:
+            raise ValueError(f"Comando inválido: {argumentos[0]}")
+        print(json.dumps(resultado, ensure_ascii=False, default=str))
+    except Exception as e:
+        print(json.dumps({"error": str(e), "type": type(e).__name__}))
+        sys.exit(1)
+    finally:
+        resumen.cerrar()
+
+
+if __name__ == '__main__':
+    main()
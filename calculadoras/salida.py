@@ -0,0 +1,211 @@
+# calculadoras/salida.py
+"""
+Capa de salida de las calculadoras hacia Node.js
+JSON compacto escrito por bloques, deduplicación de los cálculos
+alternativos y empaquetado binario estilo MessagePack
+"""
+
+import json
+import struct
+from typing import Dict, Any, IO
+
+# Marcador que reemplaza el modo alterno idéntico a la ficha activa
+REFERENCIA_ACTIVA = {'$ref': '#'}
+
+TAMAÑO_BLOQUE_DEFECTO = 64 * 1024
+
+# Claves de la ficha que no forman parte del resultado de un modo
+_CLAVES_CONTROL = ('modo_sensibilizado', 'calculos_alternativos')
+
+
+def deduplicar_alternativos(ficha: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reemplaza por una referencia el modo alterno igual a la ficha activa
+
+    generar_ficha_tecnica devuelve el modo activo dos veces: en la raíz y
+    dentro de calculos_alternativos. La copia se sustituye por
+    REFERENCIA_ACTIVA ('#' = secciones de la raíz de la ficha).
+
+    Args:
+        ficha: Ficha técnica generada
+
+    Returns:
+        Nueva ficha (no modifica la original)
+    """
+    alternativos = ficha.get('calculos_alternativos')
+    if not isinstance(alternativos, dict):
+        return ficha
+
+    activo = {clave: valor for clave, valor in ficha.items() if clave not in _CLAVES_CONTROL}
+    deduplicados = {
+        modo: REFERENCIA_ACTIVA if resultado == activo else resultado
+        for modo, resultado in alternativos.items()
+    }
+    return {**ficha, 'calculos_alternativos': deduplicados}
+
+
+def resolver_referencias(ficha: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Inverso de deduplicar_alternativos
+
+    Args:
+        ficha: Ficha con referencias
+
+    Returns:
+        Nueva ficha con los modos alternos completos
+    """
+    alternativos = ficha.get('calculos_alternativos')
+    if not isinstance(alternativos, dict):
+        return ficha
+
+    activo = {clave: valor for clave, valor in ficha.items() if clave not in _CLAVES_CONTROL}
+    resueltos = {
+        modo: activo if resultado == REFERENCIA_ACTIVA else resultado
+        for modo, resultado in alternativos.items()
+    }
+    return {**ficha, 'calculos_alternativos': resueltos}
+
+
+# ===== JSON =====
+
+def serializar_json(datos: Any) -> str:
+    """
+    Serializa a JSON compacto (sin espacios tras separadores)
+
+    Args:
+        datos: Objeto a serializar
+
+    Returns:
+        Texto JSON
+    """
+    return json.dumps(datos, separators=(',', ':'), default=str)
+
+
+def escribir_json(datos: Any, destino: IO[str], compacto: bool = True,
+                  tamaño_bloque: int = TAMAÑO_BLOQUE_DEFECTO) -> int:
+    """
+    Serializa a JSON y escribe en bloques a medida que se codifica
+
+    Args:
+        datos: Objeto a serializar
+        destino: Flujo de texto (ejemplo: sys.stdout)
+        compacto: Si True, sin indentación ni espacios tras separadores
+        tamaño_bloque: Caracteres acumulados antes de cada escritura
+
+    Returns:
+        Número de caracteres escritos
+    """
+    if compacto:
+        encoder = json.JSONEncoder(separators=(',', ':'), default=str)
+    else:
+        encoder = json.JSONEncoder(indent=2, default=str)
+
+    escritos = 0
+    bloque = []
+    acumulado = 0
+    for fragmento in encoder.iterencode(datos):
+        bloque.append(fragmento)
+        acumulado += len(fragmento)
+        if acumulado >= tamaño_bloque:
+            escritos += destino.write(''.join(bloque))
+            bloque = []
+            acumulado = 0
+    if bloque:
+        escritos += destino.write(''.join(bloque))
+    destino.write('\n')
+    destino.flush()
+    return escritos + 1
+
+
+# ===== MESSAGEPACK =====
+
+def _empaquetar(valor: Any, partes: list) -> None:
+    if valor is None:
+        partes.append(b'\xc0')
+    elif valor is True:
+        partes.append(b'\xc3')
+    elif valor is False:
+        partes.append(b'\xc2')
+    elif isinstance(valor, int):
+        if 0 <= valor < 0x80:
+            partes.append(struct.pack('B', valor))
+        elif -32 <= valor < 0:
+            partes.append(struct.pack('b', valor))
+        elif -2 ** 63 <= valor < 2 ** 63:
+            partes.append(b'\xd3' + struct.pack('>q', valor))
+        else:
+            raise ValueError(f"Entero fuera de rango para MessagePack: {valor}")
+    elif isinstance(valor, float):
+        partes.append(b'\xcb' + struct.pack('>d', valor))
+    elif isinstance(valor, str):
+        datos = valor.encode('utf-8')
+        n = len(datos)
+        if n < 32:
+            partes.append(struct.pack('B', 0xa0 | n))
+        elif n < 0x100:
+            partes.append(b'\xd9' + struct.pack('B', n))
+        elif n < 0x10000:
+            partes.append(b'\xda' + struct.pack('>H', n))
+        else:
+            partes.append(b'\xdb' + struct.pack('>I', n))
+        partes.append(datos)
+    elif isinstance(valor, (list, tuple)):
+        n = len(valor)
+        if n < 16:
+            partes.append(struct.pack('B', 0x90 | n))
+        elif n < 0x10000:
+            partes.append(b'\xdc' + struct.pack('>H', n))
+        else:
+            partes.append(b'\xdd' + struct.pack('>I', n))
+        for elemento in valor:
+            _empaquetar(elemento, partes)
+    elif isinstance(valor, dict):
+        n = len(valor)
+        if n < 16:
+            partes.append(struct.pack('B', 0x80 | n))
+        elif n < 0x10000:
+            partes.append(b'\xde' + struct.pack('>H', n))
+        else:
+            partes.append(b'\xdf' + struct.pack('>I', n))
+        for clave, elemento in valor.items():
+            _empaquetar(str(clave), partes)
+            _empaquetar(elemento, partes)
+    else:
+        # Igual que default=str en la salida JSON
+        _empaquetar(str(valor), partes)
+
+
+def empaquetar_msgpack(datos: Any) -> bytes:
+    """
+    Codifica un objeto en formato MessagePack (sin dependencias externas)
+
+    Soporta None, bool, int, float, str, list/tuple y dict; otros tipos
+    se convierten a str.
+
+    Args:
+        datos: Objeto a codificar
+
+    Returns:
+        Bytes MessagePack
+    """
+    partes = []
+    _empaquetar(datos, partes)
+    return b''.join(partes)
+
+
+def escribir_msgpack(datos: Any, destino: IO[bytes]) -> int:
+    """
+    Escribe un marco binario: longitud (uint32 big-endian) + MessagePack
+
+    Args:
+        datos: Objeto a codificar
+        destino: Flujo binario (ejemplo: sys.stdout.buffer)
+
+    Returns:
+        Número de bytes escritos
+    """
+    cuerpo = empaquetar_msgpack(datos)
+    destino.write(struct.pack('>I', len(cuerpo)))
+    destino.write(cuerpo)
+    destino.flush()
+    return 4 + len(cuerpo)
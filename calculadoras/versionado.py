@@ -0,0 +1,123 @@
+# calculadoras/versionado.py
+"""
+Huellas de versión de parámetros y calculadoras
+Permiten saber si una ficha guardada o cacheada sigue vigente
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from types import ModuleType
+from typing import Dict, Any, List
+
+from . import __version__
+
+
+def _canonico(valor: Any) -> str:
+    return json.dumps(valor, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def parametros_publicos(modulo: ModuleType) -> Dict[str, Any]:
+    """
+    Constantes públicas (nombres en MAYÚSCULAS) de un módulo de parámetros
+
+    Args:
+        modulo: Módulo de parámetros (ejemplo: cacao_convencional.parametros)
+
+    Returns:
+        Dict nombre -> valor
+    """
+    return {
+        nombre: valor for nombre, valor in vars(modulo).items()
+        if nombre.isupper() and not nombre.startswith('_')
+    }
+
+
+def huella_parametros(parametros: Any) -> str:
+    """
+    Hash SHA-256 del conjunto de parámetros
+
+    Args:
+        parametros: Módulo de parámetros o dict nombre -> valor
+
+    Returns:
+        Hash hexadecimal
+    """
+    if isinstance(parametros, ModuleType):
+        parametros = parametros_publicos(parametros)
+    return hashlib.sha256(_canonico(parametros).encode('utf-8')).hexdigest()
+
+
+# Módulos de calculadoras/ que intervienen en cualquier ficha (clases base,
+# céntimos, serialización y carga de conjuntos de parámetros)
+MODULOS_COMPARTIDOS = ('base_calculadora.py', 'centavos.py', 'salida.py', 'parametros_externos.py')
+
+
+@lru_cache(maxsize=None)
+def huella_calculadora(*rutas: str) -> str:
+    """
+    Hash SHA-256 del código fuente de una calculadora
+
+    Incluye la versión de calculadoras y los módulos indicados (o todos los
+    .py de cada paquete), de modo que cualquier cambio de fórmulas o
+    constantes en el código invalida la huella. Se calcula una vez por proceso.
+
+    Args:
+        rutas: Archivos .py o directorios de paquete (ejemplo: os.path.dirname(__file__))
+
+    Returns:
+        Hash hexadecimal
+    """
+    archivos = []
+    for ruta in rutas:
+        if os.path.isdir(ruta):
+            archivos.extend(os.path.join(ruta, nombre) for nombre in sorted(os.listdir(ruta)) if nombre.endswith('.py'))
+        else:
+            archivos.append(ruta)
+
+    h = hashlib.sha256(__version__.encode('utf-8'))
+    for archivo in archivos:
+        h.update(os.path.basename(archivo).encode('utf-8'))
+        with open(archivo, 'rb') as contenido:
+            h.update(contenido.read())
+    return h.hexdigest()
+
+
+def archivos_ficha(paquete: str) -> List[str]:
+    """
+    Archivos de código que determinan la ficha de una calculadora
+
+    Args:
+        paquete: Directorio del paquete de la calculadora (ejemplo: calculadoras/cacao_convencional)
+
+    Returns:
+        Rutas de los .py del paquete más MODULOS_COMPARTIDOS
+    """
+    paquete = os.path.abspath(paquete)
+    raiz = os.path.dirname(os.path.abspath(__file__))
+    return [os.path.join(paquete, nombre) for nombre in sorted(os.listdir(paquete)) if nombre.endswith('.py')] \
+        + [os.path.join(raiz, nombre) for nombre in MODULOS_COMPARTIDOS]
+
+
+def huella_ficha(paquete: str) -> str:
+    """
+    Huella de todo el código que determina la ficha de una calculadora
+
+    Args:
+        paquete: Directorio del paquete de la calculadora
+
+    Returns:
+        huella_calculadora de archivos_ficha(paquete)
+    """
+    return huella_calculadora(*archivos_ficha(paquete))
+
+
+def clave_contenido(**entradas: Any) -> str:
+    """
+    Clave direccionada por contenido de un conjunto de entradas
+
+    Returns:
+        Hash SHA-256 hexadecimal de las entradas serializadas canónicamente
+    """
+    return hashlib.sha256(_canonico(entradas).encode('utf-8')).hexdigest()
@@ -0,0 +1,242 @@
+"""Cronogramas de pago de los créditos a partir de MONTO_CREDITO, TEA y PLAZO_MESES.
+
+Calcula cuota, interés, amortización y saldo de miles de préstamos a la
+vez como matrices (préstamos × meses) en float32. Los préstamos se agrupan
+en cohortes con el mismo plazo y tipo de cronograma, de modo que cada
+matriz tiene exactamente las columnas de su plazo, y cada cohorte se
+entrega por bloques de filas para acotar la memoria.
+
+Tipos de cronograma:
+    frances: cuota constante
+    bullet: solo intereses cada mes y el capital en la última cuota
+    gracia: `gracia` meses de solo intereses (o capitalizando intereses con
+        capitalizar_gracia) y luego cuota constante en los meses restantes;
+        al capitalizar, el interés del mes figura en interes y como
+        amortización negativa, porque pasa al saldo
+
+En todos los tipos cuota = interes + amortizacion y el saldo de cada mes es
+el anterior menos la amortización. La columna t corresponde a la cuota del
+mes t + 1 desde el desembolso.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+TIPOS_CRONOGRAMA = ("frances", "bullet", "gracia")
+
+# Celdas préstamo × mes por bloque de una cohorte
+CELDAS_POR_BLOQUE = 4_000_000
+
+
+@dataclass
+class Cronogramas:
+    """Cronogramas de una cohorte (mismo plazo, tipo y gracia)."""
+
+    indices: np.ndarray
+    plazo: int
+    tipo: str
+    gracia: int
+    cuota: np.ndarray
+    interes: np.ndarray
+    amortizacion: np.ndarray
+    saldo: np.ndarray
+
+
+def tasa_mensual(tea: Any) -> np.ndarray:
+    """Tasa efectiva mensual equivalente a la TEA (fracción, ej. 0.2682)."""
+    tea = np.asarray(tea, dtype=np.float64)
+    if (tea <= -1).any():
+        raise ValueError("La TEA debe ser mayor a -100%")
+    return np.power(1 + tea, 1 / 12) - 1
+
+
+def _cuota_constante(saldo: np.ndarray, tasa: np.ndarray, meses: int) -> np.ndarray:
+    cuota = np.empty_like(saldo)
+    sin_interes = tasa == 0
+    cuota[sin_interes] = saldo[sin_interes] / meses
+    i = tasa[~sin_interes]
+    cuota[~sin_interes] = saldo[~sin_interes] * i / (1 - np.power(1 + i, -meses))
+    return cuota
+
+
+def _calcular(
+    monto: np.ndarray, tasa: np.ndarray, plazo: int, tipo: str, gracia: int, capitalizar_gracia: bool
+) -> Dict[str, np.ndarray]:
+    filas = len(monto)
+    saldo_inicio = np.empty((filas, plazo))
+    cuota = np.zeros((filas, plazo))
+
+    if tipo == "bullet":
+        saldo_inicio[:] = monto[:, None]
+        cuota[:] = (monto * tasa)[:, None]
+        cuota[:, -1] += monto
+    else:
+        gracia = gracia if tipo == "gracia" else 0
+        if gracia:
+            if capitalizar_gracia:
+                saldo_inicio[:, :gracia] = monto[:, None] * np.power(1 + tasa[:, None], np.arange(gracia))
+            else:
+                saldo_inicio[:, :gracia] = monto[:, None]
+                cuota[:, :gracia] = (monto * tasa)[:, None]
+        base = monto * np.power(1 + tasa, gracia) if capitalizar_gracia else monto
+        restantes = plazo - gracia
+        constante = _cuota_constante(base, tasa, restantes)
+        # Saldo al inicio del mes t de la parte con cuota constante
+        crecimiento = np.power(1 + tasa[:, None], np.arange(restantes))
+        con_interes = tasa[:, None] != 0
+        acumulado = np.where(
+            con_interes,
+            (crecimiento - 1) / np.where(con_interes, tasa[:, None], 1),
+            np.arange(restantes)[None, :],
+        )
+        saldo_inicio[:, gracia:] = base[:, None] * crecimiento - constante[:, None] * acumulado
+        cuota[:, gracia:] = constante[:, None]
+
+    # En la gracia capitalizada la cuota es 0: el interés devengado queda como
+    # amortización negativa y el saldo crece en ese monto
+    interes = saldo_inicio * tasa[:, None]
+    amortizacion = cuota - interes
+    saldo = saldo_inicio - amortizacion
+    # Última cuota cierra el saldo (error de redondeo)
+    amortizacion[:, -1] += saldo[:, -1]
+    cuota[:, -1] += saldo[:, -1]
+    saldo[:, -1] = 0.0
+    return {"cuota": cuota, "interes": interes, "amortizacion": amortizacion, "saldo": saldo}
+
+
+def iterar_cohortes(
+    montos: Sequence[float],
+    teas: Sequence[float],
+    plazos: Sequence[int],
+    tipos: Optional[Sequence[str]] = None,
+    gracias: Optional[Sequence[int]] = None,
+    capitalizar_gracia: bool = False,
+    celdas_por_bloque: int = CELDAS_POR_BLOQUE,
+) -> Iterator[Cronogramas]:
+    """Cronogramas por cohorte y bloque de filas.
+
+    Args:
+        montos, teas, plazos: Un valor por préstamo (TEA como fracción)
+        tipos: Tipo de cronograma por préstamo (default: 'frances')
+        gracias: Meses de gracia por préstamo (solo tipo 'gracia')
+        capitalizar_gracia: Si True, la gracia no paga intereses y los capitaliza
+        celdas_por_bloque: Máximo de celdas préstamo × mes por bloque
+    """
+    montos = np.asarray(montos, dtype=np.float64)
+    tasas = tasa_mensual(teas)
+    plazos = np.asarray(plazos, dtype=np.int64)
+    n = len(montos)
+    tipos = np.asarray(["frances"] * n if tipos is None else tipos, dtype=object)
+    gracias = np.zeros(n, dtype=np.int64) if gracias is None else np.asarray(gracias, dtype=np.int64)
+
+    if not (len(tasas) == len(plazos) == len(tipos) == len(gracias) == n):
+        raise ValueError("montos, teas, plazos, tipos y gracias deben tener la misma longitud")
+    if (montos < 0).any():
+        raise ValueError("Los montos no pueden ser negativos")
+    if (plazos <= 0).any():
+        raise ValueError("Los plazos deben ser mayores a 0")
+    invalidos = set(tipos.tolist()) - set(TIPOS_CRONOGRAMA)
+    if invalidos:
+        raise ValueError(f"Tipo de cronograma inválido: {', '.join(sorted(invalidos))}")
+    gracias = np.where(tipos == "gracia", gracias, 0)
+    if (gracias < 0).any() or (gracias >= plazos).any():
+        raise ValueError("Los meses de gracia deben estar entre 0 y plazo - 1")
+    if celdas_por_bloque <= 0:
+        raise ValueError("El límite de celdas debe ser mayor a 0")
+
+    cohortes = pd.DataFrame({"plazo": plazos, "tipo": tipos, "gracia": gracias}).groupby(
+        ["plazo", "tipo", "gracia"], sort=True
+    ).indices
+    for (plazo, tipo, gracia), indices in cohortes.items():
+        paso = max(1, celdas_por_bloque // int(plazo))
+        for inicio in range(0, len(indices), paso):
+            bloque = indices[inicio:inicio + paso]
+            matrices = _calcular(montos[bloque], tasas[bloque], int(plazo), tipo, int(gracia), capitalizar_gracia)
+            yield Cronogramas(
+                indices=bloque,
+                plazo=int(plazo),
+                tipo=tipo,
+                gracia=int(gracia),
+                **{nombre: matriz.astype(np.float32) for nombre, matriz in matrices.items()},
+            )
+
+
+def cronograma_prestamo(
+    monto: float, tea: float, plazo: int, tipo: str = "frances", gracia: int = 0, capitalizar_gracia: bool = False
+) -> Dict[str, Any]:
+    """Cronograma de un préstamo como listas (mes 1..plazo)."""
+    cohorte = next(iterar_cohortes([monto], [tea], [plazo], [tipo], [gracia], capitalizar_gracia))
+    return {
+        "monto": monto,
+        "tea": tea,
+        "tasa_mensual": round(float(tasa_mensual(tea)), 6),
+        "plazo_meses": plazo,
+        "tipo": tipo,
+        "meses": list(range(1, plazo + 1)),
+        **{nombre: np.round(getattr(cohorte, nombre)[0].astype(np.float64), 2).tolist()
+           for nombre in ("cuota", "interes", "amortizacion", "saldo")},
+        "total_intereses": round(float(cohorte.interes[0].sum(dtype=np.float64)), 2),
+    }
+
+
+def flujo_mensual(
+    montos: Sequence[float],
+    teas: Sequence[float],
+    plazos: Sequence[int],
+    inicios: Optional[Sequence[int]] = None,
+    **opciones: Any,
+) -> Dict[str, np.ndarray]:
+    """Cobranza esperada total por mes sumando todos los préstamos.
+
+    Args:
+        inicios: Mes (entero, desde 0) de la primera cuota de cada préstamo
+            en un calendario común (default: todos en 0)
+        opciones: tipos, gracias, capitalizar_gracia, celdas_por_bloque
+
+    Returns:
+        Dict con vectores float64 cuota, interes y amortizacion por mes. Con
+        capitalizar_gracia, interes incluye el interés devengado y no cobrado
+        de la gracia, que resta en amortizacion (cuota = interes +
+        amortizacion en cada mes)
+    """
+    plazos = np.asarray(plazos, dtype=np.int64)
+    inicios = np.zeros(len(plazos), dtype=np.int64) if inicios is None else np.asarray(inicios, dtype=np.int64)
+    if (inicios < 0).any():
+        raise ValueError("Los meses de inicio no pueden ser negativos")
+    meses = int((inicios + plazos).max()) if len(plazos) else 0
+    flujo = {nombre: np.zeros(meses) for nombre in ("cuota", "interes", "amortizacion")}
+
+    for cohorte in iterar_cohortes(montos, teas, plazos, **opciones):
+        columnas = (inicios[cohorte.indices][:, None] + np.arange(cohorte.plazo)).ravel()
+        for nombre, total in flujo.items():
+            total += np.bincount(columnas, weights=getattr(cohorte, nombre).ravel(), minlength=meses)
+    return flujo
+
+
+def flujo_colocaciones(df: Optional[pd.DataFrame] = None, **opciones: Any) -> Dict[str, Any]:
+    """Cobranza mensual de COLOCACIONES_BIOCREDITOS por mes calendario.
+
+    Los créditos con plazo 0 se tratan como pago único al mes siguiente.
+    """
+    if df is None:
+        from .predictor import _cargar_datos
+
+        df = _cargar_datos()
+    desembolso = pd.to_datetime(df["FECHA_DESEMBOLSO"]).dt.to_period("M")
+    origen = desembolso.min()
+    inicios = np.array([(periodo - origen).n + 1 for periodo in desembolso], dtype=np.int64)
+    flujo = flujo_mensual(
+        df["MONTO_CREDITO"].astype(float).to_numpy(),
+        df["TEA"].astype(float).to_numpy(),
+        np.maximum(df["PLAZO_MESES"].astype(int).to_numpy(), 1),
+        inicios=inicios,
+        **opciones,
+    )
+    return {
+        "meses": [str(origen + k) for k in range(len(flujo["cuota"]))],
+        **{nombre: np.round(valores, 2).tolist() for nombre, valores in flujo.items()},
+    }
@@ -0,0 +1,265 @@
+"""Puntaje de toda la cartera con el modelo vigente.
+
+Recorre COLOCACIONES_BIOCREDITOS (o un archivo de cartera .csv/.xlsx con
+las mismas columnas) por lotes, arma las variables del lote completo de
+una vez y escribe PD, pérdida esperada, eco_score y decisión como
+columnas .npy que se pueden abrir con memoria mapeada (cargar_puntajes).
+El checkpoint guarda los lotes terminados para reanudar.
+
+Uso:
+    python -m modelo_crediticio.cartera [ENTRADA] [--salida DIR] [--lote N]
+        [--checkpoint RUTA] [--reiniciar]
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .predictor import (
+    DATA_FILE,
+    MODEL_FILE,
+    SHEET_NAME,
+    UMBRAL_OBSERVACION,
+    UMBRAL_RECHAZO,
+    ModeloBundle,
+    _cargar_modelo,
+    _renombrar_columnas,
+    _si_no,
+)
+
+SALIDA_DEFECTO = Path(__file__).resolve().parents[1] / "data" / "puntajes_cartera"
+TAMAÑO_LOTE_DEFECTO = 5000
+
+# Código de decisión guardado en decision.npy
+DECISIONES = ("APROBADO", "OBSERVACIÓN", "RECHAZADO")
+
+COLUMNAS_ECO = ["PREDIO_SAF", "PREDIO_LIBRE_DEFOREST", "PREDIO_FUERA_ANP", "USO_ABONOS", "MANEJO_PLAGAS"]
+
+# Columna -> dtype de los archivos .npy
+COLUMNAS_SALIDA = {
+    "id": np.int64,
+    "prob_impago": np.float64,
+    "perdida_esperada": np.float64,
+    "eco_score": np.int16,
+    "eco_completo": np.bool_,
+    "decision": np.int8,
+}
+
+
+def _leer_lotes(ruta: Path, tamaño_lote: int) -> Iterator[pd.DataFrame]:
+    if ruta.suffix.lower() == ".csv":
+        for lote in pd.read_csv(ruta, chunksize=tamaño_lote):
+            yield _renombrar_columnas(lote)
+        return
+    df = _renombrar_columnas(pd.read_excel(ruta, sheet_name=SHEET_NAME))
+    for inicio in range(0, len(df), tamaño_lote):
+        yield df.iloc[inicio:inicio + tamaño_lote]
+
+
+def _contar_filas(ruta: Path) -> int:
+    if ruta.suffix.lower() == ".csv":
+        return sum(len(lote) for lote in pd.read_csv(ruta, usecols=[0], chunksize=100_000))
+    return len(pd.read_excel(ruta, sheet_name=SHEET_NAME, usecols=[0]))
+
+
+def _preparar_lote(df: pd.DataFrame, bundle: ModeloBundle) -> pd.DataFrame:
+    # Mismos valores por defecto que _preparar_input para columnas faltantes
+    X = df.reindex(columns=bundle.feature_columns)
+    for col in bundle.feature_columns:
+        if col in bundle.numerical_features:
+            X[col] = pd.to_numeric(X[col], errors="coerce").fillna(0).astype(float)
+        else:
+            X[col] = X[col].astype(object).where(X[col].notna(), "N/A")
+    return X.reset_index(drop=True)
+
+
+def _eco_scores(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    n = len(df)
+    positivos = np.zeros(n, dtype=np.int16)
+    completos = np.ones(n, dtype=bool)
+    for col in COLUMNAS_ECO:
+        if col not in df.columns:
+            completos[:] = False
+            continue
+        # _si_no se evalúa una vez por valor distinto
+        codigos, unicos = pd.factorize(df[col], use_na_sentinel=True)
+        si = np.array([_si_no(valor) == "Sí" for valor in unicos] + [False])
+        vacio = np.array([str(valor) == "" for valor in unicos] + [True])
+        positivos += si[codigos]
+        completos &= ~vacio[codigos]
+    scores = np.rint(positivos / len(COLUMNAS_ECO) * 100).astype(np.int16)
+    return scores, completos
+
+
+def puntuar_lote(df: pd.DataFrame, bundle: ModeloBundle) -> Dict[str, np.ndarray]:
+    """Puntajes de un lote de colocaciones (columnas renombradas)."""
+    X = _preparar_lote(df, bundle)
+    prob_impago = bundle.clf.predict_proba(X)[:, 1].astype(np.float64)
+    perdida_esperada = bundle.reg.predict(X).astype(np.float64)
+    eco_score, eco_completo = _eco_scores(df)
+    decision = np.select(
+        [prob_impago >= UMBRAL_RECHAZO, prob_impago >= UMBRAL_OBSERVACION],
+        [DECISIONES.index("RECHAZADO"), DECISIONES.index("OBSERVACIÓN")],
+        DECISIONES.index("APROBADO"),
+    ).astype(np.int8)
+    return {
+        "prob_impago": prob_impago,
+        "perdida_esperada": perdida_esperada,
+        "eco_score": eco_score,
+        "eco_completo": eco_completo,
+        "decision": decision,
+    }
+
+
+def _huella_modelo() -> str:
+    estado = MODEL_FILE.stat()
+    return f"{estado.st_size}:{estado.st_mtime_ns}"
+
+
+def puntuar_cartera(
+    entrada: Path = DATA_FILE,
+    salida: Path = SALIDA_DEFECTO,
+    tamaño_lote: int = TAMAÑO_LOTE_DEFECTO,
+    checkpoint: Path | None = None,
+) -> Dict[str, Any]:
+    """Puntúa toda la cartera y escribe una columna .npy por resultado.
+
+    Con checkpoint, un lote queda registrado solo después de escribir y
+    sincronizar sus filas; al reanudar se continúa en el lote siguiente.
+    """
+    if tamaño_lote <= 0:
+        raise ValueError("El tamaño de lote debe ser mayor a 0")
+    entrada, salida = Path(entrada), Path(salida)
+    if not entrada.exists():
+        raise FileNotFoundError(f"No se encontró el archivo de cartera: {entrada}")
+
+    inicio = time.perf_counter()
+    bundle = _cargar_modelo()
+    estado = {
+        "entrada": str(entrada.resolve()),
+        "salida": str(salida.resolve()),
+        "tamaño_lote": tamaño_lote,
+        "modelo": _huella_modelo(),
+        "lotes_completos": 0,
+    }
+
+    reanudado = False
+    if checkpoint is not None and Path(checkpoint).exists():
+        with open(checkpoint, encoding="utf-8") as archivo:
+            previo = json.load(archivo)
+        for clave in ("entrada", "salida", "tamaño_lote", "modelo"):
+            if previo[clave] != estado[clave]:
+                raise ValueError(f"El checkpoint no corresponde a esta ejecución ({clave})")
+        estado = previo
+        reanudado = True
+
+    if reanudado:
+        filas = estado["filas"]
+        columnas = {
+            nombre: np.load(salida / f"{nombre}.npy", mmap_mode="r+") for nombre in COLUMNAS_SALIDA
+        }
+    else:
+        filas = _contar_filas(entrada)
+        estado["filas"] = filas
+        salida.mkdir(parents=True, exist_ok=True)
+        columnas = {
+            nombre: np.lib.format.open_memmap(salida / f"{nombre}.npy", mode="w+", dtype=dtype, shape=(filas,))
+            for nombre, dtype in COLUMNAS_SALIDA.items()
+        }
+        with open(salida / "columnas.json", "w", encoding="utf-8") as archivo:
+            json.dump(
+                {
+                    "filas": filas,
+                    "columnas": {nombre: np.dtype(dtype).str for nombre, dtype in COLUMNAS_SALIDA.items()},
+                    "decisiones": DECISIONES,
+                    "umbrales": {"rechazo": UMBRAL_RECHAZO, "observacion": UMBRAL_OBSERVACION},
+                    "modelo": estado["modelo"],
+                    "entrada": estado["entrada"],
+                },
+                archivo,
+                ensure_ascii=False,
+            )
+
+    procesados = 0
+    for numero, lote in enumerate(_leer_lotes(entrada, tamaño_lote)):
+        if numero < estado["lotes_completos"]:
+            continue
+        desde = numero * tamaño_lote
+        hasta = desde + len(lote)
+        if hasta > filas:
+            raise ValueError("La cartera cambió de tamaño durante el puntaje")
+
+        puntajes = puntuar_lote(lote, bundle)
+        if "ID" in lote.columns:
+            puntajes["id"] = pd.to_numeric(lote["ID"], errors="coerce").fillna(-1).to_numpy(np.int64)
+        else:
+            puntajes["id"] = np.arange(desde, hasta, dtype=np.int64)
+        for nombre, valores in puntajes.items():
+            columnas[nombre][desde:hasta] = valores
+            columnas[nombre].flush()
+
+        estado["lotes_completos"] = numero + 1
+        procesados += hasta - desde
+        if checkpoint is not None:
+            temporal = f"{checkpoint}.tmp"
+            with open(temporal, "w", encoding="utf-8") as archivo:
+                json.dump(estado, archivo, ensure_ascii=False)
+            os.replace(temporal, checkpoint)
+
+    decisiones = np.bincount(columnas["decision"], minlength=len(DECISIONES))
+    return {
+        "salida": str(salida),
+        "filas": filas,
+        "procesadas": procesados,
+        "reanudado": reanudado,
+        "decisiones": dict(zip(DECISIONES, decisiones.tolist())),
+        "perdida_esperada_total": round(float(columnas["perdida_esperada"].sum()), 2),
+        "segundos": round(time.perf_counter() - inicio, 3),
+    }
+
+
+def cargar_puntajes(salida: Path = SALIDA_DEFECTO) -> Dict[str, np.ndarray]:
+    """Columnas de puntaje abiertas con memoria mapeada (solo lectura)."""
+    salida = Path(salida)
+    return {nombre: np.load(salida / f"{nombre}.npy", mmap_mode="r") for nombre in COLUMNAS_SALIDA}
+
+
+def main() -> None:
+    argumentos = sys.argv[1:]
+    try:
+        opciones = {}
+        for nombre in ("--salida", "--lote", "--checkpoint"):
+            if nombre in argumentos:
+                indice = argumentos.index(nombre)
+                if indice + 1 >= len(argumentos):
+                    raise ValueError(f"{nombre} requiere un valor")
+                opciones[nombre] = argumentos[indice + 1]
+                del argumentos[indice:indice + 2]
+        reiniciar = "--reiniciar" in argumentos
+        argumentos = [a for a in argumentos if a != "--reiniciar"]
+
+        checkpoint = opciones.get("--checkpoint")
+        if reiniciar and checkpoint is not None and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
+        resultado = puntuar_cartera(
+            entrada=Path(argumentos[0]) if argumentos else DATA_FILE,
+            salida=Path(opciones.get("--salida", SALIDA_DEFECTO)),
+            tamaño_lote=int(opciones.get("--lote", TAMAÑO_LOTE_DEFECTO)),
+            checkpoint=Path(checkpoint) if checkpoint is not None else None,
+        )
+        print(json.dumps(resultado, ensure_ascii=False))
+    except Exception as e:
+        print(json.dumps({"error": str(e), "type": type(e).__name__}, ensure_ascii=False))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""Cobertura del servicio de deuda mes a mes con la ficha de cacao.
+
+Alinea el flujo de caja de la ficha técnica de cacao con el cronograma de
+cuotas de cada préstamo (amortizacion.iterar_cohortes):
+
+    costos: cronograma mensual de CicloProductivoCacao por año productivo,
+        incluyendo los indirectos en proporción a cada mes
+    ingresos: ingreso anual de la ficha repartido en MESES_COMERCIALIZACION
+
+El perfil por hectárea cubre los años 1-15 (180 meses desde agosto del
+año 1) y se escala por AREA_CULTIVAR. Los años 1-3 son de desarrollo
+(PRODUCTIVIDAD['año_1_3'], 0 qq): no hay ingresos y la ficha no les asigna
+costos de producción, así que su flujo neto es 0 y las cuotas de esos meses
+salen de la caja. Cada préstamo entra al perfil según EDAD_SAF (limitada a
+1-15) y el mes calendario de su primera cuota; pasado el año 15 se repite
+el último año.
+
+Por mes se calcula la cobertura (flujo neto de la ficha / cuota) y la caja
+acumulada (caja inicial + flujo neto - cuotas); los meses con caja negativa
+son meses de déficit. Todo se evalúa sobre matrices (préstamos × meses).
+"""
+from __future__ import annotations
+
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from calculadoras.cacao_convencional import parametros as p
+
+from .amortizacion import iterar_cohortes
+
+AÑO_INICIO_FICHA = 4
+AÑO_FIN_FICHA = 15
+# Primer año del perfil: los años 1-3 son de desarrollo, sin cosecha
+AÑO_INICIO_PERFIL = 1
+MESES_DESARROLLO = (AÑO_INICIO_FICHA - AÑO_INICIO_PERFIL) * 12
+MESES_PERFIL = (AÑO_FIN_FICHA - AÑO_INICIO_PERFIL + 1) * 12
+
+# Mes calendario (1-12) con el que empieza p.MESES ('ago')
+MES_INICIO_CAMPAÑA = 8
+
+
+@lru_cache(maxsize=1)
+def perfil_ficha() -> Tuple[np.ndarray, np.ndarray]:
+    """Ingresos y costos por hectárea de los 180 meses de los años 1-15.
+
+    Los 36 meses de desarrollo (años 1-3) quedan en 0; los años 4-15 vienen
+    de CicloProductivoCacao.
+    """
+    from calculadoras.cacao_convencional.ciclo import CicloProductivoCacao
+
+    ciclo = CicloProductivoCacao(hectareas=1.0, año_inicio=AÑO_INICIO_FICHA, año_fin=AÑO_FIN_FICHA).calcular()
+    matriz = ciclo["matriz_costos"]
+    costos = matriz * (ciclo["costos_totales"] / matriz.sum(axis=1))[:, None]
+    ingresos = np.zeros_like(costos)
+    cosecha = [p.MESES.index(mes) for mes in p.MESES_COMERCIALIZACION]
+    ingresos[:, cosecha] = (ciclo["ingresos"] / len(cosecha))[:, None]
+    desarrollo = np.zeros((AÑO_INICIO_FICHA - AÑO_INICIO_PERFIL, 12))
+    ingresos = np.vstack([desarrollo, ingresos])
+    costos = np.vstack([desarrollo, costos])
+    ingresos.flags.writeable = False
+    costos.flags.writeable = False
+    return ingresos.ravel(), costos.ravel()
+
+
+def _posicion_inicial(edades: np.ndarray, meses_primera_cuota: np.ndarray) -> np.ndarray:
+    años = np.clip(np.nan_to_num(edades, nan=AÑO_INICIO_FICHA), AÑO_INICIO_PERFIL, AÑO_FIN_FICHA).astype(np.int64)
+    return (años - AÑO_INICIO_PERFIL) * 12 + (meses_primera_cuota - MES_INICIO_CAMPAÑA) % 12
+
+
+def _posiciones(inicio: np.ndarray, plazo: int) -> np.ndarray:
+    posiciones = inicio[:, None] + np.arange(plazo)
+    fuera = posiciones >= MESES_PERFIL
+    # Después del año 15 se repite el último año (MESES_PERFIL es múltiplo de 12)
+    posiciones[fuera] = MESES_PERFIL - 12 + posiciones[fuera] % 12
+    return posiciones
+
+
+def analizar_cobertura(
+    montos: Sequence[float],
+    teas: Sequence[float],
+    plazos: Sequence[int],
+    hectareas: Sequence[float],
+    edades_plantacion: Sequence[float],
+    meses_primera_cuota: Sequence[int],
+    caja_inicial: Any = 0.0,
+    **opciones: Any,
+) -> Dict[str, np.ndarray]:
+    """Indicadores de cobertura por préstamo.
+
+    Args:
+        hectareas: Área cultivada de cada préstamo
+        edades_plantacion: Edad de la plantación (años) al desembolso
+        meses_primera_cuota: Mes calendario (1-12) de la primera cuota
+        caja_inicial: Caja disponible al desembolso (escalar o por préstamo)
+        opciones: tipos, gracias, capitalizar_gracia, celdas_por_bloque
+
+    Returns:
+        Dict de vectores (uno por préstamo): cobertura_total (flujo neto /
+        cuotas del plazo), cobertura_minima, meses_deficit, primer_mes_deficit
+        (1..plazo, 0 sin déficit), deficit_maximo y meses_sin_produccion
+        (cuotas que caen en los años de desarrollo 1-3)
+    """
+    hectareas = np.asarray(hectareas, dtype=np.float64)
+    edades = np.asarray(edades_plantacion, dtype=np.float64)
+    meses = np.asarray(meses_primera_cuota, dtype=np.int64)
+    n = len(hectareas)
+    caja = np.broadcast_to(np.asarray(caja_inicial, dtype=np.float64), (n,))
+    if not (len(edades) == len(meses) == len(montos) == n):
+        raise ValueError("Todos los vectores deben tener una entrada por préstamo")
+    if (hectareas < 0).any():
+        raise ValueError("Las hectáreas no pueden ser negativas")
+    if ((meses < 1) | (meses > 12)).any():
+        raise ValueError("El mes de la primera cuota debe estar entre 1 y 12")
+
+    ingresos, costos = perfil_ficha()
+    neto_perfil = ingresos - costos
+    inicio = _posicion_inicial(edades, meses)
+    resultado = {
+        "cobertura_total": np.zeros(n),
+        "cobertura_minima": np.zeros(n),
+        "meses_deficit": np.zeros(n, dtype=np.int64),
+        "primer_mes_deficit": np.zeros(n, dtype=np.int64),
+        "deficit_maximo": np.zeros(n),
+        "meses_sin_produccion": np.zeros(n, dtype=np.int64),
+    }
+
+    for cohorte in iterar_cohortes(montos, teas, plazos, **opciones):
+        filas = cohorte.indices
+        posiciones = _posiciones(inicio[filas], cohorte.plazo)
+        neto = neto_perfil[posiciones] * hectareas[filas, None]
+        cuota = cohorte.cuota.astype(np.float64)
+        con_cuota = cuota > 0
+        cobertura = np.divide(neto, cuota, out=np.full_like(neto, np.inf), where=con_cuota)
+        acumulada = caja[filas, None] + np.cumsum(neto - cuota, axis=1)
+        deficit = acumulada < 0
+
+        total_cuotas = cuota.sum(axis=1)
+        resultado["cobertura_total"][filas] = np.divide(
+            neto.sum(axis=1), total_cuotas, out=np.full(len(filas), np.inf), where=total_cuotas > 0
+        )
+        resultado["cobertura_minima"][filas] = cobertura.min(axis=1)
+        resultado["meses_deficit"][filas] = deficit.sum(axis=1)
+        resultado["primer_mes_deficit"][filas] = np.where(deficit.any(axis=1), deficit.argmax(axis=1) + 1, 0)
+        resultado["deficit_maximo"][filas] = np.maximum(-acumulada.min(axis=1), 0.0)
+        resultado["meses_sin_produccion"][filas] = (posiciones < MESES_DESARROLLO).sum(axis=1)
+    return resultado
+
+
+def _mes_primera_cuota(fecha: Any) -> int:
+    return (pd.Timestamp(fecha).month % 12) + 1
+
+
+def cobertura_prestamo(
+    monto: float,
+    tea: float,
+    plazo: int,
+    hectareas: float,
+    edad_plantacion: float,
+    fecha_desembolso: Any = None,
+    tipo: str = "frances",
+    gracia: int = 0,
+    caja_inicial: float = 0.0,
+) -> Dict[str, Any]:
+    """Detalle mensual de cobertura de una solicitud (cuota, flujo neto, caja).
+
+    La TEA va como fracción (0.18), igual que en amortizacion. Con
+    edad_plantacion menor a 4 las primeras cuotas caen en los años de
+    desarrollo, sin ingresos (meses_sin_produccion).
+    """
+    if hectareas <= 0:
+        raise ValueError("El área cultivada debe ser mayor a 0")
+    mes = _mes_primera_cuota(date.today() if fecha_desembolso is None else fecha_desembolso)
+    cohorte = next(iterar_cohortes([monto], [tea], [plazo], [tipo], [gracia]))
+    ingresos, costos = perfil_ficha()
+    posiciones = _posiciones(_posicion_inicial(np.array([edad_plantacion], dtype=np.float64), np.array([mes])), plazo)[0]
+    ingreso = ingresos[posiciones] * hectareas
+    costo = costos[posiciones] * hectareas
+    neto = ingreso - costo
+    cuota = cohorte.cuota[0].astype(np.float64)
+    caja = caja_inicial + np.cumsum(neto - cuota)
+    cobertura = [round(float(n / c), 4) if c > 0 else None for n, c in zip(neto, cuota)]
+    calendario = [p.MESES[posicion % 12] for posicion in posiciones]
+    deficit = np.flatnonzero(caja < 0)
+
+    return {
+        "meses": list(range(1, plazo + 1)),
+        "mes_calendario": calendario,
+        "ingreso": np.round(ingreso, 2).tolist(),
+        "costo": np.round(costo, 2).tolist(),
+        "flujo_neto": np.round(neto, 2).tolist(),
+        "cuota": np.round(cuota, 2).tolist(),
+        "cobertura": cobertura,
+        "caja_acumulada": np.round(caja, 2).tolist(),
+        "cobertura_total": round(float(neto.sum() / cuota.sum()), 4) if cuota.sum() > 0 else None,
+        "meses_deficit": [int(k) + 1 for k in deficit],
+        "deficit_maximo": round(float(max(-caja.min(), 0.0)), 2),
+        "meses_sin_produccion": int((posiciones < MESES_DESARROLLO).sum()),
+    }
+
+
+def cobertura_solicitud(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """cobertura_prestamo con los campos del formulario de evaluación.
+
+    La TEA del formulario llega en porcentaje (tea: 18) y se convierte a
+    fracción como la columna TEA de la cartera.
+    """
+    from .predictor import _tea_fraccion
+
+    return cobertura_prestamo(
+        monto=float(payload.get("monto_credito", 0)),
+        tea=_tea_fraccion(payload.get("tea", 0)),
+        plazo=int(payload.get("plazo_meses", 12)),
+        hectareas=float(payload.get("area_cultivar", 1)),
+        edad_plantacion=float(payload.get("edad_saf", AÑO_INICIO_FICHA)),
+        fecha_desembolso=payload.get("fecha_desembolso"),
+        tipo=payload.get("tipo_cronograma", "frances"),
+        gracia=int(payload.get("meses_gracia", 0)),
+        caja_inicial=float(payload.get("caja_inicial", 0.0)),
+    )
+
+
+def cobertura_colocaciones(
+    df: Optional[pd.DataFrame] = None, solo_cacao: bool = True, caja_inicial: float = 0.0, **opciones: Any
+) -> pd.DataFrame:
+    """Indicadores de cobertura de COLOCACIONES_BIOCREDITOS (uno por préstamo).
+
+    Con solo_cacao se evalúan solo los préstamos cuya actividad incluye cacao,
+    que son los que corresponden a la ficha.
+    """
+    if df is None:
+        from .predictor import _cargar_datos
+
+        df = _cargar_datos()
+    if solo_cacao:
+        df = df[df["ACTIVIDAD_PRINCIPAL"].astype(str).str.lower().str.contains("cacao")]
+    meses = (pd.to_datetime(df["FECHA_DESEMBOLSO"]).dt.month % 12 + 1).to_numpy()
+    indicadores = analizar_cobertura(
+        df["MONTO_CREDITO"].astype(float).to_numpy(),
+        df["TEA"].astype(float).to_numpy(),
+        np.maximum(df["PLAZO_MESES"].astype(int).to_numpy(), 1),
+        df["AREA_CULTIVAR"].astype(float).to_numpy(),
+        pd.to_numeric(df["EDAD_SAF"], errors="coerce").to_numpy(np.float64),
+        meses,
+        caja_inicial=caja_inicial,
+        **opciones,
+    )
+    return pd.DataFrame({"ID": df["ID"].to_numpy(), **indicadores})
+
+
+def cobertura_desde_stdin() -> Dict[str, Any]:
+    from .predictor import _leer_payload_stdin
+
+    return cobertura_solicitud(_leer_payload_stdin())
@@ -1,6 +1,27 @@
 import json
-from .predictor import predecir_desde_stdin
+import sys
+
+from .cobertura import cobertura_desde_stdin
+from .predictor import optimizar_desde_stdin, predecir_desde_stdin, recomendar_desde_stdin
+from .similares import similares_desde_stdin
+from .ubicacion import concentracion_desde_stdin
 
 if __name__ == "__main__":
-    resultado = predecir_desde_stdin()
+    # --optimizar: grilla de monto x plazo para el solicitante (optimizar_condiciones)
+    if "--optimizar" in sys.argv[1:]:
+        resultado = optimizar_desde_stdin()
+    # --recomendar: prácticas sostenibles que más reducen el riesgo (recomendar_practicas)
+    elif "--recomendar" in sys.argv[1:]:
+        resultado = recomendar_desde_stdin()
+    # --cobertura: cuotas frente al flujo mensual de la ficha de cacao (cobertura_solicitud)
+    elif "--cobertura" in sys.argv[1:]:
+        resultado = cobertura_desde_stdin()
+    # --similares: clientes pasados más parecidos y sus resultados (IndiceSimilares)
+    elif "--similares" in sys.argv[1:]:
+        resultado = similares_desde_stdin()
+    # --ubicacion: préstamos, EL e incumplimiento alrededor de las coordenadas (IndiceEspacial)
+    elif "--ubicacion" in sys.argv[1:]:
+        resultado = concentracion_desde_stdin()
+    else:
+        resultado = predecir_desde_stdin()
     print(json.dumps(resultado, ensure_ascii=False))
@@ -0,0 +1,195 @@
+"""Pruebas de estrés de la cartera sobre una matriz de escenarios.
+
+Cada escenario combina multiplicadores de PD por grupo (REGION, PROVINCIA,
+AGENCIA, ACTIVIDAD_PRINCIPAL, TIPO_CREDITO), un shock relativo al precio
+del cacao (PRECIO_VENTA_PROMEDIO) y un recorte del valor de las garantías.
+Todos los escenarios se aplican a la vez con broadcasting sobre bloques
+(escenario × préstamo) de tamaño acotado.
+
+El shock de precio se transmite a los préstamos cuya actividad incluye
+cacao: la utilidad de la ficha de cacao cae en shock × ingresos/utilidad y
+esa caída desplaza la PD en la escala probit (SENSIBILIDAD_UTILIDAD). El
+recorte de garantías reduce la recuperación: LGD' = 1 - (1 - LGD)(1 - recorte).
+
+Ejemplo de escenario:
+    {"nombre": "cacao -30%", "precio_cacao": -0.30, "recorte_garantias": 0.2,
+     "multiplicador_pd": 1.1, "multiplicadores_pd": {"REGION": {"Cusco": 1.25}}}
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy.special import ndtr, ndtri
+
+from .predictor import UMBRAL_RECHAZO
+from .riesgo_cartera import DIMENSIONES, CarteraRiesgo, _etiqueta
+
+ESCENARIOS_DEFECTO = [
+    {"nombre": "base"},
+    {"nombre": "precio cacao -20%", "precio_cacao": -0.20},
+    {"nombre": "precio cacao -40%", "precio_cacao": -0.40},
+    {"nombre": "garantías -30%", "recorte_garantias": 0.30},
+    {"nombre": "PD +50%", "multiplicador_pd": 1.5},
+    {"nombre": "severo", "precio_cacao": -0.40, "recorte_garantias": 0.30, "multiplicador_pd": 1.25},
+]
+
+# Desplazamiento probit de la PD por cada 100% de caída de la utilidad
+SENSIBILIDAD_UTILIDAD = 1.0
+
+# Celdas escenario × préstamo evaluadas a la vez
+CELDAS_MAXIMAS = 2_000_000
+
+CLAVES_ESCENARIO = {"nombre", "precio_cacao", "recorte_garantias", "multiplicador_pd", "multiplicadores_pd"}
+
+
+@lru_cache(maxsize=1)
+def _ficha_cacao() -> Dict[str, float]:
+    from calculadoras.cacao_convencional.calculadora_cacao_convencional import CalculadoraCacaoConvencional
+
+    promedio = CalculadoraCacaoConvencional(hectareas=1.0).generar_ficha_tecnica(["produccion_promedio"])
+    return promedio["produccion_promedio"]
+
+
+def _es_cacao(actividad: str) -> bool:
+    return "cacao" in actividad.lower()
+
+
+class MotorEstres:
+    """EL y exposición en riesgo por escenario y segmento en una sola pasada."""
+
+    def __init__(
+        self,
+        cartera: CarteraRiesgo,
+        escenarios: Sequence[Dict[str, Any]] = ESCENARIOS_DEFECTO,
+        sensibilidad_utilidad: float = SENSIBILIDAD_UTILIDAD,
+        celdas_maximas: int = CELDAS_MAXIMAS,
+    ):
+        if not escenarios:
+            raise ValueError("Se requiere al menos un escenario")
+        if celdas_maximas <= 0:
+            raise ValueError("El límite de celdas debe ser mayor a 0")
+
+        self.cartera = cartera
+        self.escenarios = list(escenarios)
+        self.celdas_maximas = celdas_maximas
+        n = len(self.escenarios)
+
+        self._global = np.ones(n)
+        self._tablas: Dict[str, np.ndarray] = {}
+        shocks = np.zeros(n)
+        self._recuperacion = np.ones(n)
+        for s, escenario in enumerate(self.escenarios):
+            desconocidas = set(escenario) - CLAVES_ESCENARIO
+            if desconocidas:
+                raise ValueError(f"Claves de escenario inválidas: {', '.join(sorted(desconocidas))}")
+            shocks[s] = float(escenario.get("precio_cacao", 0.0))
+            if shocks[s] < -1:
+                raise ValueError("El shock de precio no puede ser menor a -100%")
+            recorte = float(escenario.get("recorte_garantias", 0.0))
+            if not 0 <= recorte <= 1:
+                raise ValueError("El recorte de garantías debe estar entre 0 y 1")
+            self._recuperacion[s] = 1 - recorte
+            self._global[s] = float(escenario.get("multiplicador_pd", 1.0))
+            for dimension, multiplicadores in escenario.get("multiplicadores_pd", {}).items():
+                if dimension not in DIMENSIONES:
+                    raise ValueError(f"Dimensión inválida: {dimension}")
+                if dimension not in self._tablas:
+                    self._tablas[dimension] = np.ones((n, len(cartera.etiquetas[dimension])))
+                indices = {etiqueta: k for k, etiqueta in enumerate(cartera.etiquetas[dimension])}
+                for grupo, factor in multiplicadores.items():
+                    if _etiqueta(grupo) not in indices:
+                        raise ValueError(f"Grupo desconocido en {dimension}: {grupo}")
+                    self._tablas[dimension][s, indices[_etiqueta(grupo)]] = float(factor)
+        if (self._global < 0).any() or any((tabla < 0).any() for tabla in self._tablas.values()):
+            raise ValueError("Los multiplicadores de PD no pueden ser negativos")
+
+        self._precios: Optional[np.ndarray] = None
+        self._desplazamiento = np.zeros(n)
+        if shocks.any():
+            ficha = _ficha_cacao()
+            self._precios = ficha["precio_venta_qq"] * (1 + shocks)
+            caida_utilidad = -shocks * ficha["ingresos"] / ficha["utilidad"]
+            self._desplazamiento = sensibilidad_utilidad * caida_utilidad
+
+        actividades = cartera.etiquetas["ACTIVIDAD_PRINCIPAL"]
+        self._cacao = np.array([_es_cacao(a) for a in actividades])[cartera.codigos["ACTIVIDAD_PRINCIPAL"]]
+
+    def _pd_estresada(self, bloque: slice) -> np.ndarray:
+        pd_ = self.cartera.pd[bloque][None, :] * self._global[:, None]
+        for dimension, tabla in self._tablas.items():
+            pd_ = pd_ * tabla[:, self.cartera.codigos[dimension][bloque]]
+        pd_ = np.clip(pd_, 0.0, 1.0)
+        cacao = self._cacao[bloque]
+        if self._desplazamiento.any() and cacao.any():
+            desplazada = ndtr(ndtri(pd_[:, cacao]) + self._desplazamiento[:, None])
+            pd_[:, cacao] = desplazada
+        return pd_
+
+    def evaluar(self, segmentos: Sequence[str] = DIMENSIONES) -> List[Dict[str, Any]]:
+        """EL, exposición en riesgo y PD media por escenario, total y por segmento.
+
+        La exposición en riesgo es la EAD de los préstamos cuya PD estresada
+        alcanza el umbral de RECHAZADO.
+        """
+        for dimension in segmentos:
+            if dimension not in DIMENSIONES:
+                raise ValueError(f"Dimensión inválida: {dimension}")
+
+        cartera = self.cartera
+        n, prestamos = len(self.escenarios), len(cartera.ids)
+        paso = max(1, self.celdas_maximas // n)
+        el = np.zeros(n)
+        en_riesgo = np.zeros(n)
+        pd_ponderada = np.zeros(n)
+        por_segmento = {
+            dimension: (np.zeros((n, len(cartera.etiquetas[dimension]))), np.zeros((n, len(cartera.etiquetas[dimension]))))
+            for dimension in segmentos
+        }
+
+        for inicio in range(0, prestamos, paso):
+            bloque = slice(inicio, min(inicio + paso, prestamos))
+            ead = cartera.ead[bloque]
+            pd_ = self._pd_estresada(bloque)
+            lgd = 1 - (1 - cartera.lgd[bloque])[None, :] * self._recuperacion[:, None]
+            el_bloque = pd_ * lgd * ead
+            riesgo_bloque = (pd_ >= UMBRAL_RECHAZO) * ead
+
+            el += el_bloque.sum(axis=1)
+            en_riesgo += riesgo_bloque.sum(axis=1)
+            pd_ponderada += pd_ @ ead
+            for dimension, (el_seg, riesgo_seg) in por_segmento.items():
+                codigos = cartera.codigos[dimension][bloque]
+                grupos = el_seg.shape[1]
+                for s in range(n):
+                    el_seg[s] += np.bincount(codigos, weights=el_bloque[s], minlength=grupos)
+                    riesgo_seg[s] += np.bincount(codigos, weights=riesgo_bloque[s], minlength=grupos)
+
+        total_ead = float(cartera.ead.sum())
+        el_base = float(cartera.el.sum())
+        resultados = []
+        for s, escenario in enumerate(self.escenarios):
+            segmentos_escenario = {}
+            for dimension, (el_seg, riesgo_seg) in por_segmento.items():
+                segmentos_escenario[dimension] = [
+                    {
+                        "grupo": etiqueta,
+                        "el": round(float(el_seg[s, k]), 2),
+                        "exposicion_en_riesgo": round(float(riesgo_seg[s, k]), 2),
+                    }
+                    for k, etiqueta in enumerate(cartera.etiquetas[dimension])
+                ]
+            resultados.append(
+                {
+                    "nombre": escenario.get("nombre", f"escenario {s + 1}"),
+                    "precio_cacao_qq": round(float(self._precios[s]), 2) if self._precios is not None else None,
+                    "el": round(float(el[s]), 2),
+                    "variacion_el": round(float(el[s]) - el_base, 2),
+                    "el_sobre_ead": round(float(el[s]) / total_ead, 4) if total_ead else 0.0,
+                    "exposicion_en_riesgo": round(float(en_riesgo[s]), 2),
+                    "pd_media": round(float(pd_ponderada[s]) / total_ead, 4) if total_ead else 0.0,
+                    "segmentos": segmentos_escenario,
+                }
+            )
+        return resultados
@@ -0,0 +1,343 @@
+"""Simulación Monte Carlo de pérdidas crediticias de la cartera.
+
+Los incumplimientos se correlacionan con una cópula gaussiana de un factor
+por grupo (AGENCIA o REGION): el factor de cada grupo combina un factor
+común y uno propio, y cada préstamo incumple cuando su variable latente
+cae bajo Φ⁻¹(PD). La LGD de cada incumplimiento se muestrea de una Beta
+con media igual a la columna LGD.
+
+Los escenarios se evalúan por bloques en un pool de procesos, cada bloque
+con un flujo independiente derivado de la semilla (SeedSequence.spawn).
+La distribución de pérdidas se acumula en un histograma fijo y solo se
+conserva la cola necesaria para VaR, ES y contribuciones por agencia.
+
+Uso:
+    python -m modelo_crediticio.perdidas_montecarlo [--escenarios N] [--procesos P]
+        [--semilla S] [--factor AGENCIA|REGION] [--puntajes DIR]
+"""
+from __future__ import annotations
+
+import json
+import math
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy.special import ndtri
+
+from .riesgo_cartera import CarteraRiesgo
+
+CUANTILES_DEFECTO = (0.95, 0.99, 0.999)
+TAMAÑO_BLOQUE_DEFECTO = 20_000
+CORRELACION_ACTIVOS = 0.15
+CORRELACION_GRUPOS = 0.5
+CONCENTRACION_LGD = 20.0
+BINS_HISTOGRAMA = 4096
+BINS_DISTRIBUCION = 64
+
+# Celdas escenario × préstamo evaluadas a la vez dentro de un bloque
+CELDAS_POR_PASO = 2_000_000
+
+# Datos de la cartera en cada proceso (ver _iniciar)
+_CARTERA: Dict[str, Any] = {}
+
+
+def cartera_puntuada(puntajes: Optional[Path] = None) -> CarteraRiesgo:
+    """Cartera de colocaciones con la PD del modelo si hay puntajes guardados.
+
+    puntajes es el directorio de modelo_crediticio.cartera; los préstamos
+    sin puntaje conservan la PD de _simular_targets.
+    """
+    cartera = CarteraRiesgo.desde_colocaciones()
+    if puntajes is None or not (Path(puntajes) / "prob_impago.npy").exists():
+        return cartera
+
+    from .cartera import cargar_puntajes
+
+    columnas = cargar_puntajes(puntajes)
+    prob_impago = dict(zip(columnas["id"].tolist(), columnas["prob_impago"].tolist()))
+    for id_prestamo in cartera.ids:
+        if id_prestamo in prob_impago:
+            cartera.actualizar(id_prestamo, pd_=prob_impago[id_prestamo])
+    return cartera
+
+
+def _iniciar(datos: Dict[str, Any]) -> None:
+    _CARTERA.clear()
+    _CARTERA.update(datos)
+
+
+def _simular_bloque(semilla: np.random.SeedSequence, n: int, tamaño_cola: int) -> Dict[str, Any]:
+    """Unidad de trabajo de un proceso: simula n escenarios y los resume."""
+    rng = np.random.default_rng(semilla)
+    umbral = _CARTERA["umbral"]
+    factor = _CARTERA["factor"]
+    agencia = _CARTERA["agencia"]
+    ead = _CARTERA["ead"]
+    alfa, beta = _CARTERA["alfa"], _CARTERA["beta"]
+    rho, rho_grupos = _CARTERA["rho"], _CARTERA["rho_grupos"]
+    n_factores, n_agencias = _CARTERA["n_factores"], _CARTERA["n_agencias"]
+    prestamos = len(ead)
+
+    perdidas = np.empty(n)
+    por_agencia = np.empty((n, n_agencias))
+    paso = max(1, CELDAS_POR_PASO // prestamos)
+    for inicio in range(0, n, paso):
+        m = min(paso, n - inicio)
+        comun = rng.standard_normal((m, 1))
+        propio = rng.standard_normal((m, n_factores))
+        sistematico = math.sqrt(rho_grupos) * comun + math.sqrt(1 - rho_grupos) * propio
+        latente = math.sqrt(rho) * sistematico[:, factor] + math.sqrt(1 - rho) * rng.standard_normal((m, prestamos))
+        filas, columnas = np.nonzero(latente < umbral)
+        monto = rng.beta(alfa[columnas], beta[columnas]) * ead[columnas]
+        celdas = np.bincount(filas * n_agencias + agencia[columnas], weights=monto, minlength=m * n_agencias)
+        por_agencia[inicio:inicio + m] = celdas.reshape(m, n_agencias)
+        perdidas[inicio:inicio + m] = por_agencia[inicio:inicio + m].sum(axis=1)
+
+    return {
+        "acumulador": _Acumulador.desde(perdidas, _CARTERA["bordes"]),
+        "suma_agencias": por_agencia.sum(axis=0),
+        **_cola(perdidas, por_agencia, tamaño_cola),
+    }
+
+
+def _cola(perdidas: np.ndarray, por_agencia: np.ndarray, tamaño: int) -> Dict[str, np.ndarray]:
+    if len(perdidas) > tamaño:
+        peores = np.argpartition(perdidas, len(perdidas) - tamaño)[-tamaño:]
+        perdidas, por_agencia = perdidas[peores], por_agencia[peores]
+    return {"cola": perdidas, "cola_agencias": por_agencia}
+
+
+class _Acumulador:
+    """Histograma de bordes fijos con momentos exactos de la pérdida."""
+
+    def __init__(self, bordes: np.ndarray):
+        self.bordes = bordes
+        self.conteos = np.zeros(len(bordes) - 1, dtype=np.int64)
+        self.n = 0
+        self.suma = 0.0
+        self.suma_cuadrados = 0.0
+        self.maximo = 0.0
+
+    @classmethod
+    def desde(cls, valores: np.ndarray, bordes: np.ndarray) -> "_Acumulador":
+        acumulador = cls(bordes)
+        idx = np.clip(np.searchsorted(bordes, valores, side="right") - 1, 0, len(acumulador.conteos) - 1)
+        acumulador.conteos += np.bincount(idx, minlength=len(acumulador.conteos))
+        acumulador.n = len(valores)
+        acumulador.suma = float(valores.sum())
+        acumulador.suma_cuadrados = float(np.square(valores).sum())
+        acumulador.maximo = float(valores.max())
+        return acumulador
+
+    def combinar(self, otro: "_Acumulador") -> None:
+        self.conteos += otro.conteos
+        self.n += otro.n
+        self.suma += otro.suma
+        self.suma_cuadrados += otro.suma_cuadrados
+        self.maximo = max(self.maximo, otro.maximo)
+
+
+class SimulacionPerdidas:
+    """Distribución de pérdidas, VaR/ES y contribuciones por agencia.
+
+    El resultado es reproducible para una semilla y no depende del número
+    de procesos.
+    """
+
+    def __init__(
+        self,
+        cartera: CarteraRiesgo,
+        factor_por: str = "AGENCIA",
+        correlacion_activos: float = CORRELACION_ACTIVOS,
+        correlacion_grupos: float = CORRELACION_GRUPOS,
+        concentracion_lgd: float = CONCENTRACION_LGD,
+        cuantiles: Sequence[float] = CUANTILES_DEFECTO,
+        semilla: int = 2025,
+        tamaño_bloque: int = TAMAÑO_BLOQUE_DEFECTO,
+    ):
+        if factor_por not in ("AGENCIA", "REGION"):
+            raise ValueError(f"Factor inválido: {factor_por}. Debe ser 'AGENCIA' o 'REGION'")
+        if not 0 <= correlacion_activos < 1 or not 0 <= correlacion_grupos <= 1:
+            raise ValueError("Las correlaciones deben estar entre 0 y 1")
+        if concentracion_lgd <= 0:
+            raise ValueError("La concentración de LGD debe ser mayor a 0")
+        if not cuantiles or not all(0 < q < 1 for q in cuantiles):
+            raise ValueError("Los cuantiles deben estar entre 0 y 1")
+        if tamaño_bloque <= 0:
+            raise ValueError("El tamaño de bloque debe ser mayor a 0")
+
+        self.cartera = cartera
+        self.factor_por = factor_por
+        self.cuantiles = tuple(sorted(cuantiles))
+        self.semilla = semilla
+        self.tamaño_bloque = tamaño_bloque
+
+        lgd = np.clip(cartera.lgd, 1e-6, 1 - 1e-6)
+        total_ead = float(cartera.ead.sum())
+        self._datos = {
+            "umbral": ndtri(np.clip(cartera.pd, 0.0, 1.0)),
+            "factor": cartera.codigos[factor_por].copy(),
+            "agencia": cartera.codigos["AGENCIA"].copy(),
+            "ead": cartera.ead.copy(),
+            "alfa": lgd * concentracion_lgd,
+            "beta": (1 - lgd) * concentracion_lgd,
+            "rho": correlacion_activos,
+            "rho_grupos": correlacion_grupos,
+            "n_factores": len(cartera.etiquetas[factor_por]),
+            "n_agencias": len(cartera.etiquetas["AGENCIA"]),
+            "bordes": np.linspace(0.0, max(total_ead, 1.0), BINS_HISTOGRAMA + 1),
+        }
+
+    def _bloques(self, escenarios: int) -> List[int]:
+        completos, resto = divmod(escenarios, self.tamaño_bloque)
+        return [self.tamaño_bloque] * completos + ([resto] if resto else [])
+
+    def simular(self, escenarios: int, procesos: Optional[int] = None) -> Dict[str, Any]:
+        """Ejecuta la simulación.
+
+        Args:
+            escenarios: Número total de escenarios
+            procesos: Procesos del pool (None o 1: en el proceso actual)
+        """
+        if escenarios <= 0:
+            raise ValueError("El número de escenarios debe ser mayor a 0")
+
+        tamaños = self._bloques(escenarios)
+        semillas = np.random.SeedSequence(self.semilla).spawn(len(tamaños))
+        # Escenarios que definen el VaR/ES del cuantil más bajo
+        tamaño_cola = math.ceil(escenarios * (1 - self.cuantiles[0]))
+        trabajo = list(zip(semillas, tamaños))
+
+        acumulador = _Acumulador(self._datos["bordes"])
+        suma_agencias = np.zeros(self._datos["n_agencias"])
+        cola = np.empty(0)
+        cola_agencias = np.empty((0, self._datos["n_agencias"]))
+
+        def combinar(bloque):
+            nonlocal suma_agencias, cola, cola_agencias
+            acumulador.combinar(bloque["acumulador"])
+            suma_agencias = suma_agencias + bloque["suma_agencias"]
+            unida = _cola(
+                np.concatenate([cola, bloque["cola"]]),
+                np.concatenate([cola_agencias, bloque["cola_agencias"]]),
+                tamaño_cola,
+            )
+            cola, cola_agencias = unida["cola"], unida["cola_agencias"]
+
+        if procesos is None or procesos <= 1:
+            _iniciar(self._datos)
+            for semilla, n in trabajo:
+                combinar(_simular_bloque(semilla, n, tamaño_cola))
+        else:
+            # Ventana de tareas en vuelo para no encolar todos los bloques a la vez
+            with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar, initargs=(self._datos,)) as pool:
+                en_vuelo = deque()
+                pendientes = iter(trabajo)
+                for semilla, n in pendientes:
+                    en_vuelo.append(pool.submit(_simular_bloque, semilla, n, tamaño_cola))
+                    if len(en_vuelo) >= 2 * procesos:
+                        break
+                while en_vuelo:
+                    bloque = en_vuelo.popleft().result()
+                    siguiente = next(pendientes, None)
+                    if siguiente is not None:
+                        en_vuelo.append(pool.submit(_simular_bloque, *siguiente, tamaño_cola))
+                    combinar(bloque)
+
+        return self._resumen(acumulador, suma_agencias, cola, cola_agencias)
+
+    def _resumen(
+        self, acumulador: _Acumulador, suma_agencias: np.ndarray, cola: np.ndarray, cola_agencias: np.ndarray
+    ) -> Dict[str, Any]:
+        n = acumulador.n
+        media = acumulador.suma / n
+        desviacion = max(acumulador.suma_cuadrados / n - media ** 2, 0.0) ** 0.5
+        orden = np.argsort(-cola, kind="stable")
+        cola, cola_agencias = cola[orden], cola_agencias[orden]
+
+        var, es, es_agencias = {}, {}, {}
+        for q in self.cuantiles:
+            # Los m peores escenarios forman la cola de probabilidad 1 - q
+            m = max(1, math.ceil(n * (1 - q)))
+            clave = str(q)
+            var[clave] = round(float(cola[m - 1]), 2)
+            es[clave] = round(float(cola[:m].mean()), 2)
+            es_agencias[clave] = cola_agencias[:m].mean(axis=0)
+
+        etiquetas = self.cartera.etiquetas["AGENCIA"]
+        el_agencias = suma_agencias / n
+        contribuciones = []
+        for k in np.argsort(-el_agencias, kind="stable"):
+            contribuciones.append(
+                {
+                    "agencia": etiquetas[k],
+                    "perdida_esperada": round(float(el_agencias[k]), 2),
+                    "es": {q: round(float(valores[k]), 2) for q, valores in es_agencias.items()},
+                    "participacion_es": {
+                        q: round(float(valores[k] / valores.sum()), 4) if valores.sum() else 0.0
+                        for q, valores in es_agencias.items()
+                    },
+                }
+            )
+
+        # Histograma reagrupado hasta la pérdida máxima observada
+        ancho = BINS_HISTOGRAMA // BINS_DISTRIBUCION
+        conteos = acumulador.conteos.reshape(BINS_DISTRIBUCION, ancho).sum(axis=1)
+        bordes = acumulador.bordes[::ancho]
+        ultimo = int(np.nonzero(conteos)[0][-1]) + 1
+        distribucion = [
+            {"desde": round(float(bordes[i]), 2), "hasta": round(float(bordes[i + 1]), 2),
+             "probabilidad": round(float(conteos[i] / n), 6)}
+            for i in range(ultimo)
+        ]
+
+        return {
+            "escenarios": n,
+            "prestamos": len(self.cartera.ids),
+            "factor_por": self.factor_por,
+            "ead_total": round(float(self.cartera.ead.sum()), 2),
+            "perdida_esperada_analitica": round(float(self.cartera.el.sum()), 2),
+            "perdida_esperada": round(media, 2),
+            "desviacion": round(desviacion, 2),
+            "perdida_maxima": round(acumulador.maximo, 2),
+            "var": var,
+            "es": es,
+            "capital_economico": {q: round(var[q] - media, 2) for q in var},
+            "contribuciones_agencia": contribuciones,
+            "distribucion": distribucion,
+        }
+
+
+def main() -> None:
+    argumentos = sys.argv[1:]
+    try:
+        opciones = {}
+        for nombre in ("--escenarios", "--procesos", "--semilla", "--factor", "--puntajes"):
+            if nombre in argumentos:
+                indice = argumentos.index(nombre)
+                if indice + 1 >= len(argumentos):
+                    raise ValueError(f"{nombre} requiere un valor")
+                opciones[nombre] = argumentos[indice + 1]
+
+        cartera = cartera_puntuada(Path(opciones["--puntajes"]) if "--puntajes" in opciones else None)
+        simulacion = SimulacionPerdidas(
+            cartera,
+            factor_por=opciones.get("--factor", "AGENCIA"),
+            semilla=int(opciones.get("--semilla", 2025)),
+        )
+        resultado = simulacion.simular(
+            int(opciones.get("--escenarios", 100_000)),
+            procesos=int(opciones["--procesos"]) if "--procesos" in opciones else None,
+        )
+        print(json.dumps(resultado, ensure_ascii=False))
+    except Exception as e:
+        print(json.dumps({"error": str(e), "type": type(e).__name__}, ensure_ascii=False))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
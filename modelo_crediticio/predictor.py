@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import json
+import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Callable, Dict, Tuple
 
 import joblib
 import numpy as np
@@ -19,6 +20,29 @@ DATA_FILE = Path(__file__).resolve().parents[1] / "data" / "AVANCE_BIOCREDITOS_Y
 MODEL_FILE = Path(__file__).resolve().parents[1] / "data" / "modelo_crediticio.joblib"
 SHEET_NAME = "COLOCACIONES_BIOCREDITOS"
 
+UMBRAL_RECHAZO = 0.5
+UMBRAL_OBSERVACION = 0.35
+
+# Grilla por defecto de optimizar_condiciones
+MONTO_MINIMO_OPTIMIZACION = 500.0
+MONTO_MAXIMO_OPTIMIZACION = 50000.0
+PASOS_MONTO_OPTIMIZACION = 50
+REDONDEO_MONTO_OPTIMIZACION = 100.0
+PLAZOS_OPTIMIZACION = (6, 12, 18, 24, 36, 48, 60)
+
+# Diferencia mínima de prob_impago entre combinaciones de prácticas para
+# considerar que el modelo responde a ellas
+TOLERANCIA_PRACTICAS = 1e-6
+
+# Prácticas sostenibles del payload -> columna del modelo
+PRACTICAS_ECO = {
+    "predio_saf": "PREDIO_SAF",
+    "predio_libre_deforest": "PREDIO_LIBRE_DEFOREST",
+    "predio_fuera_anp": "PREDIO_FUERA_ANP",
+    "uso_abonos": "USO_ABONOS",
+    "manejo_plagas": "MANEJO_PLAGAS",
+}
+
 
 @dataclass
 class ModeloBundle:
@@ -47,11 +71,21 @@ def _si_no(valor: Any) -> str:
     return "No"
 
 
-def _cargar_datos() -> pd.DataFrame:
-    if not DATA_FILE.exists():
-        raise FileNotFoundError(f"No se encontró el archivo de datos: {DATA_FILE}")
+def _tea_fraccion(valor: Any) -> float:
+    """TEA del payload como fracción, igual que la columna TEA de la cartera.
+
+    El formulario envía la TEA en porcentaje (18 = 18%); los valores mayores
+    a 1 se interpretan como porcentaje y los demás como fracción (0.18).
+    """
+    tea = float(valor or 0)
+    if tea > 1:
+        tea /= 100
+    if not 0 <= tea < 1:
+        raise ValueError("La TEA debe estar entre 0% y 100%")
+    return tea
+
 
-    df = pd.read_excel(DATA_FILE, sheet_name=SHEET_NAME)
+def _renombrar_columnas(df: pd.DataFrame) -> pd.DataFrame:
     df = df.rename(
         columns={
             "NUMERO": "ID",
@@ -90,6 +124,14 @@ def _cargar_datos() -> pd.DataFrame:
     if "EDAD" not in df.columns:
         df["EDAD"] = 35
 
+    return df
+
+
+def _cargar_datos() -> pd.DataFrame:
+    if not DATA_FILE.exists():
+        raise FileNotFoundError(f"No se encontró el archivo de datos: {DATA_FILE}")
+
+    df = _renombrar_columnas(pd.read_excel(DATA_FILE, sheet_name=SHEET_NAME))
     df = df.dropna()
     return df
 
@@ -231,7 +273,53 @@ def _cargar_modelo() -> ModeloBundle:
     return _entrenar_modelo()
 
 
-def _preparar_input(payload: Dict[str, Any], bundle: ModeloBundle) -> pd.DataFrame:
+# Índices derivados de la cartera ya construidos en este proceso: archivo -> (huella, índice)
+_INDICES_CARGADOS: Dict[Path, Tuple[Any, Any]] = {}
+
+
+def _huella_fuentes(*dependencias: Path) -> Any:
+    """Tamaño y mtime de los datos, el modelo y las dependencias (None si falta alguno)."""
+    rutas = (DATA_FILE, MODEL_FILE, *dependencias)
+    if not all(ruta.exists() for ruta in rutas):
+        return None
+    return tuple((ruta.stat().st_size, ruta.stat().st_mtime_ns) for ruta in rutas)
+
+
+def _cargar_indice(archivo: Path, construir: Callable[[], Any], *dependencias: Path) -> Any:
+    """Índice guardado junto al modelo, reconstruido si cambian los datos o el modelo.
+
+    Cada consulta de la API es un proceso nuevo, así que el índice se guarda
+    con joblib en `archivo` junto con la huella de DATA_FILE, MODEL_FILE y
+    las dependencias (el módulo que define el índice). Si no se puede
+    escribir el archivo, el índice se usa igual sin guardarlo.
+    """
+    huella = _huella_fuentes(*dependencias)
+    en_proceso = _INDICES_CARGADOS.get(archivo)
+    if huella is not None and en_proceso is not None and en_proceso[0] == huella:
+        return en_proceso[1]
+    if huella is not None and archivo.exists():
+        try:
+            guardado = joblib.load(archivo)
+            if guardado["huella"] == huella:
+                _INDICES_CARGADOS[archivo] = (huella, guardado["indice"])
+                return guardado["indice"]
+        except Exception:
+            pass
+
+    indice = construir()
+    # construir puede entrenar el modelo, así que la huella se toma de nuevo
+    huella = _huella_fuentes(*dependencias)
+    _INDICES_CARGADOS[archivo] = (huella, indice)
+    temporal = archivo.with_name(f"{archivo.name}.{os.getpid()}.tmp")
+    try:
+        joblib.dump({"huella": huella, "indice": indice}, temporal)
+        os.replace(temporal, archivo)
+    except OSError:
+        temporal.unlink(missing_ok=True)
+    return indice
+
+
+def _fila_input(payload: Dict[str, Any], bundle: ModeloBundle) -> Dict[str, Any]:
     base = {
         "REGION": payload.get("region", "Cusco"),
         "PROVINCIA": payload.get("provincia", "La Convención"),
@@ -268,7 +356,11 @@ def _preparar_input(payload: Dict[str, Any], bundle: ModeloBundle) -> pd.DataFra
             else:
                 fila[col] = "N/A"
 
-    return pd.DataFrame([fila])
+    return fila
+
+
+def _preparar_input(payload: Dict[str, Any], bundle: ModeloBundle) -> pd.DataFrame:
+    return pd.DataFrame([_fila_input(payload, bundle)])
 
 
 def _eco_score(payload: Dict[str, Any]) -> Tuple[int, bool]:
@@ -291,41 +383,48 @@ def _eco_score(payload: Dict[str, Any]) -> Tuple[int, bool]:
     return score, completos
 
 
-def predecir(payload: Dict[str, Any]) -> Dict[str, Any]:
+def _decision(prob_impago: float) -> str:
+    if prob_impago >= UMBRAL_RECHAZO:
+        return "RECHAZADO"
+    if prob_impago >= UMBRAL_OBSERVACION:
+        return "OBSERVACIÓN"
+    return "APROBADO"
+
+
+def _predecir_lote(construir: Callable[[ModeloBundle], pd.DataFrame]) -> Tuple[np.ndarray, np.ndarray]:
+    # construir arma las filas para un bundle; si el modelo guardado no
+    # coincide con las columnas se reentrena y se vuelven a armar
     bundle = _cargar_modelo()
-    X = _preparar_input(payload, bundle)
+    X = construir(bundle)
 
     try:
-        prob_impago = float(bundle.clf.predict_proba(X)[0, 1])
-        perdida_esperada = float(bundle.reg.predict(X)[0])
+        return bundle.clf.predict_proba(X)[:, 1], bundle.reg.predict(X)
     except ValueError as exc:
         mensaje = str(exc).lower()
         if "n_features" in mensaje or "feature" in mensaje:
             if MODEL_FILE.exists():
                 MODEL_FILE.unlink(missing_ok=True)
             bundle = _entrenar_modelo()
-            X = _preparar_input(payload, bundle)
-            prob_impago = float(bundle.clf.predict_proba(X)[0, 1])
-            perdida_esperada = float(bundle.reg.predict(X)[0])
-        else:
-            raise
+            X = construir(bundle)
+            return bundle.clf.predict_proba(X)[:, 1], bundle.reg.predict(X)
+        raise
 
-    eco_score, completos = _eco_score(payload)
 
-    if prob_impago >= 0.5:
-        decision = "RECHAZADO"
-    elif prob_impago >= 0.35:
-        decision = "OBSERVACIÓN"
-    else:
-        decision = "APROBADO"
+def predecir(payload: Dict[str, Any]) -> Dict[str, Any]:
+    probabilidades, perdidas = _predecir_lote(lambda bundle: _preparar_input(payload, bundle))
+    prob_impago = float(probabilidades[0])
+    perdida_esperada = float(perdidas[0])
+
+    eco_score, completos = _eco_score(payload)
+    decision = _decision(prob_impago)
 
     if not completos:
         resumen = "Complete los datos ambientales para activar la IA."
         eco_tip = "Complete los datos ambientales para activar la IA."
     else:
-        if prob_impago >= 0.5:
+        if prob_impago >= UMBRAL_RECHAZO:
             resumen = "Riesgo elevado detectado. Se recomienda revisar garantías y plan de manejo."
-        elif prob_impago >= 0.35:
+        elif prob_impago >= UMBRAL_OBSERVACION:
             resumen = "Riesgo moderado. Considere ajustar condiciones y acompañamiento técnico."
         else:
             resumen = "Perfil saludable con buenas prácticas ambientales."
@@ -342,11 +441,163 @@ def predecir(payload: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def predecir_desde_stdin() -> Dict[str, Any]:
+def _variantes(payload: Dict[str, Any], bundle: ModeloBundle, montos: np.ndarray, plazos: np.ndarray) -> pd.DataFrame:
+    base = _preparar_input(payload, bundle)
+    X = base.loc[base.index.repeat(len(plazos) * len(montos))].reset_index(drop=True)
+    if "PLAZO_MESES" in X.columns:
+        X["PLAZO_MESES"] = np.repeat(plazos, len(montos)).astype(float)
+    if "MONTO_CREDITO" in X.columns:
+        X["MONTO_CREDITO"] = np.tile(montos, len(plazos)).astype(float)
+    return X
+
+
+def _mejor_condicion(superficie: np.ndarray, montos: np.ndarray, plazos: np.ndarray, umbral: float) -> Dict[str, Any] | None:
+    # Por plazo, el monto máximo tal que todos los montos menores de la
+    # grilla también quedan bajo el umbral (el bosque no es monótono)
+    bajo_umbral = np.logical_and.accumulate(superficie < umbral, axis=1)
+    cantidad = bajo_umbral.sum(axis=1)
+    if not cantidad.any():
+        return None
+    candidatos = np.flatnonzero(cantidad == cantidad.max())
+    fila = candidatos[np.argmin(superficie[candidatos, cantidad.max() - 1])]
+    columna = cantidad[fila] - 1
+    return {
+        "monto_maximo": float(montos[columna]),
+        "plazo_meses": int(plazos[fila]),
+        "prob_impago": round(float(superficie[fila, columna]) * 100, 2),
+    }
+
+
+def _grilla_montos(monto_minimo: float, monto_maximo: float, pasos: int) -> np.ndarray:
+    # Redondea a REDONDEO_MONTO_OPTIMIZACION solo si el paso lo permite; un
+    # rango estrecho se muestrea sin redondear. Los extremos siempre se respetan.
+    montos = np.linspace(monto_minimo, monto_maximo, pasos)
+    if (monto_maximo - monto_minimo) / (pasos - 1) >= REDONDEO_MONTO_OPTIMIZACION:
+        montos = np.round(montos / REDONDEO_MONTO_OPTIMIZACION) * REDONDEO_MONTO_OPTIMIZACION
+    return np.unique(montos.clip(monto_minimo, monto_maximo))
+
+
+def optimizar_condiciones(payload: Dict[str, Any]) -> Dict[str, Any]:
+    monto_solicitado = float(payload.get("monto_credito", 0))
+    monto_minimo = float(payload.get("monto_minimo", MONTO_MINIMO_OPTIMIZACION))
+    monto_maximo = float(payload.get("monto_maximo", max(MONTO_MAXIMO_OPTIMIZACION, monto_solicitado)))
+    pasos = int(payload.get("pasos_monto", PASOS_MONTO_OPTIMIZACION))
+    plazos = np.array(sorted({int(plazo) for plazo in payload.get("plazos", PLAZOS_OPTIMIZACION)}))
+    if monto_minimo <= 0 or monto_maximo < monto_minimo:
+        raise ValueError("El rango de montos debe ser positivo y monto_minimo <= monto_maximo")
+    if pasos < 2 or len(plazos) == 0 or plazos.min() <= 0:
+        raise ValueError("Se requieren al menos 2 montos y plazos positivos")
+
+    montos = _grilla_montos(monto_minimo, monto_maximo, pasos)
+    probabilidades, perdidas = _predecir_lote(lambda bundle: _variantes(payload, bundle, montos, plazos))
+    superficie = probabilidades.reshape(len(plazos), len(montos))
+    perdidas = perdidas.reshape(len(plazos), len(montos))
+
+    return {
+        "monto_solicitado": monto_solicitado,
+        "plazo_solicitado": float(payload.get("plazo_meses", 12)),
+        "aprobado": _mejor_condicion(superficie, montos, plazos, UMBRAL_OBSERVACION),
+        "observacion": _mejor_condicion(superficie, montos, plazos, UMBRAL_RECHAZO),
+        "montos": montos.tolist(),
+        "plazos": plazos.tolist(),
+        "superficie": {
+            "prob_impago": np.round(superficie * 100, 2).tolist(),
+            "perdida_esperada": np.round(perdidas, 2).tolist(),
+        },
+    }
+
+
+def _categorias_si_no(bundle: ModeloBundle, columna: str) -> Tuple[Any, Any]:
+    """Valores de "Sí" y "No" de una columna en el vocabulario del OneHotEncoder.
+
+    La cartera usa "SI"; si el encoder no conoce alguno de los dos se deja
+    "Sí"/"No", que handle_unknown="ignore" codifica como desconocido.
+    """
+    encoder = bundle.clf.named_steps["preprocessor"].named_transformers_["cat"]
+    categorias = encoder.categories_[list(bundle.categorical_features).index(columna)]
+    por_valor = {_si_no(str(categoria)): categoria for categoria in categorias
+                 if str(categoria).strip().lower() in {"si", "sí", "s", "no", "n"}}
+    return por_valor.get("Sí", "Sí"), por_valor.get("No", "No")
+
+
+def _combinaciones_practicas(payload: Dict[str, Any], bundle: ModeloBundle, combinaciones: np.ndarray) -> pd.DataFrame:
+    base = _preparar_input(payload, bundle)
+    X = base.loc[base.index.repeat(len(combinaciones))].reset_index(drop=True)
+    for j, columna in enumerate(PRACTICAS_ECO.values()):
+        if columna in X.columns:
+            si, no = _categorias_si_no(bundle, columna)
+            X[columna] = np.where(combinaciones[:, j], si, no)
+    return X
+
+
+def recomendar_practicas(payload: Dict[str, Any], maximo: int = 5) -> Dict[str, Any]:
+    """Combinaciones de prácticas sostenibles que más reducen el riesgo.
+
+    Con modelo_sensible False el riesgo no cambia con ninguna combinación
+    (el modelo no usa las prácticas) y recomendaciones queda vacía.
+    """
+    claves = list(PRACTICAS_ECO)
+    actuales = np.array([_si_no(payload.get(clave, "No")) == "Sí" for clave in claves])
+    # Las 32 combinaciones de prácticas (bit j = práctica j)
+    combinaciones = (np.arange(2 ** len(claves))[:, None] >> np.arange(len(claves))) & 1 == 1
+    probabilidades, perdidas = _predecir_lote(
+        lambda bundle: _combinaciones_practicas(payload, bundle, combinaciones)
+    )
+    eco_scores = np.rint(combinaciones.sum(axis=1) / len(claves) * 100).astype(int)
+
+    actual = int(np.flatnonzero((combinaciones == actuales).all(axis=1))[0])
+    # Alcanzables: conservan las prácticas que el productor ya tiene
+    alcanzables = np.flatnonzero((combinaciones | ~actuales).all(axis=1) & (np.arange(len(combinaciones)) != actual))
+    cambios = combinaciones.sum(axis=1) - actuales.sum()
+    orden = np.lexsort((cambios[alcanzables], -eco_scores[alcanzables], perdidas[alcanzables], probabilidades[alcanzables]))
+
+    def _opcion(i: int) -> Dict[str, Any]:
+        return {
+            "adoptar": [clave for clave, nueva, previa in zip(claves, combinaciones[i], actuales) if nueva and not previa],
+            "prob_impago": round(float(probabilidades[i]) * 100, 2),
+            "perdida_esperada": round(float(perdidas[i]), 2),
+            "eco_score": int(eco_scores[i]),
+            "decision": _decision(float(probabilidades[i])),
+            "reduccion_prob_impago": round(float(probabilidades[actual] - probabilidades[i]) * 100, 2),
+            "reduccion_perdida_esperada": round(float(perdidas[actual] - perdidas[i]), 2),
+            "aumento_eco_score": int(eco_scores[i] - eco_scores[actual]),
+        }
+
+    individuales = [i for i in alcanzables if cambios[i] == 1]
+    # Si ninguna combinación cambia el riesgo, el orden solo vendría del
+    # eco_score: no se presenta como recomendación por riesgo
+    modelo_sensible = bool(np.ptp(probabilidades) > TOLERANCIA_PRACTICAS)
+    return {
+        "modelo_sensible": modelo_sensible,
+        "actual": {
+            "practicas": [clave for clave, tiene in zip(claves, actuales) if tiene],
+            "prob_impago": round(float(probabilidades[actual]) * 100, 2),
+            "perdida_esperada": round(float(perdidas[actual]), 2),
+            "eco_score": int(eco_scores[actual]),
+            "decision": _decision(float(probabilidades[actual])),
+        },
+        "recomendaciones": [_opcion(i) for i in alcanzables[orden][:maximo]] if modelo_sensible else [],
+        "por_practica": sorted((_opcion(i) for i in individuales), key=lambda o: -o["reduccion_prob_impago"]),
+        "combinaciones_evaluadas": len(combinaciones),
+    }
+
+
+def _leer_payload_stdin() -> Dict[str, Any]:
     import sys
 
     raw = sys.stdin.read().strip()
     if not raw:
         raw = "{}"
-    payload = json.loads(raw)
-    return predecir(payload)
+    return json.loads(raw)
+
+
+def predecir_desde_stdin() -> Dict[str, Any]:
+    return predecir(_leer_payload_stdin())
+
+
+def optimizar_desde_stdin() -> Dict[str, Any]:
+    return optimizar_condiciones(_leer_payload_stdin())
+
+
+def recomendar_desde_stdin() -> Dict[str, Any]:
+    return recomendar_practicas(_leer_payload_stdin())
@@ -0,0 +1,170 @@
+"""Pérdida esperada de la cartera agregada por grupos.
+
+Guarda PD, LGD, EAD y EL = PD × LGD × EAD como columnas de NumPy y cada
+dimensión de agrupación (REGION, PROVINCIA, AGENCIA, ACTIVIDAD_PRINCIPAL,
+TIPO_CREDITO) como códigos enteros. Los totales por grupo se calculan una
+vez con bincount y luego se mantienen con deltas al cambiar un préstamo,
+sin volver a recorrer la cartera.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .predictor import _cargar_datos, _simular_targets
+
+DIMENSIONES = ("REGION", "PROVINCIA", "AGENCIA", "ACTIVIDAD_PRINCIPAL", "TIPO_CREDITO")
+
+
+def _etiqueta(valor: Any) -> str:
+    if valor is None or (isinstance(valor, float) and np.isnan(valor)):
+        return "N/A"
+    return str(valor).strip() or "N/A"
+
+
+class CarteraRiesgo:
+    """Columnas de riesgo por préstamo y totales por grupo actualizables en O(1)."""
+
+    def __init__(self, df: pd.DataFrame, columna_id: str = "ID"):
+        faltantes = [col for col in ("PD", "LGD", "EAD", *DIMENSIONES) if col not in df.columns]
+        if faltantes:
+            raise ValueError(f"Faltan columnas en la cartera: {', '.join(faltantes)}")
+
+        self.ids = df[columna_id].tolist() if columna_id in df.columns else list(range(len(df)))
+        self.posiciones = {id_: i for i, id_ in enumerate(self.ids)}
+        if len(self.posiciones) != len(self.ids):
+            raise ValueError(f"La columna {columna_id} tiene identificadores repetidos")
+
+        self.pd = df["PD"].to_numpy(np.float64, copy=True)
+        self.lgd = df["LGD"].to_numpy(np.float64, copy=True)
+        self.ead = df["EAD"].to_numpy(np.float64, copy=True)
+        self.el = self.pd * self.lgd * self.ead
+
+        self.codigos: Dict[str, np.ndarray] = {}
+        self.etiquetas: Dict[str, List[str]] = {}
+        self._indices: Dict[str, Dict[str, int]] = {}
+        for dimension in DIMENSIONES:
+            codigos, unicos = pd.factorize(df[dimension].map(_etiqueta))
+            self.codigos[dimension] = codigos.astype(np.int64)
+            self.etiquetas[dimension] = list(unicos)
+            self._indices[dimension] = {etiqueta: i for i, etiqueta in enumerate(unicos)}
+
+        self.recalcular()
+
+    @classmethod
+    def desde_colocaciones(cls) -> "CarteraRiesgo":
+        """Cartera de COLOCACIONES_BIOCREDITOS con los targets de _simular_targets."""
+        return cls(_simular_targets(_cargar_datos()))
+
+    def recalcular(self) -> None:
+        """Rehace todos los totales desde las columnas (elimina deriva de redondeo)."""
+        self.total_el = float(self.el.sum())
+        self.total_ead = float(self.ead.sum())
+        self._suma_el: Dict[str, np.ndarray] = {}
+        self._suma_ead: Dict[str, np.ndarray] = {}
+        self._conteo: Dict[str, np.ndarray] = {}
+        for dimension in DIMENSIONES:
+            codigos = self.codigos[dimension]
+            k = len(self.etiquetas[dimension])
+            self._suma_el[dimension] = np.bincount(codigos, weights=self.el, minlength=k)
+            self._suma_ead[dimension] = np.bincount(codigos, weights=self.ead, minlength=k)
+            self._conteo[dimension] = np.bincount(codigos, minlength=k)
+
+    def _codigo(self, dimension: str, valor: Any) -> int:
+        etiqueta = _etiqueta(valor)
+        indices = self._indices[dimension]
+        if etiqueta not in indices:
+            indices[etiqueta] = len(self.etiquetas[dimension])
+            self.etiquetas[dimension].append(etiqueta)
+            for sumas in (self._suma_el, self._suma_ead, self._conteo):
+                sumas[dimension] = np.append(sumas[dimension], 0)
+        return indices[etiqueta]
+
+    def actualizar(
+        self,
+        id_prestamo: Any,
+        pd_: Optional[float] = None,
+        lgd: Optional[float] = None,
+        ead: Optional[float] = None,
+        **grupos: Any,
+    ) -> Dict[str, float]:
+        """Cambia los datos de un préstamo y ajusta los totales con deltas.
+
+        grupos acepta las dimensiones por nombre (ej. AGENCIA="Quillabamba")
+        para mover el préstamo de grupo.
+        """
+        if id_prestamo not in self.posiciones:
+            raise ValueError(f"Préstamo desconocido: {id_prestamo}")
+        desconocidas = [dimension for dimension in grupos if dimension not in DIMENSIONES]
+        if desconocidas:
+            raise ValueError(f"Dimensión inválida: {', '.join(desconocidas)}")
+        if pd_ is not None and not 0 <= pd_ <= 1:
+            raise ValueError("PD debe estar entre 0 y 1")
+        if lgd is not None and not 0 <= lgd <= 1:
+            raise ValueError("LGD debe estar entre 0 y 1")
+        if ead is not None and ead < 0:
+            raise ValueError("EAD no puede ser negativa")
+
+        i = self.posiciones[id_prestamo]
+        el_anterior, ead_anterior = self.el[i], self.ead[i]
+        if pd_ is not None:
+            self.pd[i] = pd_
+        if lgd is not None:
+            self.lgd[i] = lgd
+        if ead is not None:
+            self.ead[i] = ead
+        self.el[i] = self.pd[i] * self.lgd[i] * self.ead[i]
+
+        delta_el = self.el[i] - el_anterior
+        delta_ead = self.ead[i] - ead_anterior
+        self.total_el += delta_el
+        self.total_ead += delta_ead
+        for dimension in DIMENSIONES:
+            anterior = self.codigos[dimension][i]
+            nuevo = self._codigo(dimension, grupos[dimension]) if dimension in grupos else anterior
+            if nuevo == anterior:
+                self._suma_el[dimension][anterior] += delta_el
+                self._suma_ead[dimension][anterior] += delta_ead
+                continue
+            self._suma_el[dimension][anterior] -= el_anterior
+            self._suma_ead[dimension][anterior] -= ead_anterior
+            self._conteo[dimension][anterior] -= 1
+            self._suma_el[dimension][nuevo] += self.el[i]
+            self._suma_ead[dimension][nuevo] += self.ead[i]
+            self._conteo[dimension][nuevo] += 1
+            self.codigos[dimension][i] = nuevo
+
+        return {"pd": float(self.pd[i]), "lgd": float(self.lgd[i]), "ead": float(self.ead[i]), "el": float(self.el[i])}
+
+    def agregados(self, dimension: str) -> List[Dict[str, Any]]:
+        """EL total, participación y EL/EAD de cada grupo de una dimensión."""
+        if dimension not in DIMENSIONES:
+            raise ValueError(f"Dimensión inválida: {dimension}. Debe ser una de {', '.join(DIMENSIONES)}")
+        suma_el, suma_ead, conteo = self._suma_el[dimension], self._suma_ead[dimension], self._conteo[dimension]
+        grupos = []
+        for k in np.argsort(-suma_el, kind="stable"):
+            if conteo[k] == 0:
+                continue
+            grupos.append(
+                {
+                    "grupo": self.etiquetas[dimension][k],
+                    "prestamos": int(conteo[k]),
+                    "ead": round(float(suma_ead[k]), 2),
+                    "el": round(float(suma_el[k]), 2),
+                    "participacion_el": round(float(suma_el[k] / self.total_el), 4) if self.total_el else 0.0,
+                    "el_sobre_ead": round(float(suma_el[k] / suma_ead[k]), 4) if suma_ead[k] else 0.0,
+                }
+            )
+        return grupos
+
+    def resumen(self) -> Dict[str, Any]:
+        """Totales de la cartera y agregados de todas las dimensiones."""
+        return {
+            "prestamos": len(self.ids),
+            "ead_total": round(self.total_ead, 2),
+            "el_total": round(self.total_el, 2),
+            "el_sobre_ead": round(self.total_el / self.total_ead, 4) if self.total_ead else 0.0,
+            "grupos": {dimension: self.agregados(dimension) for dimension in DIMENSIONES},
+        }
@@ -0,0 +1,202 @@
+"""Clientes similares de COLOCACIONES_BIOCREDITOS para mostrar junto al score.
+
+Cada préstamo se codifica con las mismas variables del modelo (numéricas
+estandarizadas + one-hot de las categorías aprendidas por el OneHotEncoder
+del bundle) y se indexa en un KDTree. La codificación de los payloads se
+hace con tablas de categorías precalculadas, sin pasar por el
+ColumnTransformer, para que la consulta de un solicitante no dependa de
+pandas.
+
+La TEA del payload se pasa a fracción como en la cartera y las variables
+numéricas estandarizadas de la consulta se limitan al rango indexado, para
+que un valor fuera de escala no decida por sí solo los vecinos.
+
+Los préstamos nuevos se agregan a un buffer que se recorre por fuerza bruta
+junto con el árbol; el árbol se reconstruye cuando el buffer supera
+FRACCION_RECONSTRUCCION del tamaño indexado. El índice de la cartera se
+guarda en INDICE_FILE y solo se reconstruye si cambian los datos o el modelo.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+from .predictor import (
+    MODEL_FILE,
+    ModeloBundle,
+    _cargar_datos,
+    _cargar_indice,
+    _cargar_modelo,
+    _fila_input,
+    _simular_targets,
+    _tea_fraccion,
+)
+
+VECINOS_DEFECTO = 5
+
+INDICE_FILE = MODEL_FILE.with_name("indice_similares.joblib")
+
+# El árbol se reconstruye cuando el buffer supera esta fracción de lo indexado
+FRACCION_RECONSTRUCCION = 0.1
+MINIMO_RECONSTRUCCION = 64
+
+COLUMNAS_RESULTADO = ("ID", "AGENCIA", "ACTIVIDAD_PRINCIPAL", "MONTO_CREDITO", "PLAZO_MESES", "incumplio_90d", "PD", "EL")
+
+
+class IndiceSimilares:
+    """Vecinos más cercanos sobre las variables codificadas del modelo."""
+
+    def __init__(self, df: pd.DataFrame, bundle: Optional[ModeloBundle] = None):
+        faltantes = [col for col in ("ID", "incumplio_90d", "PD", "EL") if col not in df.columns]
+        if faltantes:
+            raise ValueError(f"Faltan columnas en la cartera: {', '.join(faltantes)}")
+
+        self.bundle = _cargar_modelo() if bundle is None else bundle
+        encoder = self.bundle.clf.named_steps["preprocessor"].named_transformers_["cat"]
+        self.numericas = list(self.bundle.numerical_features)
+        self.categoricas = list(self.bundle.categorical_features)
+        self._offsets: List[Dict[Any, int]] = []
+        posicion = len(self.numericas)
+        for categorias in encoder.categories_:
+            self._offsets.append({categoria: posicion + k for k, categoria in enumerate(categorias)})
+            posicion += len(categorias)
+        self.dimension = posicion
+
+        numericas = df[self.numericas].to_numpy(np.float64)
+        self._media = numericas.mean(axis=0)
+        self._escala = numericas.std(axis=0)
+        self._escala[self._escala == 0] = 1.0
+
+        self._base = self.codificar(df.to_dict("records"))
+        self._minimos = self._base[:, : len(self.numericas)].min(axis=0)
+        self._maximos = self._base[:, : len(self.numericas)].max(axis=0)
+        self._datos = {col: df[col].to_numpy() for col in COLUMNAS_RESULTADO if col in df.columns}
+        self._buffer = np.empty((0, self.dimension))
+        self._arbol = KDTree(self._base)
+
+    @classmethod
+    def desde_colocaciones(cls) -> "IndiceSimilares":
+        """Índice de COLOCACIONES_BIOCREDITOS con los targets de _simular_targets."""
+        return cls(_simular_targets(_cargar_datos()))
+
+    @classmethod
+    def cargar(cls) -> "IndiceSimilares":
+        """desde_colocaciones guardado en INDICE_FILE (ver predictor._cargar_indice)."""
+        return _cargar_indice(INDICE_FILE, cls.desde_colocaciones, Path(__file__))
+
+    def __len__(self) -> int:
+        return len(self._base) + len(self._buffer)
+
+    def codificar(self, filas: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Matriz (filas × dimension) con la codificación del modelo.
+
+        Las categorías que el encoder no conoce quedan en cero, como con
+        handle_unknown="ignore".
+        """
+        matriz = np.zeros((len(filas), self.dimension))
+        for i, fila in enumerate(filas):
+            matriz[i, : len(self.numericas)] = [float(fila.get(col, 0) or 0) for col in self.numericas]
+            for col, offsets in zip(self.categoricas, self._offsets):
+                posicion = offsets.get(fila.get(col))
+                if posicion is not None:
+                    matriz[i, posicion] = 1.0
+        matriz[:, : len(self.numericas)] = (matriz[:, : len(self.numericas)] - self._media) / self._escala
+        return matriz
+
+    def agregar(self, df: pd.DataFrame) -> None:
+        """Agrega préstamos (con sus resultados) sin reconstruir el árbol cada vez."""
+        nuevas = self.codificar(df.to_dict("records"))
+        self._buffer = np.vstack([self._buffer, nuevas])
+        for col, valores in self._datos.items():
+            nuevos = df[col].to_numpy() if col in df.columns else np.full(len(df), None, dtype=object)
+            self._datos[col] = np.concatenate([valores, nuevos])
+        if len(self._buffer) > max(MINIMO_RECONSTRUCCION, FRACCION_RECONSTRUCCION * len(self._base)):
+            self.reconstruir()
+
+    def reconstruir(self) -> None:
+        """Incorpora el buffer al árbol."""
+        if len(self._buffer):
+            self._base = np.vstack([self._base, self._buffer])
+            self._buffer = np.empty((0, self.dimension))
+            self._arbol = KDTree(self._base)
+
+    def consultar(self, consultas: np.ndarray, k: int = VECINOS_DEFECTO) -> Tuple[np.ndarray, np.ndarray]:
+        """Distancias e índices (consultas × k) de los k vecinos más cercanos."""
+        if k <= 0:
+            raise ValueError("k debe ser mayor a 0")
+        k = min(k, len(self))
+        distancias, indices = self._arbol.query(consultas, k=min(k, len(self._base)))
+        if len(self._buffer):
+            # Fuerza bruta sobre el buffer: |x|² + |b|² - 2 x·b
+            cuadrados = (
+                (consultas ** 2).sum(axis=1)[:, None]
+                + (self._buffer ** 2).sum(axis=1)[None, :]
+                - 2 * consultas @ self._buffer.T
+            )
+            distancias = np.hstack([distancias, np.sqrt(np.maximum(cuadrados, 0.0))])
+            indices = np.hstack([indices, len(self._base) + np.broadcast_to(np.arange(len(self._buffer)), cuadrados.shape)])
+            orden = np.argsort(distancias, axis=1, kind="stable")[:, :k]
+            distancias = np.take_along_axis(distancias, orden, axis=1)
+            indices = np.take_along_axis(indices, orden, axis=1)
+        return distancias, indices
+
+    def buscar(self, payloads: Sequence[Dict[str, Any]], k: int = VECINOS_DEFECTO) -> List[Dict[str, Any]]:
+        """Clientes similares y su resumen de resultados para cada payload.
+
+        La TEA del payload puede venir en porcentaje (18) o como fracción (0.18).
+        """
+        consultas = self.codificar(
+            [_fila_input({**payload, "tea": _tea_fraccion(payload.get("tea", 0))}, self.bundle) for payload in payloads]
+        )
+        n = len(self.numericas)
+        consultas[:, :n] = np.clip(consultas[:, :n], self._minimos, self._maximos)
+        distancias, indices = self.consultar(consultas, k)
+        vacia = [None] * distancias.shape[1]
+        resultados = []
+        for fila_distancias, fila_indices in zip(distancias, indices):
+            vecinos = {col: valores[fila_indices] for col, valores in self._datos.items()}
+            incumplio, pd_, el = (vecinos[col].astype(np.float64) for col in ("incumplio_90d", "PD", "EL"))
+            clientes = [
+                {
+                    "id": id_,
+                    "agencia": agencia,
+                    "actividad_principal": actividad,
+                    "monto_credito": None if monto is None else float(monto),
+                    "plazo_meses": None if plazo is None else float(plazo),
+                    "incumplio_90d": int(incumplio_i),
+                    "prob_impago": round(pd_i * 100, 2),
+                    "perdida_esperada": round(el_i, 2),
+                    "distancia": round(distancia, 4),
+                }
+                for id_, agencia, actividad, monto, plazo, incumplio_i, pd_i, el_i, distancia in zip(
+                    vecinos["ID"].tolist(),
+                    vecinos["AGENCIA"].tolist() if "AGENCIA" in vecinos else vacia,
+                    vecinos["ACTIVIDAD_PRINCIPAL"].tolist() if "ACTIVIDAD_PRINCIPAL" in vecinos else vacia,
+                    vecinos["MONTO_CREDITO"].tolist() if "MONTO_CREDITO" in vecinos else vacia,
+                    vecinos["PLAZO_MESES"].tolist() if "PLAZO_MESES" in vecinos else vacia,
+                    incumplio.tolist(),
+                    pd_.tolist(),
+                    el.tolist(),
+                    fila_distancias.tolist(),
+                )
+            ]
+            resultados.append(
+                {
+                    "similares": clientes,
+                    "tasa_incumplimiento": round(float(incumplio.mean()) * 100, 2),
+                    "prob_impago_media": round(float(pd_.mean()) * 100, 2),
+                    "perdida_esperada_media": round(float(el.mean()), 2),
+                }
+            )
+        return resultados
+
+
+def similares_desde_stdin() -> Dict[str, Any]:
+    from .predictor import _leer_payload_stdin
+
+    payload = _leer_payload_stdin()
+    return IndiceSimilares.cargar().buscar([payload], int(payload.get("k", VECINOS_DEFECTO)))[0]
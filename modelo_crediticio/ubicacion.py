@@ -0,0 +1,381 @@
+"""Índice espacial de la cartera sobre COORDENADAS UTM (17).
+
+La columna llega como texto libre, en su mayoría latitud/longitud
+("LAT: -12.480750, LON: -72.783180", "LAT:12.83S, LON:72.66") y a veces UTM
+("18L 712345 8601234", "E: 712345 N: 8601234 zona 18"). parsear_coordenadas
+normaliza ambos formatos a latitud, longitud, este, norte y zona.
+
+Para medir distancias todos los puntos se proyectan a una misma zona UTM
+(la más frecuente de la cartera) y se indexan en una grilla uniforme de
+celdas cuadradas. Un préstamo se ubica en su celda en O(1) y las consultas
+por radio o recuadro solo revisan las celdas que tocan el área. Los mapas de
+calor por celda se arman con bincount. El índice de la cartera se guarda en
+INDICE_FILE, junto al modelo, y solo se reconstruye si cambian los datos o
+el modelo.
+
+Los valores sin signo ni hemisferio se asumen en el hemisferio sur y al
+oeste de Greenwich, donde está toda la cartera (Perú). Los puntos fuera de
+LIMITES_LATLON se descartan (salvo latitud y longitud intercambiadas).
+"""
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Elipsoide WGS84 y parámetros UTM
+_A = 6378137.0
+_F = 1 / 298.257223563
+_K0 = 0.9996
+_ESTE_FALSO = 500000.0
+_NORTE_FALSO_SUR = 10000000.0
+
+_N = _F / (2 - _F)
+_A_RECTIFICANTE = _A / (1 + _N) * (1 + _N ** 2 / 4 + _N ** 4 / 64)
+_ALFA = (_N / 2 - 2 * _N ** 2 / 3 + 5 * _N ** 3 / 16, 13 * _N ** 2 / 48 - 3 * _N ** 3 / 5, 61 * _N ** 3 / 240)
+_BETA = (_N / 2 - 2 * _N ** 2 / 3 + 37 * _N ** 3 / 96, _N ** 2 / 48 + _N ** 3 / 15, 17 * _N ** 3 / 480)
+_DELTA = (2 * _N - 2 * _N ** 2 / 3 - 2 * _N ** 3, 7 * _N ** 2 / 3 - 8 * _N ** 3 / 5, 56 * _N ** 3 / 15)
+
+# Zona y hemisferio de los textos UTM que no los indican (La Convención, Cusco)
+ZONA_DEFECTO = 18
+
+# Recuadro (lat_min, lat_max, lon_min, lon_max) de coordenadas aceptadas: Perú
+LIMITES_LATLON = (-18.5, 0.5, -81.5, -68.5)
+
+TAMAÑO_CELDA_KM = 5.0
+
+INDICE_FILE = Path(__file__).resolve().parents[1] / "data" / "indice_espacial.joblib"
+
+_NUMERO = r"([-–]?)\s*(\d+(?:[.,]\d+)?)\s*°?\s*([NSEOW])?"
+_PATRON_LAT = re.compile(r"LAT[A-Z]*\.?\s*:?\s*" + _NUMERO, re.IGNORECASE)
+_PATRON_LON = re.compile(r"LON[A-Z]*\.?\s*:?\s*" + _NUMERO, re.IGNORECASE)
+_PATRON_ZONA = re.compile(r"(?:ZONA|ZONE|Z)?\s*:?\s*\b(\d{1,2})\s*([C-HJ-NP-X])?\b(?!\d)", re.IGNORECASE)
+_PATRON_ESTE = re.compile(r"\b(?:E|ESTE|X)\s*:?\s*(\d{6}(?:[.,]\d+)?)", re.IGNORECASE)
+_PATRON_NORTE = re.compile(r"\b(?:N|NORTE|Y)\s*:?\s*(\d{7}(?:[.,]\d+)?)", re.IGNORECASE)
+_PATRON_GRANDE = re.compile(r"(?<![\d.])(\d{6,7}(?:[.,]\d+)?)")
+
+
+def _meridiano_central(zona: Any) -> np.ndarray:
+    return np.radians(np.asarray(zona, dtype=np.float64) * 6 - 183)
+
+
+def zona_utm(lon: Any) -> np.ndarray:
+    """Zona UTM (1-60) de cada longitud."""
+    return (np.floor((np.asarray(lon, dtype=np.float64) + 180) / 6) % 60 + 1).astype(np.int64)
+
+
+def _transversa(lat: np.ndarray, lon: np.ndarray, zona: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Este y norte sin falso norte (continuo a través del ecuador)
+    phi = np.radians(lat)
+    lam = np.radians(lon) - _meridiano_central(zona)
+
+    c = 2 * np.sqrt(_N) / (1 + _N)
+    t = np.sinh(np.arctanh(np.sin(phi)) - c * np.arctanh(c * np.sin(phi)))
+    xi = np.arctan2(t, np.cos(lam))
+    eta = np.arctanh(np.sin(lam) / np.sqrt(1 + t ** 2))
+    este = eta.copy()
+    norte = xi.copy()
+    for j, alfa in enumerate(_ALFA, start=1):
+        este += alfa * np.cos(2 * j * xi) * np.sinh(2 * j * eta)
+        norte += alfa * np.sin(2 * j * xi) * np.cosh(2 * j * eta)
+    return _ESTE_FALSO + _K0 * _A_RECTIFICANTE * este, _K0 * _A_RECTIFICANTE * norte
+
+
+def latlon_a_utm(lat: Any, lon: Any, zona: Any = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Este y norte (m) de latitudes/longitudes WGS84, vectorizado.
+
+    Con zona se proyecta en esa zona aunque el punto caiga en la vecina
+    (válido para algunos grados fuera de ella). El norte usa el falso norte
+    del hemisferio sur cuando la latitud es negativa.
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    zona = zona_utm(lon) if zona is None else np.broadcast_to(np.asarray(zona, dtype=np.int64), lon.shape)
+    este, norte = _transversa(lat, lon, zona)
+    return este, norte + np.where(lat < 0, _NORTE_FALSO_SUR, 0.0), zona
+
+
+def utm_a_latlon(este: Any, norte: Any, zona: Any, sur: Any = True) -> Tuple[np.ndarray, np.ndarray]:
+    """Latitud y longitud WGS84 de coordenadas UTM, vectorizado."""
+    este = np.asarray(este, dtype=np.float64)
+    norte = np.asarray(norte, dtype=np.float64) - np.where(np.asarray(sur, dtype=bool), _NORTE_FALSO_SUR, 0.0)
+    xi = norte / (_K0 * _A_RECTIFICANTE)
+    eta = (este - _ESTE_FALSO) / (_K0 * _A_RECTIFICANTE)
+    xi_p = xi.copy()
+    eta_p = eta.copy()
+    for j, beta in enumerate(_BETA, start=1):
+        xi_p -= beta * np.sin(2 * j * xi) * np.cosh(2 * j * eta)
+        eta_p -= beta * np.cos(2 * j * xi) * np.sinh(2 * j * eta)
+    chi = np.arcsin(np.sin(xi_p) / np.cosh(eta_p))
+    phi = chi.copy()
+    for j, delta in enumerate(_DELTA, start=1):
+        phi += delta * np.sin(2 * j * chi)
+    lam = _meridiano_central(zona) + np.arctan2(np.sinh(eta_p), np.cos(xi_p))
+    return np.degrees(phi), np.degrees(lam)
+
+
+def _escala(este: Any) -> np.ndarray:
+    # Factor de escala de la proyección a una distancia del meridiano central
+    return _K0 * (1 + ((np.asarray(este, dtype=np.float64) - _ESTE_FALSO) / _A) ** 2 / 2)
+
+
+def _dentro_limites(lat: float, lon: float) -> bool:
+    lat_min, lat_max, lon_min, lon_max = LIMITES_LATLON
+    return lat_min <= lat <= lat_max and lon_min <= lon <= lon_max
+
+
+def _grados(signo: str, valor: str, hemisferio: Optional[str]) -> float:
+    grados = float(valor.replace(",", "."))
+    if not signo and (hemisferio or "").upper() in ("N", "E"):
+        return grados
+    return -grados
+
+
+def _leer(texto: Any) -> Optional[Dict[str, Any]]:
+    # Solo lat y lon para textos de latitud/longitud (la proyección va aparte)
+    if texto is None or (isinstance(texto, float) and np.isnan(texto)):
+        return None
+    texto = str(texto).strip()
+
+    lat, lon = _PATRON_LAT.search(texto), _PATRON_LON.search(texto)
+    if lat and lon:
+        latitud = _grados(*lat.groups())
+        longitud = _grados(*lon.groups())
+        if not _dentro_limites(latitud, longitud):
+            if not _dentro_limites(longitud, latitud):
+                return None
+            latitud, longitud = longitud, latitud
+        return {"lat": latitud, "lon": longitud}
+
+    este, norte = _PATRON_ESTE.search(texto), _PATRON_NORTE.search(texto)
+    if este and norte:
+        valor_este, valor_norte = float(este.group(1).replace(",", ".")), float(norte.group(1).replace(",", "."))
+        resto = texto[: min(este.start(), norte.start())] + " " + texto[max(este.end(), norte.end()):]
+    else:
+        grandes = [float(valor.replace(",", ".")) for valor in _PATRON_GRANDE.findall(texto)]
+        if len(grandes) != 2:
+            return None
+        valor_este, valor_norte = sorted(grandes)
+        resto = _PATRON_GRANDE.sub(" ", texto)
+    if not (100000 <= valor_este <= 900000 and 0 <= valor_norte <= _NORTE_FALSO_SUR):
+        return None
+
+    zona, sur = ZONA_DEFECTO, True
+    indicada = _PATRON_ZONA.search(resto)
+    if indicada and 1 <= int(indicada.group(1)) <= 60:
+        zona = int(indicada.group(1))
+        if indicada.group(2):
+            sur = indicada.group(2).upper() < "N"
+    latitud, longitud = utm_a_latlon(valor_este, valor_norte, zona, sur)
+    if not _dentro_limites(latitud, longitud):
+        return None
+    return {
+        "lat": float(latitud),
+        "lon": float(longitud),
+        "este": valor_este,
+        "norte": valor_norte,
+        "zona": zona,
+        "sur": sur,
+    }
+
+
+def parsear_coordenadas(texto: Any) -> Optional[Dict[str, Any]]:
+    """Latitud, longitud, este, norte y zona de un texto de coordenadas.
+
+    Returns:
+        Dict con lat, lon, este, norte, zona y sur (hemisferio), o None si
+        el texto no tiene coordenadas reconocibles
+    """
+    punto = _leer(texto)
+    if punto is not None and "este" not in punto:
+        este, norte, zona = latlon_a_utm(punto["lat"], punto["lon"])
+        punto.update(este=float(este), norte=float(norte), zona=int(zona), sur=punto["lat"] < 0)
+    return punto
+
+
+def parsear_columna(coordenadas: pd.Series) -> pd.DataFrame:
+    """parsear_coordenadas sobre una columna; las filas sin coordenadas quedan en NaN."""
+    filas = pd.DataFrame(
+        [_leer(valor) or {} for valor in coordenadas],
+        index=coordenadas.index,
+        columns=["lat", "lon", "este", "norte", "zona", "sur"],
+    )
+    filas["sur"] = filas["sur"].astype(object)
+    latlon = (filas["lat"].notna() & filas["este"].isna()).to_numpy()
+    if latlon.any():
+        lat = filas["lat"].to_numpy(np.float64)[latlon]
+        este, norte, zona = latlon_a_utm(lat, filas["lon"].to_numpy(np.float64)[latlon])
+        filas.loc[latlon, "este"] = este
+        filas.loc[latlon, "norte"] = norte
+        filas.loc[latlon, "zona"] = zona
+        filas.loc[latlon, "sur"] = lat < 0
+    return filas
+
+
+class IndiceEspacial:
+    """Grilla uniforme (celdas de tamaño_celda_km) sobre la cartera proyectada."""
+
+    def __init__(self, df: pd.DataFrame, tamaño_celda_km: float = TAMAÑO_CELDA_KM):
+        faltantes = [col for col in ("COORDENADAS", "EAD", "EL", "PD", "incumplio_90d") if col not in df.columns]
+        if faltantes:
+            raise ValueError(f"Faltan columnas en la cartera: {', '.join(faltantes)}")
+        if tamaño_celda_km <= 0:
+            raise ValueError("El tamaño de celda debe ser mayor a 0")
+
+        coordenadas = parsear_columna(df["COORDENADAS"])
+        validas = coordenadas["lat"].notna().to_numpy()
+        self.sin_coordenadas = int((~validas).sum())
+        if not validas.any():
+            raise ValueError("Ningún préstamo tiene coordenadas válidas")
+
+        df = df[validas]
+        coordenadas = coordenadas[validas]
+        self.ids = df["ID"].to_numpy() if "ID" in df.columns else np.flatnonzero(validas)
+        self.lat = coordenadas["lat"].to_numpy(np.float64)
+        self.lon = coordenadas["lon"].to_numpy(np.float64)
+        self.ead = df["EAD"].to_numpy(np.float64)
+        self.el = df["EL"].to_numpy(np.float64)
+        self.pd = df["PD"].to_numpy(np.float64)
+        self.incumplio = df["incumplio_90d"].to_numpy(np.float64)
+
+        # Todos los puntos en la zona más frecuente para medir en metros
+        self.zona = int(np.bincount(coordenadas["zona"].astype(np.int64)).argmax())
+        self.x, self.y = self._proyectar(self.lat, self.lon)
+
+        self.celda = tamaño_celda_km * 1000
+        self._x0, self._y0 = self.x.min(), self.y.min()
+        self._columnas = int((self.x.max() - self._x0) // self.celda) + 1
+        self._filas = int((self.y.max() - self._y0) // self.celda) + 1
+        claves = self._clave(self.x, self.y)
+        self._orden = np.argsort(claves, kind="stable")
+        limites = np.searchsorted(claves[self._orden], np.arange(self._columnas * self._filas + 1))
+        self._inicio = limites[:-1]
+        self._fin = limites[1:]
+
+    @classmethod
+    def desde_colocaciones(cls, tamaño_celda_km: float = TAMAÑO_CELDA_KM) -> "IndiceEspacial":
+        """Índice de COLOCACIONES_BIOCREDITOS con los targets de _simular_targets."""
+        from .predictor import _cargar_datos, _simular_targets
+
+        return cls(_simular_targets(_cargar_datos()), tamaño_celda_km)
+
+    @classmethod
+    def cargar(cls) -> "IndiceEspacial":
+        """desde_colocaciones guardado en INDICE_FILE (ver predictor._cargar_indice)."""
+        from .predictor import _cargar_indice
+
+        return _cargar_indice(INDICE_FILE, cls.desde_colocaciones, Path(__file__))
+
+    def _clave(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        columna = ((x - self._x0) // self.celda).astype(np.int64)
+        fila = ((y - self._y0) // self.celda).astype(np.int64)
+        return columna * self._filas + fila
+
+    def _proyectar(self, lat: Any, lon: Any) -> Tuple[np.ndarray, np.ndarray]:
+        lat = np.asarray(lat, dtype=np.float64)
+        return _transversa(lat, np.asarray(lon, dtype=np.float64), np.full(lat.shape, self.zona))
+
+    def _candidatos(self, x_min: float, y_min: float, x_max: float, y_max: float) -> np.ndarray:
+        c0 = max(int((x_min - self._x0) // self.celda), 0)
+        c1 = min(int((x_max - self._x0) // self.celda), self._columnas - 1)
+        f0 = max(int((y_min - self._y0) // self.celda), 0)
+        f1 = min(int((y_max - self._y0) // self.celda), self._filas - 1)
+        if c0 > c1 or f0 > f1:
+            return np.empty(0, dtype=np.int64)
+        claves = (np.arange(c0, c1 + 1)[:, None] * self._filas + np.arange(f0, f1 + 1)).ravel()
+        partes = [self._orden[i:j] for i, j in zip(self._inicio[claves], self._fin[claves]) if j > i]
+        return np.concatenate(partes) if partes else np.empty(0, dtype=np.int64)
+
+    def _resumen(self, indices: np.ndarray) -> Dict[str, Any]:
+        ead = float(self.ead[indices].sum())
+        return {
+            "prestamos": int(len(indices)),
+            "ead": round(ead, 2),
+            "el": round(float(self.el[indices].sum()), 2),
+            "el_sobre_ead": round(float(self.el[indices].sum()) / ead, 4) if ead else 0.0,
+            "tasa_incumplimiento": round(float(self.incumplio[indices].mean()) * 100, 2) if len(indices) else 0.0,
+            "prob_impago_media": round(float(self.pd[indices].mean()) * 100, 2) if len(indices) else 0.0,
+        }
+
+    def en_radio(self, lat: float, lon: float, radio_km: float) -> np.ndarray:
+        """Posiciones de los préstamos a radio_km o menos del punto."""
+        if radio_km < 0:
+            raise ValueError("El radio no puede ser negativo")
+        x, y = self._proyectar(lat, lon)
+        # Radio en metros de la proyección (corrige el factor de escala local)
+        radio = radio_km * 1000 * float(_escala(x))
+        candidatos = self._candidatos(x - radio, y - radio, x + radio, y + radio)
+        distancia = np.hypot(self.x[candidatos] - x, self.y[candidatos] - y)
+        return np.sort(candidatos[distancia <= radio])
+
+    def en_recuadro(self, lat_min: float, lon_min: float, lat_max: float, lon_max: float) -> np.ndarray:
+        """Posiciones de los préstamos dentro del recuadro de latitud/longitud."""
+        if lat_min > lat_max or lon_min > lon_max:
+            raise ValueError("El recuadro debe tener mínimos menores a los máximos")
+        x, y = self._proyectar([lat_min, lat_min, lat_max, lat_max], [lon_min, lon_max, lon_min, lon_max])
+        candidatos = self._candidatos(x.min(), y.min(), x.max(), y.max())
+        dentro = (
+            (self.lat[candidatos] >= lat_min) & (self.lat[candidatos] <= lat_max)
+            & (self.lon[candidatos] >= lon_min) & (self.lon[candidatos] <= lon_max)
+        )
+        return np.sort(candidatos[dentro])
+
+    def riesgo_en_radio(self, lat: float, lon: float, radio_km: float) -> Dict[str, Any]:
+        """Préstamos, EAD, EL y tasa de incumplimiento a radio_km del punto."""
+        return {"lat": lat, "lon": lon, "radio_km": radio_km, **self._resumen(self.en_radio(lat, lon, radio_km))}
+
+    def riesgo_en_recuadro(self, lat_min: float, lon_min: float, lat_max: float, lon_max: float) -> Dict[str, Any]:
+        """Préstamos, EAD, EL y tasa de incumplimiento dentro del recuadro."""
+        return self._resumen(self.en_recuadro(lat_min, lon_min, lat_max, lon_max))
+
+    def mapa_calor(self, tamaño_celda_km: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Riesgo por celda (solo celdas con préstamos), ordenado por EL descendente."""
+        celda = self.celda if tamaño_celda_km is None else tamaño_celda_km * 1000
+        if celda <= 0:
+            raise ValueError("El tamaño de celda debe ser mayor a 0")
+        columna = ((self.x - self._x0) // celda).astype(np.int64)
+        fila = ((self.y - self._y0) // celda).astype(np.int64)
+        filas = int(fila.max()) + 1
+        claves, codigos = np.unique(columna * filas + fila, return_inverse=True)
+        conteo = np.bincount(codigos)
+        ead = np.bincount(codigos, weights=self.ead)
+        el = np.bincount(codigos, weights=self.el)
+        incumplidos = np.bincount(codigos, weights=self.incumplio)
+        pd_suma = np.bincount(codigos, weights=self.pd)
+
+        centro_x = self._x0 + (claves // filas + 0.5) * celda
+        centro_y = self._y0 + (claves % filas + 0.5) * celda
+        lat, lon = utm_a_latlon(centro_x, centro_y, self.zona, sur=False)
+        celdas = []
+        for k in np.argsort(-el, kind="stable"):
+            celdas.append(
+                {
+                    "lat": round(float(lat[k]), 6),
+                    "lon": round(float(lon[k]), 6),
+                    "prestamos": int(conteo[k]),
+                    "ead": round(float(ead[k]), 2),
+                    "el": round(float(el[k]), 2),
+                    "el_sobre_ead": round(float(el[k] / ead[k]), 4) if ead[k] else 0.0,
+                    "tasa_incumplimiento": round(float(incumplidos[k] / conteo[k]) * 100, 2),
+                    "prob_impago_media": round(float(pd_suma[k] / conteo[k]) * 100, 2),
+                }
+            )
+        return celdas
+
+
+def concentracion_solicitud(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Riesgo de la cartera alrededor de las coordenadas de una solicitud."""
+    punto = parsear_coordenadas(payload.get("coordenadas"))
+    if punto is None:
+        return {"error": "Coordenadas inválidas"}
+    indice = IndiceEspacial.cargar()
+    return indice.riesgo_en_radio(punto["lat"], punto["lon"], float(payload.get("radio_km", 10.0)))
+
+
+def concentracion_desde_stdin() -> Dict[str, Any]:
+    from .predictor import _leer_payload_stdin
+
+    return concentracion_solicitud(_leer_payload_stdin())
@@ -177,6 +177,16 @@ export function guardarFichaTecnica(
   });
 }
 
+// Las fichas paramétricas tienen datos_json vacío: se regeneran con
+// `python -m calculadoras.almacenamiento leer <id_ficha>`
+function parsearFila(row: any) {
+  return {
+    ...row,
+    datos_json: row.datos_json ? JSON.parse(row.datos_json) : null,
+    parametrica: !row.datos_json
+  }
+}
+
 export function obtenerFichasTecnicas(categoria_id?: string, provincia?: string): Promise<any[]> {
   return new Promise((resolve, reject) => {
     let query = 'SELECT * FROM fichas_tecnicas WHERE 1=1'
@@ -197,10 +207,7 @@ export function obtenerFichasTecnicas(categoria_id?: string, provincia?: string)
     db.all(query, params, (err, rows) => {
       if (err) reject(err)
       else {
-        const fichas = rows.map((row: any) => ({
-          ...row,
-          datos_json: JSON.parse(row.datos_json)
-        }))
+        const fichas = rows.map(parsearFila)
         resolve(fichas)
       }
     })
@@ -215,10 +222,7 @@ export function obtenerFichaTecnica(id_ficha: number): Promise<any> {
       (err, row: any) => {
         if (err) reject(err)
         else if (row) {
-          resolve({
-            ...row,
-            datos_json: JSON.parse(row.datos_json)
-          })
+          resolve(parsearFila(row))
         } else {
           reject(new Error('Ficha técnica no encontrada'))
         }
@@ -1,7 +1,7 @@
 import express from 'express'
 import path from 'path'
 import { fileURLToPath } from 'url'
-import { execSync } from 'child_process'
+import { execFileSync } from 'child_process'
 import { db, guardarFichaTecnica, obtenerCategorias, obtenerCultivosPorCategoria, obtenerTodosCultivos } from './database.js'
 
 const __filename = fileURLToPath(import.meta.url)
@@ -15,7 +15,7 @@ function encontrarPython() {
   
   for (const cmd of posibles) {
     try {
-      execSync(`${cmd} --version`, { stdio: 'pipe', encoding: 'utf-8' })
+      execFileSync(cmd, ['--version'], { stdio: 'pipe', encoding: 'utf-8' })
       console.log(`✓ Python encontrado: ${cmd}`)
       return cmd
     } catch (e) {
@@ -28,6 +28,46 @@ function encontrarPython() {
 
 const pythonCmd = encontrarPython()
 
+// Secciones de la ficha que muestra components/fichas-tecnicas.html
+// (la proyección a 15 años no se usa en la página). Solo recortan la
+// respuesta HTTP: en BD siempre se guarda la ficha completa
+const CAMPOS_FICHA = [
+  'datos_proyecto',
+  'instalacion',
+  'produccion_promedio',
+  'costos_produccion_detallado',
+  'costos_instalacion_detallado',
+  'analisis_financiero',
+  'calculos_alternativos'
+]
+
+// Ficha con solo CAMPOS_FICHA (en el modo activo y en los alternos)
+function proyectarFicha(ficha: any) {
+  const proyectar = (resultado: any) =>
+    Object.fromEntries(Object.entries(resultado || {}).filter(([campo]) => CAMPOS_FICHA.includes(campo)))
+  const proyectada: Record<string, any> = { ...proyectar(ficha), modo_sensibilizado: ficha.modo_sensibilizado }
+  if (ficha.calculos_alternativos) {
+    proyectada.calculos_alternativos = Object.fromEntries(
+      Object.entries(ficha.calculos_alternativos).map(([modo, resultado]) => [modo, proyectar(resultado)])
+    )
+  }
+  return proyectada
+}
+
+// Reconstruye los modos alternos que Python envía como {"$ref": "#"}
+// (referencia a las secciones de la raíz de la ficha)
+function resolverReferencias(ficha: any) {
+  const alternativos = ficha?.calculos_alternativos
+  if (!alternativos || typeof alternativos !== 'object') return ficha
+
+  const { modo_sensibilizado, calculos_alternativos, ...activo } = ficha
+  const resueltos: Record<string, any> = {}
+  for (const [modo, resultado] of Object.entries(alternativos)) {
+    resueltos[modo] = (resultado as any)?.$ref === '#' ? activo : resultado
+  }
+  return { ...ficha, calculos_alternativos: resueltos }
+}
+
 // Middleware
 app.use(express.json())
 app.use(express.static(path.join(__dirname, '..', 'public')))
@@ -102,24 +142,44 @@ app.post('/api/ficha-tecnica-cacao', async (req, res) => {
       return res.status(400).json({ error: 'Hectáreas inválidas' })
     }
 
+    if (typeof categoria_id !== 'string' || !/^[A-Z_]+$/.test(categoria_id)) {
+      return res.status(400).json({ error: 'Categoría inválida' })
+    }
+
+    if (!Number.isInteger(cultivo_id) || cultivo_id <= 0) {
+      return res.status(400).json({ error: 'Cultivo inválido' })
+    }
+
     if (!pythonCmd) {
       return res.status(500).json({ error: 'Python no está disponible' })
     }
     
     const projectRoot = path.join(__dirname, '..')
     const sensibilizadoParam = sensibilizado ? 'true' : 'false'
-    const result = execSync(`${pythonCmd} -m calculadoras.cacao_convencional.ejecutar ${hectareas} ${sensibilizadoParam}`, {
+    const argumentos = ['-m', 'calculadoras.cacao_convencional.ejecutar', String(hectareas), sensibilizadoParam]
+    // FICHAS_PARAMETRICAS=1: Python guarda solo entradas + versión (calculadoras/almacenamiento.py)
+    // y regenera la ficha completa al leerla, así que basta pedir CAMPOS_FICHA.
+    // Si no, Node guarda la ficha completa y recorta solo la respuesta
+    const parametrica = process.env.FICHAS_PARAMETRICAS === '1'
+    if (parametrica) {
+      argumentos.push('--campos', CAMPOS_FICHA.join(','), '--guardar', `${categoria_id},${cultivo_id}`)
+    }
+    const result = execFileSync(pythonCmd, argumentos, {
       cwd: projectRoot,
       encoding: 'utf-8',
       stdio: 'pipe'
     })
     
-    const fichaData = JSON.parse(result.trim())
+    const fichaData = resolverReferencias(JSON.parse(result.trim()))
     
     if (fichaData.error) {
       return res.status(400).json(fichaData)
     }
     
+    if (parametrica) {
+      return res.json(fichaData)
+    }
+    
     // Guardar en BD
     const fichaId = await guardarFichaTecnica(
       categoria_id,
@@ -129,7 +189,7 @@ app.post('/api/ficha-tecnica-cacao', async (req, res) => {
       fichaData
     )
     
-    res.json({ ...fichaData, id_ficha: fichaId })
+    res.json({ ...proyectarFicha(fichaData), id_ficha: fichaId })
     
   } catch (error: any) {
     console.error('Error:', error.message)
@@ -147,7 +207,7 @@ app.post('/api/evaluacion-credito', async (req, res) => {
     const projectRoot = path.join(__dirname, '..')
     const payload = JSON.stringify(req.body || {})
 
-    const result = execSync(`${pythonCmd} -m modelo_crediticio.ejecutar`, {
+    const result = execFileSync(pythonCmd, ['-m', 'modelo_crediticio.ejecutar'], {
       cwd: projectRoot,
       encoding: 'utf-8',
       stdio: ['pipe', 'pipe', 'pipe'],
@@ -162,6 +222,130 @@ app.post('/api/evaluacion-credito', async (req, res) => {
   }
 })
 
+// Monto máximo y plazo bajo los umbrales de aprobación (grilla monto x plazo)
+app.post('/api/evaluacion-credito/optimizar', async (req, res) => {
+  try {
+    if (!pythonCmd) {
+      return res.status(500).json({ error: 'Python no está disponible' })
+    }
+
+    const projectRoot = path.join(__dirname, '..')
+    const payload = JSON.stringify(req.body || {})
+
+    const result = execFileSync(pythonCmd, ['-m', 'modelo_crediticio.ejecutar', '--optimizar'], {
+      cwd: projectRoot,
+      encoding: 'utf-8',
+      stdio: ['pipe', 'pipe', 'pipe'],
+      input: payload
+    })
+
+    res.json(JSON.parse(result.trim()))
+  } catch (error: any) {
+    console.error('Error optimización crédito:', error.message)
+    res.status(500).json({ error: 'Error al optimizar condiciones' })
+  }
+})
+
+// Eco-asesor: combinaciones de prácticas sostenibles ordenadas por reducción de riesgo
+app.post('/api/eco-asesor/recomendar', async (req, res) => {
+  try {
+    if (!pythonCmd) {
+      return res.status(500).json({ error: 'Python no está disponible' })
+    }
+
+    const projectRoot = path.join(__dirname, '..')
+    const payload = JSON.stringify(req.body || {})
+
+    const result = execFileSync(pythonCmd, ['-m', 'modelo_crediticio.ejecutar', '--recomendar'], {
+      cwd: projectRoot,
+      encoding: 'utf-8',
+      stdio: ['pipe', 'pipe', 'pipe'],
+      input: payload
+    })
+
+    res.json(JSON.parse(result.trim()))
+  } catch (error: any) {
+    console.error('Error eco-asesor:', error.message)
+    res.status(500).json({ error: 'Error al recomendar prácticas' })
+  }
+})
+
+// Cobertura mensual de las cuotas con el flujo de la ficha de cacao (meses con déficit de caja)
+app.post('/api/evaluacion-credito/cobertura', async (req, res) => {
+  try {
+    if (!pythonCmd) {
+      return res.status(500).json({ error: 'Python no está disponible' })
+    }
+
+    const projectRoot = path.join(__dirname, '..')
+    const payload = JSON.stringify(req.body || {})
+
+    const result = execFileSync(pythonCmd, ['-m', 'modelo_crediticio.ejecutar', '--cobertura'], {
+      cwd: projectRoot,
+      encoding: 'utf-8',
+      stdio: ['pipe', 'pipe', 'pipe'],
+      input: payload
+    })
+
+    res.json(JSON.parse(result.trim()))
+  } catch (error: any) {
+    console.error('Error cobertura crédito:', error.message)
+    res.status(500).json({ error: 'Error al calcular cobertura' })
+  }
+})
+
+// Clientes similares de la cartera (comparables junto al score)
+app.post('/api/evaluacion-credito/similares', async (req, res) => {
+  try {
+    if (!pythonCmd) {
+      return res.status(500).json({ error: 'Python no está disponible' })
+    }
+
+    const projectRoot = path.join(__dirname, '..')
+    const payload = JSON.stringify(req.body || {})
+
+    const result = execFileSync(pythonCmd, ['-m', 'modelo_crediticio.ejecutar', '--similares'], {
+      cwd: projectRoot,
+      encoding: 'utf-8',
+      stdio: ['pipe', 'pipe', 'pipe'],
+      input: payload
+    })
+
+    res.json(JSON.parse(result.trim()))
+  } catch (error: any) {
+    console.error('Error clientes similares:', error.message)
+    res.status(500).json({ error: 'Error al buscar clientes similares' })
+  }
+})
+
+// Concentración de riesgo alrededor de las coordenadas del predio (radio_km)
+app.post('/api/evaluacion-credito/ubicacion', async (req, res) => {
+  try {
+    if (!pythonCmd) {
+      return res.status(500).json({ error: 'Python no está disponible' })
+    }
+
+    const projectRoot = path.join(__dirname, '..')
+    const payload = JSON.stringify(req.body || {})
+
+    const result = execFileSync(pythonCmd, ['-m', 'modelo_crediticio.ejecutar', '--ubicacion'], {
+      cwd: projectRoot,
+      encoding: 'utf-8',
+      stdio: ['pipe', 'pipe', 'pipe'],
+      input: payload
+    })
+
+    const data = JSON.parse(result.trim())
+    if (data.error) {
+      return res.status(400).json(data)
+    }
+    res.json(data)
+  } catch (error: any) {
+    console.error('Error concentración geográfica:', error.message)
+    res.status(500).json({ error: 'Error al consultar la ubicación' })
+  }
+})
+
 // Health check
 app.get('/healthz', (req, res) => {
   res.status(200).json({ status: 'ok', timestamp: new Date().toISOString() })